@@ -0,0 +1,18 @@
+"""
+Suíte de benchmarks do CCIMAR360.
+
+Mede os caminhos críticos da aplicação (importadores SIAFI, extratos do
+Cartão de Pagamento do Governo Federal, objetos auditáveis, filtros das
+tabelas, consultas do chatbot, exportações e geração de notas) com dados
+sintéticos determinísticos em 1×, 10× e 100× o volume de produção.
+
+Uso (a partir da raiz do repositório):
+
+    python -m pytest benchmarks                      # escala 1×
+    python -m pytest benchmarks --escalas=1,10,100   # todas as escalas
+    python -m benchmarks.comparar                    # compara as duas últimas execuções
+    python -m benchmarks.comparar base.json atual.json --limite 15
+
+Os resultados de cada execução são gravados em JSON (pytest-benchmark) em
+``benchmarks/.resultados``.
+"""
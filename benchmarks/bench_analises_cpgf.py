@@ -0,0 +1,112 @@
+"""
+Benchmarks das análises sobre as transações do CPGF (fracionamento de despesa e triagem de valores).
+"""
+
+import sqlite3
+
+import pytest
+
+from benchmarks.geradores import gerar_extrato_cpgf
+
+RODADAS = 3
+
+# Cabeçalho do portal -> coluna de ``tabela_cartao_corporativo``
+COLUNAS_CPGF = {
+    "CÓDIGO ÓRGÃO SUPERIOR": "cod_orgao_superior",
+    "NOME ÓRGÃO SUPERIOR": "nome_orgao_superior",
+    "CÓDIGO ÓRGÃO": "cod_orgao",
+    "NOME ÓRGÃO": "nome_orgao",
+    "CÓDIGO UNIDADE GESTORA": "cod_unidade_gestora",
+    "NOME UNIDADE GESTORA": "nome_unidade_gestora",
+    "ANO EXTRATO": "ano_extrato",
+    "MÊS EXTRATO": "mes_extrato",
+    "CPF PORTADOR": "cpf_portador",
+    "NOME PORTADOR": "nome_portador",
+    "CNPJ OU CPF FAVORECIDO": "cnpj_cpf_favorecido",
+    "NOME FAVORECIDO": "nome_favorecido",
+    "TRANSAÇÃO": "transacao",
+    "DATA TRANSAÇÃO": "data_transacao",
+    "VALOR TRANSAÇÃO": "valor_transacao",
+}
+
+
+@pytest.fixture
+def banco_cpgf(escala, tmp_path):
+    """Banco com ``tabela_cartao_corporativo`` populada a partir do extrato sintético."""
+    df = gerar_extrato_cpgf(escala).rename(columns=COLUNAS_CPGF)
+    df["valor_transacao"] = df["valor_transacao"].str.replace(",", ".").astype(float)
+    df.index += 1
+    caminho = tmp_path / "cartao.db"
+    with sqlite3.connect(caminho) as conn:
+        df.to_sql("tabela_cartao_corporativo", conn, index=True, index_label="id")
+    return caminho
+
+
+def bench_detectar_fracionamento(benchmark, banco_cpgf):
+    from modules.ccimar13_execucao.menu.content.cartao_corporativo.analises.fracionamento import (
+        TABELA_ACHADOS,
+        executar_deteccao,
+    )
+
+    # Limite baixo para o extrato sintético (valores de centenas de reais) gerar achados
+    limites = {"teste": 1500.0}
+    total = benchmark.pedantic(executar_deteccao, args=(banco_cpgf, limites), rounds=RODADAS)
+    with sqlite3.connect(banco_cpgf) as conn:
+        gravados = conn.execute(f"SELECT COUNT(*) FROM {TABELA_ACHADOS}").fetchone()[0]
+    assert gravados == total
+
+
+@pytest.mark.parametrize("lote", ["novo", "em_cache"])
+def bench_triagem_valores(benchmark, banco_cpgf, lote):
+    from modules.ccimar13_execucao.menu.content.cartao_corporativo.analises.triagem_valores import (
+        TABELA_ESTATISTICAS,
+        executar_triagem_cpgf,
+    )
+
+    # "em_cache": mesmo lote já triado, só confere a impressão digital da tabela
+    executar_triagem_cpgf(banco_cpgf)
+    benchmark.pedantic(executar_triagem_cpgf, args=(banco_cpgf, lote == "novo"), rounds=RODADAS)
+    with sqlite3.connect(banco_cpgf) as conn:
+        ugs = conn.execute(f"SELECT COUNT(*) FROM {TABELA_ESTATISTICAS}").fetchone()[0]
+    assert ugs > 0
+
+
+def bench_reimportacao_cpgf(benchmark, escala, banco_cpgf):
+    from modules.ccimar13_execucao.menu.content.cartao_corporativo.analises.duplicidade import importar_transacoes
+
+    # Reimporta o mesmo extrato: todas as linhas devem ser descartadas pelo índice de impressão digital
+    df = gerar_extrato_cpgf(escala).rename(columns=COLUNAS_CPGF)
+    df["valor_transacao"] = df["valor_transacao"].str.replace(",", ".").astype(float)
+
+    def reimportar():
+        with sqlite3.connect(banco_cpgf) as conn:
+            return importar_transacoes(conn, df, banco_cpgf)
+
+    inseridas, ignoradas = benchmark.pedantic(reimportar, rounds=RODADAS)
+    assert inseridas == 0 and ignoradas == len(df)
+
+
+@pytest.mark.parametrize("modo", ["completa", "incremental"])
+def bench_concentracao_ug_mes(benchmark, banco_cpgf, modo):
+    from modules.ccimar13_execucao.menu.content.cartao_corporativo.analises.concentracao import (
+        atualizar_concentracao,
+        ranking_concentracao,
+    )
+
+    with sqlite3.connect(banco_cpgf) as conn:
+        # Datas do extrato sintético em ISO, como gravadas pelo importador
+        conn.execute(
+            "UPDATE tabela_cartao_corporativo SET data_transacao = "
+            "substr(data_transacao, 7, 4) || '-' || substr(data_transacao, 4, 2) || '-' || substr(data_transacao, 1, 2)"
+        )
+        # Incremental: um mês de todas as UGs, como após a importação de um extrato mensal
+        afetadas = conn.execute(
+            "SELECT DISTINCT cod_unidade_gestora, substr(data_transacao, 1, 7) FROM tabela_cartao_corporativo "
+            "WHERE data_transacao LIKE '2024-06-%'"
+        ).fetchall()
+    atualizar_concentracao(banco_cpgf)
+
+    benchmark.pedantic(
+        atualizar_concentracao, args=(banco_cpgf, afetadas if modo == "incremental" else None), rounds=RODADAS
+    )
+    assert not ranking_concentracao(banco_cpgf, limite=10).empty
@@ -0,0 +1,91 @@
+"""
+Benchmarks das consultas do chatbot, da resolução de entidades e das exportações XLSX/DOCX/PDF.
+"""
+
+import os
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.geradores import gerar_fornecedores, gerar_planilhas_siafi
+
+RODADAS = 3
+
+CONSULTA_MUNIC = """
+    SELECT cod_siafi, codigo_om, despesa_autorizada, quantidade_de_notas, ultima_auditoria
+    FROM criterio_munic
+    ORDER BY despesa_autorizada DESC
+"""
+
+
+@pytest.fixture
+def banco_consultas(escala, qapp, tmp_path):
+    """Banco CCIMAR11 populado com OMs e o critério de municiamento."""
+    from modules.ccimar11_planejamento.model import CCIMAR11Model
+
+    caminho = tmp_path / "ccimar11.db"
+    CCIMAR11Model(caminho)
+    planilhas = gerar_planilhas_siafi(escala)
+    oms = planilhas["OM"]
+    munic = planilhas["MUNIC"]
+    with sqlite3.connect(caminho) as conn:
+        conn.executemany(
+            "INSERT INTO organizacoes_militares (cod_siafi, sigla_om, nome_om, distrito, uf) VALUES (?, ?, ?, ?, ?)",
+            oms[["SIGLA SIAFI", "SIGLA_OM", "NOME_OM", "AREA_OM", "UF"]].itertuples(index=False, name=None),
+        )
+        conn.executemany(
+            "INSERT INTO criterio_munic (cod_siafi, codigo_om, despesa_autorizada, quantidade_de_notas, ultima_auditoria) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (int(r[0]), str(r[1]), float(r[2]), int(r[3]), r[4])
+                for r in munic[["SIGLA SIAFI", "CODIGO_OM", "DESPESA AUTORIZADA",
+                                "QUANTIDADE_DE_NOTAS", "ULTIMA_AUDITORIA"]].itertuples(index=False, name=None)
+            ],
+        )
+    return caminho
+
+
+def bench_execute_sql_query(benchmark, banco_consultas):
+    from modules.ccimar11_planejamento.menu.content.chatbot import ChatbotWidget
+
+    # O método só depende de ``db_path``; evita instanciar o cliente OpenAI
+    widget = SimpleNamespace(db_path=str(banco_consultas))
+    resultado = benchmark.pedantic(
+        ChatbotWidget.execute_sql_query, args=(widget, CONSULTA_MUNIC), rounds=RODADAS
+    )
+    assert not resultado.startswith("Erro")
+
+
+@pytest.mark.parametrize("formato", ["xlsx", "docx", "pdf"])
+def bench_exportacao(benchmark, banco_consultas, formato, tmp_path, monkeypatch):
+    from modules.ccimar11_planejamento.menu.content import chatbot
+
+    # Não abre o arquivo gerado no visualizador do sistema
+    monkeypatch.setattr(os, "startfile", lambda *args, **kwargs: None, raising=False)
+    exportar = getattr(chatbot, f"export_{formato}")
+    destino = str(tmp_path / f"export.{formato}")
+
+    resultado = benchmark.pedantic(
+        exportar, args=(str(banco_consultas), CONSULTA_MUNIC, destino), rounds=RODADAS
+    )
+    assert not resultado.startswith("Erro")
+
+
+def bench_resolver_fornecedores(benchmark, escala):
+    """Indexa as razões sociais e resolve a grafia de cada fornecedor em outra fonte."""
+    from database.resolucao_entidades import IndiceTrigramas, normalizar_fornecedor, resolver_nome
+
+    fornecedores = gerar_fornecedores(escala)
+
+    def resolver():
+        indice = IndiceTrigramas()
+        for cnpj, razao_social, _ in fornecedores:
+            indice.adicionar(cnpj[:8], normalizar_fornecedor(razao_social))
+        return [resolver_nome(indice, normalizar_fornecedor(alternativa)) for _, _, alternativa in fornecedores]
+
+    resolvidos = benchmark.pedantic(resolver, rounds=RODADAS)
+    acertos = sum(
+        1 for (cnpj, _, _), (raiz, _, _, aceito) in zip(fornecedores, resolvidos) if aceito and raiz == cnpj[:8]
+    )
+    assert acertos >= 0.95 * len(fornecedores)
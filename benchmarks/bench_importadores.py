@@ -0,0 +1,189 @@
+"""
+Benchmarks dos importadores: critérios SIAFI (``insert_*``), extratos do
+CPGF (``CartaoCorporativoController.import_xlsx_to_db``) e itens do PNCP.
+"""
+
+import pytest
+
+from benchmarks.geradores import (
+    escrever_extrato_cpgf,
+    gerar_extrato_cpgf,
+    gerar_itens_pncp,
+    gerar_planilhas_siafi,
+)
+
+RODADAS = 3
+
+
+@pytest.fixture
+def planilhas(escala):
+    return gerar_planilhas_siafi(escala)
+
+
+@pytest.fixture
+def novo_banco_ccimar11(qapp, tmp_path):
+    """Retorna uma função que cria um banco CCIMAR11 vazio a cada rodada."""
+    from modules.ccimar11_planejamento.model import CCIMAR11Model
+
+    contador = {"n": 0}
+
+    def criar(planilhas=None):
+        contador["n"] += 1
+        model = CCIMAR11Model(tmp_path / f"ccimar11_{contador['n']}.db")
+        if planilhas is not None:
+            model.insert_organizacao_militar(planilhas["OM"])
+        return model
+
+    return criar
+
+
+def bench_insert_organizacao_militar(benchmark, planilhas, novo_banco_ccimar11):
+    benchmark.pedantic(
+        lambda model: model.insert_organizacao_militar(planilhas["OM"]),
+        setup=lambda: ((novo_banco_ccimar11(),), {}),
+        rounds=RODADAS,
+    )
+
+
+@pytest.mark.parametrize("importador, aba", [
+    ("insert_munic", "MUNIC"),
+    ("insert_execucao_licitacao", "EXEC_LICITACAO"),
+    ("insert_pagamento", "PAGAMENTO"),
+    ("insert_patrimonio", "PATRIMONIO"),
+])
+def bench_insert_criterios(benchmark, planilhas, novo_banco_ccimar11, importador, aba):
+    benchmark.pedantic(
+        lambda model: getattr(model, importador)(planilhas[aba]),
+        setup=lambda: ((novo_banco_ccimar11(planilhas),), {}),
+        rounds=RODADAS,
+    )
+
+
+@pytest.mark.parametrize("extensao", [".csv", ".xlsx"])
+def bench_import_cartao_corporativo(benchmark, escala, extensao, icons, tmp_path, monkeypatch):
+    from modules.ccimar13_execucao.menu.content.cartao_corporativo import cartaocontroller
+    from modules.ccimar13_execucao.menu.content.cartao_corporativo.cartaomodel import CartaoCorporativoModel
+    from modules.ccimar13_execucao.menu.content.cartao_corporativo.cartaoview import CartaoCorporativoView
+
+    arquivo = escrever_extrato_cpgf(gerar_extrato_cpgf(escala), tmp_path / f"extrato{extensao}")
+
+    # Substitui os diálogos modais: o arquivo é escolhido sem interação
+    monkeypatch.setattr(cartaocontroller.QFileDialog, "getOpenFileName", lambda *args, **kwargs: (arquivo, ""))
+    monkeypatch.setattr(cartaocontroller.QMessageBox, "information", lambda *args, **kwargs: None)
+    monkeypatch.setattr(cartaocontroller.QMessageBox, "warning", lambda *args, **kwargs: pytest.fail(args[2]))
+
+    contador = {"n": 0}
+
+    def preparar():
+        contador["n"] += 1
+        model = CartaoCorporativoModel(tmp_path / f"cartao_{contador['n']}.db")
+        sql_model = model.setup_model("tabela_cartao_corporativo", editable=True)
+        view = CartaoCorporativoView(icons, sql_model, model.database_manager.db_path)
+        controller = cartaocontroller.CartaoCorporativoController(icons, view, model)
+        return (controller,), {}
+
+    benchmark.pedantic(lambda controller: controller.import_xlsx_to_db(), setup=preparar, rounds=RODADAS)
+
+
+def bench_popular_itens_pncp(benchmark, escala, tmp_path):
+    from config.config_Setores.database import DatabaseManager
+
+    data_informacoes, resultados = gerar_itens_pncp(escala)
+    contador = {"n": 0}
+
+    def preparar():
+        contador["n"] += 1
+        manager = DatabaseManager(tmp_path / f"pncp_{contador['n']}.db")
+        manager.criar_tabela_itens_pregao(
+            data_informacoes["numeroCompra"], data_informacoes["anoCompra"],
+            data_informacoes["unidadeOrgao"]["codigoUnidade"],
+        )
+        return (manager,), {}
+
+    benchmark.pedantic(
+        lambda manager: manager.popular_db_consulta_itens_api(
+            resultados, data_informacoes, data_informacoes["numeroCompra"],
+            data_informacoes["anoCompra"], data_informacoes["unidadeOrgao"]["codigoUnidade"],
+        ),
+        setup=preparar,
+        rounds=RODADAS,
+    )
+
+
+def bench_itens_acima_do_percentil(benchmark, escala, tmp_path):
+    """Consulta de itens acima do p90 do catálogo a partir das referências já mantidas."""
+    from config.config_Setores.database import DatabaseManager
+
+    data_informacoes, resultados = gerar_itens_pncp(escala)
+    manager = DatabaseManager(tmp_path / "pncp_referencias.db")
+    manager.criar_tabela_itens_pregao(
+        data_informacoes["numeroCompra"], data_informacoes["anoCompra"],
+        data_informacoes["unidadeOrgao"]["codigoUnidade"],
+    )
+    manager.popular_db_consulta_itens_api(
+        resultados, data_informacoes, data_informacoes["numeroCompra"],
+        data_informacoes["anoCompra"], data_informacoes["unidadeOrgao"]["codigoUnidade"],
+    )
+
+    benchmark.pedantic(manager.itens_acima_do_percentil, rounds=RODADAS)
+
+
+def bench_sketch_adicionar_remover(benchmark, escala):
+    """Ida e volta no sketch de preços: extremos nunca aparecem como valor de balde."""
+    import random
+
+    from utils.precos_referencia import QuantileSketch
+
+    # Caso do revisor: o máximo removido não pode virar o valor do balde de 100
+    sketch = QuantileSketch()
+    for valor in (100, 100, 50):
+        sketch.adicionar(valor)
+    sketch.remover(100)
+    sketch.remover(100)
+    assert sketch.minimo == 50 and sketch.maximo is None
+    assert sketch.quantil(1.0) <= sketch.teto < 50 * sketch.gamma
+
+    gerador = random.Random(49)
+    precos = [round(gerador.lognormvariate(4, 1), 2) for _ in range(escala * 10)]
+    ordem = sorted(range(len(precos)), key=precos.__getitem__)
+    retirados = [precos[i] for i in sorted(set(ordem[:3] + ordem[-3:] + list(range(0, len(precos), 7))))]
+
+    def ida_e_volta():
+        sketch = QuantileSketch()
+        for valor in precos:
+            sketch.adicionar(valor)
+        for valor in retirados:
+            sketch.remover(valor)
+        for valor in retirados:
+            sketch.adicionar(valor)
+        return sketch
+
+    sketch = benchmark.pedantic(ida_e_volta, rounds=RODADAS)
+    assert sketch.qtd == len(precos)
+    # Os extremos voltaram ao conjunto: ou são os exatos, ou ficam desconhecidos
+    assert sketch.minimo in (None, min(precos)) and sketch.maximo in (None, max(precos))
+    assert sketch.piso <= min(precos) and sketch.teto >= max(precos)
+
+
+@pytest.mark.parametrize("cache", ["frio", "quente"])
+def bench_ler_planilha_siafi(benchmark, planilhas, tmp_path, cache):
+    """Leitura de todas as abas da planilha SIAFI sem cache (frio) e com o cache preenchido (quente)."""
+    import pandas as pd
+
+    from utils.planilha_cache import PlanilhaCache
+
+    caminho = tmp_path / "siafi.xlsx"
+    with pd.ExcelWriter(caminho) as writer:
+        for aba, df in planilhas.items():
+            df.to_excel(writer, sheet_name=aba, index=False)
+    planilha_cache = PlanilhaCache(tmp_path / "cache")
+    if cache == "quente":
+        planilha_cache.ler(caminho, sheet_name=None)
+
+    def preparar():
+        if cache == "frio":
+            planilha_cache.limpar()
+        return (), {}
+
+    abas = benchmark.pedantic(lambda: planilha_cache.ler(caminho, sheet_name=None), setup=preparar, rounds=RODADAS)
+    assert set(abas) == set(planilhas)
@@ -0,0 +1,214 @@
+"""
+Benchmarks da camada de apresentação: filtragem multicoluna da barra de
+pesquisa sobre uma tabela do tamanho de um extrato do CPGF e custo de
+polimento do painel de critérios com folhas de estilo por widget × tema único
+e ordenação do modelo projetado por uma coluna oculta.
+"""
+
+import pytest
+
+from benchmarks.geradores import gerar_extrato_cpgf
+
+RODADAS = 5
+
+
+@pytest.fixture
+def proxy_cpgf(escala, qapp):
+    from PyQt6.QtGui import QStandardItem, QStandardItemModel
+    from utils.search_bar import MultiColumnFilterProxyModel
+
+    df = gerar_extrato_cpgf(escala)
+    source = QStandardItemModel(len(df), len(df.columns))
+    source.setHorizontalHeaderLabels(list(df.columns))
+    for row, valores in enumerate(df.itertuples(index=False)):
+        for col, valor in enumerate(valores):
+            source.setItem(row, col, QStandardItem(valor))
+
+    proxy = MultiColumnFilterProxyModel()
+    proxy.setSourceModel(source)
+    return proxy
+
+
+@pytest.mark.parametrize("termo", ["FORNECEDOR 7", "PORTADOR 12", "inexistente"])
+def bench_filtro_multicoluna(benchmark, proxy_cpgf, termo):
+    from PyQt6.QtCore import QRegularExpression
+    from utils.search_bar import on_search_text_changed
+
+    def filtrar():
+        on_search_text_changed(termo, proxy_cpgf)
+        return proxy_cpgf.rowCount()
+
+    benchmark.pedantic(
+        filtrar,
+        setup=lambda: proxy_cpgf.setFilterRegularExpression(QRegularExpression()),
+        rounds=RODADAS,
+    )
+
+
+# Folhas de estilo que create_objetos_auditaveis aplicava a cada widget antes do tema único
+FOLHA_GRUPO_INLINE = """
+                QGroupBox {
+                    background-color: #181928;  /* Fundo escuro */
+                    border: 2px solid #25283D;  /* Borda sutil */
+                    border-radius: 8px;  /* Bordas arredondadas */
+                    margin-top: 20px;  /* Ajuste para o título não sobrepor a borda */
+                    padding: 10px;
+                    font-size: 16px;
+                    font-weight: bold;
+                }
+
+                QGroupBox::title {
+                    subcontrol-origin: margin;
+                    subcontrol-position: top left;
+                    padding: 5px 10px;
+                    background-color: #25283D; /* Fundo do título */
+                    color: white;                    
+                    border-radius: 4px;
+                }
+            """
+FOLHA_CONTEUDO_INLINE = "background-color: #181928;"
+FOLHA_TITULO_INLINE = """
+                    color: #8AB4F7;  /* Azul suave para contraste */
+                    font-weight: bold;
+                    font-size: 14px;
+                    padding: 5px 10px;
+                """
+FOLHA_TABELA_INLINE = """
+                    QTableWidget {
+                        background-color: #181928;  /* Fundo escuro */
+                        color: white;  /* Texto claro */
+                        gridline-color: #25283D;  /* Linhas separadoras discretas */
+                        selection-background-color: #2A2D44;  /* Destaque ao selecionar */
+                        selection-color: white;
+                        border: 1px solid #25283D;
+                        alternate-background-color: #1F2133;  /* Linhas alternadas */
+                                           font-size: 16px;
+                    }
+
+                    QHeaderView::section {
+                        background-color: #25283D;  /* Cabeçalhos com fundo escuro */
+                        color: white;
+                        font-size: 16px;
+                        font-weight: bold;
+                        padding: 2px;
+                        border: 1px solid #2F324B;
+                    }
+
+                    QTableCornerButton::section {
+                        background-color: #25283D;
+                        border: 1px solid #2F324B;
+                    }
+                """
+
+
+def _painel_criterios(qapp, estilo_inline):
+    """Monta um painel como o de critérios dos objetos auditáveis (3 grupos × 10 critérios)."""
+    from PyQt6.QtWidgets import QGroupBox, QLabel, QTableWidget, QVBoxLayout, QWidget
+    from assets.styles.theme import set_variant
+
+    painel = QWidget()
+    layout = QVBoxLayout(painel)
+    for categoria in ("Materialidade", "Relevancia", "Criticidade"):
+        grupo = QGroupBox(categoria)
+        grupo_layout = QVBoxLayout(grupo)
+        conteudo = QWidget()
+        conteudo_layout = QVBoxLayout(conteudo)
+        # Comportamento anterior: as mesmas chamadas setStyleSheet de create_objetos_auditaveis
+        if estilo_inline:
+            grupo.setStyleSheet(FOLHA_GRUPO_INLINE)
+            conteudo.setStyleSheet(FOLHA_CONTEUDO_INLINE)
+        else:
+            set_variant(grupo, "criteria")
+            set_variant(conteudo, "criteriaContent")
+        for i in range(10):
+            titulo = QLabel(f"Critério: {i}")
+            tabela = QTableWidget(4, 2)
+            if estilo_inline:
+                titulo.setStyleSheet(FOLHA_TITULO_INLINE)
+                tabela.setStyleSheet(FOLHA_TABELA_INLINE)
+            else:
+                set_variant(titulo, "criteriaTitle")
+                set_variant(tabela, "criteria")
+            conteudo_layout.addWidget(titulo)
+            conteudo_layout.addWidget(tabela)
+        grupo_layout.addWidget(conteudo)
+        layout.addWidget(grupo)
+    # Força o polimento de todos os widgets, como ao exibir o painel
+    painel.ensurePolished()
+    for filho in painel.findChildren(QWidget):
+        filho.ensurePolished()
+    painel.deleteLater()
+
+
+@pytest.mark.parametrize("estilo", ["inline", "tema"])
+def bench_polimento_painel_criterios(benchmark, qapp, estilo):
+    """Compara folhas de estilo por widget com o tema único da aplicação."""
+    from assets.styles.theme import apply_theme
+
+    apply_theme(qapp)
+    benchmark.pedantic(_painel_criterios, args=(qapp, estilo == "inline"), rounds=RODADAS)
+
+
+@pytest.mark.parametrize("cenario", ["mesmos_rotulos", "rotulos_novos"])
+def bench_atualizacao_grafico_barras(benchmark, qapp, cenario):
+    """Troca de órgão no dashboard do cartão: atualização no lugar do gráfico top 10."""
+    from utils.bar_chart_canvas import BarChartCanvas
+
+    canvas = BarChartCanvas("Top 10 Favorecidos", "nome_favorecido", "valor_transacao")
+    canvas.resize(640, 420)
+    canvas.show()
+    canvas.draw()
+    estado = {"n": 0}
+
+    def atualizar():
+        estado["n"] += 1
+        prefixo = "FAVORECIDO" if cenario == "mesmos_rotulos" else f"ORGAO {estado['n']} FAVORECIDO"
+        canvas.update_data([f"{prefixo} {i}" for i in range(10)], [900 - i * 50 + estado["n"] % 7 for i in range(10)])
+        qapp.processEvents()
+
+    benchmark.pedantic(atualizar, rounds=RODADAS, iterations=10)
+    canvas.close()
+
+
+def bench_ordenacao_coluna_oculta(benchmark, qapp, tmp_path, escala):
+    """Modelo projetado ordenado por uma coluna fora da projeção: a ordem precisa vir do banco."""
+    import sqlite3
+
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtSql import QSqlDatabase
+    from utils.projected_table_model import ProjectedSqlTableModel
+
+    caminho = tmp_path / "projecao.db"
+    total = 1_000 * escala
+    with sqlite3.connect(caminho) as conn:
+        conn.execute("CREATE TABLE contratos (id TEXT PRIMARY KEY, objeto TEXT, vigencia_final TEXT)")
+        conn.executemany(
+            "INSERT INTO contratos VALUES (?, ?, ?)",
+            [(f"C{i:06d}", f"OBJETO {i}", f"{2020 + (i * 7) % 10}-01-{1 + i % 28:02d}") for i in range(total)],
+        )
+
+    db = QSqlDatabase.addDatabase("QSQLITE", "bench_projecao")
+    db.setDatabaseName(str(caminho))
+    db.open()
+    model = ProjectedSqlTableModel(db=db)
+    model.setTable("contratos")
+    model.set_visible_columns(["objeto"])
+    model.setSort(model.fieldIndex("vigencia_final"), Qt.SortOrder.DescendingOrder)
+
+    def selecionar():
+        model.select()
+        while model.canFetchMore():
+            model.fetchMore()
+        return model.rowCount()
+
+    assert benchmark.pedantic(selecionar, rounds=RODADAS) == total
+    assert "ORDER BY" in model.selectStatement()
+
+    # A coluna de ordenação é buscada mesmo oculta, e as linhas chegam na ordem do banco
+    vigencias = [model.index(linha, model.fieldIndex("vigencia_final")).data() for linha in range(model.rowCount())]
+    assert all(vigencias) and vigencias == sorted(vigencias, reverse=True)
+
+    del model
+    db.close()
+    del db
+    QSqlDatabase.removeDatabase("bench_projecao")
@@ -0,0 +1,32 @@
+"""
+Benchmark da geração de notas de auditoria (``gera_notas_calc_total.main``).
+"""
+
+import os
+
+from benchmarks.geradores import gerar_inconsistencias_munic, gerar_modelo_nota
+
+RODADAS = 3
+
+
+def bench_gera_notas(benchmark, escala, tmp_path):
+    from utils import gera_notas_calc_total
+
+    df = gerar_inconsistencias_munic(escala)
+    modelo = gerar_modelo_nota(tmp_path / "modelo-formatado.docx")
+    destino = tmp_path / "notas"
+    destino.mkdir()
+
+    benchmark.pedantic(
+        gera_notas_calc_total.main,
+        kwargs={
+            "df_inconsistencias": df,
+            "path_notas": f"{destino}{os.sep}",
+            "coluna_oms": "OC",
+            "path_modelo": modelo,
+            "titulo": None,
+            "num_nota": "S/N",
+            "nome_notas": "NA-{sigla}-munic_em_lic",
+        },
+        rounds=RODADAS,
+    )
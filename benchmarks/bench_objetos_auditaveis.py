@@ -0,0 +1,57 @@
+"""
+Benchmarks do modelo de objetos auditáveis (PAINT): carga da tabela e
+recálculo com novos multiplicadores.
+"""
+
+from benchmarks.geradores import gerar_config_paint, gerar_objetos_auditaveis
+
+RODADAS = 3
+
+
+def _criar_modelo(data):
+    from modules.ccimar11_planejamento.menu.content.objetos_auditaveis.models import ObjetosAuditaveisModel
+
+    return ObjetosAuditaveisModel(criterios_manager=None, data=data)
+
+
+def bench_load_data(benchmark, escala, qapp, config_paint):
+    linhas = gerar_objetos_auditaveis(escala)
+    universo = gerar_config_paint(escala)
+
+    def preparar():
+        config_paint(universo)
+        return (_criar_modelo([]), linhas), {}
+
+    benchmark.pedantic(lambda model, data: model.load_data(data), setup=preparar, rounds=RODADAS)
+
+
+def bench_update_multiplicadores(benchmark, escala, qapp, config_paint):
+    linhas = gerar_objetos_auditaveis(escala)
+    config_paint(gerar_config_paint(escala))
+    model = _criar_modelo(linhas)
+    pesos = iter([(5, 3, 2), (4, 2, 4)] * 100)
+
+    benchmark.pedantic(lambda: model.update_multiplicadores(*next(pesos)), rounds=RODADAS)
+
+
+def bench_commit_detalhes(benchmark, escala, qapp, config_paint, monkeypatch):
+    """Salvar o diálogo de detalhes: critérios e valores calculados numa única gravação."""
+    from paths import document_store
+
+    linhas = gerar_objetos_auditaveis(escala)
+    config_paint(gerar_config_paint(escala))
+    model = _criar_modelo(linhas)
+    gravacoes = []
+    salvar = document_store.save
+    monkeypatch.setattr(document_store, "save", lambda *args, **kwargs: gravacoes.append(args[0]) or salvar(*args, **kwargs))
+
+    def salvar_detalhes():
+        gravacoes.clear()
+        model.begin_update()
+        model.set_objeto_criterios(model.get_objeto_id(0), {"materialidade": {}, "relevancia": {}, "criticidade": {}})
+        for coluna, valor in ((2, "8.0"), (3, "6.0"), (4, "4.0")):
+            model.setData(model.index(0, coluna), valor)
+        model.commit()
+        return len(gravacoes)
+
+    assert benchmark.pedantic(salvar_detalhes, rounds=RODADAS) == 1
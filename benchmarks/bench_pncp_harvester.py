@@ -0,0 +1,50 @@
+"""
+Benchmark da coleta concorrente do PNCP (``utils.pncp_harvester``) contra o
+servidor de replay local, com latência artificial por requisição.
+"""
+
+from datetime import date
+
+import pytest
+
+from benchmarks.geradores import gravar_respostas_pncp
+
+RODADAS = 3
+LATENCIA_MS = 50
+INICIO, FIM = date(2024, 1, 1), date(2024, 1, 31)
+
+
+@pytest.fixture
+def servidor_replay(escala, tmp_path):
+    from utils.pncp_replay_server import ReplayServer
+
+    respostas = tmp_path / "gravacoes"
+    gravar_respostas_pncp(escala, respostas, INICIO, FIM)
+    with ReplayServer(respostas, latencia_ms=LATENCIA_MS, semente=360) as servidor:
+        yield servidor
+
+
+@pytest.mark.parametrize("concorrencia", [1, 16])
+def bench_coleta_pncp(benchmark, servidor_replay, tmp_path, concorrencia):
+    from utils.pncp_harvester import PNCPHarvester
+
+    contador = {"n": 0}
+
+    def preparar():
+        # Cache vazio a cada rodada: mede a coleta completa, não o reaproveitamento
+        contador["n"] += 1
+        harvester = PNCPHarvester(
+            servidor_replay.url, tmp_path / f"cache_{contador['n']}", concorrencia=concorrencia, taxa=1000,
+        )
+        return (harvester,), {}
+
+    benchmark.pedantic(lambda harvester: harvester.coletar_sync(INICIO, FIM), setup=preparar, rounds=RODADAS)
+
+
+def bench_coleta_pncp_incremental(benchmark, servidor_replay, tmp_path):
+    """Segunda coleta do mesmo período: compras inalteradas vêm do disco."""
+    from utils.pncp_harvester import PNCPHarvester
+
+    harvester = PNCPHarvester(servidor_replay.url, tmp_path / "cache", concorrencia=16, taxa=1000)
+    harvester.coletar_sync(INICIO, FIM)
+    benchmark.pedantic(harvester.coletar_sync, args=(INICIO, FIM), rounds=RODADAS)
@@ -0,0 +1,105 @@
+"""
+Compara duas execuções dos benchmarks e aponta regressões.
+
+Uso:
+    python -m benchmarks.comparar                       # duas últimas execuções salvas
+    python -m benchmarks.comparar base.json atual.json  # arquivos específicos
+    python -m benchmarks.comparar --limite 15 --estatistica median
+
+Retorna código de saída 1 quando algum benchmark ficar mais lento que o
+limite percentual, o que permite usar o comando em scripts de CI.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+RESULTADOS_DIR = Path(__file__).resolve().parent / ".resultados"
+
+
+def carregar_resultados(caminho):
+    """
+    Lê um arquivo JSON do pytest-benchmark.
+
+    Returns:
+        dict: {fullname: stats} de cada benchmark da execução.
+    """
+    with open(caminho, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+    return {bench["fullname"]: bench["stats"] for bench in dados.get("benchmarks", [])}
+
+
+def ultimas_execucoes(diretorio=RESULTADOS_DIR, quantidade=2):
+    """Retorna os arquivos das últimas execuções salvas, do mais antigo ao mais novo."""
+    arquivos = sorted(Path(diretorio).glob("*/*.json"), key=lambda p: p.stat().st_mtime)
+    return arquivos[-quantidade:]
+
+
+def comparar(base, atual, estatistica="mean", limite=10.0):
+    """
+    Compara os tempos de duas execuções.
+
+    Args:
+        base (dict): Resultados de referência ({fullname: stats}).
+        atual (dict): Resultados da nova execução.
+        estatistica (str): Estatística usada na comparação (mean, median, min).
+        limite (float): Variação percentual a partir da qual há regressão.
+
+    Returns:
+        list: Tuplas (nome, tempo_base, tempo_atual, variacao_pct, regressao).
+    """
+    linhas = []
+    for nome in sorted(set(base) & set(atual)):
+        tempo_base = base[nome][estatistica]
+        tempo_atual = atual[nome][estatistica]
+        variacao = ((tempo_atual - tempo_base) / tempo_base * 100) if tempo_base else 0.0
+        linhas.append((nome, tempo_base, tempo_atual, variacao, variacao > limite))
+    return linhas
+
+
+def _formatar_tempo(segundos):
+    if segundos >= 1:
+        return f"{segundos:8.3f} s "
+    return f"{segundos * 1000:8.2f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara duas execuções dos benchmarks do CCIMAR360.")
+    parser.add_argument("arquivos", nargs="*", help="JSON base e JSON atual (padrão: duas últimas execuções)")
+    parser.add_argument("--limite", type=float, default=10.0, help="Percentual de piora tolerado (padrão: 10)")
+    parser.add_argument("--estatistica", default="mean", choices=["mean", "median", "min"])
+    args = parser.parse_args(argv)
+
+    arquivos = args.arquivos or ultimas_execucoes()
+    if len(arquivos) != 2:
+        print("São necessárias duas execuções para comparar. Rode `python -m pytest benchmarks` ao menos duas vezes.")
+        return 2
+
+    base_path, atual_path = arquivos
+    base = carregar_resultados(base_path)
+    atual = carregar_resultados(atual_path)
+    linhas = comparar(base, atual, args.estatistica, args.limite)
+
+    print(f"Base:  {base_path}")
+    print(f"Atual: {atual_path}")
+    print(f"Estatística: {args.estatistica} | limite: +{args.limite:.1f}%\n")
+
+    largura = max((len(nome) for nome, *_ in linhas), default=20)
+    regressoes = 0
+    for nome, tempo_base, tempo_atual, variacao, regressao in linhas:
+        marcador = "❌ REGRESSÃO" if regressao else ("✅" if variacao < -args.limite else "")
+        regressoes += regressao
+        print(f"{nome:<{largura}}  {_formatar_tempo(tempo_base)}  {_formatar_tempo(tempo_atual)}  {variacao:+7.1f}%  {marcador}")
+
+    for nome in sorted(set(atual) - set(base)):
+        print(f"{nome:<{largura}}  (novo)")
+    for nome in sorted(set(base) - set(atual)):
+        print(f"{nome:<{largura}}  (removido)")
+
+    print(f"\n{regressoes} regressão(ões) acima de {args.limite:.1f}%.")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Configuração comum dos benchmarks: caminho do código-fonte, aplicação Qt
+sem janela, escalas parametrizadas e bancos/arquivos temporários.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Os modelos Qt precisam de uma QApplication, mas não de uma tela
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--escalas",
+        default="1",
+        help="Escalas de volume separadas por vírgula (1, 10, 100). Padrão: 1",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "escala" in metafunc.fixturenames:
+        escalas = [int(valor) for valor in metafunc.config.getoption("escalas").split(",") if valor.strip()]
+        metafunc.parametrize("escala", escalas, ids=[f"{valor}x" for valor in escalas])
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """QApplication única para toda a sessão de benchmarks."""
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def icons(qapp):
+    from utils.icon_loader import load_icons
+
+    return load_icons()
+
+
+@pytest.fixture
+def config_paint(tmp_path, monkeypatch):
+    """
+    Redireciona o ``config_paint.json`` dos objetos auditáveis para um
+    arquivo temporário, preservando o arquivo real do usuário.
+    """
+    from modules.ccimar11_planejamento.menu.content.objetos_auditaveis import models, persistence
+
+    caminho = tmp_path / "config_paint.json"
+    monkeypatch.setattr(persistence, "CONFIG_PAINT_PATH", caminho)
+    monkeypatch.setattr(models, "CONFIG_PAINT_PATH", caminho)
+
+    def gravar(conteudo):
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(conteudo, f, indent=4, ensure_ascii=False)
+        return caminho
+
+    return gravar
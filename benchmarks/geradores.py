@@ -0,0 +1,448 @@
+"""
+Geradores determinísticos de dados sintéticos para os benchmarks.
+
+Cada gerador recebe a escala (1, 10 ou 100) e devolve sempre o mesmo
+conjunto de dados para a mesma escala, de modo que execuções diferentes
+sejam comparáveis entre si.
+"""
+
+import json
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+SEMENTE = 360
+
+# Volumes aproximados de produção (escala 1×)
+VOLUMES_PRODUCAO = {
+    "organizacoes": 400,      # OMs com código SIAFI
+    "cpgf": 5000,             # transações em um extrato mensal do CPGF
+    "objetos": 60,            # objetos auditáveis do PAINT
+    "pncp_itens": 200,        # itens homologados por pregão
+    "pncp_compras": 30,       # pregões da Marinha publicados em um mês no PNCP
+    "notas_oms": 40,          # OMs com inconsistências no MUNIC
+    "fornecedores": 5000,     # fornecedores distintos entre CPGF, PNCP e contratos
+}
+
+ESCALAS = (1, 10, 100)
+
+UFS = ["RJ", "SP", "DF", "PA", "AM", "RS", "BA", "PE", "RN", "MS", "SC", "ES"]
+DISTRITOS = ["1DN", "2DN", "3DN", "4DN", "5DN", "6DN", "7DN", "8DN", "9DN"]
+PALAVRAS = [
+    "MATERIAL", "SERVIÇO", "MANUTENÇÃO", "COMBUSTÍVEL", "GÊNEROS", "OBRAS",
+    "EXPEDIENTE", "INFORMÁTICA", "SAÚDE", "MUNICIAMENTO", "SOBRESSALENTES",
+    "VIATURAS", "CAPACITAÇÃO", "LIMPEZA", "VIGILÂNCIA", "ENERGIA",
+]
+SOBRENOMES = [
+    "SILVA", "SOUZA", "OLIVEIRA", "SANTOS", "PEREIRA", "LIMA", "CARVALHO", "FERREIRA", "ARAÚJO", "RIBEIRO",
+    "ALMEIDA", "COSTA", "GOMES", "MARTINS", "ROCHA", "BARBOSA", "CAVALCANTI", "MONTEIRO", "MOREIRA", "NUNES",
+]
+# Ramo da razão social -> forma abreviada vista em outras fontes
+RAMOS = {
+    "COMÉRCIO DE MATERIAIS": "COM. DE MAT.",
+    "INDÚSTRIA E COMÉRCIO": "IND. E COM.",
+    "SERVIÇOS DE ENGENHARIA": "SERV. DE ENG.",
+    "DISTRIBUIDORA DE PRODUTOS": "DISTR. DE PROD.",
+    "TECNOLOGIA E EQUIPAMENTOS": "TEC. E EQUIP.",
+    "REPRESENTAÇÕES COMERCIAIS": "REPRES. COMERCIAIS",
+}
+SUFIXOS = ["LTDA", "EIRELI", "ME", "EPP", "S/A"]
+
+
+def _rng(nome, escala):
+    """Retorna um gerador aleatório exclusivo para o par (conjunto, escala)."""
+    return random.Random(f"{SEMENTE}-{nome}-{escala}")
+
+
+def _quantidade(chave, escala):
+    return VOLUMES_PRODUCAO[chave] * escala
+
+
+def _codigos_siafi(escala):
+    return [700000 + i for i in range(_quantidade("organizacoes", escala))]
+
+
+def gerar_organizacoes(escala):
+    """
+    Gera a aba de organizações militares (colunas da planilha SIAFI).
+
+    Returns:
+        pd.DataFrame: Colunas SIGLA SIAFI, SIGLA_OM, NOME_OM, AREA_OM e UF.
+    """
+    rng = _rng("organizacoes", escala)
+    linhas = []
+    for cod in _codigos_siafi(escala):
+        linhas.append({
+            "SIGLA SIAFI": cod,
+            "SIGLA_OM": f"OM{cod % 100000:05d}",
+            "NOME_OM": f"ORGANIZAÇÃO MILITAR {cod}",
+            "AREA_OM": rng.choice(DISTRITOS),
+            "UF": rng.choice(UFS),
+        })
+    return pd.DataFrame(linhas)
+
+
+def gerar_planilhas_siafi(escala):
+    """
+    Gera as abas de critérios SIAFI usadas pelos importadores ``insert_*``.
+
+    Returns:
+        dict: {nome_da_aba: DataFrame} com as chaves OM, MUNIC,
+        EXEC_LICITACAO, PAGAMENTO e PATRIMONIO (esta última já no formato
+        concatenado com a coluna SHEET_NAME).
+    """
+    rng = _rng("siafi", escala)
+    codigos = _codigos_siafi(escala)
+    valor = lambda: round(rng.uniform(0, 5_000_000), 2)
+
+    munic = pd.DataFrame([{
+        "SIGLA SIAFI": cod,
+        "CODIGO_OM": cod - 600000,
+        "DESPESA AUTORIZADA": valor(),
+        "QUANTIDADE_DE_NOTAS": rng.randint(0, 400),
+        "ULTIMA_AUDITORIA": str(rng.randint(2015, 2024)) if rng.random() > 0.2 else None,
+    } for cod in codigos])
+
+    colunas_licitacao = [
+        "VALOR CONVITE", "VALOR TP", "VALOR CONC", "VALOR DISP LICIT", "VALOR INEXIG",
+        "VALOR NÃO SE APLICA", "VALOR SF", "VALOR REG DIF CONT PUB", "VALOR CONS",
+        "VALOR PREGAO", "VALOR CRED",
+    ]
+    execucao = pd.DataFrame([
+        {"COD SIAFI": cod, **{coluna: valor() for coluna in colunas_licitacao}}
+        for cod in codigos
+    ])
+
+    pagamento = pd.DataFrame([{"COD SIAFI": cod, "TOTAL PAGTO": valor()} for cod in codigos])
+
+    moveis = pd.DataFrame([{
+        "COD SIAFI": cod,
+        "TOTAL GERAL": valor(),
+        "IMPORTACOES EM ANDAMENTO - BENS MOVEIS": valor(),
+        "SHEET_NAME": "BENS MOVEIS",
+    } for cod in codigos])
+    imoveis = pd.DataFrame([{
+        "COD SIAFI": cod,
+        "TOTAL GERAL": valor(),
+        "= OBRAS EM ANDAMENTO": valor(),
+        "= BENS IMOVEIS A CLASSIFICAR/ A REGISTRAR": valor(),
+        "SHEET_NAME": "BENS IMOVEIS",
+    } for cod in codigos])
+
+    return {
+        "OM": gerar_organizacoes(escala),
+        "MUNIC": munic,
+        "EXEC_LICITACAO": execucao,
+        "PAGAMENTO": pagamento,
+        "PATRIMONIO": pd.concat([moveis, imoveis], ignore_index=True),
+    }
+
+
+def gerar_extrato_cpgf(escala):
+    """
+    Gera um extrato do Cartão de Pagamento do Governo Federal no layout do
+    Portal da Transparência (todas as colunas como texto).
+
+    Returns:
+        pd.DataFrame: Extrato com os cabeçalhos originais do portal.
+    """
+    rng = _rng("cpgf", escala)
+    orgaos = [(52131 + i, f"COMANDO DA MARINHA {i}") for i in range(5)]
+    ugs = [(str(780000 + i), f"UNIDADE GESTORA {i}") for i in range(60 * escala)]
+    portadores = [
+        (f"***.{rng.randint(100, 999)}.{rng.randint(100, 999)}-**", f"PORTADOR {i}")
+        for i in range(300 * escala)
+    ]
+    favorecidos = [
+        (f"{rng.randint(10**13, 10**14 - 1)}", f"FORNECEDOR {i} LTDA")
+        for i in range(800 * escala)
+    ]
+    inicio = date(2024, 1, 1)
+
+    linhas = []
+    for _ in range(_quantidade("cpgf", escala)):
+        cod_orgao, nome_orgao = rng.choice(orgaos)
+        cod_ug, nome_ug = rng.choice(ugs)
+        cpf, portador = rng.choice(portadores)
+        cnpj, favorecido = rng.choice(favorecidos)
+        data = inicio + timedelta(days=rng.randint(0, 365))
+        # Distribuição com cauda longa, como nos extratos reais
+        valor = round(rng.lognormvariate(5, 1.2), 2)
+        linhas.append({
+            "CÓDIGO ÓRGÃO SUPERIOR": "52000",
+            "NOME ÓRGÃO SUPERIOR": "MINISTÉRIO DA DEFESA",
+            "CÓDIGO ÓRGÃO": str(cod_orgao),
+            "NOME ÓRGÃO": nome_orgao,
+            "CÓDIGO UNIDADE GESTORA": cod_ug,
+            "NOME UNIDADE GESTORA": nome_ug,
+            "ANO EXTRATO": str(data.year),
+            "MÊS EXTRATO": f"{data.month:02d}",
+            "CPF PORTADOR": cpf,
+            "NOME PORTADOR": portador,
+            "CNPJ OU CPF FAVORECIDO": cnpj,
+            "NOME FAVORECIDO": favorecido,
+            "TRANSAÇÃO": rng.choice(["COMPRA A/V - R$ - APRES", "SAQUE CASH/ATM BB"]),
+            "DATA TRANSAÇÃO": data.strftime("%d/%m/%Y"),
+            "VALOR TRANSAÇÃO": f"{valor:.2f}".replace(".", ","),
+        })
+    return pd.DataFrame(linhas)
+
+
+def escrever_extrato_cpgf(df, caminho):
+    """Grava o extrato em CSV (``;``, latin-1) ou XLSX, conforme a extensão."""
+    caminho = str(caminho)
+    if caminho.endswith(".csv"):
+        df.to_csv(caminho, sep=";", index=False, encoding="latin-1")
+    else:
+        df.to_excel(caminho, index=False)
+    return caminho
+
+
+def gerar_fornecedores(escala):
+    """
+    Gera razões sociais de fornecedores com a grafia de cada um em outra fonte.
+
+    A grafia alternativa reproduz as diferenças vistas entre CPGF, PNCP e
+    contratos: ramo abreviado, outro sufixo societário, sem acentos ou com
+    uma letra a menos no nome fantasia.
+
+    Returns:
+        list: [(cnpj, razao_social, grafia_alternativa)]
+    """
+    rng = _rng("fornecedores", escala)
+    letras = "ABCDEFGHIJLMNOPRSTUVZ"
+    fornecedores = []
+    for _ in range(_quantidade("fornecedores", escala)):
+        fantasia = "".join(rng.choice(letras) for _ in range(rng.randint(5, 9)))
+        sobrenome = rng.choice(SOBRENOMES)
+        ramo = rng.choice(list(RAMOS))
+        razao_social = f"{fantasia} {sobrenome} {ramo} {rng.choice(SUFIXOS)}"
+        variacao = rng.randrange(4)
+        if variacao == 0:
+            alternativa = f"{fantasia} {sobrenome} {RAMOS[ramo]} {rng.choice(SUFIXOS)}"
+        elif variacao == 1:
+            alternativa = f"{fantasia} & {sobrenome} {ramo}"
+        elif variacao == 2:
+            alternativa = razao_social.translate(str.maketrans("ÁÃÇÉÍÓÚ", "AACEIOU")).lower()
+        else:
+            posicao = rng.randrange(len(fantasia))
+            alternativa = f"{fantasia[:posicao]}{fantasia[posicao + 1:]} {sobrenome} {ramo}"
+        fornecedores.append((f"{rng.randint(10**13, 10**14 - 1)}", razao_social, alternativa))
+    return fornecedores
+
+
+def gerar_objetos_auditaveis(escala):
+    """
+    Gera as linhas de objetos auditáveis no formato aceito por
+    ``ObjetosAuditaveisModel.load_data``.
+
+    Returns:
+        list: [nr, descricao, materialidade, relevancia, criticidade, total, tipo_risco]
+    """
+    rng = _rng("objetos", escala)
+    linhas = []
+    for nr in range(1, _quantidade("objetos", escala) + 1):
+        descricao = f"{rng.choice(PALAVRAS)} {rng.choice(PALAVRAS)} {nr:05d}"
+        linhas.append([
+            nr, descricao,
+            rng.randint(1, 10), rng.randint(1, 10), rng.randint(1, 10),
+            0, "Baixo",
+        ])
+    return linhas
+
+
+def gerar_config_paint(escala):
+    """
+    Gera um universo completo do ``config_paint.json``: multiplicadores,
+    lista de objetos e os critérios calculados de cada objeto.
+
+    Returns:
+        dict: Conteúdo pronto para ``json.dump``.
+    """
+    objetos = gerar_objetos_auditaveis(escala)
+    config = {
+        "multiplicadores": {"materialidade": 4, "relevancia": 2, "criticidade": 4},
+        "objetos": [],
+    }
+    for nr, descricao, mat, rel, crit, _, _ in objetos:
+        total = mat * 4 + rel * 2 + crit * 4
+        tipo_risco = "Alto" if total >= 80 else "Médio" if total >= 50 else "Baixo"
+        config["objetos"].append({
+            "NR": str(nr),
+            "Objetos Auditáveis": descricao,
+            "materialidade": float(mat),
+            "relevancia": float(rel),
+            "criticidade": float(crit),
+            "total": float(total),
+            "tipo_risco": tipo_risco,
+        })
+        config[descricao] = {
+            "valores_calculados": {
+                "materialidade": mat,
+                "relevancia": rel,
+                "criticidade": crit,
+                "total": total,
+                "tipo_risco": tipo_risco,
+            }
+        }
+    return config
+
+
+def gerar_itens_pncp(escala):
+    """
+    Gera a resposta da API do PNCP para um pregão homologado.
+
+    Returns:
+        tuple: (data_informacoes, resultados_completos) no mesmo formato
+        consumido por ``popular_db_consulta_itens_api``.
+    """
+    rng = _rng("pncp", escala)
+    data_informacoes = {
+        "numeroControlePNCP": "00394502000144-1-090001/2024",
+        "anoCompra": 2024,
+        "numeroCompra": "90001",
+        "unidadeOrgao": {"codigoUnidade": "787000", "nomeUnidade": "CENTRO DE INTENDÊNCIA DA MARINHA"},
+        "objetoCompra": "Aquisição de material de consumo",
+        "srp": True,
+    }
+    fornecedores = [
+        (f"{rng.randint(10**13, 10**14 - 1)}", f"FORNECEDOR {i} LTDA")
+        for i in range(max(10, _quantidade("pncp_itens", escala) // 8))
+    ]
+    resultados = []
+    for numero in range(1, _quantidade("pncp_itens", escala) + 1):
+        estimado = round(rng.uniform(1, 5000), 2)
+        cnpj, empresa = rng.choice(fornecedores)
+        tem_resultado = 1 if rng.random() > 0.1 else 0
+        resultados.append({
+            "numeroItem": numero,
+            "descricao": f"{rng.choice(PALAVRAS)} {rng.choice(PALAVRAS)}",
+            "unidadeMedida": rng.choice(["UN", "CX", "KG", "L", "PCT"]),
+            "quantidadeHomologada": rng.randint(1, 1000) if tem_resultado else 0,
+            "valorUnitarioEstimado": estimado,
+            "valorUnitarioHomologado": round(estimado * rng.uniform(0.6, 1.0), 2) if tem_resultado else 0,
+            "temResultado": tem_resultado,
+            "niFornecedor": cnpj if tem_resultado else None,
+            "nomeRazaoSocialFornecedor": empresa if tem_resultado else None,
+        })
+    return data_informacoes, resultados
+
+
+def gravar_respostas_pncp(escala, diretorio, data_inicial, data_final, cnpj="00394502000144",
+                          modalidade=6, tamanho_pagina=50, itens_por_compra=40):
+    """
+    Grava respostas sintéticas da API do PNCP no formato do cache do
+    ``PNCPHarvester``, para serem servidas por ``utils.pncp_replay_server``.
+
+    São geradas a listagem paginada de compras do período e, para cada compra,
+    a quantidade de itens, as páginas de itens e os resultados dos itens
+    homologados. Os parâmetros devem coincidir com os usados pelo coletor.
+
+    Returns:
+        int: Número de compras gravadas.
+    """
+    rng = _rng("pncp_compras", escala)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    contador = {"n": 0}
+
+    def gravar(path, params, body):
+        contador["n"] += 1
+        with open(diretorio / f"{contador['n']:07d}.json", "w", encoding="utf-8") as f:
+            json.dump({"path": path, "params": {k: str(v) for k, v in params.items()},
+                       "status": 200, "etag": f'"{contador["n"]}"', "body": body}, f, ensure_ascii=False)
+
+    compras = []
+    for sequencial in range(1, _quantidade("pncp_compras", escala) + 1):
+        compras.append({
+            "numeroControlePNCP": f"{cnpj}-1-{sequencial:06d}/{data_inicial.year}",
+            "anoCompra": data_inicial.year,
+            "sequencialCompra": sequencial,
+            "numeroCompra": f"{90000 + sequencial}",
+            "orgaoEntidade": {"cnpj": cnpj, "razaoSocial": "COMANDO DA MARINHA"},
+            "unidadeOrgao": {"codigoUnidade": str(rng.choice(_codigos_siafi(1))), "nomeUnidade": "OM SINTÉTICA"},
+            "objetoCompra": f"Aquisição de {rng.choice(PALAVRAS).lower()}",
+            "modalidadeId": modalidade,
+            "srp": rng.random() > 0.5,
+            "dataAtualizacao": f"{data_inicial.isoformat()}T10:00:00",
+        })
+
+    params_listagem = {
+        "dataInicial": data_inicial.strftime("%Y%m%d"), "dataFinal": data_final.strftime("%Y%m%d"),
+        "codigoModalidadeContratacao": modalidade, "tamanhoPagina": tamanho_pagina, "cnpj": cnpj,
+    }
+    total_paginas = max(1, -(-len(compras) // tamanho_pagina))
+    for pagina in range(1, total_paginas + 1):
+        gravar("/api/consulta/v1/contratacoes/publicacao", {**params_listagem, "pagina": pagina}, {
+            "data": compras[(pagina - 1) * tamanho_pagina:pagina * tamanho_pagina],
+            "totalRegistros": len(compras), "totalPaginas": total_paginas, "numeroPagina": pagina,
+        })
+
+    for compra in compras:
+        path = f"/api/pncp/v1/orgaos/{cnpj}/compras/{compra['anoCompra']}/{compra['sequencialCompra']}/itens"
+        itens = []
+        for numero in range(1, itens_por_compra + 1):
+            homologado = rng.random() > 0.1
+            itens.append({
+                "numeroItem": numero,
+                "descricao": f"{rng.choice(PALAVRAS)} {rng.choice(PALAVRAS)}",
+                "unidadeMedida": rng.choice(["UN", "CX", "KG", "L", "PCT"]),
+                "valorUnitarioEstimado": round(rng.uniform(1, 5000), 2),
+                "temResultado": homologado,
+            })
+        gravar(f"{path}/quantidade", {}, len(itens))
+        for pagina in range(1, -(-len(itens) // tamanho_pagina) + 1):
+            gravar(path, {"pagina": pagina, "tamanhoPagina": tamanho_pagina},
+                   itens[(pagina - 1) * tamanho_pagina:pagina * tamanho_pagina])
+        for item in itens:
+            if item["temResultado"]:
+                gravar(f"{path}/{item['numeroItem']}/resultados", {}, [{
+                    "quantidadeHomologada": rng.randint(1, 1000),
+                    "valorUnitarioHomologado": round(item["valorUnitarioEstimado"] * rng.uniform(0.6, 1.0), 2),
+                    "niFornecedor": f"{rng.randint(10**13, 10**14 - 1)}",
+                    "nomeRazaoSocialFornecedor": f"FORNECEDOR {rng.randint(1, 50)} LTDA",
+                }])
+    return len(compras)
+
+
+def gerar_inconsistencias_munic(escala):
+    """
+    Gera a planilha de inconsistências usada por ``gera_notas_calc_total.main``
+    (uma nota por OM, coluna ``OC`` e coluna numérica ``Total2``).
+
+    Returns:
+        pd.DataFrame: Dados já tratados como texto, como no script original.
+    """
+    rng = _rng("notas", escala)
+    linhas = []
+    for i in range(_quantidade("notas_oms", escala)):
+        sigla = f"OM{i:04d}"
+        for _ in range(rng.randint(3, 12)):
+            valor = round(rng.uniform(50, 20000), 2)
+            linhas.append({
+                "OC": sigla,
+                "NIP": f"{rng.randint(10**7, 10**8 - 1)}",
+                "DATA INÍCIO": f"{rng.randint(1, 28):02d}/0{rng.randint(1, 9)}/2024",
+                "VALOR TOTAL": f"R$ {valor:,.2f}",
+                "Total2": str(valor),
+            })
+    return pd.DataFrame(linhas)
+
+
+def gerar_modelo_nota(caminho):
+    """
+    Cria um modelo DOCX mínimo com as marcações substituídas por
+    ``gera_notas_calc_total`` e o estilo ``Título da tabela``.
+    """
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+
+    documento = Document()
+    documento.styles.add_style("Título da tabela", WD_STYLE_TYPE.PARAGRAPH)
+    documento.sections[0].header.add_paragraph("Nota de Auditoria - <sigla_om>")
+    documento.add_paragraph("Rio de Janeiro, <data_hoje>.")
+    documento.add_paragraph("Referência: <mmaaa> - prazo <_prazo>.")
+    documento.add_paragraph("<tabela_abaixo>")
+    documento.add_paragraph("Encaminha-se a relação acima para providências.")
+    documento.save(str(caminho))
+    return str(caminho)
@@ -1,26 +1,33 @@
 # main.spec
 # -*- mode: python ; coding: utf-8 -*-
 
+import subprocess
 import sys
 from pathlib import Path
 from PyInstaller.utils.hooks import collect_all
 
-# Defina o caminho do diretório base diretamente
-BASE_DIR = Path("C:/Users/guilh/OneDrive/Documentos/novo360/360JAN2025/src")
+# Diretório base relativo ao próprio .spec (SPECPATH é definido pelo PyInstaller)
+BASE_DIR = Path(SPECPATH) / "src"
 DATABASE_DIR = BASE_DIR / "database"
 ASSETS_DIR = BASE_DIR / "assets"
 ICON_PATH = ASSETS_DIR / "icone_brasil.ico"
+# Recurso compilado dos ícones (gerado no build; não versionado)
+ICONS_RCC = ASSETS_DIR / "icons.rcc"
 
 # Adicione o caminho do diretório base ao sys.path
 sys.path.insert(0, str(BASE_DIR))
 
 block_cipher = None
 
+# Gera assets/icons.rcc antes da análise; sem ele o executável indexaria os PNGs a cada abertura.
+# Roda em um processo à parte para não carregar o Qt dentro do PyInstaller.
+subprocess.run([sys.executable, "-m", "utils.icon_loader", "--build"], cwd=str(BASE_DIR), check=True)
+
 a = Analysis(
     ['src/main.py'],  # Corrigido para o caminho correto
     pathex=[str(BASE_DIR)],
     binaries=[],
-    datas=[],  # Removido datas individuais
+    datas=[(str(ICONS_RCC), 'src/assets/')],  # Recurso compilado dos ícones
     hiddenimports=['psutil'],
     hookspath=['.'], 
     runtime_hooks=[],
@@ -29,12 +36,17 @@ a = Analysis(
     win_private_assemblies=False,
     cipher=block_cipher,
 )
-# Inclua os diretórios database e resources inteiros
-a.datas += Tree(str(DATABASE_DIR), prefix='src/database/')
-a.datas += Tree(str(ASSETS_DIR), prefix='src/assets/')
+# Bancos e JSONs vão como semente somente leitura: na primeira execução são
+# copiados para a pasta de dados do usuário (paths.base_path.seed_user_data),
+# onde ficam todas as gravações. Logs, trace e PDFs locais não são empacotados.
+a.datas += Tree(str(DATABASE_DIR / "json"), prefix='src/database/json/')
+a.datas += Tree(str(DATABASE_DIR / "sql"), prefix='src/database/sql/', excludes=['trace.db', '*.db-journal'])
+a.datas += Tree(str(ASSETS_DIR), prefix='src/assets/', excludes=['icons.rcc', 'icons.qrc'])
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
+# Build onedir (EXE + COLLECT): nada é extraído para um diretório temporário
+# a cada inicialização, então o tempo de abertura não depende do tamanho dos bancos.
 exe = EXE(
     pyz,
     a.scripts,
@@ -46,7 +58,6 @@ exe = EXE(
     strip=False,
     upx=True,
     upx_exclude=[],
-    runtime_tmpdir="assets",
     console=True,
     icon=str(ICON_PATH) 
 )
@@ -1,67 +1,20 @@
-from PyQt6.QtGui import QIcon, QPixmap
-
-def get_menu_button_style():
-    return """
-        QPushButton {
-            background-color: transparent;
-            font-weight: bold;
-            font-size: 16px;
-            text-align: left;
-            border: 1px solid transparent;
-            border-left: 2px solid transparent; 
-            border-radius: 0px;
-            padding: 5px;
-            margin: 0px; 
-        }
-        QPushButton:hover {
-            background-color: #181928;
-            border-left: 2px solid transparent;
-            color: white;
-            border-radius: 0px;
-            padding: 5px;
-        }
-    """
-
-def get_menu_button_activated_style():
-    return """
-        QPushButton {
-            background-color: #181928;
-            color: white;
-            font-weight: bold;
-            font-size: 16px;
-            text-align: left;
-            border: 1px solid #181928;
-            border-left: 2px solid #F3F3F3;
-            border-radius: 0px;
-            padding: 5px;
-            margin: 0px; 
-        }
-    """
-
-def table_view_stylesheet() -> str:
-    return """
-    QTableView {
-        font-size: 14px;
-        padding: 4px;
-        border: 1px solid #8AB4F7;
-        border-radius: 6px;
-        gridline-color: #3C3C5A;
-    }
-        QHeaderView::section {
-            background-color: #f0f0f0;
-            color: black; 
-            font-weight: bold;
-            padding: 4px;
-            border: 1px solid #ddd;
-        }
-    """
-
-
-def title_view_stylesheet() -> str:
-    return """
-    QLabel {
-        font-size: 20px;
-        font-weight: bold;
-        color: #8BE9FD;
-    }
-    """
+# Tokens de cor do tema da aplicação (usados por assets/styles/theme.py)
+TOKENS = {
+    "bg_app": "#181928",           # Fundo da área de conteúdo
+    "bg_menu": "#13141F",          # Menu lateral
+    "surface": "#25283D",          # Cabeçalhos, títulos de grupos
+    "surface_alt": "#1F2133",      # Linhas alternadas
+    "surface_border": "#2F324B",
+    "selection": "#2A2D44",
+    "hover": "#2C2F3F",
+    "selected": "#44475A",
+    "selected_border": "#6272A4",
+    "accent": "#8AB4F7",           # Azul suave (bordas, títulos de critérios)
+    "title": "#8BE9FD",            # Títulos das páginas
+    "grid": "#3C3C5A",
+    "text": "#FFFFFF",
+    "header_light": "#f0f0f0",
+    "header_light_border": "#ddd",
+    "toggle_bg": "rgba(0, 0, 0, 100)",
+    "toggle_hover": "rgba(255, 255, 255, 50)",
+}
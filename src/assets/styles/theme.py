@@ -0,0 +1,217 @@
+"""
+Tema da aplicação.
+
+Uma única folha de estilo é montada a partir de ``styles.TOKENS`` e aplicada na
+QApplication. Os widgets escolhem o visual por ``objectName`` ou pela
+propriedade dinâmica ``variant`` (ex.: ``set_variant(tabela, "data")``),
+sem chamar ``setStyleSheet`` individualmente. Assim o Qt interpreta a folha
+uma vez só; reconstruir painéis ou trocar de página apenas aplica regras já
+interpretadas.
+"""
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+from assets.styles.styles import TOKENS
+
+
+_STYLESHEET_TEMPLATE = """
+/* ====== JANELA PRINCIPAL ====== */
+QWidget#sideMenu {{
+    background-color: {bg_menu};
+}}
+QFrame#contentWidget {{
+    background-color: {bg_app};
+}}
+QLabel#menuTooltip {{
+    background-color: {bg_menu};
+    color: {text};
+    border: 1px solid {accent};
+    padding: 4px;
+    border-radius: 4px;
+}}
+QPushButton#menuToggle {{
+    background-color: {toggle_bg};
+    border-radius: 5px;
+}}
+QPushButton#menuToggle:hover {{
+    background-color: {toggle_hover};
+}}
+
+/* Botões do menu lateral; o ativo usa a propriedade active=true */
+QPushButton[variant="menuButton"] {{
+    background-color: transparent;
+    font-weight: bold;
+    font-size: 16px;
+    text-align: left;
+    border: 1px solid transparent;
+    border-left: 2px solid transparent;
+    border-radius: 0px;
+    padding: 5px;
+    margin: 0px;
+}}
+QPushButton[variant="menuButton"]:hover {{
+    background-color: {bg_app};
+    color: {text};
+}}
+QPushButton[variant="menuButton"][active="true"] {{
+    background-color: {bg_app};
+    color: {text};
+    border: 1px solid {bg_app};
+    border-left: 2px solid #F3F3F3;
+}}
+
+/* ====== MENUS EM ÁRVORE DOS MÓDULOS ====== */
+QTreeView[variant="moduleMenu"] {{
+    color: {text};
+    font-size: 16px;
+}}
+QTreeView[variant="moduleMenu"]::item:hover {{
+    background-color: {hover};
+    border: {hover};
+}}
+QTreeView[variant="moduleMenu"]::item:selected {{
+    background-color: {selected};
+    border: 1px solid {selected};
+}}
+QTreeView[variant="moduleMenuCompact"] {{
+    color: {text};
+    font-size: 14px;
+}}
+QTreeView[variant="moduleMenuCompact"]::item:hover {{
+    background-color: {hover};
+    border: none;
+}}
+QTreeView[variant="moduleMenuCompact"]::item:selected {{
+    background-color: {selected};
+    border: 1px solid {selected_border};
+    outline: none;
+}}
+QTreeView[variant="moduleMenuCompact"]::item:focus {{
+    outline: none;
+}}
+
+/* ====== PÁGINAS DOS MÓDULOS ====== */
+QLabel[variant="viewTitle"] {{
+    font-size: 20px;
+    font-weight: bold;
+    color: {title};
+}}
+QTableView[variant="data"] {{
+    font-size: 14px;
+    padding: 4px;
+    border: 1px solid {accent};
+    border-radius: 6px;
+    gridline-color: {grid};
+}}
+QTableView[variant="data"] QHeaderView::section {{
+    background-color: {header_light};
+    color: black;
+    font-weight: bold;
+    padding: 4px;
+    border: 1px solid {header_light_border};
+}}
+
+/* ====== PAINEL DE CRITÉRIOS (OBJETOS AUDITÁVEIS) ====== */
+QGroupBox[variant="criteria"] {{
+    background-color: {bg_app};
+    border: 2px solid {surface};
+    border-radius: 8px;
+    margin-top: 20px;
+    padding: 10px;
+    font-size: 16px;
+    font-weight: bold;
+}}
+QGroupBox[variant="criteria"]::title {{
+    subcontrol-origin: margin;
+    subcontrol-position: top left;
+    padding: 5px 10px;
+    background-color: {surface};
+    color: {text};
+    border-radius: 4px;
+}}
+QWidget[variant="criteriaContent"] {{
+    background-color: {bg_app};
+}}
+QLabel[variant="criteriaTitle"] {{
+    color: {accent};
+    font-weight: bold;
+    font-size: 14px;
+    padding: 5px 10px;
+}}
+QTableWidget[variant="criteria"] {{
+    background-color: {bg_app};
+    color: {text};
+    gridline-color: {surface};
+    selection-background-color: {selection};
+    selection-color: {text};
+    border: 1px solid {surface};
+    alternate-background-color: {surface_alt};
+    font-size: 16px;
+}}
+QTableWidget[variant="criteria"] QHeaderView::section {{
+    background-color: {surface};
+    color: {text};
+    font-size: 16px;
+    font-weight: bold;
+    padding: 2px;
+    border: 1px solid {surface_border};
+}}
+QTableWidget[variant="criteria"] QTableCornerButton::section {{
+    background-color: {surface};
+    border: 1px solid {surface_border};
+}}
+"""
+
+_stylesheet_cache = {}
+
+
+def build_stylesheet(tokens=None):
+    """Monta a folha de estilo da aplicação a partir dos tokens (resultado em cache)."""
+    tokens = {**TOKENS, **(tokens or {})}
+    key = tuple(sorted(tokens.items()))
+    if key not in _stylesheet_cache:
+        _stylesheet_cache[key] = _STYLESHEET_TEMPLATE.format(**tokens)
+    return _stylesheet_cache[key]
+
+
+def apply_theme(app=None, tokens=None):
+    """
+    Aplica o tema na QApplication.
+
+    Chamadas repetidas com a mesma folha não fazem nada, evitando que o Qt
+    reinterprete o estilo e repolir todos os widgets.
+    """
+    app = app or QApplication.instance()
+    if app is None:
+        return
+    stylesheet = build_stylesheet(tokens)
+    if app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
+
+
+def set_variant(widget, variant, **properties):
+    """
+    Define a variante visual do widget (e propriedades extras, ex.: active=True).
+
+    Se o widget já estiver polido, só ele é repolido; a folha de estilo não é
+    interpretada novamente.
+    """
+    widget.setProperty("variant", variant)
+    for name, value in properties.items():
+        widget.setProperty(name, value)
+    repolish(widget)
+    return widget
+
+
+def set_state(widget, **properties):
+    """Altera propriedades de estado (ex.: active) e repole apenas o widget."""
+    for name, value in properties.items():
+        widget.setProperty(name, value)
+    repolish(widget)
+
+
+def repolish(widget):
+    if widget.testAttribute(Qt.WidgetAttribute.WA_WState_Polished):
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
@@ -3,12 +3,12 @@ from functools import partial
 import json
 from utils.add_button import add_button_func
 from utils.linha_layout import linha_divisoria_sem_spacer_layout
-from paths import ORGANIZACOES_FILE
+from paths import ORGANIZACOES_FILE, document_store
 
 from PyQt6.QtWidgets import QLabel, QScrollArea, QVBoxLayout, QWidget
 from PyQt6.QtCore import Qt
 import json
-from paths import ORGANIZACOES_FILE
+from paths import ORGANIZACOES_FILE, document_store
 def show_organizacoes_widget(content_layout, icons, parent):
     """Exibe o widget para Alteração das Organizações Militares com funcionalidade de edição."""
     # Limpa o layout de conteúdo
@@ -32,8 +32,7 @@ def show_organizacoes_widget(content_layout, icons, parent):
 
     # Carregar dados do arquivo JSON
     try:
-        with open(ORGANIZACOES_FILE, 'r', encoding='utf-8') as file:
-            config_data = json.load(file)
+        config_data = document_store.load(ORGANIZACOES_FILE, {})
     except (FileNotFoundError, json.JSONDecodeError):
         config_data = {}
 
@@ -185,7 +184,6 @@ class EditOMWidget(QWidget):
                 })
         self.config_data[self.categoria] = items
 
-        with open(ORGANIZACOES_FILE, 'w', encoding='utf-8') as file:
-            json.dump(self.config_data, file, ensure_ascii=False, indent=4)
+        document_store.save(ORGANIZACOES_FILE, self.config_data)
 
         QMessageBox.information(self, "Sucesso", "Dados salvos com sucesso.")
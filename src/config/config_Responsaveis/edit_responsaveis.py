@@ -2,129 +2,130 @@ from PyQt6.QtWidgets import *
 from PyQt6.QtGui import *
 from PyQt6.QtCore import *
 from paths import *
-from config.config_widget import linha_divisoria_sem_spacer_layout
+from utils.add_button import add_button_func
 import sqlite3
-from pathlib import Path
-import pandas as pd
-import os
 import json
-from functools import partial
+import logging
+from database.tracing import span
+
+TABELA_AGENTES = "controle_agentes_responsaveis"
+
+# Opções dos delegates de Posto, Abreviação e Função
+POSTOS = [
+    "Capitão de Mar e Guerra (IM)", "Capitão de Fragata (IM)", "Capitão de Corveta (IM)", "Capitão Tenente (IM)",
+    "Primeiro-Tenente", "Segundo-Tenente", "Suboficial", "Primeiro-Sargento",
+    "Segundo-Sargento", "Terceiro-Sargento", "Cabo", "Outro",
+]
+ABREVIACOES = ["CMG (IM)", "CF (IM)", "CC (IM)", "CT (IM)", "1ºTEN", "2ºTEN", "SO", "1º SG", "2º SG", "3º SG", "CB", "Outro"]
+FUNCOES = [
+    "Ordenador de Despesa", "Ordenador de Despesa Substituto", "Agente Fiscal", "Agente Fiscal Substituto",
+    "Gerente de Crédito", "Responsável pela Demanda", "Operador da Contratação", "Pregoeiro",
+]
+
+
+def criar_tabela_agentes_responsaveis(database_path=CONTROLE_DADOS):
+    """
+    Cria (ou migra) a tabela dos agentes responsáveis com chave ``id`` explícita.
+
+    Tabelas antigas, identificadas só pelo rowid implícito (que o VACUUM pode
+    renumerar), são recriadas com ``id`` = rowid atual. Na criação, a tabela é
+    preenchida com os agentes do antigo ``agentes_responsaveis.json``.
+    """
+    colunas = ", ".join(f"{coluna} TEXT" for coluna in AgentesResponsaveisTableModel.COLUMNS)
+    sql_criacao = f"CREATE TABLE {TABELA_AGENTES} (id INTEGER PRIMARY KEY, {colunas})"
+    conn = sqlite3.connect(database_path)
+    try:
+        existentes = [linha[1] for linha in conn.execute(f"PRAGMA table_info({TABELA_AGENTES})")]
+        # DDL não abre transação implícita no sqlite3; BEGIN explícito torna a migração atômica
+        conn.execute("BEGIN")
+        if not existentes:
+            conn.execute(sql_criacao)
+            conn.executemany(
+                f"INSERT INTO {TABELA_AGENTES} ({', '.join(AgentesResponsaveisTableModel.COLUMNS)}) VALUES (?, ?, ?, ?)",
+                _agentes_do_json(),
+            )
+        elif "id" not in existentes:
+            copiar = [coluna for coluna in AgentesResponsaveisTableModel.COLUMNS if coluna in existentes]
+            conn.execute(f"ALTER TABLE {TABELA_AGENTES} RENAME TO {TABELA_AGENTES}_antiga")
+            conn.execute(sql_criacao)
+            conn.execute(
+                f"INSERT INTO {TABELA_AGENTES} (id, {', '.join(copiar)}) "
+                f"SELECT rowid, {', '.join(copiar)} FROM {TABELA_AGENTES}_antiga"
+            )
+            conn.execute(f"DROP TABLE {TABELA_AGENTES}_antiga")
+            logging.info("Tabela '%s' recriada com chave id explícita.", TABELA_AGENTES)
+        else:
+            for coluna in AgentesResponsaveisTableModel.COLUMNS:
+                if coluna not in existentes:
+                    conn.execute(f"ALTER TABLE {TABELA_AGENTES} ADD COLUMN {coluna} TEXT")
+        conn.commit()
+    finally:
+        conn.close()
 
-def show_agentes_responsaveis_widget(content_layout, icons, parent):
-    """Exibe o widget para Alteração dos Agentes Responsáveis."""
-    # Limpa o layout de conteúdo
-    while content_layout.count():
-        item = content_layout.takeAt(0)
-        widget = item.widget()
-        if widget:
-            widget.deleteLater()
-        elif item.layout():
-            clear_layout(item.layout)
-
-    def clear_layout(layout):
-        """Recursivamente limpa um layout."""
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-            elif item.layout():
-                clear_layout(item.layout)
-
-    # Widget principal para o conteúdo
-    main_widget = QWidget()
-    layout = QVBoxLayout(main_widget)
-
-    # Título
-    title = QLabel("Alteração dos Agentes Responsáveis")
-    title.setStyleSheet("font-size: 20px; font-weight: bold; color: #4E648B")
-    layout.addWidget(title)
 
-    # Carregar dados do arquivo JSON
+def _agentes_do_json():
+    """Linhas (nome, posto, abreviação, função) do antigo arquivo JSON de agentes, se existir."""
     try:
-        with open(AGENTES_RESPONSAVEIS_FILE, 'r', encoding='utf-8') as file:
-            config_data = json.load(file)
+        config_data = document_store.load(AGENTES_RESPONSAVEIS_FILE, {})
     except (FileNotFoundError, json.JSONDecodeError):
-        config_data = {}
-
-    # Lista de agentes
-    agentes = [
-        "Ordenador de Despesa",
-        "Agente Fiscal",
-        "Gerente de Crédito",
-        "Responsável pela Demanda",
-        "Operador da Contratação",
-        "Pregoeiro",
-    ]
-
-    # Criando botões para cada agente
-    for agente in agentes:
-        categoria = agente.lower().replace(" ", "_")
-        item_layout = QVBoxLayout()
-
-        linha_divisoria = linha_divisoria_sem_spacer_layout()
-        item_layout.addWidget(linha_divisoria)
-
-        # Exibir valores existentes no JSON acima do botão
-        if categoria in config_data:
-            for item in config_data[categoria]:
-                item_label = QLabel(
-                    f"{item['Nome']} - {item['Posto']} - {item['Abreviacao']} - {item['Funcao']}"
-                )
-                item_label.setStyleSheet("font-size: 14px; color: #000;")
-                item_layout.addWidget(item_label)
-
-        # Layout horizontal para o botão com espaçadores laterais
-        button_layout = QHBoxLayout()
-        button_layout.addStretch()  # Espaçador à esquerda
-
-        # Botão com texto do agente
-        button = QPushButton(agente)
-        button.setIcon(icons.get("edit"))  # Ajuste para o ícone correto
-        button.setStyleSheet("font-size: 14px; padding: 5px;")
-        button.clicked.connect(partial(edit_agent, parent, agente))  # Passa o nome do agente para a função
-        button_layout.addWidget(button)
-
-        button_layout.addStretch()  # Espaçador à direita
-        item_layout.addLayout(button_layout)
-
-        layout.addLayout(item_layout)
-
-    # Adiciona espaçador para empurrar o conteúdo para o topo
-    layout.addStretch()
-
-    # Configura o widget no layout principal
-    content_layout.addWidget(main_widget)
-
-def edit_agent(parent, agente):
-    """Função chamada ao clicar em 'Editar'."""
-    categoria = agente.lower().replace(" ", "_")  # Transformar em formato adequado para JSON
-    try:
-        # Carregar os dados do JSON
-        if not Path(AGENTES_RESPONSAVEIS_FILE).exists():
-            with open(AGENTES_RESPONSAVEIS_FILE, 'w', encoding='utf-8') as file:
-                json.dump({}, file, ensure_ascii=False, indent=4)
+        return []
+    linhas = []
+    for itens in config_data.values():
+        for item in itens if isinstance(itens, list) else []:
+            if isinstance(item, dict):
+                linhas.append((item.get("Nome", ""), item.get("Posto", ""), item.get("Abreviacao", ""), item.get("Funcao", "")))
+    return linhas
 
-        with open(AGENTES_RESPONSAVEIS_FILE, 'r', encoding='utf-8') as file:
-            config_data = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        config_data = {}
 
-    # Garantir que a categoria exista no dicionário
-    if categoria not in config_data:
-        config_data[categoria] = []
+def create_agentes_responsaveis_widget(icons, database_path=CONTROLE_DADOS, parent=None):
+    """Widget de edição dos agentes responsáveis: tabela editável com salvar/desfazer."""
+    widget = QWidget(parent)
+    layout = QVBoxLayout(widget)
 
-    # Abrir o diálogo de edição
-    dialog = EditPredefinicoesDialog(categoria, config_data, parent)
-    if dialog.exec():
-        # Salvar alterações no JSON
-        with open(AGENTES_RESPONSAVEIS_FILE, 'w', encoding='utf-8') as file:
-            json.dump(config_data, file, ensure_ascii=False, indent=4)
+    title = QLabel("Alteração dos Agentes Responsáveis")
+    title.setStyleSheet("font-size: 20px; font-weight: bold; color: #4E648B")
+    layout.addWidget(title)
 
-        # Atualizar o widget após salvar as alterações
-        show_agentes_responsaveis_widget(parent.content_layout, parent.icons, parent)
+    model = AgentesResponsaveisTableModel(database_path=database_path, parent=widget)
+    table_view = QTableView()
+    table_view.setModel(model)
+    table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    for coluna, opcoes in (("posto", POSTOS), ("abreviacao", ABREVIACOES), ("funcao", FUNCOES)):
+        table_view.setItemDelegateForColumn(model.COLUMNS.index(coluna), ComboBoxDelegate(opcoes, table_view))
+    layout.addWidget(table_view)
+
+    status = QLabel("")
+    model.pending_changed.connect(lambda pendente: status.setText("Alterações não salvas" if pendente else ""))
+    model.changes_saved.connect(lambda total: status.setText(f"{total} alteração(ões) salva(s)"))
+
+    def remover_selecionadas():
+        # De baixo para cima, para que os índices das demais linhas não mudem
+        for row in sorted({index.row() for index in table_view.selectionModel().selectedRows()}, reverse=True):
+            model.removeRow(row)
+
+    button_layout = QHBoxLayout()
+    add_button_func("Adicionar", "add_comment", lambda: model.addRow(), button_layout, icons, tooltip="Adicionar agente")
+    add_button_func("Remover", "delete", remover_selecionadas, button_layout, icons, tooltip="Remover agentes selecionados")
+    add_button_func("Salvar", "apply", model.submit, button_layout, icons, tooltip="Gravar as alterações pendentes")
+    add_button_func("Desfazer", "cancel", model.revert, button_layout, icons, tooltip="Descartar as alterações pendentes")
+    button_layout.addStretch()
+    button_layout.addWidget(status)
+    layout.addLayout(button_layout)
+
+    widget.model = model
+    return widget
+
+
+def show_agentes_responsaveis_widget(content_layout, icons, parent):
+    """Exibe o widget para Alteração dos Agentes Responsáveis."""
+    while content_layout.count():
+        item = content_layout.takeAt(0)
+        widget = item.widget()
+        if widget:
+            widget.deleteLater()
+    content_layout.addWidget(create_agentes_responsaveis_widget(icons, parent=parent))
 
-        
 class ComboBoxDelegate(QStyledItemDelegate):
     def __init__(self, options, parent=None):
         super().__init__(parent)
@@ -160,16 +161,84 @@ class ComboBoxDelegate(QStyledItemDelegate):
         editor.setGeometry(option.rect)
         
 class AgentesResponsaveisTableModel(QAbstractTableModel):
-    def __init__(self, data, database_path):
-        super().__init__()
-        self._data = data
-        self._headers = ["Nome", "Posto", "Função"]
+    """
+    Modelo editável da tabela 'controle_agentes_responsaveis' com buffer de edições.
+
+    Cada linha é identificada pela coluna ``id`` (INTEGER PRIMARY KEY explícita:
+    ao contrário do rowid implícito, não é renumerada por VACUUM). Inclusões,
+    alterações e exclusões ficam pendentes em memória e são gravadas em uma
+    única transação por ``submit()``, chamado pelo botão de salvar ou
+    automaticamente após ``autosave_ms`` sem novas edições.
+    ``revert()`` descarta as pendências e recarrega os dados do banco.
+    """
+
+    COLUMNS = ["nome", "posto", "abreviacao", "funcao"]
+    TABLE = TABELA_AGENTES
+
+    # Emitido quando o estado de pendências muda (True = há alterações não salvas)
+    pending_changed = pyqtSignal(bool)
+    # Emitido após uma gravação bem-sucedida com o número de operações aplicadas
+    changes_saved = pyqtSignal(int)
+
+    def __init__(self, data=None, database_path=CONTROLE_DADOS, row_ids=None, autosave_ms=1500, parent=None):
+        super().__init__(parent)
+        self._headers = ["Nome", "Posto", "Abreviação", "Função"]
         self.database_path = database_path
-
-    def rowCount(self, index):
+        self._data = []
+        self._row_ids = []
+        self._next_temp_id = -1
+        self._pending_inserts = set()   # ids temporários (negativos) ainda não gravados
+        self._pending_updates = {}      # id -> {coluna: valor}
+        self._pending_deletes = set()   # ids a excluir
+
+        # Debounce: cada edição reinicia o timer; a gravação ocorre quando o usuário para de editar
+        self._autosave_timer = QTimer(self)
+        self._autosave_timer.setSingleShot(True)
+        self._autosave_timer.timeout.connect(self.submit)
+        self.autosave_ms = autosave_ms
+        if autosave_ms:
+            self._autosave_timer.setInterval(autosave_ms)
+
+        if data is None:
+            self.load()
+        else:
+            self._data = [list(row) for row in data]
+            self._row_ids = list(row_ids) if row_ids is not None else self._fetch_row_ids(len(self._data))
+
+    # ====== CARGA ======
+    def load(self):
+        """Carrega as linhas do banco com seus ids, descartando pendências."""
+        self.beginResetModel()
+        self._clear_pending()
+        self._data, self._row_ids = [], []
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                rows = conn.execute(f"SELECT id, {', '.join(self.COLUMNS)} FROM {self.TABLE} ORDER BY id").fetchall()
+            for row_id, *values in rows:
+                self._row_ids.append(row_id)
+                self._data.append(list(values))
+        except sqlite3.Error as e:
+            QMessageBox.critical(None, "Erro", f"Erro ao carregar os agentes responsáveis: {e}")
+        self.endResetModel()
+        self.pending_changed.emit(False)
+
+    def _fetch_row_ids(self, count):
+        """Compatibilidade com a carga antiga (só valores): associa as linhas aos ids na ordem do banco."""
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                ids = [r[0] for r in conn.execute(f"SELECT id FROM {self.TABLE} ORDER BY id LIMIT ?", (count,))]
+        except sqlite3.Error:
+            ids = []
+        while len(ids) < count:
+            ids.append(self._new_temp_id())
+            self._pending_inserts.add(ids[-1])
+        return ids
+
+    # ====== LEITURA ======
+    def rowCount(self, index=QModelIndex()):
         return len(self._data)
 
-    def columnCount(self, index):
+    def columnCount(self, index=QModelIndex()):
         return len(self._headers)
 
     def data(self, index, role):
@@ -183,232 +252,138 @@ class AgentesResponsaveisTableModel(QAbstractTableModel):
             if orientation == Qt.Orientation.Vertical:
                 return section + 1
 
-    def setData(self, index, value, role):
-        if role == Qt.ItemDataRole.EditRole:
-            self._data[index.row()][index.column()] = value
-            self.updateDatabase(index.row(), index.column(), value)
-            self.dataChanged.emit(index, index, (Qt.ItemDataRole.EditRole,))
-            return True
-        return False
-
     def flags(self, index):
         return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
 
-    def updateDatabase(self, row, column, value):
-        try:
-            with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                headers = ['nome', 'posto', 'funcao']
-                query = f"UPDATE controle_agentes_responsaveis SET {headers[column]} = ? WHERE rowid = ?"
-                cursor.execute(query, (value, row + 1))  # rowid é 1-indexado
-                conn.commit()
-        except Exception as e:
-            QMessageBox.critical(None, "Erro", f"Erro ao atualizar o banco de dados: {e}")
-
-    def addRow(self):
-        self.beginInsertRows(QModelIndex(), self.rowCount(None), self.rowCount(None))
-        self._data.append(["", "", ""])  # Adiciona uma linha vazia
-        self.endInsertRows()
+    def rowId(self, row):
+        """Retorna o id da linha (negativo enquanto a inclusão não foi gravada)."""
+        return self._row_ids[row]
 
-        try:
-            with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("INSERT INTO controle_agentes_responsaveis (nome, posto, funcao) VALUES (?, ?, ?)", ("", "", ""))
-                conn.commit()
-        except Exception as e:
-            QMessageBox.critical(None, "Erro", f"Erro ao adicionar ao banco de dados: {e}")
+    # ====== EDIÇÃO ======
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+        if self._data[row][column] == value:
+            return True
+        self._data[row][column] = value
+        row_id = self._row_ids[row]
+        # Inclusões pendentes já levam os valores atuais da linha no INSERT
+        if row_id not in self._pending_inserts:
+            self._pending_updates.setdefault(row_id, {})[self.COLUMNS[column]] = value
+        self.dataChanged.emit(index, index, (Qt.ItemDataRole.EditRole,))
+        self._schedule_submit()
+        return True
+
+    def addRow(self, values=None):
+        """Adiciona uma linha (vazia por padrão) ao buffer."""
+        self.add_rows([values or [""] * len(self.COLUMNS)])
+
+    def add_rows(self, rows):
+        """
+        Adiciona várias linhas de uma vez (colagem ou importação em lote).
+
+        As inclusões são gravadas juntas, em uma única transação.
+        """
+        rows = [list(row) + [""] * (len(self.COLUMNS) - len(row)) for row in rows]
+        if not rows:
+            return
+        first = len(self._data)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for values in rows:
+            temp_id = self._new_temp_id()
+            self._data.append(values[:len(self.COLUMNS)])
+            self._row_ids.append(temp_id)
+            self._pending_inserts.add(temp_id)
+        self.endInsertRows()
+        self._schedule_submit()
 
     def removeRow(self, row, parent=QModelIndex()):
-        self.beginRemoveRows(QModelIndex(), row, row)
-        self._data.pop(row)
+        return self.removeRows(row, 1, parent)
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if row < 0 or count <= 0 or row + count > len(self._data):
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        for row_id in self._row_ids[row:row + count]:
+            if row_id in self._pending_inserts:
+                self._pending_inserts.discard(row_id)
+            else:
+                self._pending_updates.pop(row_id, None)
+                self._pending_deletes.add(row_id)
+        del self._data[row:row + count]
+        del self._row_ids[row:row + count]
         self.endRemoveRows()
+        self._schedule_submit()
+        return True
 
-        try:
-            with sqlite3.connect(self.database_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM controle_agentes_responsaveis WHERE rowid = ?", (row + 1,))
-                conn.commit()
-        except Exception as e:
-            QMessageBox.critical(None, "Erro", f"Erro ao remover do banco de dados: {e}")
-            
-class EditPredefinicoesDialog(QDialog):
-    def __init__(self, categoria, config_data, parent=None):
-        super().__init__(parent)
-        self.categoria = categoria
-        self.config_data = config_data
-        self.setWindowTitle(f"Editar {categoria.replace('_', ' ').capitalize()}")
-
-        layout = QVBoxLayout(self)
-
-        # Título
-        title = QLabel(f"Edição de {categoria.replace('_', ' ').capitalize()}")
-        title.setStyleSheet("font-size: 18px; font-weight: bold;")
-        layout.addWidget(title)
-
-        # Lista de itens
-        self.list_widget = QListWidget()
-        if categoria in config_data:
-            for item in config_data[categoria]:
-                if isinstance(item, dict):  # Garantir que o item é um dicionário
-                    item_text = f"{item.get('Nome', 'N/A')} - {item.get('Posto', 'N/A')} - {item.get('Abreviacao', 'N/A')} - {item.get('Funcao', 'N/A')}"
-                    self.list_widget.addItem(item_text)
-        layout.addWidget(self.list_widget)
-
-        # Nome
-        layout.addWidget(QLabel("Nome:"))
-        self.nome_input = QLineEdit()
-        self.nome_input.setPlaceholderText("Digite o nome")
-        self.nome_input.textChanged.connect(self.forcar_caixa_alta)
-        layout.addWidget(self.nome_input)
-
-        # Posto
-        layout.addWidget(QLabel("Posto:"))
-        self.posto_input = QComboBox()
-        self.posto_input.setEditable(True)
-        self.posto_input.currentTextChanged.connect(self.atualizar_abreviacao)
-        layout.addWidget(self.posto_input)
-
-        # Abreviação do Posto
-        layout.addWidget(QLabel("Abreviação do Posto:"))
-        self.abrev_posto_input = QComboBox()
-        self.abrev_posto_input.setEditable(True)
-        layout.addWidget(self.abrev_posto_input)
-
-        # Preencher o ComboBox de posto dinamicamente
-        self.atualizar_posto()
-
-        # Conectar a função de inicialização da abreviação
-        self.atualizar_abreviacao(self.posto_input.currentText())
-
-        # Função
-        layout.addWidget(QLabel("Função:"))
-        self.funcao_input = QComboBox()
-        self.funcao_input.setEditable(True)
-        layout.addWidget(self.funcao_input)
-
-        # Inicializa os valores da função com base na categoria
-        self.inicializar_funcoes()
-
-        # Botões para adicionar e remover itens
-        button_layout = QHBoxLayout()
-        add_btn = QPushButton("Adicionar")
-        add_btn.clicked.connect(self.adicionar_item)
-        button_layout.addWidget(add_btn)
-
-        remove_btn = QPushButton("Remover")
-        remove_btn.clicked.connect(self.remover_item)
-        button_layout.addWidget(remove_btn)
-
-        layout.addLayout(button_layout)
-
-        # Botão de salvar
-        save_btn = QPushButton("Salvar")
-        save_btn.clicked.connect(self.salvar_e_fechar)
-        layout.addWidget(save_btn)
-
-        # Conecta a seleção na lista para preencher os campos
-        self.list_widget.itemClicked.connect(self.preencher_campos)
-
-    def forcar_caixa_alta(self):
-        """Garante que o nome seja sempre em caixa alta."""
-        self.nome_input.setText(self.nome_input.text().upper())
-
-    def atualizar_posto(self):
-        """Atualiza as opções de posto com base na categoria."""
-        postos_ordenador_agente_fiscal = [
-            "Capitão de Mar e Guerra (IM)", "Capitão de Fragata (IM)", "Capitão de Corveta (IM)",
-            "Capitão Tenente (IM)", "Outro"
-        ]
-        postos_geral = [
-            "Primeiro-Tenente", "Segundo-Tenente", "Suboficial", "Primeiro-Sargento",
-            "Segundo-Sargento", "Terceiro-Sargento", "Cabo", "Outro"
-        ]
-        postos = postos_ordenador_agente_fiscal if self.categoria in ["ordenador_de_despesa", "agente_fiscal"] else postos_geral
-        self.posto_input.clear()
-        self.posto_input.addItems(postos)
-
-    def atualizar_abreviacao(self, posto):
-        """Atualiza as opções de abreviação de posto com base no posto selecionado e categoria."""
-        abrev_map_ordenador_agente_fiscal = {
-            "Capitão de Mar e Guerra (IM)": ["CMG (IM)", "Outro"],
-            "Capitão de Fragata (IM)": ["CF (IM)", "Outro"],
-            "Capitão de Corveta (IM)": ["CC (IM)", "Outro"],
-            "Capitão Tenente (IM)": ["CT (IM)", "Outro"],
-            "Outro": ["Outro"]
-        }
-        abrev_map_geral = {
-            "Primeiro-Tenente": ["1ºTEN", "Outro"],
-            "Segundo-Tenente": ["2ºTEN", "Outro"],
-            "Suboficial": ["SO", "Outro"],
-            "Primeiro-Sargento": ["1º SG", "Outro"],
-            "Segundo-Sargento": ["2º SG", "Outro"],
-            "Terceiro-Sargento": ["3º SG", "Outro"],
-            "Cabo": ["CB", "Outro"],
-            "Outro": ["Outro"]
-        }
-        abrev_map = abrev_map_ordenador_agente_fiscal if self.categoria in ["ordenador_de_despesa", "agente_fiscal"] else abrev_map_geral
-        self.abrev_posto_input.clear()
-        self.abrev_posto_input.addItems(abrev_map.get(posto, ["Outro"]))
-
-    def inicializar_funcoes(self):
-        """Define as funções disponíveis com base na categoria."""
-        self.funcao_input.clear()
-        if self.categoria == "ordenador_de_despesa":
-            self.funcao_input.addItems(["Ordenador de Despesa", "Ordenador de Despesa Substituto"])
-        elif self.categoria == "agente_fiscal":
-            self.funcao_input.addItems(["Agente Fiscal", "Agente Fiscal Substituto"])
-        else:
-            self.funcao_input.addItems([
-                "Gerente de Crédito", "Responsável pela Demanda",
-                "Operador da Contratação", "Pregoeiro"
-            ])
-
-    def preencher_campos(self, item):
-        """Preenche os campos de edição com os valores do item selecionado."""
-        partes = item.text().split(" - ")
-        if len(partes) == 4:
-            self.nome_input.setText(partes[0].strip())
-            self.posto_input.setCurrentText(partes[1].strip())
-            self.abrev_posto_input.setCurrentText(partes[2].strip())
-            self.funcao_input.setCurrentText(partes[3].strip())
-
-    def adicionar_item(self):
-        """Adiciona um novo item à lista."""
-        nome = self.nome_input.text().strip()
-        posto = self.posto_input.currentText().strip()
-        abreviacao = self.abrev_posto_input.currentText().strip()
-        funcao = self.funcao_input.currentText().strip()
-
-        if not nome or not posto or not abreviacao or not funcao:
-            QMessageBox.warning(self, "Aviso", "Todos os campos devem ser preenchidos.")
-            return
+    # ====== PENDÊNCIAS ======
+    def hasPendingChanges(self):
+        return bool(self._pending_inserts or self._pending_updates or self._pending_deletes)
+
+    def submit(self):
+        """Grava todas as alterações pendentes em uma única transação."""
+        self._autosave_timer.stop()
+        if not self.hasPendingChanges():
+            return True
+
+        deletes = [(row_id,) for row_id in self._pending_deletes]
+        updates = [(row_id, changes) for row_id, changes in self._pending_updates.items()]
+        inserts = [(i, row_id) for i, row_id in enumerate(self._row_ids) if row_id in self._pending_inserts]
+        operations = len(deletes) + len(updates) + len(inserts)
 
-        item_text = f"{nome} - {posto} - {abreviacao} - {funcao}"
-        self.list_widget.addItem(item_text)
-
-        # Limpa os campos após adicionar
-        self.nome_input.clear()
-        self.posto_input.setCurrentIndex(-1)
-        self.abrev_posto_input.setCurrentIndex(-1)
-        self.funcao_input.setCurrentIndex(-1)
-
-    def remover_item(self):
-        """Remove o item selecionado da lista."""
-        selected_item = self.list_widget.currentItem()
-        if selected_item:
-            self.list_widget.takeItem(self.list_widget.row(selected_item))
-
-    def salvar_e_fechar(self):
-        """Salva as alterações na configuração e fecha o diálogo."""
-        items = []
-        for i in range(self.list_widget.count()):
-            partes = self.list_widget.item(i).text().split(" - ")
-            if len(partes) == 4:
-                items.append({
-                    "Nome": partes[0].strip(),
-                    "Posto": partes[1].strip(),
-                    "Abreviacao": partes[2].strip(),
-                    "Funcao": partes[3].strip()
-                })
-        self.config_data[self.categoria] = items
-        self.accept()
+        try:
+            with span("agentes_responsaveis.submit", "sql") as info:
+                conn = sqlite3.connect(self.database_path)
+                try:
+                    with conn:
+                        cursor = conn.cursor()
+                        if deletes:
+                            cursor.executemany(f"DELETE FROM {self.TABLE} WHERE id = ?", deletes)
+                        for row_id, changes in updates:
+                            assignments = ", ".join(f"{column} = ?" for column in changes)
+                            cursor.execute(
+                                f"UPDATE {self.TABLE} SET {assignments} WHERE id = ?",
+                                (*changes.values(), row_id),
+                            )
+                        new_ids = {}
+                        for row, temp_id in inserts:
+                            cursor.execute(
+                                f"INSERT INTO {self.TABLE} ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                                self._data[row],
+                            )
+                            new_ids[row] = cursor.lastrowid
+                finally:
+                    conn.close()
+                info["rows"] = operations
+        except sqlite3.Error as e:
+            # A transação foi desfeita; as pendências continuam no buffer para nova tentativa
+            QMessageBox.critical(None, "Erro", f"Erro ao salvar os agentes responsáveis: {e}")
+            return False
+
+        for row, row_id in new_ids.items():
+            self._row_ids[row] = row_id
+        self._clear_pending()
+        self.pending_changed.emit(False)
+        self.changes_saved.emit(operations)
+        return True
+
+    def revert(self):
+        """Descarta as alterações pendentes e recarrega os dados do banco."""
+        self._autosave_timer.stop()
+        self.load()
+
+    def _schedule_submit(self):
+        self.pending_changed.emit(True)
+        if self.autosave_ms:
+            self._autosave_timer.start()
+
+    def _clear_pending(self):
+        self._pending_inserts.clear()
+        self._pending_updates.clear()
+        self._pending_deletes.clear()
+
+    def _new_temp_id(self):
+        temp_id = self._next_temp_id
+        self._next_temp_id -= 1
+        return temp_id
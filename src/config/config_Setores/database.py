@@ -12,6 +12,11 @@ import num2words
 import locale
 import pandas as pd
 import re
+from paths import PNCP_DB_PATH
+from utils.precos_referencia import (
+    atualizar_referencias, itens_acima_do_percentil, precos_do_pregao, preparar_tabela_referencia,
+    reconstruir_referencias, referencia_preco, PERCENTIL_ALERTA
+)
 locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
 
 def formatar_valor_monetario(valor):
@@ -50,6 +55,28 @@ def remover_caracteres_especiais(texto):
 
     return texto
 
+# Tabela única com os itens homologados de todos os pregões consultados no PNCP
+PNCP_ITENS_TABELA = "pncp_itens"
+PNCP_ITENS_COLUNAS = {
+    'numeroControlePNCP': 'TEXT NOT NULL', 'item': 'INTEGER NOT NULL', 'grupo': 'TEXT', 'catalogo': 'TEXT',
+    'descricao': 'TEXT', 'unidade': 'TEXT', 'quantidade': 'REAL', 'valor_estimado': 'REAL',
+    'valor_homologado_item_unitario': 'REAL', 'percentual_desconto': 'REAL', 'valor_estimado_total_do_item': 'REAL',
+    'valor_homologado_total_item': 'REAL', 'marca_fabricante': 'TEXT', 'modelo_versao': 'TEXT', 'situacao': 'TEXT',
+    'descricao_detalhada': 'TEXT', 'uasg': 'TEXT', 'orgao_responsavel': 'TEXT', 'num_pregao': 'TEXT',
+    'ano_pregao': 'INTEGER', 'srp': 'BOOLEAN', 'objeto': 'TEXT', 'melhor_lance': 'REAL', 'valor_negociado': 'REAL',
+    'ordenador_despesa': 'TEXT', 'empresa': 'TEXT', 'cnpj': 'TEXT', 'endereco': 'TEXT', 'cep': 'TEXT',
+    'municipio': 'TEXT', 'telefone': 'TEXT', 'email': 'TEXT', 'responsavel_legal': 'TEXT'
+}
+# Nome das tabelas antigas, uma por pregão: "{numeroCompra}-{anoCompra}-{uasg}-HomologAPI"
+PADRAO_TABELA_HOMOLOG_API = re.compile(r"^(.+)-(\d{4})-([^-]+)-HomologAPI$")
+
+
+def chave_pregao_pncp(numeroCompra, anoCompra, unidadeOrgaoCodigoUnidade, numeroControlePNCP=None):
+    """Retorna o numeroControlePNCP do pregão ou, na falta dele, uma chave derivada de UASG/número/ano."""
+    if numeroControlePNCP:
+        return numeroControlePNCP
+    return f"{unidadeOrgaoCodigoUnidade}-{numeroCompra}/{anoCompra}"
+
 class DatabaseManager:
     def __init__(self, db_path):
         self.db_path = db_path
@@ -346,29 +373,42 @@ class DatabaseManager:
             ))
             conn.commit()       
 
-    def criar_tabela_itens_pregao(self, numeroCompra, anoCompra, unidadeOrgaoCodigoUnidade):
-        table_name = f"{numeroCompra}-{anoCompra}-{unidadeOrgaoCodigoUnidade}-HomologAPI"
-        column_order = [
-            'grupo', 'item PRIMARY KEY', 'catalogo', 'descricao', 'unidade', 'quantidade', 'valor_estimado', 
-            'valor_homologado_item_unitario', 'percentual_desconto', 'valor_estimado_total_do_item', 
-            'valor_homologado_total_item', 'marca_fabricante', 'modelo_versao', 'situacao', 
-            'descricao_detalhada', 'uasg', 'orgao_responsavel', 'num_pregao', 'ano_pregao', 
-            'srp', 'objeto', 'melhor_lance', 'valor_negociado', 'ordenador_despesa', 'empresa', 
-            'cnpj', 'endereco', 'cep', 'municipio', 'telefone', 'email', 'responsavel_legal'
+    def criar_tabela_pncp_itens(self, conn=None):
+        """
+        Cria (se necessário) a tabela única de itens homologados do PNCP.
+
+        Todos os pregões ficam em 'pncp_itens', com chave (numeroControlePNCP, item).
+        Os índices por CNPJ, catálogo e UASG/ano permitem análises entre pregões
+        (preços por CATMAT, descontos por fornecedor) em uma única consulta SQL.
+        """
+        colunas = ", ".join(f"{coluna} {tipo}" for coluna, tipo in PNCP_ITENS_COLUNAS.items())
+        comandos = [
+            f"CREATE TABLE IF NOT EXISTS {PNCP_ITENS_TABELA} ({colunas}, PRIMARY KEY (numeroControlePNCP, item))",
+            f"CREATE INDEX IF NOT EXISTS idx_pncp_itens_cnpj ON {PNCP_ITENS_TABELA} (cnpj)",
+            f"CREATE INDEX IF NOT EXISTS idx_pncp_itens_catalogo ON {PNCP_ITENS_TABELA} (catalogo)",
+            f"CREATE INDEX IF NOT EXISTS idx_pncp_itens_uasg ON {PNCP_ITENS_TABELA} (uasg, ano_pregao)",
         ]
-        
+        if conn is not None:
+            for comando in comandos:
+                conn.execute(comando)
+            return
         with self.connect_to_database() as conn:
-            cursor = conn.cursor()
-            columns_definition = ", ".join(column_order)
-            create_table_query = f"CREATE TABLE IF NOT EXISTS '{table_name}' ({columns_definition})"
-            cursor.execute(create_table_query)
-            conn.commit()      
+            for comando in comandos:
+                conn.execute(comando)
+            conn.commit()
+
+    def criar_tabela_itens_pregao(self, numeroCompra, anoCompra, unidadeOrgaoCodigoUnidade):
+        """Mantido por compatibilidade: os itens de todos os pregões ficam em 'pncp_itens'."""
+        self.criar_tabela_pncp_itens()
 
     def popular_db_consulta_itens_api(self, resultados_completos, data_informacoes, numeroCompra, anoCompra, unidadeOrgaoCodigoUnidade):
-        table_name = f"{numeroCompra}-{anoCompra}-{unidadeOrgaoCodigoUnidade}-HomologAPI"
-        
+        numero_controle = chave_pregao_pncp(
+            numeroCompra, anoCompra, unidadeOrgaoCodigoUnidade, data_informacoes.get("numeroControlePNCP")
+        )
+
         # Informações gerais de data_informacoes que serão inseridas com cada item
         data_informacoes_to_insert = {
+            "numeroControlePNCP": numero_controle,
             "ano_pregao": data_informacoes.get("anoCompra"),
             "num_pregao": data_informacoes.get("numeroCompra"),
             "uasg": data_informacoes.get("unidadeOrgao", {}).get("codigoUnidade"),
@@ -377,15 +417,15 @@ class DatabaseManager:
             "srp": data_informacoes.get("srp")
         }
 
-        # Para cada item em resultados_completos, insere ou atualiza os dados no banco de dados
+        registros = []
         for item in resultados_completos:
             quantidade = item.get("quantidadeHomologada", 0) or 0
             valor_estimado = item.get("valorUnitarioEstimado", 0) or 0
             valor_homologado_item_unitario = item.get("valorUnitarioHomologado", 0) or 0
-            
+
             # Cálculos necessários
             percentual_desconto = (
-                ((valor_estimado - valor_homologado_item_unitario) / valor_estimado * 100) 
+                ((valor_estimado - valor_homologado_item_unitario) / valor_estimado * 100)
                 if valor_estimado else 0
             )
             valor_homologado_total_item = quantidade * valor_homologado_item_unitario
@@ -395,8 +435,9 @@ class DatabaseManager:
             situacao = 'Adjudicado e Homologado' if item.get("temResultado") == 1 else 'Fracassado/Deserto/Cancelado ou Anulado'
 
             # Combina dados específicos do item com as informações gerais e os cálculos
-            data_to_insert = {
+            registros.append({
                 "item": item.get("numeroItem"),
+                "catalogo": item.get("catalogoCodigoItem"),
                 "descricao": item.get("descricao"),
                 "descricao_detalhada": item.get("descricao"),
                 "unidade": item.get("unidadeMedida"),
@@ -406,16 +447,149 @@ class DatabaseManager:
                 "percentual_desconto": percentual_desconto,
                 "valor_homologado_total_item": valor_homologado_total_item,
                 "valor_estimado_total_do_item": valor_estimado_total_do_item,
-                "situacao": situacao,  # Adiciona o valor convertido de situacao
+                "situacao": situacao,
                 "cnpj": item.get("niFornecedor"),
                 "empresa": item.get("nomeRazaoSocialFornecedor"),
-                **data_informacoes_to_insert  # Adiciona as informações de data_informacoes
-            }
+                **data_informacoes_to_insert
+            })
+
+        if not registros:
+            return 0
+
+        colunas = list(registros[0].keys())
+        atualizacoes = ", ".join(
+            f"{coluna} = excluded.{coluna}" for coluna in colunas if coluna not in ("numeroControlePNCP", "item")
+        )
+        upsert_query = (
+            f"INSERT INTO {PNCP_ITENS_TABELA} ({', '.join(colunas)}) VALUES ({', '.join(['?'] * len(colunas))}) "
+            f"ON CONFLICT(numeroControlePNCP, item) DO UPDATE SET {atualizacoes}"
+        )
+
+        # Todos os itens do pregão em uma única transação, junto com os preços de referência
+        with self.connect_to_database() as conn:
+            self.criar_tabela_pncp_itens(conn)
+            precos_anteriores = precos_do_pregao(conn, numero_controle)
+            conn.executemany(upsert_query, [tuple(registro[c] for c in colunas) for registro in registros])
+            # Na criação a tabela de referência já é preenchida com todos os itens, inclusive estes
+            if not preparar_tabela_referencia(conn):
+                atualizar_referencias(conn, precos_anteriores, precos_do_pregao(conn, numero_controle))
+            conn.commit()
+        return len(registros)
+
+    def referencia_preco(self, catalogo, unidade=None, quantis=None):
+        """
+        Referência de preço (mediana, IQR, percentis) de um item de catálogo, por unidade de medida.
+
+        Uso:
+            manager.referencia_preco("150805", "UNIDADE", quantis=[0.95])
+        """
+        with self.connect_to_database() as conn:
+            self.criar_tabela_pncp_itens(conn)
+            referencias = referencia_preco(conn, catalogo, unidade, quantis)
+            conn.commit()
+        return referencias
+
+    def itens_acima_do_percentil(self, percentil=PERCENTIL_ALERTA, numeroControlePNCP=None):
+        """Itens homologados com preço acima do percentil de referência do catálogo (DataFrame)."""
+        with self.connect_to_database() as conn:
+            self.criar_tabela_pncp_itens(conn)
+            itens = itens_acima_do_percentil(conn, percentil, numeroControlePNCP)
+            conn.commit()
+        return itens
+
+    def load_pncp_itens(self, **filtros):
+        """
+        Carrega itens de 'pncp_itens' em um DataFrame.
+
+        Uso:
+            manager.load_pncp_itens(cnpj="12345678000199")
+            manager.load_pncp_itens(uasg="787000", ano_pregao=2024)
+        """
+        colunas_invalidas = set(filtros) - set(PNCP_ITENS_COLUNAS)
+        if colunas_invalidas:
+            raise ValueError(f"Colunas inexistentes em {PNCP_ITENS_TABELA}: {', '.join(sorted(colunas_invalidas))}")
+        query = f"SELECT * FROM {PNCP_ITENS_TABELA}"
+        if filtros:
+            query += " WHERE " + " AND ".join(f"{coluna} = ?" for coluna in filtros)
+        with self.connect_to_database() as conn:
+            self.criar_tabela_pncp_itens(conn)
+            return pd.read_sql_query(query, conn, params=list(filtros.values()))
+
+    def migrar_tabelas_itens_pregao(self, remover_origem=False):
+        """
+        Copia as tabelas antigas '{numeroCompra}-{anoCompra}-{uasg}-HomologAPI' para 'pncp_itens'.
+
+        A chave numeroControlePNCP é recuperada de 'pregoes_consultados' quando o
+        pregão foi consultado; caso contrário é usada uma chave derivada do nome da
+        tabela. Itens já presentes em 'pncp_itens' não são sobrescritos, então a
+        migração pode ser executada novamente sem perda de dados mais recentes.
+        As tabelas copiadas ficam registradas em 'pncp_migracoes' e não são
+        relidas nas execuções seguintes.
+
+        :param remover_origem: Remove as tabelas antigas após a cópia.
+        :return: Dicionário {tabela: itens migrados}.
+        """
+        migrados = {}
+        with self.connect_to_database() as conn:
+            self.criar_tabela_pncp_itens(conn)
+            conn.execute("CREATE TABLE IF NOT EXISTS pncp_migracoes (tabela TEXT PRIMARY KEY, itens INTEGER, migrado_em TEXT)")
+            tabelas = [
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE '%-HomologAPI' "
+                    "AND name NOT IN (SELECT tabela FROM pncp_migracoes)"
+                )
+            ]
+            controles = {}
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='pregoes_consultados'").fetchone():
+                for numero, ano, uasg, controle in conn.execute(
+                    "SELECT numeroCompra, anoCompra, unidadeOrgaoCodigoUnidade, numeroControlePNCP FROM pregoes_consultados"
+                ):
+                    controles[(str(numero), str(ano), str(uasg))] = controle
+
+            for tabela in tabelas:
+                partes = PADRAO_TABELA_HOMOLOG_API.match(tabela)
+                if not partes:
+                    logging.warning(f"Tabela '{tabela}' ignorada na migração: nome fora do padrão.")
+                    continue
+                numero, ano, uasg = partes.groups()
+                numero_controle = chave_pregao_pncp(numero, ano, uasg, controles.get((numero, ano, uasg)))
+
+                existentes = [row[1] for row in conn.execute(f"PRAGMA table_info('{tabela}')")]
+                colunas = [c for c in existentes if c in PNCP_ITENS_COLUNAS and c != "numeroControlePNCP"]
+                selecao = ", ".join(f'"{c}"' for c in colunas)
+                cursor = conn.execute(
+                    f"INSERT OR IGNORE INTO {PNCP_ITENS_TABELA} (numeroControlePNCP, {', '.join(colunas)}) "
+                    f"SELECT ?, {selecao} FROM '{tabela}' WHERE item IS NOT NULL",
+                    (numero_controle,),
+                )
+                migrados[tabela] = cursor.rowcount
+                conn.execute(
+                    "INSERT OR REPLACE INTO pncp_migracoes VALUES (?, ?, ?)",
+                    (tabela, cursor.rowcount, datetime.now().isoformat(timespec="seconds")),
+                )
+                if remover_origem:
+                    conn.execute(f"DROP TABLE '{tabela}'")
+            # Itens migrados em lote: recalcula os preços de referência de uma vez
+            if not preparar_tabela_referencia(conn) and any(migrados.values()):
+                reconstruir_referencias(conn)
+            conn.commit()
+
+        for tabela, quantidade in migrados.items():
+            logging.info(f"Migração PNCP: {quantidade} itens de '{tabela}' copiados para {PNCP_ITENS_TABELA}.")
+        return migrados
+
 
-            # Comando SQL de INSERT OR REPLACE para atualizar caso item já exista
-            placeholders = ", ".join(["?"] * len(data_to_insert))
-            columns = ", ".join(data_to_insert.keys())
-            insert_query = f"INSERT OR REPLACE INTO '{table_name}' ({columns}) VALUES ({placeholders})"
+def migrar_itens_pncp(db_path=PNCP_DB_PATH):
+    """
+    Migração de abertura: copia as tabelas antigas por pregão para 'pncp_itens'.
 
-            # Executa a inserção ou atualização no banco de dados
-            self.execute_update(insert_query, tuple(data_to_insert.values()))
\ No newline at end of file
+    Não cria o banco se ele ainda não existir. Idempotente: cada tabela antiga
+    é copiada uma única vez (ver ``DatabaseManager.migrar_tabelas_itens_pregao``).
+    """
+    if not Path(db_path).exists():
+        return {}
+    try:
+        return DatabaseManager(db_path).migrar_tabelas_itens_pregao()
+    except sqlite3.Error as e:
+        logging.warning(f"Migração dos itens do PNCP não concluída: {e}")
+        return {}
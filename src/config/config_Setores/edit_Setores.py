@@ -3,7 +3,7 @@ from functools import partial
 import json
 from utils.add_button import add_button_func
 from utils.linha_layout import linha_divisoria_sem_spacer_layout
-from paths import ORGANIZACOES_FILE
+from paths import ORGANIZACOES_FILE, document_store
 
 def show_setores_widget(content_layout, icons, parent):
     """Exibe o widget para Alteração das Organizações Militares."""
@@ -41,8 +41,7 @@ def show_setores_widget(content_layout, icons, parent):
 
     # Carregar dados do arquivo JSON
     try:
-        with open(ORGANIZACOES_FILE, 'r', encoding='utf-8') as file:
-            config_data = json.load(file)
+        config_data = document_store.load(ORGANIZACOES_FILE, {})
     except (FileNotFoundError, json.JSONDecodeError):
         config_data = {}
 
@@ -103,11 +102,9 @@ def edit_om(om, config_data, parent):
     try:
         # Garantir que o arquivo JSON exista
         if not ORGANIZACOES_FILE.exists():
-            with open(ORGANIZACOES_FILE, 'w', encoding='utf-8') as file:
-                json.dump({}, file, ensure_ascii=False, indent=4)
+            document_store.save(ORGANIZACOES_FILE, {})
 
-        with open(ORGANIZACOES_FILE, 'r', encoding='utf-8') as file:
-            config_data = json.load(file)
+        config_data = document_store.load(ORGANIZACOES_FILE, {})
     except (FileNotFoundError, json.JSONDecodeError):
         config_data = {}
 
@@ -246,7 +243,6 @@ class EditOMWidget(QWidget):
                 })
         self.config_data[self.categoria] = items
 
-        with open(ORGANIZACOES_FILE, 'w', encoding='utf-8') as file:
-            json.dump(self.config_data, file, ensure_ascii=False, indent=4)
+        document_store.save(ORGANIZACOES_FILE, self.config_data)
 
         QMessageBox.information(self, "Sucesso", "Dados salvos com sucesso.")
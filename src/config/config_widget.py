@@ -1,12 +1,8 @@
 from PyQt6.QtWidgets import *
 from PyQt6.QtGui import *
 from PyQt6.QtCore import *
-from utils.add_button import add_button_func
-from utils.linha_layout import linha_divisoria_sem_spacer_layout
-from .config_Responsaveis.edit_responsaveis import EditPredefinicoesDialog
+from .config_Responsaveis.edit_responsaveis import create_agentes_responsaveis_widget
 from paths import *
-import json
-from functools import partial
 from .config_OM.edit_OM import show_organizacoes_widget
 from .config_Setores.edit_Setores import show_setores_widget
 
@@ -106,117 +102,9 @@ class ConfigManager(QWidget):
                 self.clear_layout(item.layout())
 
     def show_agentes_responsaveis_widget(self):
-        """Exibe o widget para Alteração dos Agentes Responsáveis."""
+        """Exibe a tabela editável dos agentes responsáveis (controle_agentes_responsaveis)."""
         self.clear_content()
-
-        # Scroll Area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-
-        # Widget principal para o conteúdo da scroll area
-        scroll_widget = QWidget()
-        layout = QVBoxLayout(scroll_widget)
-
-        # Título
-        title = QLabel("Alteração dos Agentes Responsáveis")
-        title.setStyleSheet("font-size: 20px; font-weight: bold; color: #4E648B")
-        layout.addWidget(title)
-
-        # Carregar dados do arquivo JSON
-        try:
-            with open(AGENTES_RESPONSAVEIS_FILE, 'r', encoding='utf-8') as file:
-                config_data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            config_data = {}
-
-        # Lista de agentes
-        agentes = [
-            "Ordenador de Despesa",
-            "Agente Fiscal",
-            "Gerente de Crédito",
-            "Responsável pela Demanda",
-            "Operador da Contratação",
-            "Pregoeiro",
-        ]
-
-        # Criando botões para cada agente
-        for agente in agentes:
-            categoria = agente.lower().replace(" ", "_")
-            item_layout = QVBoxLayout()
-
-            linha_divisoria = linha_divisoria_sem_spacer_layout()
-            item_layout.addWidget(linha_divisoria)
-
-            # Exibir valores existentes no JSON acima do botão
-            if categoria in config_data:
-                for item in config_data[categoria]:
-                    if isinstance(item, dict):  # Verifica se o item é um dicionário
-                        item_label = QLabel(
-                            f"{item.get('Nome', 'N/A')} - {item.get('Posto', 'N/A')} - "
-                            f"{item.get('Abreviacao', 'N/A')} - {item.get('Funcao', 'N/A')}"
-                        )
-                    else:
-                        # Tratamento para itens inválidos no JSON
-                        item_label = QLabel(f"Item inválido: {item}")
-                    item_label.setStyleSheet("font-size: 14px; color: #000;")
-                    item_layout.addWidget(item_label)
-
-            # Layout horizontal para o botão com espaçadores laterais
-            button_layout = QHBoxLayout()
-            button_layout.addStretch()  # Espaçador à esquerda
-
-            # Botão com texto do agente
-            button = add_button_func(
-                text=agente,
-                icon_name="edit",  # Substituir pelo nome do ícone correto
-                slot=partial(self.edit_agent, agente),  # Passa o nome do agente para a função
-                layout=button_layout,
-                icons=self.icons,
-                tooltip=f"Editar {agente}",
-                button_size=(300, 40)
-            )
-
-            button_layout.addStretch()  # Espaçador à direita
-            item_layout.addLayout(button_layout)
-
-            layout.addLayout(item_layout)
-
-        # Adiciona espaçador para empurrar o conteúdo para o topo
-        layout.addStretch()
-
-        # Configura o widget no scroll area
-        scroll_area.setWidget(scroll_widget)
-
-        # Adiciona o scroll area ao layout principal
-        self.content_layout.addWidget(scroll_area)
-
-    def edit_agent(self, agente):
-        """Função chamada ao clicar em 'Editar'."""
-        categoria = agente.lower().replace(" ", "_")  # Transformar em formato adequado para JSON
-        try:
-            # Carregar os dados do JSON
-            if not AGENTES_RESPONSAVEIS_FILE.exists():
-                with open(AGENTES_RESPONSAVEIS_FILE, 'w', encoding='utf-8') as file:
-                    json.dump({}, file, ensure_ascii=False, indent=4)
-
-            with open(AGENTES_RESPONSAVEIS_FILE, 'r', encoding='utf-8') as file:
-                config_data = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            config_data = {}
-
-        # Garantir que a categoria exista no dicionário
-        if categoria not in config_data:
-            config_data[categoria] = []
-
-        # Abrir o diálogo de edição
-        dialog = EditPredefinicoesDialog(categoria, config_data, self)
-        if dialog.exec():
-            # Salvar alterações no JSON
-            with open(AGENTES_RESPONSAVEIS_FILE, 'w', encoding='utf-8') as file:
-                json.dump(config_data, file, ensure_ascii=False, indent=4)
-
-            # Atualizar o widget após salvar as alterações
-            self.show_agentes_responsaveis_widget()
+        self.content_layout.addWidget(create_agentes_responsaveis_widget(self.icons, parent=self))
 
     def show_organizacoes_widget(self):
         show_organizacoes_widget(self.content_layout, self.icons, self)
@@ -0,0 +1,289 @@
+"""
+Arquivamento por exercício e compactação do banco do cartão corporativo (CPGF).
+
+Cada importação anual do CPGF acrescenta linhas a ``tabela_cartao_corporativo``
+e toda consulta do painel e dos filtros percorria o histórico inteiro. Aqui os
+exercícios fechados (anteriores ao anterior) podem sair da tabela "quente" para
+um banco por exercício (``<banco>_arquivo/<banco>_<ano>.db``), gravado já
+compactado com ``VACUUM INTO`` e aberto somente leitura. Consultas que
+precisam de vários anos usam ``conectar_historico``, que anexa os arquivos sob
+demanda e expõe a view temporária ``<tabela>_historico``.
+
+O arquivamento é uma ação explícita do usuário (``arquivar=True``): a tabela
+e a exportação do CPGF leem só a tabela quente; o dashboard e as análises que
+cruzam exercícios (fracionamento, concentração, duplicidade) leem também os
+arquivos anuais. A manutenção automática apenas compacta o banco. Os arquivos anuais entram no backup periódico
+(``database.backup.bancos_backup``).
+
+O banco quente passa a usar ``auto_vacuum = INCREMENTAL``: as páginas liberadas
+pelo arquivamento são devolvidas aos poucos (``incremental_vacuum``), sem
+reescrever o arquivo inteiro a cada manutenção.
+
+O SQLite não comprime páginas sem extensões; os arquivos anuais ficam
+compactos por serem reescritos sem páginas livres e apenas com o índice usado
+nas consultas entre exercícios.
+"""
+
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+
+from database.tracing import span
+from paths import CARTAO_CORPORATIVO_PATH
+
+TABELA_CPGF = "tabela_cartao_corporativo"
+# Exercício da transação: ano da data (gravada em ISO) ou, sem data, o ano do extrato
+EXPRESSAO_EXERCICIO = "COALESCE(CAST(substr(data_transacao, 1, 4) AS INTEGER), ano_extrato)"
+# Exercícios mantidos na tabela quente: o atual e o anterior
+EXERCICIOS_QUENTES = 2
+# Páginas devolvidas ao sistema de arquivos por rodada de incremental_vacuum
+PAGINAS_POR_RODADA = 5000
+INDICES_ARQUIVO = {"idx_arquivo_ug_data": "cod_unidade_gestora, data_transacao"}
+# O SQLite anexa no máximo 10 bancos por conexão
+LIMITE_ANEXOS = 10
+
+# Uma manutenção por vez (importações seguidas não disparam execuções concorrentes)
+_manutencao_lock = threading.Lock()
+
+
+def exercicio_de_corte(hoje=None, exercicios_quentes=EXERCICIOS_QUENTES):
+    """Primeiro exercício mantido na tabela quente; os anteriores são arquivados."""
+    return (hoje or date.today()).year - exercicios_quentes + 1
+
+
+def diretorio_arquivo(db_path=CARTAO_CORPORATIVO_PATH):
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}_arquivo")
+
+
+def caminho_arquivo(exercicio, db_path=CARTAO_CORPORATIVO_PATH):
+    return diretorio_arquivo(db_path) / f"{Path(db_path).stem}_{exercicio}.db"
+
+
+def exercicios_arquivados(db_path=CARTAO_CORPORATIVO_PATH):
+    """Retorna {exercício: caminho} dos arquivos anuais existentes, em ordem crescente."""
+    padrao = re.compile(rf"^{re.escape(Path(db_path).stem)}_(\d{{4}})\.db$")
+    diretorio = diretorio_arquivo(db_path)
+    if not diretorio.is_dir():
+        return {}
+    arquivos = {}
+    for caminho in diretorio.iterdir():
+        encontrado = padrao.match(caminho.name)
+        if encontrado:
+            arquivos[int(encontrado.group(1))] = caminho
+    return dict(sorted(arquivos.items()))
+
+
+def arquivar_exercicios_fechados(db_path=CARTAO_CORPORATIVO_PATH, tabela=TABELA_CPGF, corte=None):
+    """
+    Move os exercícios anteriores a ``corte`` da tabela quente para os arquivos anuais.
+
+    Para cada exercício a cópia para o arquivo e a exclusão na tabela quente são
+    uma única transação. Reimportações de um exercício já arquivado são
+    acrescentadas ao arquivo existente. Retorna {exercício: linhas movidas}.
+    """
+    corte = corte or exercicio_de_corte()
+    movidas = {}
+    with span("arquivar_exercicios", "arquivo", detail=str(db_path)) as info:
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabela}_exercicio ON {tabela} ({EXPRESSAO_EXERCICIO})")
+            conn.commit()
+            exercicios = [
+                exercicio for (exercicio,) in conn.execute(
+                    f"SELECT DISTINCT {EXPRESSAO_EXERCICIO} FROM {tabela} WHERE {EXPRESSAO_EXERCICIO} < ?", (corte,)
+                )
+            ]
+            for exercicio in sorted(exercicios):
+                movidas[exercicio] = _arquivar_exercicio(conn, db_path, tabela, exercicio)
+        finally:
+            conn.close()
+        info["rows"] = sum(movidas.values())
+    if movidas:
+        logging.info("Exercícios arquivados de %s: %s", tabela, movidas)
+    return movidas
+
+
+def compactar(db_path=CARTAO_CORPORATIVO_PATH, paginas=PAGINAS_POR_RODADA):
+    """
+    Devolve ao sistema de arquivos até ``paginas`` páginas livres do banco.
+
+    Na primeira execução converte o banco para ``auto_vacuum = INCREMENTAL``
+    (exige um VACUUM completo, feito uma única vez). Retorna as páginas liberadas.
+    """
+    with span("compactar", "arquivo", detail=str(db_path)) as info:
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            livres = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            conn.execute(f"PRAGMA incremental_vacuum({int(paginas)})").fetchall()
+            liberadas = livres - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        finally:
+            conn.close()
+        info["rows"] = liberadas
+    return liberadas
+
+
+def executar_manutencao(db_path=CARTAO_CORPORATIVO_PATH, tabela=TABELA_CPGF, arquivar=False):
+    """Compacta o banco quente; com ``arquivar=True``, antes arquiva os exercícios fechados."""
+    movidas = arquivar_exercicios_fechados(db_path, tabela) if arquivar else {}
+    liberadas = compactar(db_path)
+    return {"exercicios": movidas, "paginas_liberadas": liberadas}
+
+
+def iniciar_manutencao(db_path=CARTAO_CORPORATIVO_PATH, tabela=TABELA_CPGF, ao_terminar=None, arquivar=False):
+    """
+    Executa ``executar_manutencao`` em uma thread de fundo.
+
+    ``ao_terminar(resultado)`` é chamado na thread de fundo ao final (use um
+    sinal Qt para voltar à interface); se a manutenção falhar, ``resultado``
+    traz a mensagem em ``"erro"``. Se já houver uma manutenção em andamento,
+    não inicia outra e retorna None.
+    """
+    if not _manutencao_lock.acquire(blocking=False):
+        return None
+
+    def executar():
+        try:
+            resultado = executar_manutencao(db_path, tabela, arquivar)
+        except (sqlite3.Error, OSError) as e:
+            # Banco em uso (ex.: VACUUM sem lock exclusivo): tenta de novo na próxima manutenção
+            logging.warning("Manutenção de %s não concluída: %s", db_path, e)
+            resultado = {"exercicios": {}, "paginas_liberadas": 0, "erro": str(e)}
+        finally:
+            _manutencao_lock.release()
+        if ao_terminar is not None:
+            ao_terminar(resultado)
+
+    thread = threading.Thread(target=executar, name="arquivamento-cpgf", daemon=True)
+    thread.start()
+    return thread
+
+
+def conectar_historico(db_path=CARTAO_CORPORATIVO_PATH, exercicios=None, tabela=TABELA_CPGF, anexos=None):
+    """
+    Abre o banco quente com os arquivos anuais anexados (somente leitura).
+
+    Cria a view temporária ``<tabela>_historico`` com a tabela quente e os
+    exercícios anexados (UNION ALL). ``exercicios`` limita os anos anexados;
+    sem ele, anexa os mais recentes que couberem no limite do SQLite.
+    ``anexos`` (esquema -> caminho) anexa antes outros bancos, somente
+    leitura, para cruzamentos (ex.: o planejamento, com as OMs); eles ocupam
+    vagas do limite de anexos.
+    """
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri(), uri=True)
+    vagas = LIMITE_ANEXOS
+    for esquema, caminho in (anexos or {}).items():
+        if Path(caminho).exists():
+            conn.execute(f"ATTACH DATABASE ? AS {esquema}", (f"{Path(caminho).resolve().as_uri()}?mode=ro",))
+            vagas -= 1
+    colunas = [linha[1] for linha in conn.execute(f"PRAGMA main.table_info({tabela})")]
+    arquivos = exercicios_arquivados(db_path)
+    if exercicios is not None:
+        arquivos = {ano: caminho for ano, caminho in arquivos.items() if ano in set(exercicios)}
+    if len(arquivos) > vagas:
+        logging.warning("Apenas os %d exercícios arquivados mais recentes foram anexados.", vagas)
+        arquivos = dict(list(arquivos.items())[-vagas:])
+
+    partes = [f"SELECT {', '.join(colunas)} FROM main.{tabela}"]
+    for exercicio, caminho in arquivos.items():
+        esquema = f"arquivo_{exercicio}"
+        conn.execute(f"ATTACH DATABASE ? AS {esquema}", (f"{caminho.resolve().as_uri()}?mode=ro",))
+        existentes = {linha[1] for linha in conn.execute(f"PRAGMA {esquema}.table_info({tabela})")}
+        # Arquivos gravados antes de uma coluna nova existir trazem NULL nela
+        selecao = ", ".join(coluna if coluna in existentes else f"NULL AS {coluna}" for coluna in colunas)
+        partes.append(f"SELECT {selecao} FROM {esquema}.{tabela}")
+    conn.execute(f"CREATE TEMP VIEW IF NOT EXISTS {tabela}_historico AS {' UNION ALL '.join(partes)}")
+    return conn
+
+
+def _arquivar_exercicio(conn, db_path, tabela, exercicio):
+    destino = caminho_arquivo(exercicio, db_path)
+    trabalho = destino.with_name(destino.stem + ".trabalho.db")
+    destino.parent.mkdir(parents=True, exist_ok=True)
+
+    if trabalho.exists():
+        if _tem_tabela(trabalho, tabela):
+            # Execução anterior interrompida depois de mover as linhas: conclui antes de continuar
+            _finalizar_arquivo(trabalho, destino, tabela)
+        else:
+            # Interrompida antes de criar a tabela (a transação não chegou a mover linhas): descarta
+            logging.warning("Arquivo de trabalho incompleto descartado: %s", trabalho)
+            for sufixo in ("", "-journal", "-wal", "-shm"):
+                Path(f"{trabalho}{sufixo}").unlink(missing_ok=True)
+    if destino.exists():
+        shutil.copy2(destino, trabalho)
+
+    sql_criacao = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+    ).fetchone()[0]
+    sql_criacao = re.sub(
+        r"^CREATE TABLE\s+(IF NOT EXISTS\s+)?[\"\w]+", f"CREATE TABLE IF NOT EXISTS arquivo.{tabela}", sql_criacao
+    )
+    colunas = ", ".join(linha[1] for linha in conn.execute(f"PRAGMA table_info({tabela})"))
+
+    conn.execute("ATTACH DATABASE ? AS arquivo", (str(trabalho),))
+    try:
+        with conn:
+            # DDL não abre transação implícita no sqlite3; BEGIN explícito inclui a criação da tabela
+            conn.execute("BEGIN")
+            conn.execute(sql_criacao)
+            # Arquivos gravados antes de uma coluna nova existir recebem a coluna
+            existentes = {linha[1] for linha in conn.execute(f"PRAGMA arquivo.table_info({tabela})")}
+            for _, coluna, tipo, *_ in conn.execute(f"PRAGMA main.table_info({tabela})").fetchall():
+                if coluna not in existentes:
+                    conn.execute(f"ALTER TABLE arquivo.{tabela} ADD COLUMN {coluna} {tipo}")
+            conn.execute(
+                f"INSERT OR REPLACE INTO arquivo.{tabela} ({colunas}) "
+                f"SELECT {colunas} FROM main.{tabela} WHERE {EXPRESSAO_EXERCICIO} = ?",
+                (exercicio,),
+            )
+            movidas = conn.execute(f"DELETE FROM main.{tabela} WHERE {EXPRESSAO_EXERCICIO} = ?", (exercicio,)).rowcount
+    finally:
+        conn.execute("DETACH DATABASE arquivo")
+
+    _finalizar_arquivo(trabalho, destino, tabela)
+    return movidas
+
+
+def _tem_tabela(caminho, tabela):
+    """
+    Indica se o banco em ``caminho`` contém ``tabela`` (falso se o arquivo estiver corrompido).
+
+    Abre para escrita para que o SQLite desfaça um journal pendente da execução interrompida.
+    """
+    try:
+        conn = sqlite3.connect(caminho)
+        try:
+            return conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+            ).fetchone() is not None
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return False
+
+
+def _finalizar_arquivo(trabalho, destino, tabela=TABELA_CPGF):
+    """Indexa o arquivo de trabalho e grava o arquivo final compactado com VACUUM INTO."""
+    novo = destino.with_name(destino.stem + ".novo.db")
+    if novo.exists():
+        novo.unlink()
+    conn = sqlite3.connect(trabalho)
+    try:
+        for indice, colunas in INDICES_ARQUIVO.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {indice} ON {tabela} ({colunas})")
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("VACUUM INTO ?", (str(novo),))
+    finally:
+        conn.close()
+    os.replace(novo, destino)
+    trabalho.unlink()
@@ -0,0 +1,244 @@
+"""
+Backup online dos bancos das divisões.
+
+As cópias usam a API de backup online do SQLite (``Connection.backup``) em
+passos de poucas páginas com pausas entre eles: cada passo segura o banco
+por milissegundos, então os analistas continuam lendo e gravando enquanto o
+backup roda em uma thread de fundo.
+
+Os snapshots ficam em ``BACKUP_DIR`` com armazenamento deduplicado: o arquivo
+copiado é dividido em blocos de tamanho fixo, cada bloco é gravado
+comprimido uma única vez (nome = hash do conteúdo) e o snapshot é só um
+manifesto JSON com a lista de blocos. Snapshots seguidos de um banco que
+mudou pouco compartilham quase todos os blocos.
+
+Ações destrutivas (ex.: ``excluir_database``) tiram antes um snapshot
+``pre_<ação>`` com ``iniciar_snapshot`` e só executam a ação ao final.
+
+Os arquivos anuais do CPGF (``database.arquivamento``) guardam as únicas
+cópias dos exercícios arquivados e entram no backup junto com os bancos.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from database.arquivamento import exercicios_arquivados
+from database.tracing import span
+from paths import BACKUP_DIR, CARTAO_CORPORATIVO_PATH, CCIMAR11_PATH
+
+# Bancos incluídos no backup periódico
+BANCOS_BACKUP = [CARTAO_CORPORATIVO_PATH, CCIMAR11_PATH]
+
+# Páginas copiadas por passo e pausa entre passos (segundos): cada passo bloqueia escritores por ~ms
+PAGINAS_POR_PASSO = 64
+PAUSA_ENTRE_PASSOS = 0.01
+# Tamanho dos blocos deduplicados (múltiplo dos tamanhos de página usuais)
+TAMANHO_BLOCO = 256 * 1024
+# Snapshots mantidos por banco e tipo (periódicos e anteriores a ações destrutivas)
+MANTER_SNAPSHOTS = 10
+
+OBJETOS_DIR = BACKUP_DIR / "objetos"
+SNAPSHOTS_DIR = BACKUP_DIR / "snapshots"
+
+# Serializa gravação de snapshots e coleta de blocos órfãos
+_lock = threading.Lock()
+
+
+def criar_snapshot(db_path, motivo="periodico", paginas=PAGINAS_POR_PASSO, pausa=PAUSA_ENTRE_PASSOS):
+    """
+    Copia ``db_path`` com a API de backup online e grava um snapshot deduplicado.
+
+    A cópia avança ``paginas`` por passo e dorme ``pausa`` segundos depois de
+    cada passo (callback ``progress``; o ``sleep`` de ``Connection.backup`` só
+    vale quando o passo encontra o banco ocupado). Retorna o caminho do
+    manifesto do snapshot.
+    """
+    db_path = Path(db_path)
+    with _lock, span("criar_snapshot", "backup", detail=f"{db_path.name} ({motivo})") as info:
+        BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        fd, copia = tempfile.mkstemp(dir=BACKUP_DIR, suffix=".db")
+        os.close(fd)
+        try:
+            origem = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+            destino = sqlite3.connect(copia)
+            try:
+                origem.backup(
+                    destino, pages=paginas, sleep=pausa,
+                    progress=lambda status, restantes, total: time.sleep(pausa) if restantes else None,
+                )
+                tamanho_pagina = destino.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                destino.close()
+                origem.close()
+            blocos, digest, novos = _gravar_blocos(copia)
+        finally:
+            os.remove(copia)
+
+        criado_em = datetime.now()
+        manifesto = {
+            "banco": str(db_path),
+            "motivo": motivo,
+            "criado_em": criado_em.isoformat(timespec="seconds"),
+            "tamanho_pagina": tamanho_pagina,
+            "tamanho_bloco": TAMANHO_BLOCO,
+            "blocos": blocos,
+            "hash": digest,
+        }
+        diretorio = SNAPSHOTS_DIR / db_path.stem
+        diretorio.mkdir(parents=True, exist_ok=True)
+        caminho = diretorio / f"{criado_em:%Y%m%d-%H%M%S-%f}_{motivo}.json"
+        temporario = caminho.with_suffix(".tmp")
+        temporario.write_text(json.dumps(manifesto, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporario, caminho)
+
+        _rotacionar(diretorio, motivo)
+        info["rows"] = novos
+    logging.info("Snapshot de %s gravado (%s; %d blocos novos de %d).", db_path.name, motivo, novos, len(blocos))
+    return caminho
+
+
+def listar_snapshots(db_path):
+    """Retorna os manifestos (dict com ``caminho``) do banco, do mais recente para o mais antigo."""
+    diretorio = SNAPSHOTS_DIR / Path(db_path).stem
+    if not diretorio.is_dir():
+        return []
+    snapshots = []
+    for caminho in sorted(diretorio.glob("*.json"), reverse=True):
+        manifesto = json.loads(caminho.read_text(encoding="utf-8"))
+        manifesto["caminho"] = caminho
+        snapshots.append(manifesto)
+    return snapshots
+
+
+def restaurar_snapshot(manifesto_path, destino=None):
+    """
+    Restaura um snapshot sobre ``destino`` (padrão: o banco de origem).
+
+    O arquivo é remontado a partir dos blocos, conferido pelo hash e copiado
+    para o banco com a API de backup, que funciona com o banco aberto.
+    """
+    manifesto = json.loads(Path(manifesto_path).read_text(encoding="utf-8"))
+    destino = Path(destino or manifesto["banco"])
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    fd, copia = tempfile.mkstemp(dir=BACKUP_DIR, suffix=".db")
+    try:
+        digest = hashlib.blake2b(digest_size=20)
+        # Sob o lock: a rotação de um snapshot concorrente não remove blocos em uso
+        with _lock, os.fdopen(fd, "wb") as arquivo:
+            for bloco in manifesto["blocos"]:
+                dados = zlib.decompress(_caminho_objeto(bloco).read_bytes())
+                digest.update(dados)
+                arquivo.write(dados)
+        if digest.hexdigest() != manifesto["hash"]:
+            raise ValueError(f"Snapshot corrompido: {manifesto_path}")
+        origem = sqlite3.connect(copia)
+        alvo = sqlite3.connect(destino)
+        try:
+            origem.backup(alvo)
+        finally:
+            alvo.close()
+            origem.close()
+    finally:
+        os.remove(copia)
+    logging.info("Snapshot %s restaurado em %s.", Path(manifesto_path).name, destino)
+
+
+def iniciar_snapshot(db_path, motivo="periodico", ao_terminar=None):
+    """
+    Executa ``criar_snapshot`` em uma thread de fundo.
+
+    ``ao_terminar(caminho_do_manifesto)`` é chamado ao final; recebe None se o
+    snapshot falhou (use um sinal Qt para voltar à interface).
+    """
+    def executar():
+        try:
+            caminho = criar_snapshot(db_path, motivo)
+        except (sqlite3.Error, OSError) as e:
+            logging.error("Falha no snapshot de %s: %s", db_path, e)
+            caminho = None
+        if ao_terminar is not None:
+            ao_terminar(caminho)
+
+    thread = threading.Thread(target=executar, name=f"backup-{Path(db_path).stem}", daemon=True)
+    thread.start()
+    return thread
+
+
+def bancos_backup():
+    """Bancos do backup periódico: ``BANCOS_BACKUP`` e os arquivos anuais do CPGF existentes."""
+    return BANCOS_BACKUP + list(exercicios_arquivados(CARTAO_CORPORATIVO_PATH).values())
+
+
+def iniciar_backups_periodicos(bancos=None, intervalo_horas=24):
+    """Em segundo plano, tira snapshot dos bancos cujo último snapshot periódico é mais antigo que o intervalo."""
+    bancos = bancos_backup() if bancos is None else bancos
+
+    def executar():
+        limite = datetime.now() - timedelta(hours=intervalo_horas)
+        for db_path in bancos:
+            if not Path(db_path).exists():
+                continue
+            periodicos = [s for s in listar_snapshots(db_path) if s["motivo"] == "periodico"]
+            if periodicos and datetime.fromisoformat(periodicos[0]["criado_em"]) > limite:
+                continue
+            try:
+                criar_snapshot(db_path)
+            except (sqlite3.Error, OSError) as e:
+                logging.error("Falha no snapshot de %s: %s", db_path, e)
+            time.sleep(PAUSA_ENTRE_PASSOS)
+
+    thread = threading.Thread(target=executar, name="backup-periodico", daemon=True)
+    thread.start()
+    return thread
+
+
+def _caminho_objeto(bloco):
+    return OBJETOS_DIR / bloco[:2] / bloco
+
+
+def _gravar_blocos(copia):
+    """Grava os blocos ainda inexistentes; retorna (hashes, hash do arquivo, quantidade de blocos novos)."""
+    blocos = []
+    novos = 0
+    digest = hashlib.blake2b(digest_size=20)
+    with open(copia, "rb") as arquivo:
+        for dados in iter(lambda: arquivo.read(TAMANHO_BLOCO), b""):
+            digest.update(dados)
+            bloco = hashlib.blake2b(dados, digest_size=20).hexdigest()
+            caminho = _caminho_objeto(bloco)
+            if not caminho.exists():
+                caminho.parent.mkdir(parents=True, exist_ok=True)
+                temporario = caminho.with_suffix(".tmp")
+                temporario.write_bytes(zlib.compress(dados, 6))
+                os.replace(temporario, caminho)
+                novos += 1
+            blocos.append(bloco)
+    return blocos, digest.hexdigest(), novos
+
+
+def _rotacionar(diretorio, motivo):
+    """Mantém os ``MANTER_SNAPSHOTS`` snapshots mais recentes do motivo e remove blocos órfãos."""
+    do_motivo = sorted(diretorio.glob(f"*_{motivo}.json"), reverse=True)
+    removidos = do_motivo[MANTER_SNAPSHOTS:]
+    for caminho in removidos:
+        caminho.unlink()
+    if removidos:
+        _coletar_blocos_orfaos()
+
+
+def _coletar_blocos_orfaos():
+    referenciados = set()
+    for caminho in SNAPSHOTS_DIR.glob("*/*.json"):
+        referenciados.update(json.loads(caminho.read_text(encoding="utf-8"))["blocos"])
+    for caminho in OBJETOS_DIR.glob("*/*"):
+        if caminho.name not in referenciados:
+            caminho.unlink()
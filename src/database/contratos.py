@@ -0,0 +1,73 @@
+"""
+Upsert de contratos compartilhado pelos módulos das divisões.
+
+CCIMAR-10, 14, 15 e 16 gravam a mesma estrutura de contrato, cada um na sua
+tabela. O SQL de upsert é montado a partir da tabela, das colunas e da chave
+de conflito, e os padrões de status/situação ficam num só lugar.
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+
+from database.normalizacao import registros_para_sql
+
+# Colunas do contrato, na ordem dos parâmetros do upsert
+COLUNAS_CONTRATO = (
+    "status", "dias", "prorrogavel", "custeio", "numero_contrato",
+    "tipo", "id", "nome_fornecedor", "objeto", "valor_global",
+    "codigo_uasg", "processo_nup", "cnpj_cpf_idgener", "natureza_continuada", "orgao_contratante_resumido",
+    "orgao_contratante", "material_servico", "link_pncp", "vigencia_inicial", "vigencia_final",
+    "termo_aditivo", "atualizacao_comprasnet", "instancia_governanca", "comprasnet_contratos", "licitacao_numero",
+    "data_assinatura", "data_publicacao", "categoria", "subtipo", "amparo_legal",
+    "modalidade", "assinatura_contrato", "situacao",
+)
+
+SITUACOES_VALIDAS = ["Planejamento", "Aprovado", "Sessão Pública", "Homologado", "Empenhado", "Concluído", "Arquivado"]
+
+
+@lru_cache(maxsize=None)
+def sql_upsert(tabela, colunas=COLUNAS_CONTRATO, chave=("id",)):
+    """INSERT ... ON CONFLICT(chave) DO UPDATE para as colunas fora da chave."""
+    atualizar = ", ".join(f"{coluna}=excluded.{coluna}" for coluna in colunas if coluna not in chave)
+    return (
+        f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+        f"VALUES ({', '.join('?' * len(colunas))}) "
+        f"ON CONFLICT({', '.join(chave)}) DO UPDATE SET {atualizar}"
+    )
+
+
+def preparar_contrato(data):
+    """Aplica a um registro (dict) os padrões de status e situação."""
+    if not data.get('status'):
+        data['status'] = 'Planejamento'
+    if data.get('situacao') not in SITUACOES_VALIDAS:
+        data['situacao'] = 'Planejamento'
+    return data
+
+
+def preparar_contratos(df):
+    """Versão vetorizada de ``preparar_contrato``; retorna uma cópia do DataFrame."""
+    df = df.copy()
+    status = df["status"] if "status" in df else pd.Series(None, index=df.index, dtype=object)
+    df["status"] = status.where(status.notna() & (status != ""), "Planejamento")
+    situacao = df["situacao"] if "situacao" in df else pd.Series(None, index=df.index, dtype=object)
+    df["situacao"] = situacao.where(situacao.isin(SITUACOES_VALIDAS), "Planejamento")
+    return df
+
+
+def upsert_contratos(conn, tabela, registros, colunas=COLUNAS_CONTRATO, chave=("id",)):
+    """
+    Insere ou atualiza contratos em ``tabela`` numa única transação.
+
+    ``registros`` pode ser um DataFrame ou uma lista de dicts, já preparados.
+    Retorna a quantidade de registros gravados; erros do sqlite3 (tabela
+    inexistente, por exemplo) são repassados ao chamador.
+    """
+    if isinstance(registros, pd.DataFrame):
+        linhas = registros_para_sql(registros, list(colunas))
+    else:
+        linhas = [tuple(registro.get(coluna) for coluna in colunas) for registro in registros]
+    with conn:
+        conn.executemany(sql_upsert(tabela, tuple(colunas), tuple(chave)), linhas)
+    return len(linhas)
@@ -1,5 +1,9 @@
 import sqlite3
 import logging
+import time
+from database.tracing import tracer, call_site_tag, register_internal_module
+
+register_internal_module(__file__)
 
 class DatabaseManager:
     def __init__(self, db_path):
@@ -18,7 +22,9 @@ class DatabaseManager:
             logging.error(f"Failed to connect to database at {self.db_path}: {e}")
             raise
 
-    def execute_query(self, query, params=None):
+    def execute_query(self, query, params=None, tag=None):
+        start = time.perf_counter()
+        rows = None
         with self.connect_to_database() as conn:
             try:
                 cursor = conn.cursor()
@@ -26,12 +32,18 @@ class DatabaseManager:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
-                return cursor.fetchall()
+                result = cursor.fetchall()
+                rows = len(result)
+                return result
             except sqlite3.Error as e:
                 logging.error(f"Error executing query: {query}, Error: {e}")
                 return None
+            finally:
+                self._trace(query, start, rows, tag)
 
-    def execute_update(self, query, params=None):
+    def execute_update(self, query, params=None, tag=None):
+        start = time.perf_counter()
+        rows = None
         with self.connect_to_database() as conn:
             try:
                 cursor = conn.cursor()
@@ -40,11 +52,19 @@ class DatabaseManager:
                 else:
                     cursor.execute(query)
                 conn.commit()
+                rows = cursor.rowcount if cursor.rowcount >= 0 else None
             except sqlite3.Error as e:
                 logging.error(f"Error executing update: {query}, Error: {e}")
                 return False
+            finally:
+                self._trace(query, start, rows, tag)
             return True
 
+    def _trace(self, query, start, rows, tag):
+        """Registra a duração da instrução no tracer compartilhado."""
+        if tracer.enabled:
+            tracer.record("sql", tag or call_site_tag(), (time.perf_counter() - start) * 1000, rows, query)
+
     def close_connection(self):
         if self.connection:
             self.connection.close()
@@ -52,13 +72,15 @@ class DatabaseManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close_connection()
 
-    def fetch_all(self, query):
+    def fetch_all(self, query, tag=None):
         """
         Executa uma consulta SQL e retorna todos os registros.
         
         :param query: A string de consulta SQL a ser executada.
+        :param tag: Identificação opcional da operação no trace (padrão: ponto de chamada).
         :return: Uma lista de dicionários, onde cada dicionário representa uma linha do resultado.
         """
+        start = time.perf_counter()
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(query)
@@ -66,6 +88,7 @@ class DatabaseManager:
             rows = cursor.fetchall()
             # Converte cada linha em um dicionário com chaves sendo os nomes das colunas
             data = [dict(zip(columns, row)) for row in rows]
+        self._trace(query, start, len(data), tag)
         return data
 
     def delete_data(self, id_processo):
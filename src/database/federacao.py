@@ -0,0 +1,305 @@
+"""
+Consultas federadas entre os bancos das divisões.
+
+Os dados ficam espalhados em vários arquivos SQLite (planejamento/OMs e
+critérios, cartão corporativo, contratos, itens do PNCP). Em vez de carregar
+cada um em um DataFrame e cruzar em memória, ``conectar_federado`` abre uma
+única conexão, anexa (ATTACH) os bancos com nomes de esquema estáveis e cria
+views temporárias com as dimensões e fatos mais usados. Os cruzamentos rodam
+no planejador do SQLite, usando os índices de cada banco.
+
+Uso:
+    conn = conectar_federado(CCIMAR11_PATH)
+    conn.execute("SELECT * FROM risco_om ORDER BY total_cartao DESC LIMIT 10")
+
+As tabelas de cada banco continuam acessíveis por ``esquema.tabela``
+(ex.: ``cartao.tabela_cartao_corporativo``).
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+
+from database.tracing import span
+from paths import (
+    CARTAO_CORPORATIVO_PATH, CCIMAR10_PATH, CCIMAR11_PATH, CCIMAR12_PATH, CCIMAR13_PATH,
+    CCIMAR14_PATH, CCIMAR15_PATH, CCIMAR16_PATH, PNCP_DB_PATH,
+)
+
+# Nome estável do esquema -> banco da divisão (o SQLite anexa no máximo 10 bancos)
+ESQUEMAS_PADRAO = {
+    "planejamento": CCIMAR11_PATH,
+    "cartao": CARTAO_CORPORATIVO_PATH,
+    "auditoria": CCIMAR10_PATH,
+    "licitacao": CCIMAR12_PATH,
+    "execucao": CCIMAR13_PATH,
+    "pagamento": CCIMAR14_PATH,
+    "material": CCIMAR15_PATH,
+    "data_science": CCIMAR16_PATH,
+    "pncp": PNCP_DB_PATH,
+}
+
+# Índices que sustentam os cruzamentos: esquema -> [(tabela, nome, colunas)]
+INDICES_FEDERACAO = {
+    "planejamento": [
+        ("criterio_execucao_licitacao", "idx_execucao_licitacao_cod_siafi", "cod_siafi"),
+        ("criterio_munic", "idx_criterio_munic_cod_siafi", "cod_siafi"),
+    ],
+    "cartao": [
+        ("tabela_cartao_corporativo", "idx_cartao_ug_valor", "cod_unidade_gestora, valor_transacao"),
+    ],
+    "auditoria": [
+        ("ccimar10_db", "idx_ccimar10_db_codigo_uasg", "codigo_uasg"),
+    ],
+}
+
+# Views temporárias: nome -> (tabelas necessárias "esquema.tabela", SQL com {esquema})
+VIEWS_FEDERADAS = {
+    "dim_om": (
+        ["planejamento.organizacoes_militares"],
+        """
+        SELECT cod_siafi, sigla_om, nome_om, distrito, uf
+        FROM {planejamento}.organizacoes_militares
+        """,
+    ),
+    "fato_gasto_cartao": (
+        ["cartao.tabela_cartao_corporativo"],
+        """
+        SELECT id, cod_unidade_gestora AS cod_siafi, nome_unidade_gestora, cod_orgao, nome_orgao,
+               cpf_portador, nome_portador, cnpj_cpf_favorecido, nome_favorecido,
+               transacao, data_transacao, valor_transacao
+        FROM {cartao}.tabela_cartao_corporativo
+        """,
+    ),
+    "gasto_cartao_por_om": (
+        ["planejamento.organizacoes_militares", "cartao.tabela_cartao_corporativo"],
+        """
+        SELECT om.cod_siafi, om.sigla_om, om.nome_om,
+               COUNT(*) AS qtd_transacoes_cartao,
+               SUM(c.valor_transacao) AS total_cartao
+        FROM {planejamento}.organizacoes_militares om
+        JOIN {cartao}.tabela_cartao_corporativo c ON c.cod_unidade_gestora = om.cod_siafi
+        GROUP BY om.cod_siafi
+        """,
+    ),
+    "risco_om": (
+        [
+            "planejamento.organizacoes_militares", "planejamento.criterio_execucao_licitacao",
+            "planejamento.criterio_munic", "cartao.tabela_cartao_corporativo",
+        ],
+        """
+        SELECT om.cod_siafi, om.sigla_om, om.nome_om, om.distrito,
+               (SELECT SUM(valor_transacao) FROM {cartao}.tabela_cartao_corporativo c
+                 WHERE c.cod_unidade_gestora = om.cod_siafi) AS total_cartao,
+               (SELECT SUM(valor_total_execucao_licitacao) FROM {planejamento}.criterio_execucao_licitacao e
+                 WHERE e.cod_siafi = om.cod_siafi) AS total_execucao_licitacao,
+               (SELECT SUM(despesa_autorizada) FROM {planejamento}.criterio_munic m
+                 WHERE m.cod_siafi = om.cod_siafi) AS despesa_autorizada_munic,
+               (SELECT MAX(ultima_auditoria) FROM {planejamento}.criterio_munic m
+                 WHERE m.cod_siafi = om.cod_siafi) AS ultima_auditoria
+        FROM {planejamento}.organizacoes_militares om
+        """,
+    ),
+    "contratos_por_om": (
+        ["planejamento.organizacoes_militares", "auditoria.ccimar10_db"],
+        """
+        SELECT om.cod_siafi, om.sigla_om, c.id AS id_contrato, c.numero_contrato, c.nome_fornecedor,
+               c.cnpj_cpf_idgener, CAST(c.valor_global AS REAL) AS valor_global,
+               c.vigencia_inicial, c.vigencia_final
+        FROM {auditoria}.ccimar10_db c
+        JOIN {planejamento}.organizacoes_militares om ON om.cod_siafi = c.codigo_uasg
+        """,
+    ),
+    "pncp_itens_por_om": (
+        ["planejamento.organizacoes_militares", "pncp.pncp_itens"],
+        """
+        SELECT om.cod_siafi, om.sigla_om, i.*
+        FROM {pncp}.pncp_itens i
+        JOIN {planejamento}.organizacoes_militares om ON om.cod_siafi = i.uasg
+        """,
+    ),
+    # Mapas gravados por database.resolucao_entidades: junções exatas entre grafias das fontes
+    "mapa_ug_om": (
+        ["planejamento.mapa_unidades"],
+        """
+        SELECT origem, codigo_origem, nome_origem, cod_siafi, sigla_om, similaridade, metodo
+        FROM {planejamento}.mapa_unidades
+        WHERE aceito = 1
+        """,
+    ),
+    "dim_fornecedor": (
+        ["planejamento.mapa_fornecedores", "planejamento.fornecedores_canonicos"],
+        """
+        SELECT m.origem, m.documento, m.nome_origem, m.cnpj_raiz, f.nome_canonico, m.similaridade, m.metodo
+        FROM {planejamento}.mapa_fornecedores m
+        JOIN {planejamento}.fornecedores_canonicos f ON f.cnpj_raiz = m.cnpj_raiz
+        WHERE m.aceito = 1
+        """,
+    ),
+    "gasto_cartao_por_om_resolvido": (
+        ["planejamento.organizacoes_militares", "planejamento.mapa_unidades", "cartao.tabela_cartao_corporativo"],
+        """
+        SELECT om.cod_siafi, om.sigla_om, om.nome_om,
+               COUNT(*) AS qtd_transacoes_cartao,
+               SUM(c.valor_transacao) AS total_cartao
+        FROM {planejamento}.mapa_unidades m
+        JOIN {cartao}.tabela_cartao_corporativo c
+          ON c.cod_unidade_gestora = CAST(m.codigo_origem AS INTEGER)
+         AND c.nome_unidade_gestora = m.nome_origem
+        JOIN {planejamento}.organizacoes_militares om ON om.cod_siafi = m.cod_siafi
+        WHERE m.origem = 'cpgf' AND m.aceito = 1
+        GROUP BY om.cod_siafi
+        """,
+    ),
+}
+
+
+class ConexaoFederada(sqlite3.Connection):
+    """Conexão SQLite que guarda os esquemas anexados e as views federadas criadas."""
+
+    esquemas = {}
+    views = []
+
+
+def conectar_federado(principal=None, esquemas=None, somente_leitura=True):
+    """
+    Abre uma conexão com os bancos das divisões anexados.
+
+    Os bancos anexados são sempre abertos somente leitura (``mode=ro``): os
+    chatbots executam nesta conexão o SQL gerado pelo modelo. Os índices
+    usados pelas views são criados na migração (``criar_indices_federacao``),
+    não a cada conexão.
+
+    :param principal: Banco aberto como ``main`` (ex.: o banco do chatbot); as
+        consultas existentes sobre ele continuam funcionando sem prefixo. Sem
+        ele, ``main`` é um banco em memória.
+    :param esquemas: Mapa esquema -> caminho (padrão: ``ESQUEMAS_PADRAO``).
+        Bancos inexistentes são ignorados (não são criados vazios).
+    :param somente_leitura: Abre também o ``main`` somente leitura e bloqueia
+        novos ATTACH. Use False apenas para rotinas internas que gravam no
+        ``main`` (ex.: mapas de ``database.resolucao_entidades``).
+    :return: ``ConexaoFederada`` com ``esquemas`` (esquema -> nome anexado) e ``views``.
+    """
+    esquemas = ESQUEMAS_PADRAO if esquemas is None else esquemas
+    principal_resolvido = Path(principal).resolve() if principal else None
+
+    with span("conectar_federado", "sql") as info:
+        if principal_resolvido is None or (somente_leitura and not principal_resolvido.exists()):
+            destino = ":memory:"
+        elif somente_leitura:
+            destino = f"{principal_resolvido.as_uri()}?mode=ro"
+        else:
+            destino = principal_resolvido.as_uri()
+        conn = sqlite3.connect(destino, uri=True, factory=ConexaoFederada)
+        anexados = {}
+        for nome, caminho in esquemas.items():
+            caminho = Path(caminho)
+            if principal_resolvido is not None and caminho.resolve() == principal_resolvido and destino != ":memory:":
+                anexados[nome] = "main"
+            elif caminho.exists():
+                conn.execute(f"ATTACH DATABASE ? AS {nome}", (f"{caminho.resolve().as_uri()}?mode=ro",))
+                anexados[nome] = nome
+
+        tabelas = _tabelas_por_esquema(conn, anexados)
+        views = _criar_views(conn, anexados, tabelas)
+        if somente_leitura:
+            conn.set_authorizer(_negar_attach)
+        info["rows"] = len(views)
+
+    conn.esquemas = anexados
+    conn.views = views
+    return conn
+
+
+def criar_indices_federacao(esquemas=None):
+    """
+    Cria, se faltarem, os índices que sustentam os cruzamentos (``INDICES_FEDERACAO``).
+
+    Executada uma vez na migração (abertura da aplicação), com uma conexão de
+    escrita própria para cada banco. Retorna a quantidade de índices verificados.
+    """
+    esquemas = ESQUEMAS_PADRAO if esquemas is None else esquemas
+    verificados = 0
+    with span("criar_indices_federacao", "sql") as info:
+        for nome, indices in INDICES_FEDERACAO.items():
+            caminho = esquemas.get(nome)
+            if caminho is None or not Path(caminho).exists():
+                continue
+            try:
+                conn = sqlite3.connect(caminho, timeout=5)
+            except sqlite3.Error as e:
+                logging.warning("Banco %s não aberto para criar índices: %s", nome, e)
+                continue
+            try:
+                tabelas = {linha[0] for linha in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                for tabela, indice, colunas in indices:
+                    if tabela not in tabelas:
+                        continue
+                    try:
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS {indice} ON {tabela} ({colunas})")
+                        verificados += 1
+                    except sqlite3.Error as e:  # banco somente leitura ou bloqueado: segue sem o índice
+                        logging.warning("Índice %s.%s não criado: %s", nome, indice, e)
+                conn.commit()
+            finally:
+                conn.close()
+        info["rows"] = verificados
+    return verificados
+
+
+def consultar_federado(sql, params=(), principal=None):
+    """Executa uma consulta na conexão federada e retorna um DataFrame."""
+    import pandas as pd
+
+    conn = conectar_federado(principal)
+    try:
+        with span("consultar_federado", "sql", detail=sql) as info:
+            df = pd.read_sql(sql, conn, params=params)
+            info["rows"] = len(df)
+        return df
+    finally:
+        conn.close()
+
+
+def criar_views_federadas(conn):
+    """
+    Cria as views federadas numa conexão aberta por outra rotina.
+
+    Considera os bancos já anexados com os nomes de ``ESQUEMAS_PADRAO`` (ex.:
+    o planejamento anexado por ``database.arquivamento.conectar_historico``)
+    e retorna as views criadas.
+    """
+    anexados = {nome: nome for _, nome, _ in conn.execute("PRAGMA database_list") if nome in ESQUEMAS_PADRAO}
+    return _criar_views(conn, anexados, _tabelas_por_esquema(conn, anexados))
+
+
+def descrever_views(conn):
+    """Retorna {view: ["coluna (tipo)", ...]} das views federadas, no formato usado pelos chatbots."""
+    return {
+        view: [f"{col[1]} ({col[2] or 'ANY'})" for col in conn.execute(f"PRAGMA temp.table_info({view})")]
+        for view in conn.views
+    }
+
+
+def _tabelas_por_esquema(conn, anexados):
+    tabelas = set()
+    for nome, esquema in anexados.items():
+        for (tabela,) in conn.execute(f"SELECT name FROM {esquema}.sqlite_master WHERE type = 'table'"):
+            tabelas.add(f"{nome}.{tabela}")
+    return tabelas
+
+
+def _negar_attach(acao, *args):
+    """Autorizador da conexão somente leitura: impede anexar (e abrir para escrita) outros arquivos."""
+    return sqlite3.SQLITE_DENY if acao == sqlite3.SQLITE_ATTACH else sqlite3.SQLITE_OK
+
+
+def _criar_views(conn, anexados, tabelas):
+    criadas = []
+    for view, (dependencias, sql) in VIEWS_FEDERADAS.items():
+        if not all(dependencia in tabelas for dependencia in dependencias):
+            continue
+        conn.execute(f"CREATE TEMP VIEW IF NOT EXISTS {view} AS {sql.format_map(anexados)}")
+        criadas.append(view)
+    return criadas
+
@@ -0,0 +1,180 @@
+"""
+Normalização de datas e valores monetários para gravação no SQLite.
+
+As planilhas e a API trazem datas como DD/MM/AAAA e valores como
+"R$ 1.234,56". Gravados assim, toda ordenação, filtro ou cálculo de prazo
+precisa interpretar texto em Python, célula a célula. Aqui os importadores
+convertem na escrita: datas para ISO (AAAA-MM-DD, que ordena como texto e é
+aceito pelas funções de data do SQLite) e valores para REAL.
+
+Valores derivados (dia da vigência, totais) ficam em colunas geradas do
+SQLite, com índice, para que filtros por faixa e ordenações rodem no banco.
+"""
+
+import logging
+import re
+from datetime import date, datetime
+
+import pandas as pd
+
+# Dia juliano de 1970-01-01: julianday(x) - EPOCA_JULIANA = dias desde a época Unix
+EPOCA_JULIANA = 2440587.5
+
+_DATA_BR = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})")
+_DATA_ISO = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+
+# Converte DD/MM/AAAA gravado como texto em AAAA-MM-DD dentro do próprio SQLite
+SQL_DATA_BR_PARA_ISO = """
+    UPDATE {tabela}
+    SET {coluna} = substr({coluna}, 7, 4) || '-' || substr({coluna}, 4, 2) || '-' || substr({coluna}, 1, 2)
+    WHERE {coluna} GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]*'
+"""
+
+
+def data_iso(valor):
+    """Converte DD/MM/AAAA, AAAA-MM-DD[...] ou date/datetime para 'AAAA-MM-DD' (None se inválida)."""
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return None
+    if isinstance(valor, (datetime, date)):
+        return valor.strftime("%Y-%m-%d")
+    texto = str(valor).strip()
+    encontrado = _DATA_ISO.match(texto)
+    if encontrado:
+        ano, mes, dia = encontrado.groups()
+    else:
+        encontrado = _DATA_BR.match(texto)
+        if not encontrado:
+            return None
+        dia, mes, ano = encontrado.groups()
+    try:
+        return date(int(ano), int(mes), int(dia)).isoformat()
+    except ValueError:
+        return None
+
+
+def valor_monetario(valor):
+    """Converte "R$ 1.234,56", "1234,56" ou 1234.56 para float (None se vazio/inválido)."""
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, float)):
+        return None if pd.isna(valor) else float(valor)
+    texto = re.sub(r"[^0-9,.\-]", "", str(valor))
+    if not texto:
+        return None
+    if "," in texto:
+        # Formato brasileiro: ponto como milhar, vírgula como decimal
+        texto = texto.replace(".", "").replace(",", ".")
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+
+def serie_data_iso(serie):
+    """Versão vetorizada de ``data_iso`` para colunas de DataFrame."""
+    texto = serie.astype("string").str.strip()
+    datas = pd.to_datetime(texto, format="%d/%m/%Y", errors="coerce")
+    faltantes = datas.isna() & texto.notna()
+    if faltantes.any():
+        datas[faltantes] = pd.to_datetime(texto[faltantes].str[:10], format="%Y-%m-%d", errors="coerce")
+    return datas.dt.strftime("%Y-%m-%d").astype(object).where(datas.notna(), None)
+
+
+def serie_valor_monetario(serie):
+    """Versão vetorizada de ``valor_monetario`` para colunas de DataFrame."""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+    texto = serie.astype("string").str.replace(r"[^0-9,.\-]", "", regex=True)
+    brasileiro = texto.str.contains(",", regex=False, na=False)
+    texto = texto.where(~brasileiro, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    return pd.to_numeric(texto, errors="coerce")
+
+
+def normalizar_colunas(conn, tabela, datas=(), valores=()):
+    """
+    Normaliza registros já gravados: datas DD/MM/AAAA para ISO e valores em texto para REAL.
+
+    Só altera linhas fora do formato normalizado, então pode ser chamada a cada
+    abertura do banco. Retorna a quantidade de células alteradas.
+    """
+    alteradas = 0
+    conn.create_function("valor_monetario", 1, valor_monetario, deterministic=True)
+    with conn:
+        for coluna in datas:
+            alteradas += conn.execute(SQL_DATA_BR_PARA_ISO.format(tabela=tabela, coluna=coluna)).rowcount
+        for coluna in valores:
+            alteradas += conn.execute(
+                f"UPDATE {tabela} SET {coluna} = valor_monetario({coluna}) "
+                f"WHERE typeof({coluna}) = 'text' AND {coluna} GLOB '*[^0-9.-]*'"
+            ).rowcount
+    if alteradas:
+        logging.info("%s: %d valores normalizados (datas/valores)", tabela, alteradas)
+    return alteradas
+
+
+def colunas_da_tabela(conn, tabela):
+    """Retorna {coluna: oculta} a partir de PRAGMA table_xinfo (2/3 = coluna gerada)."""
+    return {linha[1]: linha[6] for linha in conn.execute(f"PRAGMA table_xinfo({tabela})")}
+
+
+def garantir_coluna_gerada(conn, tabela, coluna, tipo, expressao):
+    """
+    Acrescenta uma coluna gerada VIRTUAL à tabela, se ainda não existir.
+
+    Colunas VIRTUAL não ocupam espaço nem exigem reescrever a tabela; o valor é
+    calculado na leitura e pode ser indexado.
+    """
+    if coluna in colunas_da_tabela(conn, tabela):
+        return False
+    conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo} GENERATED ALWAYS AS ({expressao}) VIRTUAL")
+    return True
+
+
+def recriar_com_coluna_gerada(conn, tabela, sql_criacao, coluna):
+    """
+    Recria a tabela quando ``coluna`` ainda é uma coluna comum e o novo
+    esquema (``sql_criacao``) a define como gerada. Os dados são copiados em
+    uma única transação; a coluna passa a ser calculada pelo SQLite.
+    """
+    colunas = colunas_da_tabela(conn, tabela)
+    if coluna not in colunas or colunas[coluna] in (2, 3):
+        return False
+
+    temporaria = f"{tabela}_antiga"
+    with conn:
+        # DDL não abre transação implícita no sqlite3; BEGIN explícito torna a troca atômica
+        conn.execute("BEGIN")
+        conn.execute(f"ALTER TABLE {tabela} RENAME TO {temporaria}")
+        conn.execute(sql_criacao)
+        novas = colunas_da_tabela(conn, tabela)
+        copiar = [c for c, oculta in novas.items() if oculta == 0 and c in colunas]
+        lista = ", ".join(copiar)
+        conn.execute(f"INSERT INTO {tabela} ({lista}) SELECT {lista} FROM {temporaria}")
+        conn.execute(f"DROP TABLE {temporaria}")
+    logging.info("Tabela '%s' recriada com '%s' como coluna gerada.", tabela, coluna)
+    return True
+
+
+def dia_hoje():
+    """Dias desde 1970-01-01 até hoje, na mesma escala das colunas geradas ``*_dia``."""
+    return date.today().toordinal() - date(1970, 1, 1).toordinal()
+
+
+def expressao_dia(coluna):
+    """Expressão SQL (determinística) com os dias desde 1970-01-01 de uma data ISO."""
+    return f"CAST(julianday({coluna}) - {EPOCA_JULIANA} AS INTEGER)"
+
+
+def registros_para_sql(df, colunas):
+    """
+    Converte um DataFrame em tuplas na ordem de ``colunas`` para ``executemany``.
+
+    Colunas ausentes viram NULL, NaN/NaT viram None e datas viram texto ISO, de
+    modo que todos os valores sejam tipos aceitos pelo sqlite3.
+    """
+    tabela = df.reindex(columns=colunas)
+    for coluna in tabela.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        tabela[coluna] = tabela[coluna].dt.strftime("%Y-%m-%d")
+    tabela = tabela.astype(object)
+    tabela = tabela.where(tabela.notna(), None)
+    return list(tabela.itertuples(index=False, name=None))
@@ -0,0 +1,513 @@
+"""
+Resolução de entidades entre os bancos das divisões: unidades (OMs) e fornecedores.
+
+A mesma OM aparece com grafias diferentes em cada fonte (``nome_unidade_gestora``
+no CPGF, ``orgao_responsavel`` no PNCP, ``orgao_contratante_resumido`` nos
+contratos, ``sigla_om``/``nome_om`` em ``organizacoes_militares`` e
+``Sigla``/``Nome`` em ``organizacoes.json``), e o mesmo fornecedor aparece com
+razões sociais e documentos diferentes (filiais, CNPJ mascarado, "LTDA"/"ME").
+Aqui cada (fonte, código, nome) é resolvido uma única vez e o resultado fica
+gravado no banco do planejamento:
+
+* ``mapa_unidades``: código/nome de origem -> ``cod_siafi``;
+* ``mapa_fornecedores``: documento/nome de origem -> raiz do CNPJ;
+* ``fornecedores_canonicos``: raiz do CNPJ -> nome canônico.
+
+Com os mapas, os cruzamentos (views de ``database.federacao``) passam a ser
+junções exatas por chave.
+
+A resolução segue do mais barato ao mais caro: código conhecido, nome
+normalizado idêntico (acentos, pontuação, abreviações e sufixos societários
+removidos), sigla contida no nome e, por fim, similaridade de trigramas. Para
+não comparar cada nome com todos os candidatos, o índice invertido de
+trigramas é consultado com filtragem por prefixo: um candidato com
+similaridade (Dice) >= ``t`` compartilha pelo menos ``t*n/(2-t)`` dos ``n``
+trigramas do nome, então basta percorrer as listas dos trigramas mais raros
+do nome — nenhum candidato acima do limiar fica de fora.
+
+Mapeamentos com ``metodo = 'manual'`` nunca são sobrescritos.
+"""
+
+import logging
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import chain
+
+from database.federacao import conectar_federado
+from database.tracing import span
+from paths import CCIMAR11_PATH, ORGANIZACOES_FILE, document_store
+
+TABELA_MAPA_UNIDADES = "mapa_unidades"
+TABELA_MAPA_FORNECEDORES = "mapa_fornecedores"
+TABELA_FORNECEDORES = "fornecedores_canonicos"
+
+COLUNAS_MAPA_UNIDADES = {
+    "origem": "TEXT NOT NULL",
+    "codigo_origem": "TEXT NOT NULL",
+    "nome_origem": "TEXT NOT NULL",
+    "cod_siafi": "INTEGER",
+    "sigla_om": "TEXT",
+    "similaridade": "REAL",
+    "metodo": "TEXT",
+    "aceito": "INTEGER",
+    "atualizado_em": "TEXT",
+}
+
+COLUNAS_MAPA_FORNECEDORES = {
+    "origem": "TEXT NOT NULL",
+    "documento": "TEXT NOT NULL",
+    "nome_origem": "TEXT NOT NULL",
+    "cnpj_raiz": "TEXT",
+    "similaridade": "REAL",
+    "metodo": "TEXT",
+    "aceito": "INTEGER",
+    "atualizado_em": "TEXT",
+}
+
+COLUNAS_FORNECEDORES = {
+    "cnpj_raiz": "TEXT PRIMARY KEY",
+    "nome_canonico": "TEXT",
+    "qtd_documentos": "INTEGER",
+    "qtd_nomes": "INTEGER",
+    "atualizado_em": "TEXT",
+}
+
+# Fontes de unidades: origem -> (tabela "esquema.tabela", coluna do código, coluna do nome)
+FONTES_UNIDADES = {
+    "cpgf": ("cartao.tabela_cartao_corporativo", "cod_unidade_gestora", "nome_unidade_gestora"),
+    "pncp": ("pncp.pncp_itens", "uasg", "orgao_responsavel"),
+    "contratos": ("auditoria.ccimar10_db", "codigo_uasg", "orgao_contratante_resumido"),
+}
+
+# Fontes de fornecedores: origem -> (tabela "esquema.tabela", coluna do documento, coluna do nome)
+FONTES_FORNECEDORES = {
+    "cpgf": ("cartao.tabela_cartao_corporativo", "cnpj_cpf_favorecido", "nome_favorecido"),
+    "pncp": ("pncp.pncp_itens", "cnpj", "empresa"),
+    "contratos": ("auditoria.ccimar10_db", "cnpj_cpf_idgener", "nome_fornecedor"),
+}
+
+# Similaridade mínima para aceitar uma correspondência sem revisão
+LIMIAR_ACEITE = 0.8
+# Abaixo deste valor o melhor candidato nem é gravado como sugestão
+LIMIAR_SUGESTAO = 0.7
+# Diferença mínima entre o melhor e o segundo candidato (entidades diferentes)
+MARGEM_AMBIGUIDADE = 0.03
+
+PALAVRAS_VAZIAS = frozenset({"A", "O", "AS", "OS", "DA", "DE", "DO", "DAS", "DOS", "E", "EM", "NA", "NO", "NAS", "NOS"})
+
+ABREVIACOES_OM = {
+    "CTRO": "CENTRO", "CENT": "CENTRO", "CMDO": "COMANDO", "COM": "COMANDO", "COMDO": "COMANDO",
+    "DIR": "DIRETORIA", "DIRET": "DIRETORIA", "HOSP": "HOSPITAL", "NAV": "NAVAL", "MAR": "MARINHA",
+    "MB": "MARINHA", "INTEND": "INTENDENCIA", "INT": "INTENDENCIA", "DIST": "DISTRITO", "DN": "DISTRITO NAVAL",
+    "ESC": "ESCOLA", "GRUP": "GRUPAMENTO", "GPTO": "GRUPAMENTO", "ADM": "ADMINISTRACAO", "SERV": "SERVICO",
+    "FUZ": "FUZILEIROS", "CFN": "CORPO FUZILEIROS NAVAIS", "CIA": "COMPANHIA", "ABAST": "ABASTECIMENTO",
+    "OBT": "OBTENCAO", "ARS": "ARSENAL", "BTL": "BATALHAO", "CAP": "CAPITANIA", "POL": "POLICLINICA",
+}
+
+ABREVIACOES_FORNECEDOR = {
+    "COM": "COMERCIO", "COML": "COMERCIAL", "IND": "INDUSTRIA", "INDL": "INDUSTRIAL", "SERV": "SERVICOS",
+    "SERVS": "SERVICOS", "DISTR": "DISTRIBUIDORA", "DIST": "DISTRIBUIDORA", "CIA": "COMPANHIA",
+    "PROD": "PRODUTOS", "EQUIP": "EQUIPAMENTOS", "MAT": "MATERIAIS", "TEC": "TECNOLOGIA",
+    "ENG": "ENGENHARIA", "CONST": "CONSTRUCOES", "REPRES": "REPRESENTACOES", "EMP": "EMPREENDIMENTOS",
+}
+
+# Sufixos societários descartados na comparação de fornecedores
+SUFIXOS_SOCIETARIOS = frozenset({"LTDA", "LTD", "ME", "EPP", "MEI", "EIRELI", "SA", "SS", "SLU"})
+
+# Uma resolução por vez (importações seguidas não disparam execuções concorrentes)
+_resolucao_lock = threading.Lock()
+
+
+def normalizar_nome(texto, abreviacoes=None, descartar=PALAVRAS_VAZIAS):
+    """
+    Normaliza um nome para comparação: maiúsculas, sem acentos nem pontuação.
+
+    Ordinais ("1º DN") viram o número, abreviações são expandidas e as
+    palavras de ``descartar`` são removidas.
+    """
+    if texto is None:
+        return ""
+    texto = re.sub(r"(\d+)\s*[ºª°]", r"\1", str(texto))
+    texto = unicodedata.normalize("NFKD", texto)
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).upper()
+    # "S/A", "S.A." e "S A" são o mesmo sufixo
+    texto = re.sub(r"\bS\s*[/.]?\s*A\b\.?", " SA ", texto)
+    palavras = []
+    for palavra in re.sub(r"[^A-Z0-9]+", " ", texto).split():
+        for parte in (abreviacoes or {}).get(palavra, palavra).split():
+            if parte not in descartar:
+                palavras.append(parte)
+    return " ".join(palavras)
+
+
+def normalizar_om(texto):
+    return normalizar_nome(texto, ABREVIACOES_OM)
+
+
+def normalizar_fornecedor(texto):
+    return normalizar_nome(texto, ABREVIACOES_FORNECEDOR, PALAVRAS_VAZIAS | SUFIXOS_SOCIETARIOS)
+
+
+def somente_digitos(documento):
+    return re.sub(r"\D", "", str(documento)) if documento is not None else ""
+
+
+def trigramas(texto):
+    """Trigramas de cada palavra com as bordas marcadas (dois espaços antes, um depois)."""
+    grams = set()
+    for palavra in texto.split():
+        palavra = f"  {palavra} "
+        grams.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return frozenset(grams)
+
+
+def similaridade(a, b):
+    """Coeficiente de Dice entre dois conjuntos de trigramas (0 a 1)."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para encontrar os nomes parecidos sem comparar todos os pares.
+
+    Cada nome indexado pertence a uma chave (ex.: ``cod_siafi``); uma chave
+    pode ter vários nomes (sigla, nome completo, grafias já vistas).
+    """
+
+    def __init__(self):
+        self.chaves = []
+        self.grams = []
+        self.listas = defaultdict(list)
+        self.exatos = defaultdict(set)
+
+    def __len__(self):
+        return len(self.chaves)
+
+    def adicionar(self, chave, nome_normalizado):
+        if not nome_normalizado or chave in self.exatos.get(nome_normalizado, ()):
+            return
+        self.exatos[nome_normalizado].add(chave)
+        grams = trigramas(nome_normalizado)
+        posicao = len(self.chaves)
+        self.chaves.append(chave)
+        self.grams.append(grams)
+        for gram in grams:
+            self.listas[gram].append(posicao)
+
+    def candidatos(self, nome_normalizado, limiar=LIMIAR_SUGESTAO):
+        """
+        Retorna [(similaridade, chave)] dos nomes com Dice >= ``limiar``, do mais parecido ao menos.
+
+        Só as listas dos trigramas mais raros do nome são percorridas
+        (filtragem por prefixo), contando em quantas delas cada nome
+        indexado aparece. Um nome só é pontuado com os trigramas completos se
+        ainda puder atingir o limiar somando os trigramas fora do prefixo.
+        Cada chave aparece uma vez, com a maior similaridade entre os seus nomes.
+        """
+        grams = trigramas(nome_normalizado)
+        if not grams:
+            return []
+        minimo_comum = math.ceil(limiar * len(grams) / (2 - limiar))
+        ordem = sorted(grams, key=lambda gram: len(self.listas.get(gram, ())))
+        tamanho_prefixo = len(grams) - minimo_comum + 1
+        contagem = Counter(chain.from_iterable(self.listas.get(gram, ()) for gram in ordem[:tamanho_prefixo]))
+        fora_do_prefixo = len(grams) - tamanho_prefixo
+
+        melhores = {}
+        for posicao, comuns in contagem.items():
+            candidato = self.grams[posicao]
+            # Limite superior do Dice com todos os trigramas fora do prefixo em comum
+            if 2 * (comuns + fora_do_prefixo) < limiar * (len(grams) + len(candidato)):
+                continue
+            valor = similaridade(grams, candidato)
+            chave = self.chaves[posicao]
+            if valor >= limiar and valor > melhores.get(chave, 0):
+                melhores[chave] = valor
+        return sorted(((valor, chave) for chave, valor in melhores.items()), key=lambda par: -par[0])
+
+
+def resolver_nome(indice, nome_normalizado, siglas=None):
+    """
+    Resolve um nome normalizado contra o índice.
+
+    :param siglas: {sigla normalizada: chave}; uma sigla que aparece como
+        palavra do nome identifica a entidade.
+    :return: (chave, similaridade, metodo, aceito); chave None sem candidato.
+    """
+    exatos = indice.exatos.get(nome_normalizado, set())
+    if len(exatos) == 1:
+        return next(iter(exatos)), 1.0, "exato", 1
+    if siglas:
+        encontradas = {siglas[palavra] for palavra in nome_normalizado.split() if palavra in siglas}
+        if len(encontradas) == 1:
+            return next(iter(encontradas)), 0.95, "sigla", 1
+
+    candidatos = indice.candidatos(nome_normalizado)
+    if not candidatos:
+        return None, None, "sem_correspondencia", 0
+    valor, chave = candidatos[0]
+    ambiguo = len(exatos) > 1 or (len(candidatos) > 1 and valor - candidatos[1][0] < MARGEM_AMBIGUIDADE)
+    aceito = int(valor >= LIMIAR_ACEITE and not ambiguo)
+    return chave, round(valor, 4), "similaridade" if aceito else "revisao", aceito
+
+
+def criar_tabelas_resolucao(conn, esquema="main"):
+    for tabela, colunas, chave in (
+        (TABELA_MAPA_UNIDADES, COLUNAS_MAPA_UNIDADES, "origem, codigo_origem, nome_origem"),
+        (TABELA_MAPA_FORNECEDORES, COLUNAS_MAPA_FORNECEDORES, "origem, documento, nome_origem"),
+        (TABELA_FORNECEDORES, COLUNAS_FORNECEDORES, None),
+    ):
+        definicao = ",\n    ".join(f"{nome} {tipo}" for nome, tipo in colunas.items())
+        if chave:
+            definicao += f",\n    PRIMARY KEY ({chave})"
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {esquema}.{tabela} (\n    {definicao}\n)")
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS {esquema}.idx_{TABELA_MAPA_UNIDADES}_codigo "
+        f"ON {TABELA_MAPA_UNIDADES} (origem, codigo_origem, aceito)"
+    )
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS {esquema}.idx_{TABELA_MAPA_FORNECEDORES}_documento "
+        f"ON {TABELA_MAPA_FORNECEDORES} (origem, documento, aceito)"
+    )
+
+
+def _gravar_mapa(conn, esquema, tabela, colunas, chave, linhas):
+    """Upsert dos mapeamentos; linhas com ``metodo = 'manual'`` são preservadas."""
+    campos = list(colunas)
+    atualizacao = ", ".join(f"{c} = excluded.{c}" for c in campos if c not in chave)
+    conn.executemany(
+        f"INSERT INTO {esquema}.{tabela} ({', '.join(campos)}) VALUES ({', '.join('?' * len(campos))}) "
+        f"ON CONFLICT ({', '.join(chave)}) DO UPDATE SET {atualizacao} WHERE metodo IS NOT 'manual'",
+        linhas,
+    )
+
+
+def _pendentes(conn, esquema, tabela_mapa, chave, fontes, tabelas, forcar):
+    """(origem, código/documento, nome) distintos das fontes ainda sem mapeamento."""
+    pendentes = []
+    for origem, (tabela, coluna_codigo, coluna_nome) in fontes.items():
+        if tabela not in tabelas:
+            continue
+        nome_esquema, nome_tabela = tabela.split(".")
+        filtro = "" if forcar else (
+            f"AND NOT EXISTS (SELECT 1 FROM {esquema}.{tabela_mapa} m WHERE m.origem = ? "
+            f"AND m.{chave[1]} = CAST(f.{coluna_codigo} AS TEXT) AND m.nome_origem = f.{coluna_nome})"
+        )
+        linhas = conn.execute(
+            f"""
+            SELECT DISTINCT CAST(f.{coluna_codigo} AS TEXT), f.{coluna_nome}
+            FROM {conn.esquemas[nome_esquema]}.{nome_tabela} f
+            WHERE f.{coluna_codigo} IS NOT NULL AND f.{coluna_nome} IS NOT NULL {filtro}
+            """,
+            () if forcar else (origem,),
+        ).fetchall()
+        pendentes.extend((origem, codigo, nome) for codigo, nome in linhas)
+    return pendentes
+
+
+def _tabelas_anexadas(conn):
+    return {
+        f"{nome}.{tabela}"
+        for nome, esquema in conn.esquemas.items()
+        for (tabela,) in conn.execute(f"SELECT name FROM {esquema}.sqlite_master WHERE type = 'table'")
+    }
+
+
+def organizacoes_selecionaveis():
+    """Lista ``organizacoes`` de organizacoes.json (leia na thread da interface: o document_store observa o arquivo)."""
+    return document_store.get(ORGANIZACOES_FILE, {}).get("organizacoes", [])
+
+
+def _dimensao_om(conn, tabelas, organizacoes=None):
+    """Retorna ({cod_siafi: sigla}, índice de nomes, {sigla normalizada: cod_siafi})."""
+    siglas_por_codigo = {}
+    nomes = []
+    if "planejamento.organizacoes_militares" in tabelas:
+        esquema = conn.esquemas["planejamento"]
+        for cod_siafi, sigla, nome in conn.execute(
+            f"SELECT cod_siafi, sigla_om, nome_om FROM {esquema}.organizacoes_militares"
+        ):
+            siglas_por_codigo[int(cod_siafi)] = sigla
+            nomes.append((int(cod_siafi), sigla, nome))
+    # organizacoes.json (seleção de OM) completa a dimensão com as UASGs que faltarem
+    for org in organizacoes_selecionaveis() if organizacoes is None else organizacoes:
+        codigo = somente_digitos(org.get("UASG"))
+        if codigo:
+            siglas_por_codigo.setdefault(int(codigo), org.get("Sigla"))
+            nomes.append((int(codigo), org.get("Sigla"), org.get("Nome")))
+
+    indice = IndiceTrigramas()
+    siglas = defaultdict(set)
+    for codigo, sigla, nome in nomes:
+        indice.adicionar(codigo, normalizar_om(nome))
+        sigla_normalizada = normalizar_nome(sigla)
+        if sigla_normalizada:
+            indice.adicionar(codigo, sigla_normalizada)
+            siglas[sigla_normalizada].add(codigo)
+    # Siglas repetidas entre OMs diferentes não identificam a unidade
+    unicas = {sigla: next(iter(codigos)) for sigla, codigos in siglas.items() if len(codigos) == 1 and len(sigla) >= 3}
+    return siglas_por_codigo, indice, unicas
+
+
+def resolver_unidades(conn, esquema="main", forcar=False, organizacoes=None):
+    """
+    Grava em ``mapa_unidades`` o ``cod_siafi`` de cada (origem, código, nome) de unidade.
+
+    Um código que já é um ``cod_siafi``/UASG conhecido é aceito direto; os
+    demais são resolvidos pelo nome. ``organizacoes`` (lista de
+    organizacoes.json) evita ler o arquivo aqui; sem ela, é lida do
+    document_store. Retorna a quantidade de linhas gravadas.
+    """
+    tabelas = _tabelas_anexadas(conn)
+    pendentes = _pendentes(
+        conn, esquema, TABELA_MAPA_UNIDADES, ("origem", "codigo_origem"), FONTES_UNIDADES, tabelas, forcar
+    )
+    if not pendentes:
+        return 0
+    siglas_por_codigo, indice, siglas = _dimensao_om(conn, tabelas, organizacoes)
+    atualizado_em = datetime.now().isoformat(timespec="seconds")
+    resolvidos = {}
+    linhas = []
+    for origem, codigo, nome in pendentes:
+        digitos = somente_digitos(codigo)
+        if digitos and int(digitos) in siglas_por_codigo:
+            cod_siafi, valor, metodo, aceito = int(digitos), 1.0, "codigo", 1
+        else:
+            normalizado = normalizar_om(nome)
+            if normalizado not in resolvidos:
+                resolvidos[normalizado] = resolver_nome(indice, normalizado, siglas)
+            cod_siafi, valor, metodo, aceito = resolvidos[normalizado]
+        linhas.append((
+            origem, codigo, nome, cod_siafi, siglas_por_codigo.get(cod_siafi), valor, metodo, aceito, atualizado_em,
+        ))
+    _gravar_mapa(
+        conn, esquema, TABELA_MAPA_UNIDADES, COLUNAS_MAPA_UNIDADES, ("origem", "codigo_origem", "nome_origem"), linhas,
+    )
+    return len(linhas)
+
+
+def resolver_fornecedores(conn, esquema="main", forcar=False):
+    """
+    Grava ``fornecedores_canonicos`` (raiz do CNPJ) e o ``mapa_fornecedores`` de cada fonte.
+
+    Documentos com CNPJ válido (14 dígitos) vão direto para a raiz (filiais
+    de uma mesma empresa se juntam); CPFs ficam sem fornecedor canônico; os
+    demais (CNPJ mascarado ou vazio) são resolvidos pelo nome contra as
+    razões sociais já associadas a uma raiz. Retorna a quantidade de linhas
+    gravadas no mapa.
+    """
+    tabelas = _tabelas_anexadas(conn)
+    atualizado_em = datetime.now().isoformat(timespec="seconds")
+
+    # Fornecedores canônicos: todas as razões sociais vistas para cada raiz de CNPJ
+    nomes_por_raiz = defaultdict(Counter)
+    documentos_por_raiz = defaultdict(set)
+    for tabela, coluna_documento, coluna_nome in FONTES_FORNECEDORES.values():
+        if tabela not in tabelas:
+            continue
+        nome_esquema, nome_tabela = tabela.split(".")
+        for documento, nome, quantidade in conn.execute(
+            f"SELECT {coluna_documento}, {coluna_nome}, COUNT(*) FROM {conn.esquemas[nome_esquema]}.{nome_tabela} "
+            f"WHERE {coluna_documento} IS NOT NULL AND {coluna_nome} IS NOT NULL GROUP BY 1, 2"
+        ):
+            digitos = somente_digitos(documento)
+            if len(digitos) == 14:
+                nomes_por_raiz[digitos[:8]][str(nome).strip()] += quantidade
+                documentos_por_raiz[digitos[:8]].add(digitos)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {esquema}.{TABELA_FORNECEDORES} ({', '.join(COLUNAS_FORNECEDORES)}) VALUES (?, ?, ?, ?, ?)",
+        [
+            (raiz, nomes.most_common(1)[0][0], len(documentos_por_raiz[raiz]), len(nomes), atualizado_em)
+            for raiz, nomes in nomes_por_raiz.items()
+        ],
+    )
+
+    pendentes = _pendentes(
+        conn, esquema, TABELA_MAPA_FORNECEDORES, ("origem", "documento"), FONTES_FORNECEDORES, tabelas, forcar
+    )
+    if not pendentes:
+        return 0
+    indice = IndiceTrigramas()
+    for raiz, nomes in nomes_por_raiz.items():
+        for normalizado in {normalizar_fornecedor(nome) for nome in nomes}:
+            indice.adicionar(raiz, normalizado)
+
+    resolvidos = {}
+    linhas = []
+    for origem, documento, nome in pendentes:
+        digitos = somente_digitos(documento)
+        if len(digitos) == 14:
+            raiz, valor, metodo, aceito = digitos[:8], 1.0, "cnpj", 1
+        elif len(digitos) == 11:
+            raiz, valor, metodo, aceito = None, None, "cpf", 0
+        else:
+            normalizado = normalizar_fornecedor(nome)
+            if normalizado not in resolvidos:
+                resolvidos[normalizado] = resolver_nome(indice, normalizado)
+            raiz, valor, metodo, aceito = resolvidos[normalizado]
+        linhas.append((origem, documento, nome, raiz, valor, metodo, aceito, atualizado_em))
+    _gravar_mapa(
+        conn, esquema, TABELA_MAPA_FORNECEDORES, COLUNAS_MAPA_FORNECEDORES, ("origem", "documento", "nome_origem"), linhas,
+    )
+    return len(linhas)
+
+
+def executar_resolucao(principal=CCIMAR11_PATH, forcar=False, organizacoes=None):
+    """
+    Resolve unidades e fornecedores de todas as fontes anexadas e grava os mapas no banco ``principal``.
+
+    Sem ``forcar``, só os (origem, código, nome) ainda não mapeados são
+    resolvidos. Retorna {"unidades": n, "fornecedores": n}.
+    """
+    with span("resolver_entidades", "analise", detail="completa" if forcar else "incremental") as info:
+        conn = conectar_federado(principal, somente_leitura=False)
+        try:
+            with conn:
+                criar_tabelas_resolucao(conn)
+                resultado = {
+                    "unidades": resolver_unidades(conn, forcar=forcar, organizacoes=organizacoes),
+                    "fornecedores": resolver_fornecedores(conn, forcar=forcar),
+                }
+        finally:
+            conn.close()
+        info["rows"] = sum(resultado.values())
+    return resultado
+
+
+def iniciar_resolucao(principal=CCIMAR11_PATH, forcar=False, ao_terminar=None):
+    """
+    Executa ``executar_resolucao`` em uma thread de fundo.
+
+    ``ao_terminar(resultado)`` é chamado na thread de fundo ao final (use um
+    sinal Qt para voltar à interface). Se já houver uma resolução em
+    andamento, não inicia outra e retorna None.
+
+    organizacoes.json é lido aqui, na thread que chama (a da interface), e
+    entregue pronto à thread de fundo: o document_store usa um
+    QFileSystemWatcher, que não pode ser acionado fora da thread da interface.
+    """
+    if not _resolucao_lock.acquire(blocking=False):
+        return None
+    organizacoes = organizacoes_selecionaveis()
+
+    def executar():
+        try:
+            resultado = executar_resolucao(principal, forcar, organizacoes)
+        except sqlite3.Error as e:
+            logging.warning("Resolução de entidades não concluída: %s", e)
+            return
+        finally:
+            _resolucao_lock.release()
+        if ao_terminar is not None:
+            ao_terminar(resultado)
+
+    thread = threading.Thread(target=executar, name="resolucao-entidades", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,207 @@
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+# Arquivos cujo frame não identifica o ponto de chamada (camada de infraestrutura)
+_INTERNAL_FILES = {os.path.normcase(os.path.abspath(__file__))}
+
+
+def register_internal_module(path):
+    """Marca um arquivo como infraestrutura para que o tag aponte para quem o chamou."""
+    _INTERNAL_FILES.add(os.path.normcase(os.path.abspath(path)))
+
+
+def call_site_tag():
+    """
+    Identifica o primeiro frame fora da camada de banco/instrumentação.
+
+    :return: String no formato "modulo.funcao:linha".
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.normcase(os.path.abspath(frame.f_code.co_filename))
+        if filename not in _INTERNAL_FILES and not filename.endswith("contextlib.py"):
+            module = frame.f_globals.get("__name__", "?")
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+class QueryTracer:
+    """
+    Registro central de operações cronometradas (consultas SQL, importações,
+    cálculos, renderizações, chamadas à LLM e travamentos da interface).
+
+    Os registros ficam em um buffer circular em memória e podem ser
+    replicados em um log rotativo e/ou em uma tabela SQLite.
+    """
+
+    def __init__(self, capacity=2000, slow_ms=200.0):
+        self.records = deque(maxlen=capacity)
+        self.slow_ms = slow_ms
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("ccimar360.trace")
+        self._log_handler = None
+        self._trace_db_path = None
+        self._pending_rows = []
+        self._flush_every = 50
+
+    # ====== DESTINOS ======
+    def enable_log(self, log_path, max_bytes=2_000_000, backup_count=3):
+        """Grava cada operação em um arquivo de log rotativo."""
+        self.disable_log()
+        os.makedirs(os.path.dirname(str(log_path)) or ".", exist_ok=True)
+        handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+        self._logger.addHandler(handler)
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._log_handler = handler
+
+    def disable_log(self):
+        if self._log_handler:
+            self._logger.removeHandler(self._log_handler)
+            self._log_handler.close()
+            self._log_handler = None
+
+    def enable_trace_table(self, db_path):
+        """Persiste as operações na tabela 'trace_operacoes' do banco informado."""
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS trace_operacoes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    momento TEXT,
+                    categoria TEXT,
+                    tag TEXT,
+                    duracao_ms REAL,
+                    linhas INTEGER,
+                    detalhe TEXT
+                )
+            """)
+        self._trace_db_path = db_path
+
+    def flush(self):
+        """Grava na tabela de trace os registros ainda pendentes."""
+        with self._lock:
+            rows, self._pending_rows = self._pending_rows, []
+        if not rows or not self._trace_db_path:
+            return
+        try:
+            with sqlite3.connect(self._trace_db_path) as conn:
+                conn.executemany(
+                    "INSERT INTO trace_operacoes (momento, categoria, tag, duracao_ms, linhas, detalhe) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Falha ao gravar a tabela de trace em {self._trace_db_path}: {e}")
+
+    # ====== REGISTRO ======
+    def record(self, category, tag, duration_ms, rows=None, detail=None, stack=None):
+        """
+        Registra uma operação concluída.
+
+        :param category: Tipo da operação (sql, import, scoring, render, llm, stall...).
+        :param tag: Identificação do ponto de chamada ou nome da operação.
+        :param duration_ms: Duração em milissegundos.
+        :param rows: Linhas retornadas/afetadas, quando aplicável.
+        :param detail: Texto livre (ex.: a consulta SQL).
+        :param stack: Amostra de pilha (usada pelo detector de travamentos).
+        """
+        if not self.enabled:
+            return
+        entry = {
+            "timestamp": datetime.now(),
+            "category": category,
+            "tag": tag,
+            "duration_ms": duration_ms,
+            "rows": rows,
+            "detail": detail,
+            "stack": stack,
+        }
+        flush_needed = False
+        with self._lock:
+            self.records.append(entry)
+            if self._trace_db_path:
+                self._pending_rows.append((
+                    entry["timestamp"].isoformat(timespec="milliseconds"), category, tag,
+                    round(duration_ms, 3), rows, detail if stack is None else f"{detail or ''}\n{stack}",
+                ))
+                flush_needed = len(self._pending_rows) >= self._flush_every
+
+        if self._log_handler:
+            self._logger.info(f"[{category}] {tag} {duration_ms:.1f} ms rows={rows} {_compact(detail)}")
+        if duration_ms >= self.slow_ms and category != "stall":
+            logging.warning(f"Operação lenta ({duration_ms:.0f} ms) [{category}] {tag}")
+        if flush_needed:
+            self.flush()
+
+    @contextmanager
+    def span(self, name, category="span", detail=None):
+        """
+        Cronometra um bloco de código.
+
+        Uso:
+            with tracer.span("importar_cpgf", "import"):
+                ...
+        O objeto retornado aceita ``info["rows"] = n`` para informar o volume processado.
+        """
+        info = {"rows": None, "detail": detail}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(category, name, (time.perf_counter() - start) * 1000, info["rows"], info["detail"])
+
+    def traced(self, category, name=None):
+        """Decorator equivalente a ``span`` para funções e métodos."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ====== CONSULTA ======
+    def snapshot(self, category=None):
+        with self._lock:
+            records = list(self.records)
+        if category:
+            records = [r for r in records if r["category"] == category]
+        return records
+
+    def top_slow(self, limit=50, category=None):
+        """Retorna as operações mais lentas do buffer, da mais lenta para a mais rápida."""
+        return sorted(self.snapshot(category), key=lambda r: r["duration_ms"], reverse=True)[:limit]
+
+    def categories(self):
+        return sorted({r["category"] for r in self.snapshot()})
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+
+def _compact(text, limit=300):
+    if not text:
+        return ""
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+# Instância compartilhada por toda a aplicação
+tracer = QueryTracer()
+span = tracer.span
+traced = tracer.traced
@@ -4,18 +4,30 @@ from PyQt6.QtCore import *
 from paths import *
 from pathlib import Path
 from utils.icon_loader import load_icons
-from assets.styles.styles import get_menu_button_style, get_menu_button_activated_style
+from assets.styles.theme import apply_theme, set_variant, set_state
 from modules.widgets import *
 from config.config_widget import ConfigManager
+from paths.config_path import load_config
+from database.tracing import tracer
+from database.backup import iniciar_backups_periodicos
+from database.federacao import criar_indices_federacao
+from config.config_Responsaveis.edit_responsaveis import criar_tabela_agentes_responsaveis
+from config.config_Setores.database import migrar_itens_pncp
+from utils.stall_detector import StallDetector
+from utils.diagnostics_panel import DiagnosticsPanel
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        apply_theme()
         self.icons = load_icons()
         self.buttons = {}
         self.active_button = None
         self.inicio_widget = None
         self.setup_ui()
+        self.setup_diagnostics()
+        self.setup_migrations()
+        self.setup_backups()
         self.open_initial_page()
 
     # ====== SETUP DA INTERFACE ======
@@ -52,13 +64,7 @@ class MainWindow(QMainWindow):
 
         # Tooltip personalizado
         self.tooltip_label = QLabel("", self)
-        self.tooltip_label.setStyleSheet("""
-            background-color: #13141F;
-            color: white;
-            border: 1px solid #8AB4F7;
-            padding: 4px;
-            border-radius: 4px;
-        """)
+        self.tooltip_label.setObjectName("menuTooltip")
         self.tooltip_label.setFont(QFont("Arial", 12))
         self.tooltip_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.tooltip_label.setVisible(False)  # Inicialmente oculto
@@ -99,7 +105,7 @@ class MainWindow(QMainWindow):
         # Cria um widget para o menu e adiciona o layout
         self.menu_widget = QWidget()
         self.menu_widget.setLayout(self.menu_layout)
-        self.menu_widget.setStyleSheet("background-color: #13141F;")
+        self.menu_widget.setObjectName("sideMenu")
 
         self.central_layout.addWidget(self.menu_widget)
             
@@ -152,16 +158,7 @@ class MainWindow(QMainWindow):
         self.toggle_button.setIconSize(QSize(30, 30))
         self.toggle_button.setFixedSize(40, 40)
         self.toggle_button.setCursor(Qt.CursorShape.PointingHandCursor) 
-
-        self.toggle_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(0, 0, 0, 100);
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 50);
-            }
-        """)
+        self.toggle_button.setObjectName("menuToggle")
         self.toggle_button.clicked.connect(self.toggle_menu)
 
         # Posicionar o botão dinamicamente ao iniciar e ao redimensionar a janela
@@ -186,7 +183,7 @@ class MainWindow(QMainWindow):
         button = QPushButton()
         button.setIcon(self.icons[icon_key])  # Ícone padrão
         button.setIconSize(QSize(30, 30))
-        button.setStyleSheet(get_menu_button_style())
+        set_variant(button, "menuButton", active=False)
         button.setCursor(Qt.CursorShape.PointingHandCursor)
         button.setFixedSize(50, 50)
 
@@ -226,13 +223,47 @@ class MainWindow(QMainWindow):
         # Reseta o estilo do botão anteriormente ativo
         if self.active_button and self.active_button != button:
             self.active_button.setIcon(self.active_button.default_icon)
-            self.active_button.setStyleSheet(get_menu_button_style())
+            set_state(self.active_button, active=False)
 
-        # Aplica o estilo de botão ativo
+        # Aplica o estilo de botão ativo (propriedade dinâmica, sem nova folha de estilo)
         button.setIcon(button.hover_icon)
-        button.setStyleSheet(get_menu_button_activated_style())
+        set_state(button, active=True)
         self.active_button = button 
 
+    # ====== DIAGNÓSTICO ======
+    def setup_diagnostics(self):
+        """Configura a instrumentação de desempenho e o atalho oculto do painel de diagnóstico."""
+        if load_config("trace_log", False):
+            tracer.enable_log(DATABASE_DIR / "logs" / "trace.log")
+        if load_config("trace_table", False):
+            tracer.enable_trace_table(SQL_DIR / "trace.db")
+
+        self.stall_detector = StallDetector(threshold_ms=load_config("stall_threshold_ms", 250), parent=self)
+        self.stall_detector.start()
+
+        self.diagnostics_panel = None
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.show_diagnostics_panel)
+
+    def setup_migrations(self):
+        """Ajustes de esquema executados uma vez na abertura (índices federados, tabelas de controle, itens do PNCP)."""
+        criar_indices_federacao()
+        criar_tabela_agentes_responsaveis()
+        migrar_itens_pncp()
+
+    def setup_backups(self):
+        """Inicia em segundo plano o backup periódico dos bancos das divisões."""
+        if load_config("backup_enabled", True):
+            iniciar_backups_periodicos(intervalo_horas=load_config("backup_interval_hours", 24))
+
+    def show_diagnostics_panel(self):
+        """Exibe o painel com as operações mais lentas (não aparece no menu)."""
+        if self.diagnostics_panel is None:
+            self.diagnostics_panel = DiagnosticsPanel(self)
+        self.diagnostics_panel.refresh()
+        self.diagnostics_panel.show()
+        self.diagnostics_panel.raise_()
+
     # ====== MÓDULOS ======
     def _show_module(self, model_class, view_class, controller_class, path, module_name: str, button_key: str) -> None:
         """Ensure the model is properly instantiated before passing it."""
@@ -325,11 +356,6 @@ class MainWindow(QMainWindow):
         self.content_widget.setLayout(self.content_layout)
         self.content_widget.setMinimumSize(1400, 750)
         self.content_widget.setFrameStyle(QFrame.Shape.NoFrame)
-        self.content_widget.setStyleSheet("""
-            QFrame#contentWidget {
-                background-color: #181928;
-            }
-        """)
         self.central_layout.addWidget(self.content_widget)
 
     def clear_content_area(self, keep_image_label: bool = False) -> None:
@@ -348,12 +374,18 @@ class MainWindow(QMainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
         )
-        event.accept() if reply == QMessageBox.StandardButton.Yes else event.ignore()
+        if reply == QMessageBox.StandardButton.Yes:
+            self.stall_detector.stop()
+            tracer.flush()
+            event.accept()
+        else:
+            event.ignore()
                     
 if __name__ == "__main__":
     import sys
 
     app = QApplication(sys.argv)
+    apply_theme(app)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -6,6 +6,7 @@ from paths.base_path import API_KEY
 import openai
 import sqlite3
 import logging
+from database.federacao import conectar_federado, descrever_views
 from PyQt6.QtCore import Qt, pyqtSignal
 import re
 from utils.add_button import add_button_func
@@ -127,19 +128,22 @@ class ChatbotWidget(QFrame):
         layout.addLayout(self.export_buttons_layout)
 
     def get_database_metadata(self):
-        """Lê as tabelas e suas colunas no banco de dados."""
+        """Lê as tabelas e suas colunas no banco de dados, incluindo as views federadas."""
         metadata = {}
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with conectar_federado(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
                 tables = cursor.fetchall()
                 for table_name in tables:
                     table_name = table_name[0]
-                    cursor.execute(f"PRAGMA table_info({table_name})")
+                    # table_xinfo inclui as colunas geradas (ex.: valor_total_execucao_licitacao), omitidas por table_info
+                    cursor.execute(f"PRAGMA table_xinfo({table_name})")
                     columns = cursor.fetchall()
                     # Armazena os nomes das colunas com seus tipos, ex.: "cod_siafi (INTEGER)"
-                    metadata[table_name] = [f"{col[1]} ({col[2]})" for col in columns]
+                    metadata[table_name] = [f"{col[1]} ({col[2]})" for col in columns if col[6] != 1]
+                # Views que cruzam os bancos das divisões (OMs, cartão, contratos, PNCP)
+                metadata.update(descrever_views(conn))
         except sqlite3.Error as e:
             logging.error(f"Database error: {e}")
             return {}
@@ -379,7 +383,7 @@ class ChatbotWidget(QFrame):
             return f"R$ {formatted}"
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with conectar_federado(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(query)
                 rows = cursor.fetchall()
@@ -527,7 +531,7 @@ def export_xlsx(db_path, query, output_filename="export.xlsx"):
     Em seguida, abre o arquivo gerado.
     """
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conectar_federado(db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
@@ -555,7 +559,7 @@ def export_docx(db_path, query, output_filename="export.docx"):
     Em seguida, abre o arquivo gerado.
     """
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conectar_federado(db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
@@ -590,7 +594,7 @@ def export_pdf(db_path, query, output_filename="export.pdf"):
     Em seguida, abre o arquivo gerado.
     """
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conectar_federado(db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
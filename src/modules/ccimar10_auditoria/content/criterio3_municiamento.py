@@ -1,4 +1,4 @@
-import pandas as pd
+from utils.planilha_cache import ler_planilha
 from PyQt6.QtWidgets import QLabel, QFrame, QVBoxLayout, QPushButton, QLineEdit, QFileDialog, QMessageBox
 
 def create_criterio3_municiamento(title_text, database_model):
@@ -13,7 +13,7 @@ def create_criterio3_municiamento(title_text, database_model):
             file_path_input.setText(file_path)
             try:
                 # Lê a aba 'MUNIC' da planilha
-                df = pd.read_excel(file_path, sheet_name="MUNIC")
+                df = ler_planilha(file_path, sheet_name="MUNIC")
 
                 if df.empty:
                     QMessageBox.warning(None, "Erro", "A aba 'MUNIC' está vazia ou não existe.")
@@ -1,10 +1,15 @@
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
-import pandas as pd
-from paths import CONTROLE_DADOS
+from utils.planilha_cache import ler_planilha
+from database.backup import iniciar_snapshot
+from utils.pncp_harvester import iniciar_coleta, salvar_coletas
+from paths import CONTROLE_DADOS, PNCP_DB_PATH
 import sqlite3
 
 class CCIMAR10Controller(QObject): 
+    preSnapshotFinished = pyqtSignal(object)
+    coletaPncpFinished = pyqtSignal(object)
+
     def __init__(self, icons, view, model):
         super().__init__()
         self.icons = icons
@@ -13,6 +18,8 @@ class CCIMAR10Controller(QObject):
         self.model_add = model
         self.model = model.setup_model("ccimar10_db")
         self.controle_om = CONTROLE_DADOS  # Atribui o caminho diretamente ao controle_om                
+        self.preSnapshotFinished.connect(self.on_pre_snapshot_finished)
+        self.coletaPncpFinished.connect(self.on_coleta_pncp_finished)
         self.setup_connections()
 
     def setup_connections(self):
@@ -21,14 +28,20 @@ class CCIMAR10Controller(QObject):
         pass
 
     def handle_api_data(self, data_informacoes_lista, resultados_completos):
-        # Estrutura os dados da API para salvar no banco de dados
-        data_api_to_save = {
-            "data_informacoes": data_informacoes_lista,
-            "resultados_completos": resultados_completos
-        }
-        
-        # Solicita ao modelo que salve os dados no banco de dados
-        self.model_add.save_api_data(data_api_to_save)
+        # Grava um pregão já consultado pelo mesmo caminho da coleta do PNCP
+        salvar_coletas(PNCP_DB_PATH, [(data_informacoes_lista, resultados_completos)])
+
+    def coletar_pncp(self, data_inicial, data_final, uasgs=None):
+        """Coleta os pregões do período de forma concorrente, em segundo plano, em vez de um por vez."""
+        self.view.setEnabled(False)
+        iniciar_coleta(data_inicial, data_final, uasgs, ao_terminar=self.coletaPncpFinished.emit)
+
+    def on_coleta_pncp_finished(self, total_itens):
+        self.view.setEnabled(True)
+        if total_itens is None:
+            QMessageBox.warning(self.view, "PNCP", "Não foi possível concluir a coleta do PNCP.")
+            return
+        QMessageBox.information(self.view, "PNCP", f"Coleta concluída: {total_itens} itens gravados.")
 
     def handle_delete_item(self):
         """Trata a ação de exclusão de um item selecionado."""
@@ -90,15 +103,12 @@ class CCIMAR10Controller(QObject):
         if filepath:
             try:
                 # Carrega o arquivo selecionado em um DataFrame
-                df = pd.read_excel(filepath)
+                df = ler_planilha(filepath)
                 self.validate_and_process_data(df)
 
-                # Insere ou atualiza os dados no banco de dados
-                for _, row in df.iterrows():
-                    data = row.to_dict()
-                    self.model_add.insert_or_update_data(data)
-                    self.view.refresh_model()
-                # Atualiza o modelo para refletir as alterações
+                # Insere ou atualiza todas as linhas em uma única transação
+                self.model_add.insert_or_update_many(df)
+                # Atualiza o modelo uma única vez, ao final
                 self.model.select()
                 QMessageBox.information(self.view, "Carregamento concluído", "Dados carregados com sucesso.")
             except Exception as e:
@@ -123,10 +133,13 @@ class CCIMAR10Controller(QObject):
         with sqlite3.connect(self.controle_om) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT uasg, sigla_om, orgao_responsavel FROM controle_om")
-            om_details = {row[0]: {'sigla_om': row[1], 'orgao_responsavel': row[2]} for row in cursor.fetchall()}
+            om_details = cursor.fetchall()
 
-        df['sigla_om'] = df['uasg'].map(lambda x: om_details.get(x, {}).get('sigla_om', ''))
-        df['orgao_responsavel'] = df['uasg'].map(lambda x: om_details.get(x, {}).get('orgao_responsavel', ''))
+        # Mapeamento vetorizado (Series.map com dicionário) em vez de uma função por linha
+        siglas = {uasg: sigla_om for uasg, sigla_om, _ in om_details}
+        orgaos = {uasg: orgao_responsavel for uasg, _, orgao_responsavel in om_details}
+        df['sigla_om'] = df['uasg'].map(siglas).fillna('')
+        df['orgao_responsavel'] = df['uasg'].map(orgaos).fillna('')
 
     def excluir_database(self):
         reply = QMessageBox.question(self.view, "Confirmação de Exclusão",
@@ -134,12 +147,23 @@ class CCIMAR10Controller(QObject):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                      QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            with self.model.database_manager as conn:
-                cursor = conn.cursor()
-                cursor.execute("DROP TABLE IF EXISTS controle_planejamento")
-                conn.commit()
-            QMessageBox.information(self.view, "Sucesso", "Tabela excluída com sucesso.")
-            self.view.refresh_model()
+            # Snapshot em segundo plano antes da exclusão; a exclusão segue em on_pre_snapshot_finished
+            self.view.setEnabled(False)
+            iniciar_snapshot(
+                self.model.database_manager.db_path, "pre_exclusao", ao_terminar=self.preSnapshotFinished.emit
+            )
+
+    def on_pre_snapshot_finished(self, snapshot):
+        self.view.setEnabled(True)
+        if snapshot is None:
+            QMessageBox.warning(self.view, "Backup", "Não foi possível criar o backup prévio. A exclusão foi cancelada.")
+            return
+        with self.model.database_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("DROP TABLE IF EXISTS controle_planejamento")
+            conn.commit()
+        QMessageBox.information(self.view, "Sucesso", "Tabela excluída com sucesso.")
+        self.view.refresh_model()
             # self.model.select()  # Atualiza o modelo para refletir a exclusão
 
 def show_warning_if_view_exists(view, title, message):
@@ -3,6 +3,7 @@
 from PyQt6.QtWidgets import QTreeView, QAbstractItemView
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 from PyQt6.QtCore import Qt
+from assets.styles.theme import set_variant
 from .menu_callbacks import (  
     show_criterio1_execucao_licitacao, show_criterio2_pagamento, show_chat_bot_local,
     show_criterio3_munic, show_criteriox_omps, show_criterio4_patrimonio,
@@ -28,20 +29,7 @@ class TreeMenu(QTreeView):
         self.expandAll()
         self.clicked.connect(self.handle_item_click)
 
-        self.setStyleSheet("""
-            QTreeView { 
-                color: #FFF; 
-                font-size: 16px; 
-            }
-            QTreeView::item:hover {
-                background-color: #2C2F3F;
-                border: #2C2F3F;
-            }
-            QTreeView::item:selected {
-                background-color: #44475A;
-                border: 1px solid #44475A;
-            }
-        """)
+        set_variant(self, "moduleMenu")
 
     def populate_tree(self):
         def add_item(parent, text, callback):
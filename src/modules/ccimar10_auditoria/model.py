@@ -1,10 +1,26 @@
 from database.db_manager import DatabaseManager
+from database.contratos import preparar_contrato, preparar_contratos, upsert_contratos
+from database.normalizacao import (
+    data_iso, expressao_dia, garantir_coluna_gerada, normalizar_colunas,
+    serie_data_iso, serie_valor_monetario, valor_monetario,
+)
 from PyQt6.QtWidgets import *
 from PyQt6.QtGui import *
 from PyQt6.QtCore import *
+from utils.projected_table_model import ProjectedSqlTableModel
 from PyQt6.QtSql import QSqlDatabase, QSqlTableModel, QSqlQuery
 import sqlite3  
-from datetime import datetime
+from datetime import date
+
+# Colunas gravadas em formato normalizado (datas ISO, valores REAL)
+COLUNAS_DATA = ["vigencia_inicial", "vigencia_final", "data_assinatura", "data_publicacao"]
+COLUNAS_VALOR = ["valor_global"]
+
+# Colunas geradas (calculadas pelo SQLite) e indexadas para filtros/ordenação
+COLUNAS_GERADAS = {
+    "vigencia_final_dia": ("INTEGER", expressao_dia("vigencia_final")),
+    "valor_global_num": ("REAL", "CAST(valor_global AS REAL)"),
+}
 
 class CCIMAR10Model(QObject):
     def __init__(self, database_path, parent=None):
@@ -35,9 +51,22 @@ class CCIMAR10Model(QObject):
         if not query.next():
             print("Tabela 'ccimar10_db' não existe. Criando tabela...")
             self.create_table_if_not_exists()
-        else:
-            pass
-            # print("Tabela 'ccimar10_db' existe. Verificando estrutura da coluna...")
+        self.normalize_table()
+
+    def normalize_table(self):
+        """
+        Converte datas/valores legados para o formato normalizado e garante as
+        colunas geradas (dia da vigência final e valor global numérico) com índice.
+        """
+        try:
+            with self.database_manager as conn:
+                normalizar_colunas(conn, "ccimar10_db", datas=COLUNAS_DATA, valores=COLUNAS_VALOR)
+                for coluna, (tipo, expressao) in COLUNAS_GERADAS.items():
+                    garantir_coluna_gerada(conn, "ccimar10_db", coluna, tipo, expressao)
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_ccimar10_db_{coluna} ON ccimar10_db ({coluna})")
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Erro ao normalizar a tabela 'ccimar10_db': {e}")
 
     def create_table_if_not_exists(self):
         """Cria a tabela 'ccimar10_db' com a estrutura definida, caso ainda não exista."""
@@ -77,59 +106,19 @@ class CCIMAR10Model(QObject):
     def insert_or_update_data(self, data):
         print("Dados recebidos para salvar:", data)
 
-        # Define 'Planejamento' como valor padrão para status se estiver vazio ou None
-        data['status'] = data.get('status', 'Planejamento')
-        if not data['status']:  # Se for string vazia, define 'Planejamento'
-            data['status'] = 'Planejamento'
-            
-        upsert_sql = '''
-        INSERT INTO ccimar10_db (
-            status, dias, prorrogavel, custeio, numero_contrato, 
-            tipo, id, nome_fornecedor, objeto, valor_global, 
-            codigo_uasg, processo_nup, cnpj_cpf_idgener, natureza_continuada, orgao_contratante_resumido, 
-            orgao_contratante, material_servico, link_pncp, vigencia_inicial, vigencia_final, 
-            termo_aditivo, atualizacao_comprasnet, instancia_governanca, comprasnet_contratos, licitacao_numero, 
-            data_assinatura, data_publicacao, categoria, subtipo, amparo_legal, 
-            modalidade, assinatura_contrato, situacao
-        ) VALUES (
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-                status=excluded.status, dias=excluded.dias, prorrogavel=excluded.prorrogavel, custeio=excluded.custeio, numero_contrato=excluded.numero_contrato,
-                tipo=excluded.tipo, nome_fornecedor=excluded.nome_fornecedor, objeto=excluded.objeto, valor_global=excluded.valor_global,    
-                codigo_uasg=excluded.codigo_uasg, processo_nup=excluded.processo_nup, cnpj_cpf_idgener=excluded.cnpj_cpf_idgener, natureza_continuada=excluded.natureza_continuada,
-                orgao_contratante_resumido=excluded.orgao_contratante_resumido, orgao_contratante=excluded.orgao_contratante, material_servico=excluded.material_servico, link_pncp=excluded.link_pncp,
-                vigencia_inicial=excluded.vigencia_inicial, vigencia_final=excluded.vigencia_final, termo_aditivo=excluded.termo_aditivo, atualizacao_comprasnet=excluded.atualizacao_comprasnet,
-                instancia_governanca=excluded.instancia_governanca, comprasnet_contratos=excluded.comprasnet_contratos, licitacao_numero=excluded.licitacao_numero, data_assinatura=excluded.data_assinatura,
-                data_publicacao=excluded.data_publicacao, categoria=excluded.categoria, subtipo=excluded.subtipo, amparo_legal=excluded.amparo_legal, 
-                modalidade=excluded.modalidade, assinatura_contrato=excluded.assinatura_contrato, situacao=excluded.situacao
-        '''
-
-        # Verifica se 'situacao' está dentro dos valores válidos
-        valid_situations = ["Planejamento", "Aprovado", "Sessão Pública", "Homologado", "Empenhado", "Concluído", "Arquivado"]
-        data['situacao'] = data.get('situacao', 'Planejamento')
-        if data['situacao'] not in valid_situations:
-            data['situacao'] = 'Planejamento'
+        # 'Planejamento' como padrão para status vazio e situação inválida
+        preparar_contrato(data)
+
+        # Datas em ISO e valores numéricos: ordenação e filtros por faixa ficam no SQLite
+        for coluna in COLUNAS_DATA:
+            data[coluna] = data_iso(data.get(coluna))
+        for coluna in COLUNAS_VALOR:
+            data[coluna] = valor_monetario(data.get(coluna))
 
         # Executa a inserção ou atualização
         try:
             with self.database_manager as conn:
-                cursor = conn.cursor()
-                cursor.execute(upsert_sql, (
-                    data.get('status'), data.get('dias'), data.get('prorrogavel'), data.get('custeio'), data.get('numero_contrato'),
-                    data.get('tipo'), data.get('id'), data.get('nome_fornecedor'), data.get('objeto'), data.get('valor_global'),
-                    data.get('codigo_uasg'), data.get('processo_nup'), data.get('cnpj_cpf_idgener'), data.get('natureza_continuada'), data.get('orgao_contratante_resumido'),
-                    data.get('orgao_contratante'), data.get('material_servico'), data.get('link_pncp'), data.get('vigencia_inicial'), data.get('vigencia_final'),
-                    data.get('termo_aditivo'), data.get('atualizacao_comprasnet'), data.get('instancia_governanca'), data.get('comprasnet_contratos'), data.get('licitacao_numero'),
-                    data.get('data_assinatura'), data.get('data_publicacao'), data.get('categoria'), data.get('subtipo'), data.get('amparo_legal'),
-                    data.get('modalidade'), data.get('assinatura_contrato'), data.get('situacao')
-                    )) 
-                conn.commit()
+                upsert_contratos(conn, 'ccimar10_db', [data])
 
         except sqlite3.OperationalError as e:
             if "no such table" in str(e):
@@ -138,7 +127,36 @@ class CCIMAR10Model(QObject):
             else:
                 QMessageBox.warning(None, "Erro", f"Ocorreu um erro ao tentar salvar os dados: {str(e)}")
 
-class CustomSqlTableModel(QSqlTableModel):
+    def insert_or_update_many(self, df):
+        """
+        Insere ou atualiza todas as linhas de um DataFrame em uma única transação.
+
+        Aplica de forma vetorizada os mesmos padrões de ``insert_or_update_data``
+        (status e situação) e grava com ``upsert_contratos``. Retorna a
+        quantidade de registros gravados.
+        """
+        df = preparar_contratos(df)
+
+        # Datas em ISO e valores numéricos, como em insert_or_update_data
+        for coluna in COLUNAS_DATA:
+            if coluna in df:
+                df[coluna] = serie_data_iso(df[coluna])
+        for coluna in COLUNAS_VALOR:
+            if coluna in df:
+                df[coluna] = serie_valor_monetario(df[coluna])
+
+        try:
+            with self.database_manager as conn:
+                gravados = upsert_contratos(conn, 'ccimar10_db', df)
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                QMessageBox.warning(None, "Erro", "A tabela 'ccimar10_db' não existe. Por favor, crie a tabela primeiro.")
+            else:
+                QMessageBox.warning(None, "Erro", f"Ocorreu um erro ao tentar salvar os dados: {str(e)}")
+            return 0
+        return gravados
+
+class CustomSqlTableModel(ProjectedSqlTableModel):
     def __init__(self, parent=None, db=None, database_manager=None, non_editable_columns=None):
         super().__init__(parent, db)
         self.database_manager = database_manager
@@ -173,35 +191,16 @@ class CustomSqlTableModel(QSqlTableModel):
         # Verifica se estamos na coluna 'dias'
         if index.column() == self.fieldIndex("dias"):
             if role == Qt.ItemDataRole.DisplayRole:
-                # Obtém o índice e valor da coluna "vigencia_final"
-                vigencia_final_index = self.fieldIndex("vigencia_final")
-                vigencia_final = self.index(index.row(), vigencia_final_index).data()
-
-                # print(f"[DEBUG] Vigência final obtida para a linha {index.row()}: {vigencia_final}")  # Debug print
-
-                if vigencia_final:
-                    try:
-                        # Tenta converter 'DD/MM/YYYY'
-                        vigencia_final_date = datetime.strptime(vigencia_final, '%d/%m/%Y')
-                        # print(f"[DEBUG] Conversão bem-sucedida (DD/MM/YYYY): {vigencia_final_date}")  # Debug print
-                    except ValueError:
-                        try:
-                            # Tenta converter 'YYYY-MM-DD'
-                            vigencia_final_date = datetime.strptime(vigencia_final, '%Y-%m-%d')
-                            # print(f"[DEBUG] Conversão bem-sucedida (YYYY-MM-DD): {vigencia_final_date}")  # Debug print
-                        except ValueError:
-                            # print(f"[ERRO] Falha ao converter data: {vigencia_final}. Formato inválido.")  # Debug print
-                            return "Data Inválida"
-
-                    # Calcula os dias restantes
-                    hoje = datetime.today()
-                    dias = (vigencia_final_date - hoje).days
-                    # print(f"[DEBUG] Hoje: {hoje}, Vigência final: {vigencia_final_date}, Dias restantes: {dias}")  # Debug print
-                    return dias  # Retorna os dias restantes
-
-                else:
-                    print(f"[ERRO] Sem data para calcular na linha {index.row()}")  # Debug print
+                # Vigência gravada em ISO; a coluna gerada vigencia_final_dia não entra no
+                # registro do QSqlTableModel (o driver lê PRAGMA table_info, que omite colunas geradas)
+                vigencia_final = self.index(index.row(), self.fieldIndex("vigencia_final")).data()
+                if not vigencia_final:
                     return "Erro"
+                try:
+                    vigencia_final_date = date.fromisoformat(str(vigencia_final)[:10])
+                except ValueError:
+                    return "Data Inválida"
+                return (vigencia_final_date - date.today()).days  # Retorna os dias restantes
 
             elif role == Qt.ItemDataRole.ForegroundRole:
                 # Obtém o valor da coluna 'dias' calculado anteriormente
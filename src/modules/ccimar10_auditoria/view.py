@@ -14,6 +14,7 @@ class CCIMAR10View(QMainWindow):
         self.document = None
         self.current_content_layout = None
         self.setup_ui()
+        self.hide_unwanted_columns()
         self.load_initial_content() 
 
     def setup_ui(self):
@@ -78,6 +79,11 @@ class CCIMAR10View(QMainWindow):
 
         main_layout.addWidget(self.content_widget, stretch=1)
 
+    def hide_unwanted_columns(self):
+        visible_columns = {0, 1, 2, 4, 5, 7, 8, 9, 14}
+        # Busca do banco só as colunas exibidas ('vigencia_final' alimenta a coluna 'dias')
+        self.model.set_visible_columns(visible_columns, always_columns=["vigencia_final"])
+
     def load_initial_content(self):
         """Carrega o conteúdo inicial dentro do content_widget."""
         self.clear_content()
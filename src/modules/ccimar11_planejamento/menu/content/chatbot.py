@@ -6,9 +6,11 @@ from paths.base_path import API_KEY
 import openai
 import sqlite3
 import logging
+from database.federacao import conectar_federado, descrever_views
 from PyQt6.QtCore import Qt, pyqtSignal
 import re
 from utils.add_button import add_button_func
+from database.tracing import span
 from .chatbot_utils.flow_layout import FlowLayout
 
 def create_chatbot(title_text, database_model, icons):
@@ -127,19 +129,22 @@ class ChatbotWidget(QFrame):
         layout.addLayout(self.export_buttons_layout)
 
     def get_database_metadata(self):
-        """Lê as tabelas e suas colunas no banco de dados."""
+        """Lê as tabelas e suas colunas no banco de dados, incluindo as views federadas."""
         metadata = {}
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with conectar_federado(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
                 tables = cursor.fetchall()
                 for table_name in tables:
                     table_name = table_name[0]
-                    cursor.execute(f"PRAGMA table_info({table_name})")
+                    # table_xinfo inclui as colunas geradas (ex.: valor_total_execucao_licitacao), omitidas por table_info
+                    cursor.execute(f"PRAGMA table_xinfo({table_name})")
                     columns = cursor.fetchall()
                     # Armazena os nomes das colunas com seus tipos, ex.: "cod_siafi (INTEGER)"
-                    metadata[table_name] = [f"{col[1]} ({col[2]})" for col in columns]
+                    metadata[table_name] = [f"{col[1]} ({col[2]})" for col in columns if col[6] != 1]
+                # Views que cruzam os bancos das divisões (OMs, cartão, contratos, PNCP)
+                metadata.update(descrever_views(conn))
         except sqlite3.Error as e:
             logging.error(f"Database error: {e}")
             return {}
@@ -292,17 +297,18 @@ class ChatbotWidget(QFrame):
             return
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": (
-                        f"Você é um assistente especializado em análise de dados do banco SQLite. "
-                        f"Analise as tabelas: {self.db_metadata} e responda diretamente o que foi perguntado, "
-                        f"apenas com os dados obtidos do banco. Se necessário, informe também o código SQL para obter os dados."
-                    )},
-                    {"role": "user", "content": f"Pergunta: {self.input_field.text().strip()}"}
-                ]
-            )
+            with span("chatbot.generate_response", "llm"):
+                response = self.client.chat.completions.create(
+                    model="gpt-4",
+                    messages=[
+                        {"role": "system", "content": (
+                            f"Você é um assistente especializado em análise de dados do banco SQLite. "
+                            f"Analise as tabelas: {self.db_metadata} e responda diretamente o que foi perguntado, "
+                            f"apenas com os dados obtidos do banco. Se necessário, informe também o código SQL para obter os dados."
+                        )},
+                        {"role": "user", "content": f"Pergunta: {self.input_field.text().strip()}"}
+                    ]
+                )
             ai_response = response.choices[0].message.content
         except Exception as e:
             logging.error(f"Error connecting to OpenAI: {e}")
@@ -333,22 +339,23 @@ class ChatbotWidget(QFrame):
         tables_info = "\n\n".join(selected_tables)
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Você é um assistente especializado em análise de dados do banco SQLite. "
-                            "Considere os metadados das tabelas abaixo e responda à pergunta retornando SOMENTE uma consulta SQL, "
-                            "a qual deverá ser utilizada para consultar o banco de dados e retornar os valores encontrados. "
-                            "A consulta SQL DEVE SEMPRE incluir a coluna 'cod_siafi' para facilitar o rastreio.\n\n"
-                            f"{tables_info}"
-                        )
-                    },
-                    {"role": "user", "content": f"Pergunta: {user_question}"}
-                ]
-            )
+            with span("chatbot.generate_direct_api_response", "llm"):
+                response = self.client.chat.completions.create(
+                    model="gpt-4",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": (
+                                "Você é um assistente especializado em análise de dados do banco SQLite. "
+                                "Considere os metadados das tabelas abaixo e responda à pergunta retornando SOMENTE uma consulta SQL, "
+                                "a qual deverá ser utilizada para consultar o banco de dados e retornar os valores encontrados. "
+                                "A consulta SQL DEVE SEMPRE incluir a coluna 'cod_siafi' para facilitar o rastreio.\n\n"
+                                f"{tables_info}"
+                            )
+                        },
+                        {"role": "user", "content": f"Pergunta: {user_question}"}
+                    ]
+                )
             ai_response = response.choices[0].message.content
         except Exception as e:
             logging.error(f"Error connecting to OpenAI: {e}")
@@ -398,7 +405,7 @@ class ChatbotWidget(QFrame):
             return f"R$ {formatted}"
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with conectar_federado(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(query)
                 rows = cursor.fetchall()
@@ -554,7 +561,7 @@ def export_xlsx(db_path, query, output_filename="export.xlsx"):
     Em seguida, abre o arquivo gerado.
     """
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conectar_federado(db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
@@ -582,7 +589,7 @@ def export_docx(db_path, query, output_filename="export.docx"):
     Em seguida, abre o arquivo gerado.
     """
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conectar_federado(db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
@@ -617,7 +624,7 @@ def export_pdf(db_path, query, output_filename="export.pdf"):
     Em seguida, abre o arquivo gerado.
     """
     try:
-        with sqlite3.connect(db_path) as conn:
+        with conectar_federado(db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
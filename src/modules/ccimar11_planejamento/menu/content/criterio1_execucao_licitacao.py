@@ -1,4 +1,4 @@
-import pandas as pd
+from utils.planilha_cache import ler_planilha
 from PyQt6.QtWidgets import QLabel, QFrame, QVBoxLayout, QPushButton, QLineEdit, QFileDialog, QMessageBox
 
 def create_criterio1_execucao_licitacao(title_text, database_model):
@@ -13,7 +13,7 @@ def create_criterio1_execucao_licitacao(title_text, database_model):
             file_path_input.setText(file_path)
             try:
                 # Lê a aba 'EXEC_LICITACAO' da planilha
-                df = pd.read_excel(file_path, sheet_name="EXEC_LICITACAO")
+                df = ler_planilha(file_path, sheet_name="EXEC_LICITACAO")
 
                 if df.empty:
                     QMessageBox.warning(None, "Erro", "A aba 'EXEC_LICITACAO' está vazia ou não existe.")
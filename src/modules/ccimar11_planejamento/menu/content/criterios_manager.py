@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from paths import document_store
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTreeWidget, QTreeWidgetItem, QInputDialog, QMessageBox,
@@ -168,9 +169,9 @@ class CriteriosManager:
         self.load_criterios()
 
     def load_criterios(self):
-        if self.json_path.exists():
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                self.criterios = json.load(f)
+        criterios = document_store.load(self.json_path)
+        if criterios is not None:
+            self.criterios = criterios
         else:
             self.create_default_criterios()
 
@@ -253,8 +254,7 @@ class CriteriosManager:
         self.save_criterios()
 
     def save_criterios(self):
-        with open(self.json_path, 'w', encoding='utf-8') as f:
-            json.dump(self.criterios, f, indent=4, ensure_ascii=False)
+        document_store.save(self.json_path, self.criterios)
 
     def get_criterios(self, tipo):
         return self.criterios.get(tipo, {"criterios": []})["criterios"]
@@ -6,6 +6,8 @@ from PyQt6.QtCore import Qt, QMimeData
 import json
 import os
 import pandas as pd
+from utils.planilha_cache import ler_planilha
+from paths import document_store
 import subprocess
 import sys
 
@@ -286,8 +288,7 @@ def load_objetivos_navais_data(json_file_path):
     Carrega os dados do arquivo JSON contendo a estrutura dos objetivos navais.
     """
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        return document_store.load(json_file_path)
     except Exception as e:
         print(f"Erro ao carregar o arquivo JSON: {e}")
         return None
@@ -553,9 +554,7 @@ def save_objetivos_navais_data(data, json_file_path):
     Salva os dados no arquivo JSON.
     """
     try:
-        with open(json_file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
-        return True
+        return document_store.save(json_file_path, data)
     except Exception as e:
         print(f"Erro ao salvar o arquivo JSON: {e}")
         return False
@@ -597,7 +596,7 @@ def import_from_excel(excel_path):
     Importa dados de uma planilha Excel para a estrutura JSON.
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = ler_planilha(excel_path)
         data = {'perspectivas': []}
         perspectivas = {}
         
@@ -13,7 +13,7 @@ from PyQt6.QtWidgets import (
     QHeaderView, QMessageBox, QGridLayout, QWidget, QInputDialog
 )
 from PyQt6.QtCore import Qt
-from paths import MAT_RELEV_CRIT_PATH
+from paths import MAT_RELEV_CRIT_PATH, document_store
 
 class CriteriosManager:
     """
@@ -33,24 +33,22 @@ class CriteriosManager:
             dict: Dicionário com os critérios
         """
         try:
-            if os.path.exists(MAT_RELEV_CRIT_PATH):
-                with open(MAT_RELEV_CRIT_PATH, 'r', encoding='utf-8') as f:
-                    criterios = json.load(f)
-                    
-                    # Verificar se o formato está correto
-                    if not isinstance(criterios, dict):
-                        criterios = {
-                            "materialidade": [],
-                            "relevancia": [],
-                            "criticidade": []
-                        }
-                    
-                    # Garantir que todas as chaves existam
-                    for tipo in ["materialidade", "relevancia", "criticidade"]:
-                        if tipo not in criterios:
-                            criterios[tipo] = []
-                            
-                    return criterios
+            criterios = document_store.load(MAT_RELEV_CRIT_PATH)
+            if criterios is not None:
+                # Verificar se o formato está correto
+                if not isinstance(criterios, dict):
+                    criterios = {
+                        "materialidade": [],
+                        "relevancia": [],
+                        "criticidade": []
+                    }
+                
+                # Garantir que todas as chaves existam
+                for tipo in ["materialidade", "relevancia", "criticidade"]:
+                    if tipo not in criterios:
+                        criterios[tipo] = []
+                        
+                return criterios
             
             # Se o arquivo não existir, criar estrutura padrão
             return {
@@ -71,11 +69,7 @@ class CriteriosManager:
         Salva os critérios no arquivo JSON.
         """
         try:
-            # Garantir que o diretório existe
-            os.makedirs(os.path.dirname(MAT_RELEV_CRIT_PATH), exist_ok=True)
-            
-            with open(MAT_RELEV_CRIT_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.criterios, f, indent=4, ensure_ascii=False)
+            document_store.save(MAT_RELEV_CRIT_PATH, self.criterios)
         except Exception as e:
             print(f"Erro ao salvar critérios: {e}")
     
@@ -12,7 +12,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QIntValidator
-from .persistence import update_objeto_criterios, get_objeto_criterios
+from .persistence import get_objeto_criterios
 
 class MultipicadoresDialog(QDialog):
     """
@@ -542,10 +542,9 @@ class DetalhesDialog(QDialog):
                     'pontuacao': opcao.get('pontuacao', 0)
                 }
         
-        # Salvar critérios
-        update_objeto_criterios(self.objeto_id, criterios)
-        
-        # Atualizar o modelo
+        # Atualizar o modelo em lote: um recálculo, uma gravação (critérios e valores) e um dataChanged
+        self.model.begin_update()
+        self.model.set_objeto_criterios(self.objeto_id, criterios)
         self.model.setData(self.model.index(self.row_index, 2), str(materialidade))
         self.model.setData(self.model.index(self.row_index, 3), str(relevancia))
         self.model.setData(self.model.index(self.row_index, 4), str(criticidade))
@@ -556,6 +555,7 @@ class DetalhesDialog(QDialog):
         self.model.setData(self.model.index(self.row_index, 2), materialidade, Qt.ItemDataRole.UserRole)
         self.model.setData(self.model.index(self.row_index, 3), relevancia, Qt.ItemDataRole.UserRole)
         self.model.setData(self.model.index(self.row_index, 4), criticidade, Qt.ItemDataRole.UserRole)
+        self.model.commit()
         
         # Fechar o diálogo
         self.accept()
@@ -9,8 +9,9 @@ import os
 import json
 from PyQt6.QtCore import Qt, QModelIndex
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
-from .persistence import get_objeto_criterios, update_objeto_criterios, load_multiplicadores
-from paths import MAT_RELEV_CRIT_PATH, CONFIG_PAINT_PATH
+from .persistence import get_objeto_criterios, load_multiplicadores
+from paths import MAT_RELEV_CRIT_PATH, CONFIG_PAINT_PATH, document_store
+from database.tracing import traced
 
 class ObjetosAuditaveisModel(QStandardItemModel):
     """
@@ -36,6 +37,12 @@ class ObjetosAuditaveisModel(QStandardItemModel):
         # Dicionário para mapear índices de linha para descrições de objetos
         self.row_to_desc = {}
         
+        # Estado de begin_update()/commit(): nível de aninhamento, linhas alteradas e critérios a gravar
+        self._update_depth = 0
+        self._pending_rows = set()
+        self._pending_criterios = {}
+        self._signals_were_blocked = False
+        
         self.setHorizontalHeaderLabels([
             "NR", "Objetos Auditáveis", 
             f"Materialidade\n(x{self.materialidade_peso})",
@@ -71,33 +78,31 @@ class ObjetosAuditaveisModel(QStandardItemModel):
             
             # Carregar objetos do arquivo CONFIG_PAINT_PATH
             objetos_data = []
-            if os.path.exists(CONFIG_PAINT_PATH):
-                with open(CONFIG_PAINT_PATH, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    
-                    # Verificar se há objetos na configuração
-                    if 'objetos' in config and isinstance(config['objetos'], list):
-                        for obj in config['objetos']:
-                            # Verificar se o objeto tem os campos necessários
-                            if 'NR' in obj and 'Objetos Auditáveis' in obj:
-                                nr = obj['NR']
-                                descricao = obj['Objetos Auditáveis']
-                                
-                                # Obter critérios do objeto
-                                criterios = get_objeto_criterios(descricao) or {}
-                                valores_calculados = criterios.get('valores_calculados', {})
-                                
-                                # Obter valores calculados ou usar valores padrão
-                                materialidade = valores_calculados.get('materialidade', 0)
-                                relevancia = valores_calculados.get('relevancia', 0)
-                                criticidade = valores_calculados.get('criticidade', 0)
-                                total = valores_calculados.get('total', 0)
-                                tipo_risco = valores_calculados.get('tipo_risco', 'Baixo')
-                                
-                                # Adicionar à lista de dados
-                                objetos_data.append([
-                                    nr, descricao, materialidade, relevancia, criticidade, total, tipo_risco
-                                ])
+            config = document_store.get(CONFIG_PAINT_PATH)
+            if config is not None:
+                # Verificar se há objetos na configuração
+                if 'objetos' in config and isinstance(config['objetos'], list):
+                    for obj in config['objetos']:
+                        # Verificar se o objeto tem os campos necessários
+                        if 'NR' in obj and 'Objetos Auditáveis' in obj:
+                            nr = obj['NR']
+                            descricao = obj['Objetos Auditáveis']
+                            
+                            # Obter critérios do objeto
+                            criterios = config.get(descricao) or {}
+                            valores_calculados = criterios.get('valores_calculados', {})
+                            
+                            # Obter valores calculados ou usar valores padrão
+                            materialidade = valores_calculados.get('materialidade', 0)
+                            relevancia = valores_calculados.get('relevancia', 0)
+                            criticidade = valores_calculados.get('criticidade', 0)
+                            total = valores_calculados.get('total', 0)
+                            tipo_risco = valores_calculados.get('tipo_risco', 'Baixo')
+                            
+                            # Adicionar à lista de dados
+                            objetos_data.append([
+                                nr, descricao, materialidade, relevancia, criticidade, total, tipo_risco
+                            ])
             
             # Carregar os dados no modelo
             if objetos_data:
@@ -125,6 +130,7 @@ class ObjetosAuditaveisModel(QStandardItemModel):
                 "Total", "Tipo de Risco"
             ])
     
+    @traced("scoring", "ObjetosAuditaveisModel.load_data")
     def load_data(self, data):
         """
         Carrega dados no modelo.
@@ -145,6 +151,7 @@ class ObjetosAuditaveisModel(QStandardItemModel):
         self.row_to_desc = {}
         
         # Adicionar os dados
+        calculados = {}
         for row_idx, row_data in enumerate(data):
             # Verificar se temos dados suficientes
             if len(row_data) < 7:
@@ -192,65 +199,72 @@ class ObjetosAuditaveisModel(QStandardItemModel):
                 self.setData(self.index(row_idx, 4), criticidade, Qt.ItemDataRole.UserRole)
             
             # Recalcular a linha para garantir que os valores estejam corretos
-            self.recalculate_row(row_idx)
+            calculados[descricao] = self.recalculate_row(row_idx)
         
-        # Salvar os dados no arquivo de configuração
-        self.save_to_config_file()
+        # Salvar os dados no arquivo de configuração (uma única gravação)
+        self.save_to_config_file(calculados)
     
-    def save_to_config_file(self):
+    def save_to_config_file(self, calculados=None, criterios=None):
         """
         Salva os dados do modelo no arquivo de configuração CONFIG_PAINT_PATH.
+        
+        Objetos, critérios e valores calculados vão numa única gravação.
+        
+        Args:
+            calculados (dict, optional): {objeto_id: valores_calculados} retornados por recalculate_row()
+            criterios (dict, optional): {objeto_id: critérios} que substituem os gravados
         """
         try:
-            # Carregar configuração existente ou criar nova
-            config = {}
-            if os.path.exists(CONFIG_PAINT_PATH):
-                with open(CONFIG_PAINT_PATH, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-            
-            # Atualizar ou criar a lista de objetos
-            objetos = []
-            for row in range(self.rowCount()):
-                nr = self.data(self.index(row, 0))
-                descricao = self.data(self.index(row, 1))
-                materialidade = float(self.data(self.index(row, 2)) or 0)
-                relevancia = float(self.data(self.index(row, 3)) or 0)
-                criticidade = float(self.data(self.index(row, 4)) or 0)
-                total = float(self.data(self.index(row, 5)) or 0)
-                tipo_risco = self.data(self.index(row, 6))
-                
-                objeto = {
-                    'NR': nr,
-                    'Objetos Auditáveis': descricao,
-                    'materialidade': materialidade,
-                    'relevancia': relevancia,
-                    'criticidade': criticidade,
-                    'total': total,
-                    'tipo_risco': tipo_risco
-                }
-                objetos.append(objeto)
-            
-            # Atualizar a configuração
-            config['objetos'] = objetos
-            
-            # Garantir que os multiplicadores estejam na configuração
-            if 'multiplicadores' not in config:
-                config['multiplicadores'] = {
-                    'materialidade': self.materialidade_peso,
-                    'relevancia': self.relevancia_peso,
-                    'criticidade': self.criticidade_peso
-                }
-            
-            # Garantir que o diretório existe
-            os.makedirs(os.path.dirname(CONFIG_PAINT_PATH), exist_ok=True)
-            
-            # Salvar a configuração
-            with open(CONFIG_PAINT_PATH, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
+            # Ler, alterar e gravar a configuração em uma única operação
+            document_store.update(CONFIG_PAINT_PATH, lambda config: self._aplicar_configuracao(config, calculados, criterios))
                 
         except Exception as e:
             print(f"Erro ao salvar dados no arquivo de configuração: {e}")
     
+    def _aplicar_configuracao(self, config, calculados=None, criterios=None):
+        """Aplica à configuração os objetos do modelo, os critérios e os valores calculados."""
+        # Atualizar ou criar a lista de objetos
+        objetos = []
+        for row in range(self.rowCount()):
+            nr = self.data(self.index(row, 0))
+            descricao = self.data(self.index(row, 1))
+            materialidade = float(self.data(self.index(row, 2)) or 0)
+            relevancia = float(self.data(self.index(row, 3)) or 0)
+            criticidade = float(self.data(self.index(row, 4)) or 0)
+            total = float(self.data(self.index(row, 5)) or 0)
+            tipo_risco = self.data(self.index(row, 6))
+            
+            objeto = {
+                'NR': nr,
+                'Objetos Auditáveis': descricao,
+                'materialidade': materialidade,
+                'relevancia': relevancia,
+                'criticidade': criticidade,
+                'total': total,
+                'tipo_risco': tipo_risco
+            }
+            objetos.append(objeto)
+        
+        # Atualizar a configuração
+        config['objetos'] = objetos
+        
+        # Garantir que os multiplicadores estejam na configuração
+        if 'multiplicadores' not in config:
+            config['multiplicadores'] = {
+                'materialidade': self.materialidade_peso,
+                'relevancia': self.relevancia_peso,
+                'criticidade': self.criticidade_peso
+            }
+        
+        # Critérios informados (ex.: pelo diálogo de detalhes) e valores recalculados de cada objeto
+        for objeto_id, criterios_objeto in (criterios or {}).items():
+            config[objeto_id] = criterios_objeto
+        for objeto_id, valores in (calculados or {}).items():
+            criterios_objeto = config.get(objeto_id)
+            if not isinstance(criterios_objeto, dict):
+                criterios_objeto = config[objeto_id] = {}
+            criterios_objeto.setdefault('valores_calculados', {}).update(valores)
+    
     def get_row_data(self, row):
         """
         Obtém os dados de uma linha específica.
@@ -311,18 +325,81 @@ class ObjetosAuditaveisModel(QStandardItemModel):
                 # Definir o valor
                 result = super().setData(index, value, role)
                 
-                if result:
+                if result and self._update_depth:
+                    # Dentro de begin_update(): recálculo e gravação ficam para o commit()
+                    self._pending_rows.add(row)
+                elif result:
                     # Recalcular o total e o tipo de risco
-                    self.recalculate_row(row)
+                    valores = self.recalculate_row(row)
                     
                     # Salvar os dados no arquivo de configuração
-                    self.save_to_config_file()
+                    self.save_to_config_file({self.get_objeto_id(row): valores})
                     
                 return result
                 
         # Para outros papéis, usar a implementação padrão
         return super().setData(index, value, role)
     
+    def begin_update(self):
+        """
+        Inicia uma atualização em lote.
+        
+        Até o commit() correspondente, as alterações de células não recalculam a
+        linha, não gravam o arquivo de configuração e não notificam as views.
+        Pode ser aninhado; só o commit() mais externo aplica o lote.
+        """
+        if self._update_depth == 0:
+            self._pending_rows = set()
+            self._pending_criterios = {}
+            self._signals_were_blocked = self.blockSignals(True)
+        self._update_depth += 1
+    
+    def commit(self):
+        """
+        Conclui a atualização em lote iniciada por begin_update().
+        
+        Recalcula uma vez cada linha alterada, grava o arquivo de configuração uma
+        única vez (critérios registrados com set_objeto_criterios() e valores
+        calculados juntos) e emite um só dataChanged cobrindo as linhas afetadas.
+        """
+        if self._update_depth == 0:
+            return
+        self._update_depth -= 1
+        if self._update_depth:
+            return
+        
+        rows = sorted(self._pending_rows)
+        criterios = self._pending_criterios
+        self._pending_rows = set()
+        self._pending_criterios = {}
+        try:
+            calculados = {self.get_objeto_id(row): self.recalculate_row(row) for row in rows}
+            if calculados or criterios:
+                self.save_to_config_file(calculados, criterios)
+        finally:
+            self.blockSignals(self._signals_were_blocked)
+        
+        if rows:
+            self.dataChanged.emit(
+                self.index(rows[0], 0), self.index(rows[-1], self.columnCount() - 1)
+            )
+    
+    def set_objeto_criterios(self, objeto_id, criterios):
+        """
+        Registra os critérios selecionados de um objeto.
+        
+        Dentro de begin_update() são gravados no commit(), junto com os valores
+        calculados; fora dele, são gravados imediatamente.
+        
+        Args:
+            objeto_id (str): ID do objeto auditável
+            criterios (dict): Dicionário com os critérios do objeto
+        """
+        if self._update_depth:
+            self._pending_criterios[objeto_id] = criterios
+        else:
+            self.save_to_config_file(criterios={objeto_id: criterios})
+    
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         """
         Obtém dados do modelo.
@@ -343,6 +420,9 @@ class ObjetosAuditaveisModel(QStandardItemModel):
         
         Args:
             row (int): Índice da linha
+            
+        Returns:
+            dict: Valores calculados da linha (não grava o arquivo de configuração)
         """
         # Obter valores originais dos critérios (armazenados como UserRole)
         materialidade = self.data(self.index(row, 2), Qt.ItemDataRole.UserRole) or float(self.data(self.index(row, 2)) or 0)
@@ -371,24 +451,14 @@ class ObjetosAuditaveisModel(QStandardItemModel):
         super().setData(self.index(row, 5), str(total))
         super().setData(self.index(row, 6), tipo_risco)
         
-        # Obter o ID do objeto
-        objeto_id = self.get_objeto_id(row)
-        
-        # Carregar critérios existentes ou criar novos
-        criterios = get_objeto_criterios(objeto_id) or {}
-        
-        # Atualizar os valores calculados
-        if 'valores_calculados' not in criterios:
-            criterios['valores_calculados'] = {}
-            
-        criterios['valores_calculados']['materialidade'] = materialidade
-        criterios['valores_calculados']['relevancia'] = relevancia
-        criterios['valores_calculados']['criticidade'] = criticidade
-        criterios['valores_calculados']['total'] = total
-        criterios['valores_calculados']['tipo_risco'] = tipo_risco
-        
-        # Salvar os critérios atualizados
-        update_objeto_criterios(objeto_id, criterios)
+        # Valores calculados; a gravação fica com quem chamou (save_to_config_file)
+        return {
+            'materialidade': materialidade,
+            'relevancia': relevancia,
+            'criticidade': criticidade,
+            'total': total,
+            'tipo_risco': tipo_risco
+        }
     
     def get_pontuacao_from_descricao(self, tipo, descricao):
         """
@@ -454,6 +524,7 @@ class ObjetosAuditaveisModel(QStandardItemModel):
             
         return self.item_flags
     
+    @traced("scoring", "ObjetosAuditaveisModel.update_multiplicadores")
     def update_multiplicadores(self, materialidade_peso, relevancia_peso, criticidade_peso):
         """
         Atualiza os multiplicadores e recalcula todos os valores.
@@ -478,11 +549,10 @@ class ObjetosAuditaveisModel(QStandardItemModel):
         ])
         
         # Recalcular todas as linhas
-        for row in range(self.rowCount()):
-            self.recalculate_row(row)
+        calculados = {self.get_objeto_id(row): self.recalculate_row(row) for row in range(self.rowCount())}
         
-        # Salvar os dados no arquivo de configuração
-        self.save_to_config_file()
+        # Salvar os dados no arquivo de configuração (uma única gravação)
+        self.save_to_config_file(calculados)
     
     def clear(self):
         """
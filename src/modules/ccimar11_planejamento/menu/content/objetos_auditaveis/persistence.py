@@ -5,10 +5,9 @@ Este módulo contém funções para carregar e salvar dados relacionados aos obj
 incluindo multiplicadores e critérios.
 """
 
-import os
-import json
+import copy
 from pathlib import Path
-from paths import MAT_RELEV_CRIT_PATH, CONFIG_PAINT_PATH
+from paths import MAT_RELEV_CRIT_PATH, CONFIG_PAINT_PATH, document_store
 
 def load_multiplicadores():
     """
@@ -18,10 +17,8 @@ def load_multiplicadores():
         tuple: (materialidade, relevancia, criticidade) com os valores dos multiplicadores
     """
     try:
-        if os.path.exists(CONFIG_PAINT_PATH):
-            with open(CONFIG_PAINT_PATH, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                
+        config = document_store.get(CONFIG_PAINT_PATH)
+        if config is not None:
             # Verificar se a configuração de multiplicadores existe
             if 'multiplicadores' in config:
                 return (
@@ -46,23 +43,17 @@ def save_multiplicadores(materialidade, relevancia, criticidade):
         criticidade (int): Peso da criticidade
     """
     try:
-        # Carregar configuração existente ou criar nova
-        config = {}
-        if os.path.exists(CONFIG_PAINT_PATH):
-            with open(CONFIG_PAINT_PATH, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        
-        # Atualizar ou criar a configuração de multiplicadores
-        if 'multiplicadores' not in config:
-            config['multiplicadores'] = {}
-            
-        config['multiplicadores']['materialidade'] = materialidade
-        config['multiplicadores']['relevancia'] = relevancia
-        config['multiplicadores']['criticidade'] = criticidade
+        def aplicar(config):
+            # Atualizar ou criar a configuração de multiplicadores
+            if 'multiplicadores' not in config:
+                config['multiplicadores'] = {}
+                
+            config['multiplicadores']['materialidade'] = materialidade
+            config['multiplicadores']['relevancia'] = relevancia
+            config['multiplicadores']['criticidade'] = criticidade
         
         # Salvar a configuração atualizada
-        with open(CONFIG_PAINT_PATH, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        document_store.update(CONFIG_PAINT_PATH, aplicar)
             
     except Exception as e:
         print(f"Erro ao salvar multiplicadores: {e}")
@@ -75,10 +66,7 @@ def load_objetos_criterios():
         dict: Dicionário com os critérios dos objetos auditáveis
     """
     try:
-        if os.path.exists(CONFIG_PAINT_PATH):
-            with open(CONFIG_PAINT_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        return document_store.load(CONFIG_PAINT_PATH, {})
     except Exception as e:
         print(f"Erro ao carregar critérios dos objetos: {e}")
         return {}
@@ -91,8 +79,7 @@ def save_objetos_criterios(criterios_data):
         criterios_data (dict): Dicionário com os critérios dos objetos auditáveis
     """
     try:
-        with open(CONFIG_PAINT_PATH, 'w', encoding='utf-8') as f:
-            json.dump(criterios_data, f, indent=4, ensure_ascii=False)
+        document_store.save(CONFIG_PAINT_PATH, criterios_data)
     except Exception as e:
         print(f"Erro ao salvar critérios dos objetos: {e}")
 
@@ -105,14 +92,8 @@ def update_objeto_criterios(objeto_id, criterios):
         criterios (dict): Dicionário com os critérios do objeto
     """
     try:
-        # Carregar dados existentes
-        criterios_data = load_objetos_criterios()
-        
-        # Atualizar ou adicionar os critérios do objeto
-        criterios_data[objeto_id] = criterios
-        
-        # Salvar os dados atualizados
-        save_objetos_criterios(criterios_data)
+        # Atualizar ou adicionar os critérios do objeto e salvar os dados atualizados
+        document_store.update(CONFIG_PAINT_PATH, lambda criterios_data: criterios_data.__setitem__(objeto_id, criterios))
     except Exception as e:
         print(f"Erro ao atualizar critérios do objeto {objeto_id}: {e}")
 
@@ -126,8 +107,8 @@ def get_objeto_criterios(objeto_id):
     Returns:
         dict: Dicionário com os critérios do objeto ou None se não encontrado
     """
-    criterios_data = load_objetos_criterios()
-    return criterios_data.get(objeto_id) 
+    criterios_data = document_store.get(CONFIG_PAINT_PATH) or {}
+    return copy.deepcopy(criterios_data.get(objeto_id))
 
 def update_objetos_calculados():
     """
@@ -135,10 +116,8 @@ def update_objetos_calculados():
     e nos multiplicadores, armazenando o resultado na chave 'calculos' do CONFIG_PAINT_PATH.
     """
     # Carrega a configuração atual
-    if os.path.exists(CONFIG_PAINT_PATH):
-        with open(CONFIG_PAINT_PATH, "r", encoding="utf-8") as f:
-            config = json.load(f)
-    else:
+    config = document_store.load(CONFIG_PAINT_PATH)
+    if config is None:
         config = {
             "multiplicadores": {"materialidade": 4, "relevancia": 2, "criticidade": 4},
             "objetos": []
@@ -182,5 +161,4 @@ def update_objetos_calculados():
     
     # Atualizar a configuração com os dados calculados
     config["calculos"] = calculos
-    with open(CONFIG_PAINT_PATH, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4, ensure_ascii=False)
+    document_store.save(CONFIG_PAINT_PATH, config)
@@ -1,11 +1,12 @@
 import os
 import json
-import pandas as pd
+from openpyxl import load_workbook
+from utils.planilha_cache import ler_planilha
 from PyQt6.QtWidgets import (
     QTableView, QMessageBox, QStyledItemDelegate,
 )
 from PyQt6.QtCore import Qt
-from paths import CONFIG_PAINT_PATH
+from paths import CONFIG_PAINT_PATH, document_store
 
 class CenteredDelegate(QStyledItemDelegate):
     def initStyleOption(self, option, index):
@@ -24,61 +25,103 @@ class CustomTableView(QTableView):
 
 def load_config():
     if os.path.exists(CONFIG_PAINT_PATH):
-        try:
-            with open(CONFIG_PAINT_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            QMessageBox.critical(None, "Erro", f"Erro ao carregar a configuração: {e}")
-            return None
+        config = document_store.load(CONFIG_PAINT_PATH)
+        if config is None:
+            QMessageBox.critical(None, "Erro", "Erro ao carregar a configuração: arquivo inválido.")
+        return config
     else:
         default_config = {
             "objetos_auditaveis": [],
             "multiplicador": {"materialidade": 0, "relevancia": 0, "criticidade": 0},
             "pontuacao_criterios": {"materialidade": [], "relevancia": [], "criticidade": []}
         }
-        try:
-            with open(CONFIG_PAINT_PATH, "w", encoding="utf-8") as f:
-                json.dump(default_config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            QMessageBox.critical(None, "Erro", f"Erro ao criar arquivo de configuração: {e}")
+        if not document_store.save(CONFIG_PAINT_PATH, default_config):
+            QMessageBox.critical(None, "Erro", "Erro ao criar arquivo de configuração.")
         return default_config
 
 class ExcelModelManager:
+    """
+    Valida a planilha de objetos auditáveis e entrega as abas ao importador.
+
+    A validação abre a pasta de trabalho no modo somente leitura do openpyxl e
+    lê apenas os nomes das abas, a linha de cabeçalho e uma amostra limitada de
+    linhas (para conferir os tipos), sem interpretar a planilha inteira. As abas
+    completas só são lidas quando o importador acessa ``sheets``, uma única vez.
+    """
+
+    SAMPLE_ROWS = 50
+
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.required_sheets = ["Compilado", "Materialidade", "Relevância", "Criticidade"]
         self.required_cols_compilado = ["NR", "Objetos Auditáveis"]
         self.required_cols_others = ["Critério", "Tipo", "Descrição", "Pontuação"]
+        self.numeric_cols_others = ["Pontuação"]
+        self._sheets = None
+
+    @property
+    def sheets(self) -> dict:
+        """Abas obrigatórias como DataFrames, lidas (ou trazidas do cache) no primeiro acesso."""
+        if self._sheets is None:
+            self._sheets = ler_planilha(self.file_path, sheet_name=self.required_sheets)
+        return self._sheets
 
     def validate(self) -> bool:
         try:
-            sheets = pd.read_excel(self.file_path, sheet_name=None)
+            workbook = load_workbook(self.file_path, read_only=True, data_only=True)
         except Exception as e:
             self._show_message(f"Erro ao ler o arquivo: {e}")
             return False
 
-        missing_sheets = [s for s in self.required_sheets if s not in sheets]
-        if missing_sheets:
-            self._show_message("Abas ausentes: " + ", ".join(missing_sheets))
-            return False
+        try:
+            missing_sheets = [s for s in self.required_sheets if s not in workbook.sheetnames]
+            if missing_sheets:
+                self._show_message("Abas ausentes: " + ", ".join(missing_sheets))
+                return False
 
-        errors = []
-        compilado = sheets["Compilado"]
-        missing_cols_comp = [c for c in self.required_cols_compilado if c not in compilado.columns]
-        if missing_cols_comp:
-            errors.append("Compilado: " + ", ".join(missing_cols_comp))
+            errors = []
+            headers, _ = self._read_header_and_sample(workbook["Compilado"])
+            missing_cols_comp = [c for c in self.required_cols_compilado if c not in headers]
+            if missing_cols_comp:
+                errors.append("Compilado: " + ", ".join(missing_cols_comp))
 
-        for aba in ["Materialidade", "Relevância", "Criticidade"]:
-            df = sheets[aba]
-            missing_cols = [c for c in self.required_cols_others if c not in df.columns]
-            if missing_cols:
-                errors.append(f"{aba}: " + ", ".join(missing_cols))
+            for aba in ["Materialidade", "Relevância", "Criticidade"]:
+                headers, sample = self._read_header_and_sample(workbook[aba])
+                missing_cols = [c for c in self.required_cols_others if c not in headers]
+                if missing_cols:
+                    errors.append(f"{aba}: " + ", ".join(missing_cols))
+                    continue
+                for col in self.numeric_cols_others:
+                    position = headers.index(col)
+                    invalid = [
+                        row_number for row_number, row in sample
+                        if position < len(row) and not self._is_number_or_empty(row[position])
+                    ]
+                    if invalid:
+                        rows = ", ".join(str(n) for n in invalid[:5])
+                        errors.append(f"{aba}: '{col}' não numérica (linha {rows})")
+        except Exception as e:
+            self._show_message(f"Erro ao ler o arquivo: {e}")
+            return False
+        finally:
+            workbook.close()
 
         if errors:
-            self._show_message("Colunas ausentes:\n" + "\n".join(errors))
+            self._show_message("Colunas ausentes ou inválidas:\n" + "\n".join(errors))
             return False
-
         return True
 
+    def _read_header_and_sample(self, worksheet):
+        """Retorna (cabeçalhos, [(nº da linha, valores)]) lendo só o início da aba."""
+        rows = worksheet.iter_rows(max_row=self.SAMPLE_ROWS + 1, values_only=True)
+        header = next(rows, ())
+        headers = ["" if value is None else str(value) for value in header]
+        sample = [(number, row) for number, row in enumerate(rows, start=2)]
+        return headers, sample
+
+    @staticmethod
+    def _is_number_or_empty(value) -> bool:
+        return value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+
     def _show_message(self, message: str):
         QMessageBox.critical(None, "Erro na Importação", message)
@@ -1,6 +1,5 @@
 import os
 import json
-import pandas as pd
 from PyQt6.QtWidgets import (
     QFrame, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QHeaderView,
     QPushButton, QFileDialog, QMessageBox, QStyledItemDelegate,
@@ -10,7 +9,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QStandardItemModel, QStandardItem, QFont
 from PyQt6.QtCore import Qt
-from paths import CONFIG_PAINT_PATH
+from paths import CONFIG_PAINT_PATH, document_store
+from assets.styles.theme import set_variant
 from .tableview import CustomTableView, ExcelModelManager, load_config
 from .calculations import MultiplicadoresDialog
 
@@ -365,8 +365,7 @@ def create_objetos_auditaveis(title_text):
             }
             config["riscos"] = new_riscos
             try:
-                with open(CONFIG_PAINT_PATH, "w", encoding="utf-8") as f:
-                    json.dump(config, f, indent=4, ensure_ascii=False)
+                document_store.save(CONFIG_PAINT_PATH, config)
                 QMessageBox.information(main_frame, "Sucesso", "Configuração de riscos salva com sucesso!")
                 load_model_from_config()  # Atualiza o TableView com os novos valores
             except Exception as e:
@@ -697,8 +696,7 @@ def create_objetos_auditaveis(title_text):
         config["objetos_auditaveis"] = objetos_auditaveis
 
         try:
-            with open(CONFIG_PAINT_PATH, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
+            document_store.save(CONFIG_PAINT_PATH, config)
             print("Arquivo JSON atualizado com sucesso.")
         except Exception as e:
             QMessageBox.critical(None, "Erro", f"Falha ao salvar no JSON: {e}")
@@ -752,27 +750,8 @@ def create_objetos_auditaveis(title_text):
             
             group_box.setFixedHeight(300)
 
-            # Aplicando um efeito ao GroupBox para combinar com #181928
-            group_box.setStyleSheet("""
-                QGroupBox {
-                    background-color: #181928;  /* Fundo escuro */
-                    border: 2px solid #25283D;  /* Borda sutil */
-                    border-radius: 8px;  /* Bordas arredondadas */
-                    margin-top: 20px;  /* Ajuste para o título não sobrepor a borda */
-                    padding: 10px;
-                    font-size: 16px;
-                    font-weight: bold;
-                }
-
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    subcontrol-position: top left;
-                    padding: 5px 10px;
-                    background-color: #25283D; /* Fundo do título */
-                    color: white;                    
-                    border-radius: 4px;
-                }
-            """)
+            # Visual do GroupBox definido pelo tema da aplicação (assets/styles/theme.py)
+            set_variant(group_box, "criteria")
 
 
             # Layout vertical para o conteúdo dentro do groupbox
@@ -795,7 +774,7 @@ def create_objetos_auditaveis(title_text):
             # Widget interno do scroll
             content_widget = QWidget()
             # Define o background do content_widget para preto
-            content_widget.setStyleSheet("background-color: #181928;")
+            set_variant(content_widget, "criteriaContent")
             # Configurar a política de tamanho para que o widget de conteúdo ocupe todo o espaço disponível
             content_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
             content_layout = QVBoxLayout(content_widget)
@@ -825,12 +804,7 @@ def create_objetos_auditaveis(title_text):
                 crit_title = crit.get("Critério", "")
                 # Estilizando o título do critério
                 title_label = QLabel(f"Critério: {crit_title}")
-                title_label.setStyleSheet("""
-                    color: #8AB4F7;  /* Azul suave para contraste */
-                    font-weight: bold;
-                    font-size: 14px;
-                    padding: 5px 10px;
-                """)
+                set_variant(title_label, "criteriaTitle")
                 title_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
                 title_label.setWordWrap(True)
                 title_label.setMaximumWidth(content_widget.width() - 10 if content_widget.width() > 0 else 300)
@@ -842,32 +816,7 @@ def create_objetos_auditaveis(title_text):
                 # Aplica o delegate passando a categoria (ex.: "relevancia") e o título do critério
                 table_widget.setItemDelegateForColumn(1, EditablePtsDelegate(table_widget, category, crit_title, load_model_from_config))
 
-                table_widget.setStyleSheet("""
-                    QTableWidget {
-                        background-color: #181928;  /* Fundo escuro */
-                        color: white;  /* Texto claro */
-                        gridline-color: #25283D;  /* Linhas separadoras discretas */
-                        selection-background-color: #2A2D44;  /* Destaque ao selecionar */
-                        selection-color: white;
-                        border: 1px solid #25283D;
-                        alternate-background-color: #1F2133;  /* Linhas alternadas */
-                                           font-size: 16px;
-                    }
-
-                    QHeaderView::section {
-                        background-color: #25283D;  /* Cabeçalhos com fundo escuro */
-                        color: white;
-                        font-size: 16px;
-                        font-weight: bold;
-                        padding: 2px;
-                        border: 1px solid #2F324B;
-                    }
-
-                    QTableCornerButton::section {
-                        background-color: #25283D;
-                        border: 1px solid #2F324B;
-                    }
-                """)
+                set_variant(table_widget, "criteria")
 
                 
                 # Centraliza os cabeçalhos da tabela
@@ -937,10 +886,12 @@ def create_objetos_auditaveis(title_text):
         if file_path:
             excel_manager = ExcelModelManager(file_path)
             if excel_manager.validate():
-                df_compilado = pd.read_excel(file_path, sheet_name="Compilado")
-                df_materialidade = pd.read_excel(file_path, sheet_name="Materialidade")
-                df_relevancia = pd.read_excel(file_path, sheet_name="Relevância")
-                df_criticidade = pd.read_excel(file_path, sheet_name="Criticidade")
+                # Única leitura completa das abas (a validação só olhou os cabeçalhos)
+                sheets = excel_manager.sheets
+                df_compilado = sheets["Compilado"]
+                df_materialidade = sheets["Materialidade"]
+                df_relevancia = sheets["Relevância"]
+                df_criticidade = sheets["Criticidade"]
 
                 objetos_auditaveis = []
                 mat_criterios = df_materialidade["Critério"].dropna().unique().tolist()
@@ -1010,8 +961,7 @@ def create_objetos_auditaveis(title_text):
                 }
 
                 try:
-                    with open(CONFIG_PAINT_PATH, "w", encoding="utf-8") as f:
-                        json.dump(config, f, indent=4, ensure_ascii=False)
+                    document_store.save(CONFIG_PAINT_PATH, config)
                     QMessageBox.information(main_frame, "Sucesso", "Configuração salva com sucesso!")
                     load_model_from_config()
                     update_criteria_groupboxes()
@@ -1078,8 +1028,7 @@ def create_objetos_auditaveis(title_text):
             # Atualizar o arquivo JSON
             config["objetos_auditaveis"] = objetos_auditaveis
             try:
-                with open(CONFIG_PAINT_PATH, "w", encoding="utf-8") as f:
-                    json.dump(config, f, indent=4, ensure_ascii=False)
+                document_store.save(CONFIG_PAINT_PATH, config)
                 
                 # Recarregar a tabela para refletir as alterações
                 load_model_from_config()
@@ -1131,8 +1080,9 @@ class EditablePtsDelegate(QStyledItemDelegate):
 
 def update_json_config(category: str, crit_title: str, option_index: int, new_value: int):
     try:
-        with open(CONFIG_PAINT_PATH, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = document_store.load(CONFIG_PAINT_PATH)
+        if config is None:
+            raise FileNotFoundError(CONFIG_PAINT_PATH)
     except Exception as e:
         print("Erro ao carregar JSON:", e)
         return
@@ -1159,8 +1109,7 @@ def update_json_config(category: str, crit_title: str, option_index: int, new_va
                 obj[category][crit_title]["valor"] = new_value
 
     try:
-        with open(CONFIG_PAINT_PATH, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        document_store.save(CONFIG_PAINT_PATH, config)
         print("JSON atualizado com sucesso.")
     except Exception as e:
         print("Erro ao salvar JSON:", e)
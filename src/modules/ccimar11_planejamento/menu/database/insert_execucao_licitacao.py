@@ -1,8 +1,12 @@
 from PyQt6.QtSql import QSqlQuery
 import pandas as pd
+import logging
 
 def insert_execucao_licitacao(database_manager, df):
-    """Inserts execution data from a DataFrame into the database, including total execution value."""
+    """Inserts execution data from a DataFrame into the database.
+
+    The total execution value is a generated column computed by SQLite.
+    """
     
     if df.empty:
         print("Error: Empty DataFrame. No data to insert.")
@@ -43,24 +47,14 @@ def insert_execucao_licitacao(database_manager, df):
         valor_pregao_eletronico = _parse_float(row["VALOR PREGAO"])
         valor_credenciamento = _parse_float(row["VALOR CRED"])
 
-        # Calculate the total execution value
-        execucao_licitacao = sum(
-            v for v in [
-                valor_convite, valor_tomada_preco, valor_concorrencia, 
-                valor_dispensa, valor_inexigibilidade, valor_nao_se_aplica, 
-                valor_suprimento_fundos, valor_regime_diferenciado, valor_cons, 
-                valor_pregao_eletronico, valor_credenciamento
-            ] if v is not None
-        )
-
         # Prepare the insert statement
         insert_query = """
         INSERT INTO criterio_execucao_licitacao (
             cod_siafi, valor_convite, valor_tomada_preco, valor_concorrencia, 
             valor_dispensa, valor_inexigibilidade, valor_nao_se_aplica, 
             valor_suprimento_fundos, valor_regime_diferenciado, valor_cons, 
-            valor_pregao_eletronico, valor_credenciamento, valor_total_execucao_licitacao
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            valor_pregao_eletronico, valor_credenciamento
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
 
         valores = (
@@ -75,13 +69,12 @@ def insert_execucao_licitacao(database_manager, df):
             valor_regime_diferenciado,
             valor_cons,
             valor_pregao_eletronico,
-            valor_credenciamento,
-            execucao_licitacao
+            valor_credenciamento
         )
 
         success = database_manager.execute_update(insert_query, valores)
         if success:
-            print(f"✅ criterio_execucao_licitacao - Execution record successfully inserted for OM {cod_siafi}.")
+            logging.debug(f"✅ criterio_execucao_licitacao - Execution record successfully inserted for OM {cod_siafi}.")
         else:
             print(f"❌ Error inserting execution data for OM {cod_siafi}.")
 
@@ -1,5 +1,6 @@
 from PyQt6.QtSql import QSqlQuery
 import pandas as pd
+import logging
 
 def insert_munic(database_manager, df):
     """Inserts municipal data from a DataFrame into the database."""
@@ -57,7 +58,7 @@ def insert_munic(database_manager, df):
 
         success = database_manager.execute_update(insert_query, valores)
         if success:
-            print(f"✅ criterio_munic - Execution record successfully inserted for OM {cod_siafi}.")
+            logging.debug(f"✅ criterio_munic - Execution record successfully inserted for OM {cod_siafi}.")
         else:
             print(f"❌ Error inserting data for OM {cod_siafi}.")
 
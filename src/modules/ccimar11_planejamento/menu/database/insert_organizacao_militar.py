@@ -1,5 +1,6 @@
 from PyQt6.QtSql import QSqlQuery
 import pandas as pd
+import logging
 
 def insert_organizacao_militar(database_manager, df):
     """Inserts or updates Military Organizations from a Pandas DataFrame."""
@@ -36,6 +37,6 @@ def insert_organizacao_militar(database_manager, df):
         """
         success = database_manager.execute_update(query, (cod_siafi, sigla_om, nome_om, distrito, uf))
         if success:
-            print(f"✅ {sigla_om} ({cod_siafi}) inserted/updated successfully.")
+            logging.debug(f"✅ {sigla_om} ({cod_siafi}) inserted/updated successfully.")
         else:
             print(f"❌ Error inserting {sigla_om} ({cod_siafi}).")
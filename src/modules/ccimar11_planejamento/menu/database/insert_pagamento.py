@@ -1,5 +1,6 @@
 from PyQt6.QtSql import QSqlQuery
 import pandas as pd
+import logging
 
 def insert_pagamento(database_manager, df):
     """Inserts execution data from a DataFrame into the database."""
@@ -44,7 +45,7 @@ def insert_pagamento(database_manager, df):
 
         success = database_manager.execute_update(insert_query, tuple(valores))
         if success:
-            print(f"✅ criterio_pagamento - Execution record successfully inserted for OM {cod_siafi}.")
+            logging.debug(f"✅ criterio_pagamento - Execution record successfully inserted for OM {cod_siafi}.")
         else:
             print(f"❌ Error inserting execution data for OM {cod_siafi}.")
 
@@ -1,4 +1,5 @@
 import pandas as pd
+import logging
 
 def insert_patrimonio(database_manager, df_data):
     """Inserts patrimony data from a merged DataFrame into the database."""
@@ -63,7 +64,7 @@ def insert_patrimonio(database_manager, df_data):
 
         success = database_manager.execute_update(insert_query, tuple(valores))
         if success:
-            print(f"✅ criterio_patrimonio - Execution record successfully inserted for {cod_siafi}.")
+            logging.debug(f"✅ criterio_patrimonio - Execution record successfully inserted for {cod_siafi}.")
         else:
             print(f"❌ Error inserting patrimony data for OM {cod_siafi}.")
 
@@ -3,6 +3,7 @@
 from PyQt6.QtWidgets import QTreeView, QAbstractItemView
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 from PyQt6.QtCore import Qt
+from assets.styles.theme import set_variant
 from .menu_callbacks import (
     show_criterios_pesos, show_objetivos_navais, show_objetos_auditaveis, show_om_representativas,  
     show_criterio1_execucao_licitacao, show_criterio2_pagamento,
@@ -29,20 +30,7 @@ class TreeMenu(QTreeView):
         self.expandAll()
         self.clicked.connect(self.handle_item_click)
 
-        self.setStyleSheet("""
-            QTreeView { 
-                color: #FFF; 
-                font-size: 16px; 
-            }
-            QTreeView::item:hover {
-                background-color: #2C2F3F;
-                border: #2C2F3F;
-            }
-            QTreeView::item:selected {
-                background-color: #44475A;
-                border: 1px solid #44475A;
-            }
-        """)
+        set_variant(self, "moduleMenu")
 
     def populate_tree(self):
         def add_item(parent, text, callback):
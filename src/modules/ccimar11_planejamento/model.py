@@ -1,4 +1,6 @@
 from database.db_manager import DatabaseManager
+from database.tracing import span
+from database.normalizacao import recriar_com_coluna_gerada
 from .menu.database.insert_munic import insert_munic
 from .menu.database.insert_organizacao_militar import insert_organizacao_militar
 from .menu.database.insert_auditoria import insert_auditoria
@@ -10,6 +12,7 @@ from PyQt6.QtGui import *
 from PyQt6.QtCore import *
 from PyQt6.QtSql import QSqlDatabase, QSqlTableModel, QSqlQuery
 from datetime import datetime
+import sqlite3
 
 class CCIMAR11Model(QObject):
     def __init__(self, database_path, parent=None):
@@ -81,7 +84,13 @@ class CCIMAR11Model(QObject):
                     valor_cons REAL,
                     valor_pregao_eletronico REAL,
                     valor_credenciamento REAL,
-                    valor_total_execucao_licitacao REAL,
+                    -- Total calculado pelo SQLite a partir das modalidades
+                    valor_total_execucao_licitacao REAL GENERATED ALWAYS AS (
+                        COALESCE(valor_convite, 0) + COALESCE(valor_tomada_preco, 0) + COALESCE(valor_concorrencia, 0)
+                        + COALESCE(valor_dispensa, 0) + COALESCE(valor_inexigibilidade, 0) + COALESCE(valor_nao_se_aplica, 0)
+                        + COALESCE(valor_suprimento_fundos, 0) + COALESCE(valor_regime_diferenciado, 0) + COALESCE(valor_cons, 0)
+                        + COALESCE(valor_pregao_eletronico, 0) + COALESCE(valor_credenciamento, 0)
+                    ) STORED,
                     FOREIGN KEY (cod_siafi) REFERENCES organizacoes_militares(cod_siafi)
                 )
             """,
@@ -124,23 +133,53 @@ class CCIMAR11Model(QObject):
             else:
                 print(f"Tabela '{nome_tabela}' criada/verificada com sucesso.")
 
+        self.migrate_generated_columns(tabelas["criterio_execucao_licitacao"])
+
+    def migrate_generated_columns(self, sql_execucao_licitacao):
+        """
+        Bancos antigos gravavam o total da execução de licitação como coluna
+        comum; recria a tabela com a coluna gerada e indexa o total.
+        """
+        try:
+            with self.database_manager as conn:
+                recriar_com_coluna_gerada(
+                    conn, "criterio_execucao_licitacao", sql_execucao_licitacao, "valor_total_execucao_licitacao"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_execucao_licitacao_total "
+                    "ON criterio_execucao_licitacao (valor_total_execucao_licitacao)"
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Erro ao migrar a tabela 'criterio_execucao_licitacao': {e}")
+
     def insert_munic(self, df):
-        insert_munic(self.database_manager, df)
+        with span("insert_munic", "import") as info:
+            info["rows"] = len(df)
+            insert_munic(self.database_manager, df)
 
     def insert_organizacao_militar(self, df):
-        insert_organizacao_militar(self.database_manager, df)
+        with span("insert_organizacao_militar", "import") as info:
+            info["rows"] = len(df)
+            insert_organizacao_militar(self.database_manager, df)
 
     def insert_auditoria(self, cod_siafi, ano_auditoria):
         insert_auditoria(self.db, cod_siafi, ano_auditoria)
 
     def insert_execucao_licitacao(self, df):
-        insert_execucao_licitacao(self.database_manager, df)
+        with span("insert_execucao_licitacao", "import") as info:
+            info["rows"] = len(df)
+            insert_execucao_licitacao(self.database_manager, df)
     
     def insert_pagamento(self, df):
-        insert_pagamento(self.database_manager, df)
+        with span("insert_pagamento", "import") as info:
+            info["rows"] = len(df)
+            insert_pagamento(self.database_manager, df)
 
     def insert_patrimonio(self, df):
-        insert_patrimonio(self.database_manager, df)
+        with span("insert_patrimonio", "import") as info:
+            info["rows"] = len(df) if df is not None else 0
+            insert_patrimonio(self.database_manager, df)
 
     def get_auditoria_statistics(self):
         """Obtém estatísticas das auditorias realizadas."""
@@ -3,6 +3,7 @@
 from PyQt6.QtWidgets import QTreeView, QAbstractItemView
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
 from PyQt6.QtCore import Qt
+from assets.styles.theme import set_variant
 from .menu_callbacks import (  
     show_nota_auditoria_teste1, show_nota_auditoria_teste2,
     show_nota_auditoria_teste3,
@@ -32,20 +33,7 @@ class TreeMenu(QTreeView):
         self.expandAll()
         self.clicked.connect(self.handle_item_click)
 
-        self.setStyleSheet("""
-            QTreeView { 
-                color: #FFF; 
-                font-size: 16px; 
-            }
-            QTreeView::item:hover {
-                background-color: #2C2F3F;
-                border: #2C2F3F;
-            }
-            QTreeView::item:selected {
-                background-color: #44475A;
-                border: 1px solid #44475A;
-            }
-        """)
+        set_variant(self, "moduleMenu")
 
     def populate_tree(self):
         def add_item(parent, text, callback):
@@ -0,0 +1,114 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtSql import QSqlTableModel
+from PyQt6.QtWidgets import QDialog, QHBoxLayout, QLabel, QTableView, QTabWidget, QVBoxLayout, QWidget
+from assets.styles.theme import set_variant
+from utils.search_bar import MultiColumnFilterProxyModel, setup_search_bar
+
+
+class AchadosTabela(QWidget):
+    """
+    Tabela de achados gravada pelas análises do cartão corporativo.
+
+    A tabela é lida direto do banco (QSqlTableModel na conexão do módulo) e
+    pode ser filtrada pela barra de pesquisa e ordenada pelo cabeçalho.
+    """
+
+    def __init__(self, icons, db, table_name, headers=None, hidden_columns=(), item_label="achados", parent=None):
+        super().__init__(parent)
+        self.item_label = item_label
+
+        self.model = QSqlTableModel(self, db)
+        self.model.setTable(table_name)
+        self.model.setEditStrategy(QSqlTableModel.EditStrategy.OnManualSubmit)
+        self.model.select()
+        # Os achados são poucos: carrega todos para a contagem e a busca valerem para a tabela inteira
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        for column, header in (headers or {}).items():
+            index = self.model.fieldIndex(column)
+            if index >= 0:
+                self.model.setHeaderData(index, Qt.Orientation.Horizontal, header)
+
+        self.proxy_model = MultiColumnFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        top_layout = QHBoxLayout()
+        self.search_bar = setup_search_bar(icons, top_layout, self.proxy_model)
+        self.count_label = QLabel(self)
+        top_layout.addWidget(self.count_label)
+        layout.addLayout(top_layout)
+
+        self.table_view = QTableView(self)
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table_view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        set_variant(self.table_view, "data")
+        for column in ("id", *hidden_columns):
+            index = self.model.fieldIndex(column)
+            if index >= 0:
+                self.table_view.hideColumn(index)
+        self.table_view.resizeColumnsToContents()
+        layout.addWidget(self.table_view)
+
+        self.proxy_model.rowsInserted.connect(self.update_count)
+        self.proxy_model.rowsRemoved.connect(self.update_count)
+        self.proxy_model.modelReset.connect(self.update_count)
+        self.proxy_model.layoutChanged.connect(self.update_count)
+        self.update_count()
+
+    def update_count(self, *args):
+        self.count_label.setText(f"{self.proxy_model.rowCount()} de {self.model.rowCount()} {self.item_label}")
+
+
+class AchadosDialog(QDialog):
+    """Exibe uma tabela de achados (``AchadosTabela``) em uma janela."""
+
+    def __init__(self, icons, db, table_name, title, headers=None, hidden_columns=(), parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(1100, 600)
+
+        self.tabela = AchadosTabela(icons, db, table_name, headers, hidden_columns, parent=self)
+        self.model = self.tabela.model
+        self.proxy_model = self.tabela.proxy_model
+        self.table_view = self.tabela.table_view
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.tabela)
+
+
+class AbasAchadosDialog(QDialog):
+    """
+    Exibe várias tabelas de achados em abas.
+
+    ``abas`` é uma lista de dicionários com ``table_name`` e ``label`` e,
+    opcionalmente, ``headers``, ``hidden_columns`` e ``item_label``.
+    """
+
+    def __init__(self, icons, db, title, abas, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(1100, 600)
+
+        self.tabs = QTabWidget(self)
+        self.tabelas = {}
+        for aba in abas:
+            tabela = AchadosTabela(
+                icons,
+                db,
+                aba["table_name"],
+                aba.get("headers"),
+                aba.get("hidden_columns", ()),
+                aba.get("item_label", "achados"),
+                parent=self.tabs,
+            )
+            self.tabelas[aba["table_name"]] = tabela
+            self.tabs.addTab(tabela, aba["label"])
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.tabs)
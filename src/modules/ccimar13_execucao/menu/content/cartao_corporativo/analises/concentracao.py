@@ -0,0 +1,217 @@
+"""
+Concentração de fornecedores por unidade gestora e mês (HHI e participação dos maiores).
+
+Para cada (unidade gestora, competência AAAA-MM) a tabela
+``concentracao_ug_mes`` guarda o índice Herfindahl-Hirschman (soma dos
+quadrados das participações dos favorecidos, de 0 a 10.000), a participação
+do maior favorecido e dos cinco maiores e a quantidade de favorecidos
+distintos.
+
+O cálculo é um único SELECT agregado (soma por favorecido, janela para o
+total e a posição de cada favorecido, agregação final) executado pelo SQLite.
+Depois de uma importação só as UG-meses das transações efetivamente
+inseridas são recalculadas: os pares afetados vão para uma tabela temporária
+e o SELECT percorre apenas essas linhas pelo índice (cod_unidade_gestora,
+data_transacao).
+
+Exercícios arquivados (``database.arquivamento``) já não estão na tabela
+quente: quando o cálculo os envolve, as transações são lidas pela view
+``<tabela>_historico`` de ``conectar_historico``. Exercícios que não couberem
+no limite de anexos do SQLite mantêm as métricas já gravadas.
+"""
+
+import logging
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+
+from database.arquivamento import LIMITE_ANEXOS, conectar_historico, exercicios_arquivados
+from database.db_manager import DatabaseManager
+from database.tracing import span
+
+TABELA_TRANSACOES = "tabela_cartao_corporativo"
+TABELA_CONCENTRACAO = "concentracao_ug_mes"
+
+COLUNAS_CONCENTRACAO = {
+    "cod_unidade_gestora": "TEXT",
+    "competencia": "TEXT",
+    "nome_unidade_gestora": "TEXT",
+    "qtd_transacoes": "INTEGER",
+    "valor_total": "REAL",
+    "qtd_favorecidos": "INTEGER",
+    "hhi": "REAL",
+    "participacao_top1": "REAL",
+    "participacao_top5": "REAL",
+    "maior_favorecido": "TEXT",
+    "atualizado_em": "TEXT",
+}
+
+# HHI a partir do qual o mês é considerado de alta concentração (escala 0-10.000)
+HHI_ALTO = 2500
+
+SQL_CONCENTRACAO = """
+    WITH por_favorecido AS (
+        SELECT t.cod_unidade_gestora AS ug,
+               substr(t.data_transacao, 1, 7) AS competencia,
+               MAX(t.nome_unidade_gestora) AS nome_ug,
+               t.cnpj_cpf_favorecido AS favorecido,
+               MAX(t.nome_favorecido) AS nome_favorecido,
+               SUM(t.valor_transacao) AS valor,
+               COUNT(*) AS qtd
+        FROM {tabela} t
+        {filtro}
+        GROUP BY 1, 2, t.cnpj_cpf_favorecido
+    ),
+    ranqueado AS (
+        SELECT *,
+               SUM(valor) OVER ug_mes AS total,
+               ROW_NUMBER() OVER (PARTITION BY ug, competencia ORDER BY valor DESC) AS posicao
+        FROM por_favorecido
+        WINDOW ug_mes AS (PARTITION BY ug, competencia)
+    )
+    SELECT ug, competencia, MAX(nome_ug), SUM(qtd), ROUND(MAX(total), 2), COUNT(*),
+           ROUND(SUM((valor / total) * (valor / total)) * 10000, 1),
+           ROUND(100.0 * SUM(CASE WHEN posicao = 1 THEN valor END) / MAX(total), 2),
+           ROUND(100.0 * SUM(CASE WHEN posicao <= 5 THEN valor END) / MAX(total), 2),
+           MAX(CASE WHEN posicao = 1 THEN nome_favorecido END),
+           ?
+    FROM ranqueado
+    WHERE total > 0
+    GROUP BY ug, competencia
+"""
+
+FILTRO_TODAS = "WHERE t.valor_transacao > 0 AND t.data_transacao IS NOT NULL"
+# Intervalo de datas ISO da competência: usa o índice (cod_unidade_gestora, data_transacao)
+FILTRO_AFETADAS = """
+        JOIN temp.ug_mes_afetados a
+          ON t.cod_unidade_gestora = a.ug
+         AND t.data_transacao >= a.competencia || '-01'
+         AND t.data_transacao < a.competencia || '-32'
+        WHERE t.valor_transacao > 0
+"""
+
+
+def criar_tabela_concentracao(conn):
+    colunas = ",\n    ".join(f"{nome} {tipo}" for nome, tipo in COLUNAS_CONCENTRACAO.items())
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABELA_CONCENTRACAO} (\n    {colunas},\n"
+        "    PRIMARY KEY (cod_unidade_gestora, competencia)\n)"
+    )
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABELA_CONCENTRACAO}_hhi ON {TABELA_CONCENTRACAO} (hhi)")
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_cartao_ug_data ON {TABELA_TRANSACOES} (cod_unidade_gestora, data_transacao)"
+    )
+
+
+def ultima_transacao(conn):
+    """Maior id da tabela de transações; os ids gravados depois dele são as transações inseridas."""
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {TABELA_TRANSACOES}").fetchone()[0]
+
+
+def ug_meses_inseridas(conn, desde_id):
+    """Pares (cod_unidade_gestora, AAAA-MM) das transações com id maior que ``desde_id``."""
+    return conn.execute(
+        f"SELECT DISTINCT cod_unidade_gestora, substr(data_transacao, 1, 7) FROM {TABELA_TRANSACOES} "
+        "WHERE id > ? AND cod_unidade_gestora IS NOT NULL AND data_transacao IS NOT NULL",
+        (desde_id,),
+    ).fetchall()
+
+
+def atualizar_concentracao(db_path, afetadas=None):
+    """
+    Recalcula as métricas de concentração.
+
+    :param afetadas: Pares (unidade gestora, AAAA-MM) a recalcular; None
+        recalcula tudo a partir das transações (incluindo as arquivadas).
+    :return: Quantidade de UG-meses gravadas.
+    """
+    campos = ", ".join(COLUNAS_CONCENTRACAO)
+    atualizado_em = datetime.now().isoformat(timespec="seconds")
+    with span("atualizar_concentracao", "analise", detail="completa" if afetadas is None else f"{len(afetadas)} UG-meses") as info:
+        with DatabaseManager(db_path) as conn:
+            criar_tabela_concentracao(conn)
+            if afetadas is not None and conn.execute(f"SELECT 1 FROM {TABELA_CONCENTRACAO} LIMIT 1").fetchone() is None:
+                # Primeira execução: ainda não há métricas para atualizar incrementalmente
+                afetadas = None
+
+        # Exercícios arquivados envolvidos no cálculo: os mais recentes são anexados, os demais preservados
+        arquivados = set(exercicios_arquivados(db_path))
+        if afetadas is not None:
+            arquivados &= {_exercicio(competencia) for _, competencia in afetadas}
+        anexados = sorted(arquivados)[-LIMITE_ANEXOS:]
+        preservados = sorted(arquivados - set(anexados))
+        if preservados:
+            logging.warning("Concentração: métricas dos exercícios %s mantidas (fora do limite de anexos).", preservados)
+            if afetadas is not None:
+                afetadas = [par for par in afetadas if _exercicio(par[1]) not in preservados]
+
+        tabela = f"{TABELA_TRANSACOES}_historico" if anexados else TABELA_TRANSACOES
+        origem = closing(conectar_historico(db_path, exercicios=anexados)) if anexados else DatabaseManager(db_path)
+        with origem as conn:
+            with conn:
+                if afetadas is None:
+                    conn.execute(
+                        f"DELETE FROM {TABELA_CONCENTRACAO} WHERE CAST(substr(competencia, 1, 4) AS INTEGER) "
+                        f"NOT IN ({', '.join('?' * len(preservados))})",
+                        preservados,
+                    )
+                    filtro = FILTRO_TODAS
+                else:
+                    conn.execute("CREATE TEMP TABLE IF NOT EXISTS ug_mes_afetados (ug, competencia, PRIMARY KEY (ug, competencia))")
+                    conn.execute("DELETE FROM temp.ug_mes_afetados")
+                    conn.executemany("INSERT OR IGNORE INTO temp.ug_mes_afetados VALUES (?, ?)", afetadas)
+                    # UG-meses que deixaram de ter transações não ficam com métricas antigas
+                    conn.execute(
+                        f"DELETE FROM {TABELA_CONCENTRACAO} WHERE (cod_unidade_gestora, competencia) IN "
+                        "(SELECT CAST(ug AS TEXT), competencia FROM temp.ug_mes_afetados)"
+                    )
+                    filtro = FILTRO_AFETADAS
+                if preservados:
+                    filtro += f" AND CAST(substr(t.data_transacao, 1, 4) AS INTEGER) NOT IN ({', '.join(map(str, preservados))})"
+                gravadas = conn.execute(
+                    f"INSERT OR REPLACE INTO {TABELA_CONCENTRACAO} ({campos}) "
+                    + SQL_CONCENTRACAO.format(tabela=tabela, filtro=filtro),
+                    (atualizado_em,),
+                ).rowcount
+        info["rows"] = gravadas
+    return gravadas
+
+
+def ranking_concentracao(db_path, competencia_inicial=None, competencia_final=None, limite=50):
+    """
+    Unidades gestoras mais concentradas no período (HHI médio ponderado pelo valor de cada mês).
+
+    Lê apenas a tabela de métricas, sem percorrer as transações.
+    """
+    condicoes, parametros = [], []
+    if competencia_inicial:
+        condicoes.append("competencia >= ?")
+        parametros.append(competencia_inicial)
+    if competencia_final:
+        condicoes.append("competencia <= ?")
+        parametros.append(competencia_final)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    with DatabaseManager(db_path) as conn:
+        criar_tabela_concentracao(conn)
+        return pd.read_sql(
+            f"""
+            SELECT cod_unidade_gestora, MAX(nome_unidade_gestora) AS nome_unidade_gestora,
+                   COUNT(*) AS meses, SUM(valor_total) AS valor_total,
+                   ROUND(SUM(hhi * valor_total) / SUM(valor_total), 1) AS hhi_medio,
+                   MAX(hhi) AS hhi_maximo, SUM(hhi >= {HHI_ALTO}) AS meses_alta_concentracao
+            FROM {TABELA_CONCENTRACAO}
+            {where}
+            GROUP BY cod_unidade_gestora
+            HAVING SUM(valor_total) > 0
+            ORDER BY hhi_medio DESC
+            LIMIT ?
+            """,
+            conn,
+            params=[*parametros, limite],
+        )
+
+
+def _exercicio(competencia):
+    ano = str(competencia)[:4]
+    return int(ano) if ano.isdigit() else None
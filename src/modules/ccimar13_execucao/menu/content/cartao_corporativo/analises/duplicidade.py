@@ -0,0 +1,193 @@
+"""
+Impressão digital das transações do CPGF: reimportações e cobranças em duplicidade.
+
+Cada transação recebe ``hash_transacao``, um hash estável (blake2b de 64 bits)
+de portador, favorecido, data, valor e tipo de transação, e ``ocorrencia``, a
+ordem da transação entre as iguais do mesmo arquivo (0, 1, ...). O índice
+único em (hash_transacao, ocorrencia) faz o papel de chave natural:
+
+* reimportar um mês já importado gera os mesmos pares e o ``INSERT OR
+  IGNORE`` descarta cada linha com uma consulta ao índice, sem comparar
+  arquivos;
+* cobranças realmente repetidas no extrato (mesmo portador, favorecido, dia,
+  valor e tipo) têm o mesmo hash com ocorrências diferentes e são mantidas.
+
+A detecção de duplicidade agrupa pelo hash (o índice já entrega as linhas
+agrupadas), sem comparação par a par, e grava ``achados_duplicidade``.
+"""
+
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from database.arquivamento import exercicios_arquivados
+from database.db_manager import DatabaseManager
+from database.normalizacao import registros_para_sql
+from database.tracing import span
+
+TABELA_TRANSACOES = "tabela_cartao_corporativo"
+TABELA_ACHADOS = "achados_duplicidade"
+INDICE_IMPRESSAO = "idx_cartao_impressao"
+
+COLUNAS_IMPRESSAO = ["cpf_portador", "cnpj_cpf_favorecido", "data_transacao", "valor_transacao", "transacao"]
+
+COLUNAS_ACHADOS = {
+    "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+    "cpf_portador": "TEXT",
+    "nome_portador": "TEXT",
+    "cnpj_cpf_favorecido": "TEXT",
+    "nome_favorecido": "TEXT",
+    "cod_unidade_gestora": "TEXT",
+    "transacao": "TEXT",
+    "data_transacao": "TEXT",
+    "valor_transacao": "REAL",
+    "qtd_cobrancas": "INTEGER",
+    "valor_excedente": "REAL",
+    "ids_transacoes": "TEXT",
+    "gerado_em": "TEXT",
+}
+
+
+def impressao_transacoes(df):
+    """
+    Calcula ``hash_transacao`` (inteiro de 64 bits com sinal) e ``ocorrencia`` de cada linha.
+
+    Os campos são normalizados antes do hash (texto sem espaços nas bordas,
+    data AAAA-MM-DD, valor em centavos), então o mesmo lançamento gera o mesmo
+    hash vindo de XLSX, de CSV ou do banco.
+    """
+    texto = {
+        coluna: df[coluna].astype("string").str.strip().fillna("") if coluna in df.columns else pd.Series("", index=df.index)
+        for coluna in COLUNAS_IMPRESSAO
+    }
+    texto["data_transacao"] = texto["data_transacao"].str[:10]
+    if "valor_transacao" in df.columns:
+        centavos = np.rint(pd.to_numeric(df["valor_transacao"], errors="coerce") * 100)
+        texto["valor_transacao"] = pd.Series(centavos, index=df.index).astype("Int64").astype("string").fillna("")
+
+    chaves = texto[COLUNAS_IMPRESSAO[0]].str.cat([texto[c] for c in COLUNAS_IMPRESSAO[1:]], sep="\x1f")
+    hashes = pd.Series(
+        [int.from_bytes(hashlib.blake2b(chave.encode(), digest_size=8).digest(), "big", signed=True) for chave in chaves],
+        index=df.index,
+        dtype=np.int64,
+    )
+    return hashes, hashes.groupby(hashes, sort=False).cumcount()
+
+
+def garantir_coluna_impressao(conn):
+    """
+    Acrescenta ``hash_transacao``/``ocorrencia`` à tabela, preenche linhas antigas e cria o índice único.
+
+    Linhas já duplicadas por reimportações anteriores recebem ocorrências
+    seguidas (ordem do id) e passam a aparecer na detecção de duplicidade.
+    """
+    colunas = {linha[1] for linha in conn.execute(f"PRAGMA table_info({TABELA_TRANSACOES})")}
+    with conn:
+        for coluna in ("hash_transacao", "ocorrencia"):
+            if coluna not in colunas:
+                conn.execute(f"ALTER TABLE {TABELA_TRANSACOES} ADD COLUMN {coluna} INTEGER")
+
+        pendentes = pd.read_sql(
+            f"SELECT id, {', '.join(COLUNAS_IMPRESSAO)} FROM {TABELA_TRANSACOES} WHERE hash_transacao IS NULL ORDER BY id",
+            conn,
+        )
+        if not pendentes.empty:
+            hashes, _ = impressao_transacoes(pendentes)
+            # Ocorrências continuam a partir das já gravadas para o mesmo hash
+            gravadas = dict(conn.execute(
+                f"SELECT hash_transacao, MAX(ocorrencia) + 1 FROM {TABELA_TRANSACOES} "
+                "WHERE hash_transacao IS NOT NULL GROUP BY hash_transacao"
+            ).fetchall())
+            ocorrencias = hashes.groupby(hashes, sort=False).cumcount() + hashes.map(gravadas).fillna(0).astype(np.int64)
+            conn.executemany(
+                f"UPDATE {TABELA_TRANSACOES} SET hash_transacao = ?, ocorrencia = ? WHERE id = ?",
+                zip(hashes.tolist(), ocorrencias.tolist(), pendentes["id"].tolist()),
+            )
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {INDICE_IMPRESSAO} "
+            f"ON {TABELA_TRANSACOES} (hash_transacao, ocorrencia)"
+        )
+    return len(pendentes)
+
+
+def _ja_arquivadas(df, db_path):
+    """Marca as linhas cujo (hash, ocorrência) já está no arquivo anual do exercício."""
+    repetidas = np.zeros(len(df), dtype=bool)
+    arquivados = exercicios_arquivados(db_path)
+    if not arquivados:
+        return repetidas
+    exercicios = pd.Series(np.nan, index=df.index)
+    if "data_transacao" in df.columns:
+        exercicios = pd.to_numeric(df["data_transacao"].astype("string").str[:4], errors="coerce")
+    if "ano_extrato" in df.columns:
+        exercicios = exercicios.fillna(pd.to_numeric(df["ano_extrato"], errors="coerce"))
+    presentes = [int(ano) for ano in exercicios.dropna().unique() if int(ano) in arquivados]
+
+    chaves = pd.MultiIndex.from_arrays([df["hash_transacao"], df["ocorrencia"]])
+    for ano in presentes:
+        with DatabaseManager(arquivados[ano]) as arquivo:
+            colunas = {linha[1] for linha in arquivo.execute(f"PRAGMA table_info({TABELA_TRANSACOES})")}
+            if "hash_transacao" not in colunas:
+                continue
+            gravadas = pd.read_sql(
+                f"SELECT hash_transacao, ocorrencia FROM {TABELA_TRANSACOES} WHERE hash_transacao IS NOT NULL", arquivo
+            )
+        repetidas |= chaves.isin(pd.MultiIndex.from_frame(gravadas)) & (exercicios == ano).to_numpy()
+    return repetidas
+
+
+def importar_transacoes(conn, df, db_path):
+    """
+    Grava as transações de um extrato ignorando as já importadas.
+
+    Retorna (inseridas, ignoradas). Transações de exercícios já arquivados
+    também são conferidas contra o arquivo anual.
+    """
+    garantir_coluna_impressao(conn)
+    df = df.copy()
+    df["hash_transacao"], df["ocorrencia"] = impressao_transacoes(df)
+    repetidas = _ja_arquivadas(df, db_path)
+    novas = df[~repetidas]
+
+    colunas = list(novas.columns)
+    antes = conn.total_changes
+    with conn:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {TABELA_TRANSACOES} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+            registros_para_sql(novas, colunas),
+        )
+    inseridas = conn.total_changes - antes
+    return inseridas, len(df) - inseridas
+
+
+def detectar_duplicidades(db_path):
+    """
+    Grava em ``achados_duplicidade`` as transações com o mesmo hash (mesmo dia) repetidas.
+
+    Retorna a quantidade de grupos de cobranças repetidas.
+    """
+    colunas = [c for c in COLUNAS_ACHADOS if c != "id"]
+    with span("detectar_duplicidades", "analise", detail=str(db_path)) as info:
+        with DatabaseManager(db_path) as conn:
+            garantir_coluna_impressao(conn)
+            definicao = ",\n    ".join(f"{nome} {tipo}" for nome, tipo in COLUNAS_ACHADOS.items())
+            with conn:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {TABELA_ACHADOS} (\n    {definicao}\n)")
+                conn.execute(f"DELETE FROM {TABELA_ACHADOS}")
+                total = conn.execute(
+                    f"""
+                    INSERT INTO {TABELA_ACHADOS} ({', '.join(colunas)})
+                    SELECT MIN(cpf_portador), MIN(nome_portador), MIN(cnpj_cpf_favorecido), MIN(nome_favorecido),
+                           MIN(cod_unidade_gestora), MIN(transacao), MIN(data_transacao), MIN(valor_transacao),
+                           COUNT(*), ROUND(MIN(valor_transacao) * (COUNT(*) - 1), 2), GROUP_CONCAT(id), ?
+                    FROM {TABELA_TRANSACOES}
+                    WHERE hash_transacao IS NOT NULL
+                    GROUP BY hash_transacao
+                    HAVING COUNT(*) > 1
+                    """,
+                    (datetime.now().isoformat(timespec="seconds"),),
+                ).rowcount
+        info["rows"] = total
+    return total
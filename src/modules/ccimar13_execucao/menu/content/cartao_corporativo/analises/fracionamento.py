@@ -0,0 +1,245 @@
+"""
+Detecção de fracionamento de despesa nas transações do CPGF.
+
+Uma despesa é suspeita de fracionamento quando o mesmo portador paga o mesmo
+favorecido, pela mesma unidade gestora, várias vezes dentro de uma janela
+curta de dias e a soma dessas transações ultrapassa o limite legal, embora
+cada uma isoladamente fique abaixo dele.
+
+O cálculo é todo vetorizado: as transações são ordenadas por
+(grupo, data), cada transação vira o fim de uma janela deslizante cujo início
+é achado com ``searchsorted`` e as somas saem de uma soma acumulada. Não há
+comparação par a par, então históricos com milhões de linhas são processados
+em poucos segundos. Janelas sobrepostas do mesmo grupo são fundidas em um
+único achado, gravado na tabela ``achados_fracionamento``.
+
+Janelas podem atravessar a virada do exercício; com exercícios arquivados, as
+transações são lidas da view histórica de ``conectar_historico``.
+"""
+
+from contextlib import closing
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from database.arquivamento import conectar_historico, exercicios_arquivados
+from database.db_manager import DatabaseManager
+from database.tracing import span
+
+TABELA_TRANSACOES = "tabela_cartao_corporativo"
+TABELA_ACHADOS = "achados_fracionamento"
+
+CHAVE_GRUPO = ["cpf_portador", "cnpj_cpf_favorecido", "cod_unidade_gestora"]
+
+# Limites de dispensa por valor (art. 75, I e II, da Lei 14.133/2021),
+# atualizados pelo Decreto 12.343/2024. Ajustar quando houver nova atualização.
+LIMITE_DISPENSA_COMPRAS_SERVICOS = 62725.59
+LIMITE_DISPENSA_OBRAS_ENGENHARIA = 125451.15
+
+# O CPGF paga compras e serviços de pronto pagamento, não obras nem serviços de
+# engenharia; por isso a triagem usa só o limite do inciso II. O limite de obras
+# (inciso I) é o dobro e nada acrescentaria: toda janela acima dele já excede o
+# de compras e serviços. Outro conjunto de regras pode ser passado em
+# ``executar_deteccao(limites=...)`` ou configurado em "cpgf_limites_fracionamento".
+LIMITES_PADRAO = {
+    "dispensa_compras_servicos": LIMITE_DISPENSA_COMPRAS_SERVICOS,
+}
+JANELA_PADRAO_DIAS = 30
+
+COLUNAS_ACHADOS = {
+    "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+    "regra": "TEXT",
+    "cpf_portador": "TEXT",
+    "nome_portador": "TEXT",
+    "cnpj_cpf_favorecido": "TEXT",
+    "nome_favorecido": "TEXT",
+    "cod_unidade_gestora": "TEXT",
+    "data_inicio": "TEXT",
+    "data_fim": "TEXT",
+    "qtd_transacoes": "INTEGER",
+    "valor_total": "REAL",
+    "valor_max_janela": "REAL",
+    "limite": "REAL",
+    "janela_dias": "INTEGER",
+    "ids_transacoes": "TEXT",
+    "gerado_em": "TEXT",
+}
+
+
+def carregar_transacoes(conn, tabela=TABELA_TRANSACOES):
+    """
+    Lê apenas as colunas usadas na detecção e converte a data para dias (int).
+
+    ``data_transacao`` é gravada em ISO pelo importador; registros legados em
+    DD/MM/AAAA também são aceitos. Linhas sem data válida ou sem valor
+    positivo são descartadas.
+    """
+    df = pd.read_sql(
+        f"""
+        SELECT id, cpf_portador, cnpj_cpf_favorecido, cod_unidade_gestora,
+               data_transacao, valor_transacao
+        FROM {tabela}
+        WHERE valor_transacao > 0
+        """,
+        conn,
+    )
+    texto = df["data_transacao"].astype(str)
+    datas = pd.to_datetime(texto.str[:10], format="%Y-%m-%d", errors="coerce")
+    faltantes = datas.isna()
+    if faltantes.any():
+        datas[faltantes] = pd.to_datetime(texto[faltantes], format="%d/%m/%Y", errors="coerce")
+
+    df["dia"] = datas.values.astype("datetime64[D]").astype(np.int64)
+    df = df[datas.notna().values].drop(columns="data_transacao")
+    df["cod_unidade_gestora"] = df["cod_unidade_gestora"].astype(str)
+    return df.reset_index(drop=True)
+
+
+def detectar_fracionamento(transacoes, limite, janela_dias=JANELA_PADRAO_DIAS, regra=""):
+    """
+    Localiza episódios de fracionamento em um DataFrame de transações.
+
+    :param transacoes: DataFrame com ``id``, colunas de ``CHAVE_GRUPO``,
+        ``dia`` (dias desde a época) e ``valor_transacao``.
+    :param limite: Valor que a soma da janela não pode ultrapassar.
+    :param janela_dias: Tamanho da janela deslizante, em dias corridos.
+    :param regra: Nome da regra gravado no achado.
+    :return: DataFrame com um achado por episódio (janelas sobrepostas fundidas).
+    """
+    # Transações acima do limite não são fracionamento; ficam fora do cálculo
+    df = transacoes[transacoes["valor_transacao"] <= limite]
+    if df.empty:
+        return _sem_achados()
+
+    grupo = df.groupby(CHAVE_GRUPO, sort=False, dropna=False).ngroup().to_numpy(np.int64)
+    # Grupos com uma única transação não formam janela
+    repetidos = np.bincount(grupo)[grupo] > 1
+    df = df[repetidos]
+    grupo = grupo[repetidos]
+    if df.empty:
+        return _sem_achados()
+
+    dia = df["dia"].to_numpy(np.int64)
+    ordem = np.lexsort((dia, grupo))
+    grupo, dia = grupo[ordem], dia[ordem]
+    valor = df["valor_transacao"].to_numpy(np.float64)[ordem]
+    ids = df["id"].to_numpy(np.int64)[ordem]
+
+    # Chave única (grupo, dia): grupos distintos ficam separados por mais que a janela
+    dia_base = dia - dia.min()
+    passo = int(dia_base.max()) + janela_dias + 1
+    chave = grupo * passo + dia_base
+
+    # Cada transação fecha a janela [dia - janela + 1, dia] do seu grupo
+    fim = np.arange(len(chave))
+    inicio = np.searchsorted(chave, chave - (janela_dias - 1), side="left")
+    acumulado = np.concatenate(([0.0], np.cumsum(valor)))
+    soma = acumulado[fim + 1] - acumulado[inicio]
+    suspeitas = (soma > limite) & (fim - inicio >= 1)
+    if not suspeitas.any():
+        return _sem_achados()
+
+    # Os inícios são não decrescentes: uma janela abre novo episódio quando
+    # começa depois do fim da janela suspeita anterior
+    ini, fi, so = inicio[suspeitas], fim[suspeitas], soma[suspeitas]
+    novo = np.concatenate(([True], ini[1:] > fi[:-1]))
+    primeira = np.flatnonzero(novo)
+    ultima = np.concatenate((primeira[1:] - 1, [len(novo) - 1]))
+    ep_inicio, ep_fim = ini[primeira], fi[ultima]
+
+    chaves = df.iloc[ordem[ep_inicio]][CHAVE_GRUPO].reset_index(drop=True)
+    achados = chaves.assign(
+        regra=regra,
+        data_inicio=_dias_para_iso(dia[ep_inicio]),
+        data_fim=_dias_para_iso(dia[ep_fim]),
+        qtd_transacoes=ep_fim - ep_inicio + 1,
+        valor_total=np.round(acumulado[ep_fim + 1] - acumulado[ep_inicio], 2),
+        valor_max_janela=np.round(np.maximum.reduceat(so, primeira), 2),
+        limite=limite,
+        janela_dias=janela_dias,
+        ids_transacoes=[",".join(map(str, ids[a:b + 1])) for a, b in zip(ep_inicio, ep_fim)],
+    )
+    return achados
+
+
+def _sem_achados():
+    return pd.DataFrame(columns=[c for c in COLUNAS_ACHADOS if c not in ("id", "nome_portador", "nome_favorecido", "gerado_em")])
+
+
+def _dias_para_iso(dias):
+    return np.datetime_as_string(dias.astype("datetime64[D]"), unit="D")
+
+
+def criar_tabela_achados(conn):
+    colunas = ",\n    ".join(f"{nome} {tipo}" for nome, tipo in COLUNAS_ACHADOS.items())
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {TABELA_ACHADOS} (\n    {colunas}\n)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABELA_ACHADOS}_portador ON {TABELA_ACHADOS} (cpf_portador)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABELA_ACHADOS}_ug ON {TABELA_ACHADOS} (cod_unidade_gestora)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABELA_ACHADOS}_regra_valor ON {TABELA_ACHADOS} (regra, valor_total)")
+
+
+def _nomes_por_id(conn, ids, tabela=TABELA_TRANSACOES):
+    """Busca nome do portador e do favorecido das transações indicadas."""
+    nomes = {}
+    ids = list(ids)
+    for i in range(0, len(ids), 900):  # limite de parâmetros do SQLite
+        lote = ids[i:i + 900]
+        marcadores = ",".join("?" * len(lote))
+        for id_, portador, favorecido in conn.execute(
+            f"SELECT id, nome_portador, nome_favorecido FROM {tabela} WHERE id IN ({marcadores})",
+            lote,
+        ):
+            nomes[id_] = (portador, favorecido)
+    return nomes
+
+
+def salvar_achados(conn, achados, tabela=TABELA_TRANSACOES):
+    """Substitui os achados gravados pelos novos, em uma única transação."""
+    criar_tabela_achados(conn)
+    primeiro_id = [int(ids.split(",", 1)[0]) for ids in achados["ids_transacoes"]]
+    nomes = _nomes_por_id(conn, primeiro_id, tabela)
+    gerado_em = datetime.now().isoformat(timespec="seconds")
+
+    colunas = [c for c in COLUNAS_ACHADOS if c != "id"]
+    registros = []
+    for id_, linha in zip(primeiro_id, achados.itertuples(index=False)):
+        registro = linha._asdict()
+        registro["nome_portador"], registro["nome_favorecido"] = nomes.get(id_, (None, None))
+        registro["gerado_em"] = gerado_em
+        registros.append(tuple(
+            registro[c].item() if hasattr(registro[c], "item") else registro[c] for c in colunas
+        ))
+
+    with conn:
+        conn.execute(f"DELETE FROM {TABELA_ACHADOS}")
+        conn.executemany(
+            f"INSERT INTO {TABELA_ACHADOS} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+            registros,
+        )
+    return len(registros)
+
+
+def executar_deteccao(db_path, limites=None, janela_dias=JANELA_PADRAO_DIAS):
+    """
+    Executa a detecção para cada regra de ``limites`` e grava os achados.
+
+    :param db_path: Banco que contém ``tabela_cartao_corporativo``.
+    :param limites: Dicionário regra -> limite (padrão: ``LIMITES_PADRAO``).
+    :return: Quantidade de achados gravados.
+    """
+    limites = limites or LIMITES_PADRAO
+    with span("detectar_fracionamento", "analise", detail=f"janela={janela_dias}") as info:
+        arquivados = exercicios_arquivados(db_path)
+        tabela = f"{TABELA_TRANSACOES}_historico" if arquivados else TABELA_TRANSACOES
+        origem = closing(conectar_historico(db_path)) if arquivados else DatabaseManager(db_path)
+        with origem as conn:
+            transacoes = carregar_transacoes(conn, tabela)
+            resultados = [
+                detectar_fracionamento(transacoes, limite, janela_dias, regra)
+                for regra, limite in limites.items()
+            ]
+            achados = pd.concat(resultados, ignore_index=True)
+            total = salvar_achados(conn, achados, tabela)
+        info["rows"] = total
+    return total
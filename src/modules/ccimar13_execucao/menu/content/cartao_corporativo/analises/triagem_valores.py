@@ -0,0 +1,441 @@
+"""
+Triagem estatística de valores: Lei de Benford, outliers robustos e valores redondos.
+
+Para cada grupo (unidade gestora no CPGF, coluna de critério no ccimar11) são
+calculados, em passagens vetorizadas do NumPy sobre todas as linhas:
+
+* distribuição do primeiro e do segundo dígito significativo comparada à Lei
+  de Benford (desvio absoluto médio, MAD, com as faixas de conformidade de
+  Nigrini, e qui-quadrado);
+* z-score robusto (mediana/MAD) do log10 do valor: valores monetários têm
+  cauda longa e, na escala log, a mediana/MAD descrevem o grupo sem que as
+  poucas despesas altas inflem a dispersão;
+* frequência de valores redondos (múltiplos de R$ 100,00).
+
+Nenhum cálculo percorre linha a linha: dígitos saem da aritmética inteira
+sobre centavos, medianas por grupo de uma única ordenação (``lexsort``) e
+contagens de ``bincount``. O resultado é gravado por lote de importação: uma
+impressão digital da tabela (quantidade, maior id e soma dos valores) fica em
+``triagem_lotes`` e, enquanto ela não muda, a triagem reaproveita as tabelas
+gravadas sem recalcular.
+"""
+
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from database.db_manager import DatabaseManager
+from database.normalizacao import registros_para_sql
+from database.tracing import span
+
+TABELA_TRANSACOES = "tabela_cartao_corporativo"
+TABELA_LOTES = "triagem_lotes"
+TABELA_ESTATISTICAS = "triagem_estatisticas"
+TABELA_BENFORD = "triagem_benford"
+TABELA_SINALIZADAS = "triagem_sinalizadas"
+TABELA_CRITERIOS_SINALIZADOS = "triagem_criterios_sinalizados"
+
+# Colunas monetárias dos critérios do ccimar11 (a coluna gerada de total fica de fora)
+COLUNAS_MONETARIAS_CRITERIOS = {
+    "criterio_execucao_licitacao": [
+        "valor_convite", "valor_tomada_preco", "valor_concorrencia", "valor_dispensa",
+        "valor_inexigibilidade", "valor_nao_se_aplica", "valor_suprimento_fundos",
+        "valor_regime_diferenciado", "valor_cons", "valor_pregao_eletronico", "valor_credenciamento",
+    ],
+    "criterio_pagamento": ["folha_de_pagamento_total"],
+    "criterio_munic": ["despesa_autorizada"],
+    "criterio_patrimonio": [
+        "total_geral_bens_moveis", "importacoes_em_andamento_bens_moveis", "total_geral_bens_imoveis",
+        "importacoes_em_andamento_bens_imoveis", "bens_imoveis_a_classificar",
+    ],
+}
+
+# Benford só vale para valores com ao menos dois dígitos significativos em reais
+VALOR_MINIMO_BENFORD = 10.0
+# Abaixo disso a distribuição de dígitos do grupo não é conclusiva
+AMOSTRA_MINIMA_BENFORD = 100
+# z-score robusto a partir do qual a transação é sinalizada (Iglewicz e Hoaglin)
+LIMIAR_Z = 3.5
+# Valor redondo: múltiplo de R$ 100,00 (em centavos); sinalizado a partir do valor mínimo
+CENTAVOS_REDONDO = 10000
+VALOR_MINIMO_REDONDO = 1000.0
+# Faixas de MAD de Nigrini para o primeiro e o segundo dígito
+FAIXAS_CONFORMIDADE = {
+    1: [(0.006, "Conformidade próxima"), (0.012, "Conformidade aceitável"), (0.015, "Conformidade marginal")],
+    2: [(0.008, "Conformidade próxima"), (0.010, "Conformidade aceitável"), (0.012, "Conformidade marginal")],
+}
+
+BENFORD_PRIMEIRO = np.log10(1 + 1 / np.arange(1, 10))
+BENFORD_SEGUNDO = np.log10(1 + 1 / (10 * np.arange(1, 10)[:, None] + np.arange(10))).sum(axis=0)
+
+COLUNAS_LOTES = {
+    "tabela": "TEXT PRIMARY KEY",
+    "lote": "TEXT",
+    "qtd_linhas": "INTEGER",
+    "qtd_sinalizadas": "INTEGER",
+    "gerado_em": "TEXT",
+}
+
+COLUNAS_ESTATISTICAS = {
+    "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+    "escopo": "TEXT",
+    "qtd": "INTEGER",
+    "valor_total": "REAL",
+    "mediana": "REAL",
+    "mad_log": "REAL",
+    "qtd_outliers": "INTEGER",
+    "pct_redondos": "REAL",
+    "qtd_benford": "INTEGER",
+    "mad_primeiro_digito": "REAL",
+    "qui2_primeiro_digito": "REAL",
+    "conformidade_primeiro_digito": "TEXT",
+    "mad_segundo_digito": "REAL",
+    "qui2_segundo_digito": "REAL",
+    "conformidade_segundo_digito": "TEXT",
+    "lote": "TEXT",
+}
+
+COLUNAS_BENFORD = {
+    "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+    "escopo": "TEXT",
+    "posicao": "INTEGER",
+    "digito": "INTEGER",
+    "qtd": "INTEGER",
+    "observado": "REAL",
+    "esperado": "REAL",
+    "lote": "TEXT",
+}
+
+COLUNAS_SINALIZADAS = {
+    "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+    "id_transacao": "INTEGER",
+    "motivo": "TEXT",
+    "cod_unidade_gestora": "TEXT",
+    "cpf_portador": "TEXT",
+    "nome_portador": "TEXT",
+    "cnpj_cpf_favorecido": "TEXT",
+    "nome_favorecido": "TEXT",
+    "data_transacao": "TEXT",
+    "valor_transacao": "REAL",
+    "z_robusto": "REAL",
+    "mediana_ug": "REAL",
+    "lote": "TEXT",
+}
+
+COLUNAS_CRITERIOS_SINALIZADOS = {
+    "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+    "tabela": "TEXT",
+    "coluna": "TEXT",
+    "cod_siafi": "INTEGER",
+    "sigla_om": "TEXT",
+    "motivo": "TEXT",
+    "valor": "REAL",
+    "z_robusto": "REAL",
+    "mediana": "REAL",
+    "lote": "TEXT",
+}
+
+
+def digitos_significativos(centavos):
+    """
+    Primeiro e segundo dígitos significativos de valores inteiros positivos.
+
+    Os valores em centavos têm os mesmos dígitos significativos dos valores em
+    reais; a aritmética inteira evita erros de ponto flutuante em ``log10``.
+    """
+    centavos = np.asarray(centavos, dtype=np.int64)
+    expoente = np.floor(np.log10(centavos)).astype(np.int64)
+    # log10 pode errar por um perto das potências de 10
+    expoente += centavos >= 10 ** (expoente + 1)
+    expoente -= centavos < 10 ** expoente
+    potencia = 10 ** expoente
+    primeiro = centavos // potencia
+    segundo = (centavos * 10 // potencia) % 10
+    return primeiro, segundo
+
+
+def mediana_por_grupo(valores, grupos, n_grupos):
+    """Mediana de ``valores`` em cada grupo (códigos 0..n_grupos-1) com uma única ordenação."""
+    ordem = np.lexsort((valores, grupos))
+    ordenados = valores[ordem]
+    contagem = np.bincount(grupos, minlength=n_grupos)
+    inicio = np.cumsum(contagem) - contagem
+    medianas = np.full(n_grupos, np.nan)
+    com_dados = contagem > 0
+    baixo = (inicio + (contagem - 1) // 2)[com_dados]
+    alto = (inicio + contagem // 2)[com_dados]
+    medianas[com_dados] = (ordenados[baixo] + ordenados[alto]) / 2
+    return medianas
+
+
+def z_robusto(valores, grupos, n_grupos):
+    """
+    z-score robusto do log10 de ``valores`` dentro de cada grupo.
+
+    Retorna (z por linha, mediana do log10 por grupo, MAD do log10 por grupo).
+    Grupos com MAD zero usam o desvio absoluto médio (escala equivalente);
+    se também for zero, o z do grupo é zero.
+    """
+    log = np.log10(valores)
+    mediana = mediana_por_grupo(log, grupos, n_grupos)
+    desvio = np.abs(log - mediana[grupos])
+    mad = mediana_por_grupo(desvio, grupos, n_grupos)
+
+    escala = mad / 0.6745
+    sem_mad = ~(mad > 0)
+    if sem_mad.any():
+        contagem = np.bincount(grupos, minlength=n_grupos)
+        desvio_medio = np.bincount(grupos, weights=desvio, minlength=n_grupos) / np.maximum(contagem, 1)
+        escala[sem_mad] = desvio_medio[sem_mad] * 1.253314
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (log - mediana[grupos]) / escala[grupos]
+    z[~np.isfinite(z)] = 0.0
+    return z, mediana, mad
+
+
+def triar_valores(valores, grupos, escopos):
+    """
+    Executa a triagem sobre valores positivos agrupados.
+
+    :param valores: Valores em reais (array de floats positivos).
+    :param grupos: Código do grupo de cada valor (inteiros 0..len(escopos)-1).
+    :param escopos: Nome de cada grupo, gravado na coluna ``escopo``.
+    :return: (DataFrame por linha com ``z_robusto``, ``outlier`` e ``redondo``;
+        DataFrame de estatísticas por grupo; DataFrame da distribuição de dígitos).
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    grupos = np.asarray(grupos, dtype=np.int64)
+    n_grupos = len(escopos)
+    centavos = np.rint(valores * 100).astype(np.int64)
+
+    z, mediana_log, mad_log = z_robusto(valores, grupos, n_grupos)
+    outlier = np.abs(z) >= LIMIAR_Z
+    redondo = centavos % CENTAVOS_REDONDO == 0
+
+    contagem = np.bincount(grupos, minlength=n_grupos)
+    com_dados = np.maximum(contagem, 1)
+    estatisticas = pd.DataFrame({
+        "escopo": escopos,
+        "qtd": contagem,
+        "valor_total": np.round(np.bincount(grupos, weights=valores, minlength=n_grupos), 2),
+        "mediana": np.round(10 ** mediana_log, 2),
+        "mad_log": np.round(mad_log, 4),
+        "qtd_outliers": np.bincount(grupos, weights=outlier, minlength=n_grupos).astype(np.int64),
+        "pct_redondos": np.round(100 * np.bincount(grupos, weights=redondo, minlength=n_grupos) / com_dados, 2),
+    })
+
+    # Benford: contagens por (grupo, dígito) em um único bincount por posição
+    elegiveis = valores >= VALOR_MINIMO_BENFORD
+    primeiro, segundo = digitos_significativos(centavos[elegiveis])
+    grupos_benford = grupos[elegiveis]
+    qtd_benford = np.bincount(grupos_benford, minlength=n_grupos)
+    estatisticas["qtd_benford"] = qtd_benford
+
+    distribuicoes = []
+    for posicao, digitos, esperado, primeiro_digito in (
+        (1, primeiro, BENFORD_PRIMEIRO, 1),
+        (2, segundo, BENFORD_SEGUNDO, 0),
+    ):
+        n_digitos = len(esperado)
+        qtd = np.bincount(
+            grupos_benford * n_digitos + (digitos - primeiro_digito), minlength=n_grupos * n_digitos
+        ).reshape(n_grupos, n_digitos)
+        observado = qtd / np.maximum(qtd_benford, 1)[:, None]
+        mad = np.abs(observado - esperado).mean(axis=1)
+        qui2 = (qtd_benford[:, None] * (observado - esperado) ** 2 / esperado).sum(axis=1)
+        nome = "primeiro" if posicao == 1 else "segundo"
+        estatisticas[f"mad_{nome}_digito"] = np.round(mad, 5)
+        estatisticas[f"qui2_{nome}_digito"] = np.round(qui2, 2)
+        estatisticas[f"conformidade_{nome}_digito"] = _conformidade(mad, qtd_benford, posicao)
+        distribuicoes.append(pd.DataFrame({
+            "escopo": np.repeat(np.asarray(escopos, dtype=object), n_digitos),
+            "posicao": posicao,
+            "digito": np.tile(np.arange(primeiro_digito, primeiro_digito + n_digitos), n_grupos),
+            "qtd": qtd.ravel(),
+            "observado": np.round(observado.ravel(), 5),
+            "esperado": np.round(np.tile(esperado, n_grupos), 5),
+        }))
+
+    por_linha = pd.DataFrame({
+        "z_robusto": np.round(z, 3),
+        "mediana": estatisticas["mediana"].to_numpy()[grupos],
+        "outlier": outlier,
+        "redondo": redondo,
+    })
+    return por_linha, estatisticas, pd.concat(distribuicoes, ignore_index=True)
+
+
+def _conformidade(mad, qtd, posicao):
+    rotulos = np.full(len(mad), "Não conformidade", dtype=object)
+    for limite, rotulo in reversed(FAIXAS_CONFORMIDADE[posicao]):
+        rotulos[mad <= limite] = rotulo
+    rotulos[qtd < AMOSTRA_MINIMA_BENFORD] = "Amostra insuficiente"
+    return rotulos
+
+
+def _motivos(por_linha, valores):
+    """Motivo da sinalização de cada linha ('' quando não sinalizada)."""
+    outlier = por_linha["outlier"].to_numpy()
+    redondo = por_linha["redondo"].to_numpy() & (valores >= VALOR_MINIMO_REDONDO)
+    motivos = np.full(len(outlier), "", dtype=object)
+    motivos[outlier] = "Valor atípico"
+    motivos[redondo] = "Valor redondo"
+    motivos[outlier & redondo] = "Valor atípico; valor redondo"
+    return motivos
+
+
+def impressao_digital(conn, tabela, coluna_id, colunas_valor):
+    """Identifica o lote de dados atual da tabela (muda a cada importação ou exclusão)."""
+    somas = ", ".join(f"TOTAL({coluna})" for coluna in colunas_valor)
+    linha = conn.execute(f"SELECT COUNT(*), MAX({coluna_id}), {somas} FROM {tabela}").fetchone()
+    return hashlib.blake2b(repr(linha).encode(), digest_size=8).hexdigest(), linha[0]
+
+
+def lote_gravado(conn, tabela):
+    """Retorna (lote, qtd_sinalizadas) da última triagem gravada de ``tabela``, ou (None, 0)."""
+    criar_tabela(conn, TABELA_LOTES, COLUNAS_LOTES)
+    linha = conn.execute(f"SELECT lote, qtd_sinalizadas FROM {TABELA_LOTES} WHERE tabela = ?", (tabela,)).fetchone()
+    return linha or (None, 0)
+
+
+def criar_tabela(conn, nome, colunas):
+    definicao = ",\n    ".join(f"{coluna} {tipo}" for coluna, tipo in colunas.items())
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {nome} (\n    {definicao}\n)")
+
+
+def _substituir(conn, nome, colunas, df):
+    """Troca as linhas gravadas em ``nome`` pelas de ``df``."""
+    criar_tabela(conn, nome, colunas)
+    lista = [coluna for coluna in colunas if coluna != "id"]
+    conn.execute(f"DELETE FROM {nome}")
+    conn.executemany(
+        f"INSERT INTO {nome} ({', '.join(lista)}) VALUES ({', '.join('?' * len(lista))})",
+        registros_para_sql(df, lista),
+    )
+
+
+def _gravar_lote(conn, tabela, lote, qtd_linhas, qtd_sinalizadas):
+    conn.execute(
+        f"INSERT OR REPLACE INTO {TABELA_LOTES} (tabela, lote, qtd_linhas, qtd_sinalizadas, gerado_em) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (tabela, lote, qtd_linhas, qtd_sinalizadas, datetime.now().isoformat(timespec="seconds")),
+    )
+
+
+def _detalhes_por_id(conn, ids):
+    """Busca as colunas descritivas apenas das transações sinalizadas."""
+    colunas = ["id", "cpf_portador", "nome_portador", "cnpj_cpf_favorecido", "nome_favorecido", "data_transacao"]
+    partes = []
+    ids = [int(i) for i in ids]
+    for i in range(0, len(ids), 900):  # limite de parâmetros do SQLite
+        lote = ids[i:i + 900]
+        partes.append(pd.read_sql(
+            f"SELECT {', '.join(colunas)} FROM {TABELA_TRANSACOES} WHERE id IN ({','.join('?' * len(lote))})",
+            conn,
+            params=lote,
+        ))
+    return pd.concat(partes, ignore_index=True)
+
+
+def executar_triagem_cpgf(db_path, forcar=False):
+    """
+    Triagem das transações do CPGF por unidade gestora.
+
+    Se o lote atual da tabela já foi triado, reaproveita o resultado gravado
+    (salvo com ``forcar``). Retorna a quantidade de transações sinalizadas.
+    """
+    with span("triagem_cpgf", "analise", detail=str(db_path)) as info:
+        with DatabaseManager(db_path) as conn:
+            lote, qtd_linhas = impressao_digital(conn, TABELA_TRANSACOES, "id", ["valor_transacao"])
+            lote_anterior, sinalizadas = lote_gravado(conn, TABELA_TRANSACOES)
+            if lote == lote_anterior and not forcar:
+                info["rows"] = 0
+                return sinalizadas
+
+            transacoes = pd.read_sql(
+                f"SELECT id, cod_unidade_gestora, valor_transacao FROM {TABELA_TRANSACOES} WHERE valor_transacao > 0",
+                conn,
+            )
+            codigos, escopos = pd.factorize(transacoes["cod_unidade_gestora"].astype(str), sort=True)
+            valores = transacoes["valor_transacao"].to_numpy(np.float64)
+            por_linha, estatisticas, benford = triar_valores(valores, codigos, list(escopos))
+
+            motivos = _motivos(por_linha, valores)
+            marcadas = np.flatnonzero(motivos != "")
+            sinalizadas = transacoes.iloc[marcadas].rename(columns={"id": "id_transacao"}).assign(
+                motivo=motivos[marcadas],
+                z_robusto=por_linha["z_robusto"].to_numpy()[marcadas],
+                mediana_ug=por_linha["mediana"].to_numpy()[marcadas],
+                lote=lote,
+            )
+            if not sinalizadas.empty:
+                detalhes = _detalhes_por_id(conn, sinalizadas["id_transacao"]).rename(columns={"id": "id_transacao"})
+                sinalizadas = sinalizadas.merge(detalhes, on="id_transacao", how="left")
+
+            with conn:
+                _substituir(conn, TABELA_ESTATISTICAS, COLUNAS_ESTATISTICAS, estatisticas.assign(lote=lote))
+                _substituir(conn, TABELA_BENFORD, COLUNAS_BENFORD, benford.assign(lote=lote))
+                _substituir(conn, TABELA_SINALIZADAS, COLUNAS_SINALIZADAS, sinalizadas)
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABELA_SINALIZADAS}_ug ON {TABELA_SINALIZADAS} (cod_unidade_gestora)")
+                _gravar_lote(conn, TABELA_TRANSACOES, lote, qtd_linhas, len(sinalizadas))
+        info["rows"] = len(transacoes)
+    return len(sinalizadas)
+
+
+def executar_triagem_criterios(db_path, forcar=False):
+    """
+    Triagem das colunas monetárias dos critérios do ccimar11.
+
+    Cada coluna é um grupo: o escopo gravado é ``tabela.coluna`` e o z-score
+    compara cada OM com as demais naquele critério. Retorna a quantidade de
+    valores sinalizados.
+    """
+    with span("triagem_criterios", "analise", detail=str(db_path)) as info:
+        with DatabaseManager(db_path) as conn:
+            existentes = {nome for (nome,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            criterios = {t: c for t, c in COLUNAS_MONETARIAS_CRITERIOS.items() if t in existentes}
+            lotes = [impressao_digital(conn, tabela, "rowid", colunas) for tabela, colunas in criterios.items()]
+            lote = hashlib.blake2b(repr(lotes).encode(), digest_size=8).hexdigest()
+            lote_anterior, sinalizados = lote_gravado(conn, "criterios")
+            if lote == lote_anterior and not forcar:
+                info["rows"] = 0
+                return sinalizados
+
+            partes = []
+            for tabela, colunas in criterios.items():
+                largo = pd.read_sql(
+                    f"SELECT t.cod_siafi, om.sigla_om, {', '.join('t.' + c for c in colunas)} FROM {tabela} t "
+                    "LEFT JOIN organizacoes_militares om ON om.cod_siafi = t.cod_siafi",
+                    conn,
+                )
+                longo = largo.melt(id_vars=["cod_siafi", "sigla_om"], var_name="coluna", value_name="valor")
+                partes.append(longo.assign(tabela=tabela))
+            valores_df = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(
+                columns=["cod_siafi", "sigla_om", "coluna", "valor", "tabela"]
+            )
+            valores_df["valor"] = pd.to_numeric(valores_df["valor"], errors="coerce")
+            valores_df = valores_df[valores_df["valor"] > 0].reset_index(drop=True)
+
+            escopo = valores_df["tabela"] + "." + valores_df["coluna"]
+            codigos, escopos = pd.factorize(escopo, sort=True)
+            valores = valores_df["valor"].to_numpy(np.float64)
+            por_linha, estatisticas, benford = triar_valores(valores, codigos, list(escopos))
+
+            # Cada OM declara um valor por critério: só valores atípicos são sinalizados
+            marcadas = np.flatnonzero(por_linha["outlier"].to_numpy())
+            sinalizados = valores_df.iloc[marcadas].assign(
+                motivo="Valor atípico",
+                z_robusto=por_linha["z_robusto"].to_numpy()[marcadas],
+                mediana=por_linha["mediana"].to_numpy()[marcadas],
+                lote=lote,
+            )
+
+            with conn:
+                _substituir(conn, TABELA_ESTATISTICAS, COLUNAS_ESTATISTICAS, estatisticas.assign(lote=lote))
+                _substituir(conn, TABELA_BENFORD, COLUNAS_BENFORD, benford.assign(lote=lote))
+                _substituir(conn, TABELA_CRITERIOS_SINALIZADOS, COLUNAS_CRITERIOS_SINALIZADOS, sinalizados)
+                _gravar_lote(conn, "criterios", lote, len(valores_df), len(sinalizados))
+        info["rows"] = len(valores_df)
+    return len(sinalizados)
@@ -1,19 +1,38 @@
-from PyQt6.QtCore import QObject
-from PyQt6.QtWidgets import QFileDialog, QMessageBox
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox
 from PyQt6.QtCore import Qt
 import pandas as pd
+from utils.planilha_cache import ler_planilha
 import chardet
 import webbrowser
 from .dashboard.dash_popup import DashboardPopup
+from .analises.achados_dialog import AbasAchadosDialog, AchadosDialog
+from .analises.fracionamento import LIMITES_PADRAO, TABELA_ACHADOS, executar_deteccao
+from .analises.duplicidade import TABELA_ACHADOS as TABELA_DUPLICIDADES, detectar_duplicidades, importar_transacoes
+from .analises.concentracao import TABELA_CONCENTRACAO, atualizar_concentracao, ug_meses_inseridas, ultima_transacao
+from .analises.triagem_valores import TABELA_ESTATISTICAS, TABELA_SINALIZADAS, executar_triagem_cpgf
+from database.tracing import span
+from database.arquivamento import exercicio_de_corte, iniciar_manutencao
+from database.backup import iniciar_snapshot
+from database.resolucao_entidades import iniciar_resolucao
+from database.normalizacao import serie_data_iso, serie_valor_monetario
+from paths.config_path import load_config
 
 class CartaoCorporativoController(QObject): 
+    # Emitido pela thread de manutenção; a conexão enfileirada traz o resultado para a interface
+    maintenanceFinished = pyqtSignal(dict)
+    # Snapshot anterior ao arquivamento (caminho do manifesto ou None)
+    preArchiveSnapshotFinished = pyqtSignal(object)
+
     def __init__(self, icons, view, model):
         super().__init__()
         self.icons = icons
         self.view = view
         self.model = model  # 🔹 Agora estamos passando diretamente o QSqlTableModel
+        self.archiving = False  # Arquivamento pedido pelo usuário em andamento
 
         self.setup_connections()
+        self.start_maintenance()
 
     def setup_connections(self):
         """Conecta os sinais da View ao Controller"""
@@ -21,22 +40,261 @@ class CartaoCorporativoController(QObject):
         self.view.rowDoubleClicked.connect(self.row_double_clicked)
         self.view.linkDataCartaoPagamentoGov.connect(self.open_link)  # 🔹 Conecta o botão ao método
         self.view.open_dashboard.connect(self.open_dashboard)  # 🔹 Conecta o botão ao métod
+        self.view.detectFracionamento.connect(self.detect_fracionamento)
+        self.view.screenValores.connect(self.screen_valores)
+        self.view.detectDuplicidades.connect(self.detect_duplicidades)
+        self.view.showConcentracao.connect(self.show_concentracao)
+        self.view.archiveExercicios.connect(self.archive_exercicios)
+        self.maintenanceFinished.connect(self.on_maintenance_finished)
+        self.preArchiveSnapshotFinished.connect(self.on_pre_archive_snapshot_finished)
+
+    def start_maintenance(self):
+        """Compacta o banco em segundo plano (o arquivamento só roda por ``archive_exercicios``)."""
+        iniciar_manutencao(self.model.database_manager.db_path, ao_terminar=self.maintenanceFinished.emit)
+
+    def archive_exercicios(self):
+        """Move os exercícios fechados para os arquivos anuais, após confirmação e snapshot prévio."""
+        corte = exercicio_de_corte()
+        reply = QMessageBox.question(
+            self.view, "Arquivar exercícios",
+            f"As transações anteriores a {corte} serão movidas para os arquivos anuais e deixarão de "
+            "aparecer na tabela, no dashboard, na exportação e nas análises.\n\nDeseja continuar?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            # Snapshot em segundo plano antes de excluir as linhas; o arquivamento segue em on_pre_archive_snapshot_finished
+            self.view.setEnabled(False)
+            iniciar_snapshot(
+                self.model.database_manager.db_path, "pre_arquivamento", ao_terminar=self.preArchiveSnapshotFinished.emit
+            )
+
+    def on_pre_archive_snapshot_finished(self, snapshot):
+        if snapshot is None:
+            self.view.setEnabled(True)
+            QMessageBox.warning(self.view, "Backup", "Não foi possível criar o backup prévio. O arquivamento foi cancelado.")
+            return
+        thread = iniciar_manutencao(
+            self.model.database_manager.db_path, ao_terminar=self.maintenanceFinished.emit, arquivar=True
+        )
+        self.archiving = thread is not None
+        if thread is None:
+            self.view.setEnabled(True)
+            QMessageBox.information(self.view, "Arquivar exercícios", "Já há uma manutenção em andamento. Tente novamente em instantes.")
+
+    def on_maintenance_finished(self, resultado):
+        """Recarrega a tabela e informa os exercícios movidos para os arquivos anuais."""
+        if not self.archiving:
+            return
+        self.archiving = False
+        self.view.setEnabled(True)
+        if resultado.get("erro"):
+            QMessageBox.warning(self.view, "Arquivar exercícios", f"Falha ao arquivar os exercícios: {resultado['erro']}")
+            return
+        exercicios = resultado.get("exercicios")
+        if exercicios:
+            self.view.model.select()
+            resumo = "\n".join(f"{ano}: {linhas} transações" for ano, linhas in exercicios.items())
+            QMessageBox.information(self.view, "Arquivar exercícios", f"Exercícios arquivados:\n{resumo}")
+        else:
+            QMessageBox.information(self.view, "Arquivar exercícios", "Nenhum exercício fechado a arquivar.")
         
     def open_dashboard(self):
         """Abre o popup do dashboard com os dados do model."""
-        data = self.model.get_all_model_data()
+        # Órgãos de todos os exercícios, inclusive os arquivados
+        df_unique_orgaos = self.model.get_orgaos()
 
-        if not data:
+        if df_unique_orgaos.empty:
             QMessageBox.warning(self.view, "Aviso", "Nenhum dado disponível para exibir no Dashboard.")
             return
 
-        # 🔹 Converter para DataFrame caso `data` seja uma lista de dicionários
-        df_unique_orgaos = pd.DataFrame(data)[["cod_orgao", "nome_orgao"]].drop_duplicates()
-
         self.dashboard_popup = DashboardPopup(df_unique_orgaos, self.model.get_data_for_orgao)
 
         self.dashboard_popup.exec()
 
+    def detect_fracionamento(self):
+        """Executa a detecção de fracionamento e exibe os achados gravados."""
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            # Regras e limites podem ser ajustados na configuração (regra -> valor em R$)
+            limites = load_config("cpgf_limites_fracionamento", LIMITES_PADRAO)
+            total = executar_deteccao(self.model.database_manager.db_path, limites)
+        except Exception as e:
+            QMessageBox.warning(self.view, "Erro", f"Falha ao detectar fracionamento: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if not total:
+            QMessageBox.information(self.view, "Fracionamento", "Nenhum indício de fracionamento encontrado.")
+            return
+
+        self.achados_dialog = AchadosDialog(
+            self.icons,
+            self.model.db,
+            TABELA_ACHADOS,
+            f"Indícios de Fracionamento ({total})",
+            headers={
+                "regra": "Regra",
+                "cpf_portador": "CPF Portador",
+                "nome_portador": "Portador",
+                "cnpj_cpf_favorecido": "CNPJ/CPF Favorecido",
+                "nome_favorecido": "Favorecido",
+                "cod_unidade_gestora": "UG",
+                "data_inicio": "Início",
+                "data_fim": "Fim",
+                "qtd_transacoes": "Transações",
+                "valor_total": "Valor Total",
+                "valor_max_janela": "Maior Janela",
+                "limite": "Limite",
+                "janela_dias": "Janela (dias)",
+            },
+            hidden_columns=("ids_transacoes", "gerado_em"),
+            parent=self.view,
+        )
+        self.achados_dialog.exec()
+
+    def detect_duplicidades(self):
+        """Agrupa transações com a mesma impressão digital no mesmo dia e exibe os achados."""
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            total = detectar_duplicidades(self.model.database_manager.db_path)
+        except Exception as e:
+            QMessageBox.warning(self.view, "Erro", f"Falha ao detectar duplicidades: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if not total:
+            QMessageBox.information(self.view, "Duplicidades", "Nenhuma cobrança em duplicidade encontrada.")
+            return
+
+        self.duplicidades_dialog = AchadosDialog(
+            self.icons,
+            self.model.db,
+            TABELA_DUPLICIDADES,
+            f"Possíveis Cobranças em Duplicidade ({total})",
+            headers={
+                "cpf_portador": "CPF Portador",
+                "nome_portador": "Portador",
+                "cnpj_cpf_favorecido": "CNPJ/CPF Favorecido",
+                "nome_favorecido": "Favorecido",
+                "cod_unidade_gestora": "UG",
+                "transacao": "Transação",
+                "data_transacao": "Data",
+                "valor_transacao": "Valor",
+                "qtd_cobrancas": "Cobranças",
+                "valor_excedente": "Valor Excedente",
+            },
+            hidden_columns=("ids_transacoes", "gerado_em"),
+            parent=self.view,
+        )
+        self.duplicidades_dialog.exec()
+
+    def show_concentracao(self):
+        """Exibe as métricas de concentração por UG e mês, das mais concentradas para as menos."""
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            # Incremental a partir da importação; sem métricas gravadas, calcula tudo uma vez
+            with self.model.database_manager as conn:
+                existe = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABELA_CONCENTRACAO,)
+                ).fetchone()
+            if not existe:
+                atualizar_concentracao(self.model.database_manager.db_path)
+        except Exception as e:
+            QMessageBox.warning(self.view, "Erro", f"Falha ao calcular a concentração: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.concentracao_dialog = AchadosDialog(
+            self.icons,
+            self.model.db,
+            TABELA_CONCENTRACAO,
+            "Concentração de Favorecidos por UG e Mês",
+            headers={
+                "cod_unidade_gestora": "UG",
+                "competencia": "Competência",
+                "nome_unidade_gestora": "Unidade Gestora",
+                "qtd_transacoes": "Transações",
+                "valor_total": "Valor Total",
+                "qtd_favorecidos": "Favorecidos",
+                "hhi": "HHI",
+                "participacao_top1": "% Maior",
+                "participacao_top5": "% 5 Maiores",
+                "maior_favorecido": "Maior Favorecido",
+            },
+            hidden_columns=("atualizado_em",),
+            parent=self.view,
+        )
+        self.concentracao_dialog.table_view.sortByColumn(
+            self.concentracao_dialog.model.fieldIndex("hhi"), Qt.SortOrder.DescendingOrder
+        )
+        self.concentracao_dialog.exec()
+
+    def screen_valores(self):
+        """Executa a triagem de valores (reaproveitada enquanto não houver nova importação) e exibe o resultado."""
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            total = executar_triagem_cpgf(self.model.database_manager.db_path)
+        except Exception as e:
+            QMessageBox.warning(self.view, "Erro", f"Falha na triagem de valores: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.triagem_dialog = AbasAchadosDialog(
+            self.icons,
+            self.model.db,
+            f"Triagem de Valores ({total} transações sinalizadas)",
+            [
+                {
+                    "table_name": TABELA_SINALIZADAS,
+                    "label": "Transações sinalizadas",
+                    "item_label": "transações",
+                    "headers": {
+                        "id_transacao": "ID",
+                        "motivo": "Motivo",
+                        "cod_unidade_gestora": "UG",
+                        "cpf_portador": "CPF Portador",
+                        "nome_portador": "Portador",
+                        "cnpj_cpf_favorecido": "CNPJ/CPF Favorecido",
+                        "nome_favorecido": "Favorecido",
+                        "data_transacao": "Data",
+                        "valor_transacao": "Valor",
+                        "z_robusto": "z Robusto",
+                        "mediana_ug": "Mediana da UG",
+                    },
+                    "hidden_columns": ("lote",),
+                },
+                {
+                    "table_name": TABELA_ESTATISTICAS,
+                    "label": "Estatísticas por UG",
+                    "item_label": "UGs",
+                    "headers": {
+                        "escopo": "UG",
+                        "qtd": "Transações",
+                        "valor_total": "Valor Total",
+                        "mediana": "Mediana",
+                        "mad_log": "MAD (log10)",
+                        "qtd_outliers": "Atípicas",
+                        "pct_redondos": "% Redondos",
+                        "qtd_benford": "Base Benford",
+                        "mad_primeiro_digito": "MAD 1º Dígito",
+                        "qui2_primeiro_digito": "χ² 1º Dígito",
+                        "conformidade_primeiro_digito": "Benford 1º Dígito",
+                        "mad_segundo_digito": "MAD 2º Dígito",
+                        "qui2_segundo_digito": "χ² 2º Dígito",
+                        "conformidade_segundo_digito": "Benford 2º Dígito",
+                    },
+                    "hidden_columns": ("lote",),
+                },
+            ],
+            parent=self.view,
+        )
+        self.triagem_dialog.exec()
+
     def open_link(self):
         """Abre o link do Portal da Transparência no navegador."""
         url = "https://portaldatransparencia.gov.br/download-de-dados/cpgf"
@@ -73,7 +331,7 @@ class CartaoCorporativoController(QObject):
                     encoding=encoding_detected
                 )
             else:  # XLSX
-                df = pd.read_excel(file_path, dtype=str)
+                df = ler_planilha(file_path, dtype=str)
 
             # 🔹 **Mapeamento de colunas do arquivo para o banco**
             column_mapping = {
@@ -96,24 +354,39 @@ class CartaoCorporativoController(QObject):
 
             df.rename(columns=column_mapping, inplace=True)
 
-            # 🔹 **Corrige valores monetários e converte para float**
+            # 🔹 **Normaliza na gravação: valor em REAL e data em ISO (AAAA-MM-DD)**
             if "valor_transacao" in df.columns:
-                df["valor_transacao"] = (
-                    df["valor_transacao"]
-                    .str.replace(",", ".", regex=True)  # Troca vírgula por ponto
-                    .str.replace("[^0-9.]", "", regex=True)  # Remove caracteres não numéricos
-                    .astype(float)  # Converte para float
-                )
+                df["valor_transacao"] = serie_valor_monetario(df["valor_transacao"])
+            if "data_transacao" in df.columns:
+                df["data_transacao"] = serie_data_iso(df["data_transacao"])
 
             # 🔹 **Insere os dados no banco de dados**
-            with self.model.database_manager as conn:
-                df.to_sql("tabela_cartao_corporativo", conn, if_exists="append", index=False)
+            # 🔹 **Transações já importadas (mesma impressão digital) são ignoradas**
+            with span("import_xlsx_to_db", "import", detail=file_path) as info:
+                with self.model.database_manager as conn:
+                    ultimo_id = ultima_transacao(conn)
+                    inseridas, ignoradas = importar_transacoes(conn, df, self.model.database_manager.db_path)
+                    afetadas = ug_meses_inseridas(conn, ultimo_id) if inseridas else []
+                info["rows"] = inseridas
+            duplicidades = detectar_duplicidades(self.model.database_manager.db_path)
+            # 🔹 **Métricas de concentração: só as UG-meses das transações inseridas são recalculadas**
+            if afetadas:
+                atualizar_concentracao(self.model.database_manager.db_path, afetadas)
 
-            QMessageBox.information(self.view, "Sucesso", "Dados importados com sucesso!")
+            mensagem = f"{inseridas} transações importadas com sucesso!"
+            if ignoradas:
+                mensagem += f"\n{ignoradas} transações já importadas foram ignoradas."
+            if duplicidades:
+                mensagem += f"\n{duplicidades} possíveis cobranças em duplicidade (botão Duplicidades)."
+            QMessageBox.information(self.view, "Sucesso", mensagem)
 
             # 🔹 **Agora chama a atualização da tabela**
             self.view.model.select()
 
+            # 🔹 **UGs e favorecidos novos entram nos mapas de entidades (segundo plano)**
+            if inseridas:
+                iniciar_resolucao()
+
         except Exception as e:
             QMessageBox.warning(self.view, "Erro", f"Falha ao importar o arquivo: {e}")
             
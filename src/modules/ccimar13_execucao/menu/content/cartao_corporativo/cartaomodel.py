@@ -1,6 +1,12 @@
 from PyQt6.QtCore import QObject, Qt
 import logging
 from database.db_manager import DatabaseManager
+from database.normalizacao import normalizar_colunas
+from database.arquivamento import conectar_historico, exercicios_arquivados
+from .analises.duplicidade import garantir_coluna_impressao
+from database.federacao import conectar_federado, criar_views_federadas
+from paths import CCIMAR11_PATH
+from utils.projected_table_model import ProjectedSqlTableModel
 from PyQt6.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel
 from PyQt6.QtGui import QColor
 import sqlite3
@@ -53,6 +59,25 @@ class CartaoCorporativoModel(QObject):
             logging.error("Falha ao criar a tabela 'tabela_cartao_corporativo': %s", query.lastError().text())
         else:
             logging.info("Tabela 'tabela_cartao_corporativo' criada com sucesso.")
+            self.normalize_table()
+
+    def normalize_table(self):
+        """Converte datas DD/MM/AAAA legadas para ISO, cria os índices de consulta e preenche a impressão digital."""
+        try:
+            with self.database_manager as conn:
+                normalizar_colunas(conn, "tabela_cartao_corporativo", datas=["data_transacao"], valores=["valor_transacao"])
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_cartao_portador_favorecido_data "
+                    "ON tabela_cartao_corporativo (cpf_portador, cnpj_cpf_favorecido, data_transacao)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_cartao_data_transacao ON tabela_cartao_corporativo (data_transacao)"
+                )
+                conn.commit()
+                # Impressão digital das transações (reimportações e duplicidades)
+                garantir_coluna_impressao(conn)
+        except sqlite3.Error as e:
+            logging.error("Falha ao normalizar a tabela 'tabela_cartao_corporativo': %s", e)
 
     def setup_model(self, table_name="tabela_cartao_corporativo", editable=False):
         """Configura o modelo SQL para a tabela especificada."""
@@ -142,21 +167,74 @@ class CartaoCorporativoModel(QObject):
 
         return data_list
 
-    def get_data_for_orgao(self, cod_orgao):
-        """Retorna os dados filtrados para um determinado órgão."""
-        query = """
-            SELECT nome_unidade_gestora, valor_transacao, nome_favorecido 
-            FROM tabela_cartao_corporativo 
-            WHERE cod_orgao = ?
+    def _conectar_leitura(self, historico):
         """
-        conn = sqlite3.connect(self.database_manager.db_path)
-        df = pd.read_sql(query, conn, params=(cod_orgao,))
-        conn.close()
-        return df
+        Conexão para as consultas do dashboard e o nome da tabela a consultar.
 
+        Com ``historico`` e exercícios arquivados, usa a view que une a tabela
+        quente aos arquivos anuais, com o planejamento anexado para as views
+        de OMs; sem arquivos, a conexão federada sobre a tabela quente.
+        """
+        db_path = self.database_manager.db_path
+        if historico and exercicios_arquivados(db_path):
+            conn = conectar_historico(db_path, anexos={"planejamento": CCIMAR11_PATH})
+            return conn, criar_views_federadas(conn), "tabela_cartao_corporativo_historico"
+        conn = conectar_federado(db_path)
+        return conn, conn.views, "tabela_cartao_corporativo"
+
+    def get_orgaos(self, historico=True):
+        """Órgãos (código e nome) com transações, incluindo os exercícios arquivados."""
+        conn, _, tabela = self._conectar_leitura(historico)
+        try:
+            return pd.read_sql(f"SELECT DISTINCT cod_orgao, nome_orgao FROM {tabela}", conn)
+        finally:
+            conn.close()
 
+    def get_data_for_orgao(self, cod_orgao, historico=True):
+        """
+        Retorna os dados filtrados para um determinado órgão.
 
-class CustomSqlTableModel(QSqlTableModel):
+        Com o banco de planejamento disponível, a unidade gestora é exibida pela
+        sigla da OM (junção feita pelo SQLite). O dashboard cobre todos os
+        exercícios, então por padrão inclui os arquivados; ``historico=False``
+        consulta só a tabela quente.
+        """
+        conn, views, tabela = self._conectar_leitura(historico)
+        try:
+            if "mapa_ug_om" in views and "dim_om" in views:
+                # Grafias da UG já resolvidas para o cod_siafi (database.resolucao_entidades)
+                query = f"""
+                    SELECT COALESCE(om.sigla_om, c.nome_unidade_gestora) AS nome_unidade_gestora,
+                           c.valor_transacao, c.nome_favorecido
+                    FROM {tabela} c
+                    LEFT JOIN mapa_ug_om m
+                      ON m.origem = 'cpgf'
+                     AND m.codigo_origem = CAST(c.cod_unidade_gestora AS TEXT)
+                     AND m.nome_origem = c.nome_unidade_gestora
+                    LEFT JOIN dim_om om ON om.cod_siafi = COALESCE(m.cod_siafi, c.cod_unidade_gestora)
+                    WHERE c.cod_orgao = ?
+                """
+            elif "dim_om" in views:
+                query = f"""
+                    SELECT COALESCE(om.sigla_om, c.nome_unidade_gestora) AS nome_unidade_gestora,
+                           c.valor_transacao, c.nome_favorecido
+                    FROM {tabela} c
+                    LEFT JOIN dim_om om ON om.cod_siafi = c.cod_unidade_gestora
+                    WHERE c.cod_orgao = ?
+                """
+            else:
+                query = f"""
+                    SELECT nome_unidade_gestora, valor_transacao, nome_favorecido 
+                    FROM {tabela} 
+                    WHERE cod_orgao = ?
+                """
+            return pd.read_sql(query, conn, params=(cod_orgao,))
+        finally:
+            conn.close()
+
+
+
+class CustomSqlTableModel(ProjectedSqlTableModel):
     def __init__(self, parent=None, db=None, database_manager=None, non_editable_columns=None):
         super().__init__(parent, db)
         self.database_manager = database_manager
@@ -192,6 +270,13 @@ class CustomSqlTableModel(QSqlTableModel):
                 valor = super().data(index, Qt.ItemDataRole.DisplayRole)
                 return f"R$ {float(valor):,.2f}" if valor else "R$ 0,00"
 
+        # 🔹 Data gravada em ISO; exibida como DD/MM/AAAA (sem conversão para datetime)
+        if index.column() == self.column_names.index("data_transacao") and role == Qt.ItemDataRole.DisplayRole:
+            data_iso = super().data(index, role)
+            if isinstance(data_iso, str) and len(data_iso) >= 10 and data_iso[4] == "-":
+                return f"{data_iso[8:10]}/{data_iso[5:7]}/{data_iso[:4]}"
+            return data_iso
+
         # 🔹 Coloração condicional para "valor_transacao"
         if index.column() == self.column_names.index("valor_transacao"):
             if role == Qt.ItemDataRole.ForegroundRole:
@@ -4,7 +4,7 @@ from PyQt6.QtCore import *
 from PyQt6.QtSql import QSqlTableModel
 from utils.search_bar import setup_search_bar, MultiColumnFilterProxyModel
 from utils.add_button import add_button
-from assets.styles.styles import table_view_stylesheet, title_view_stylesheet
+from assets.styles.theme import set_variant
 import pandas as pd
 
 class CartaoCorporativoView(QMainWindow):
@@ -13,6 +13,11 @@ class CartaoCorporativoView(QMainWindow):
     rowDoubleClicked = pyqtSignal(dict)
     linkDataCartaoPagamentoGov = pyqtSignal()
     open_dashboard = pyqtSignal() 
+    detectFracionamento = pyqtSignal()
+    screenValores = pyqtSignal()
+    detectDuplicidades = pyqtSignal()
+    showConcentracao = pyqtSignal()
+    archiveExercicios = pyqtSignal()
 
     def __init__(self, icons, model, database_path, parent=None):
         super().__init__(parent)
@@ -39,7 +44,7 @@ class CartaoCorporativoView(QMainWindow):
         # Title bar
         title_layout = QHBoxLayout()
         label_title = QLabel("Cartão Corporativo", self)
-        label_title.setStyleSheet(title_view_stylesheet())
+        set_variant(label_title, "viewTitle")
         title_layout.addWidget(label_title)
         title_layout.addStretch()
         self.main_layout.addLayout(title_layout)
@@ -61,6 +66,11 @@ class CartaoCorporativoView(QMainWindow):
         add_button("Refresh", "excel", self.refreshRequested, layout, self.icons, tooltip="Atualizar dados")
         add_button("Export", "word", self.refreshRequested, layout, self.icons, tooltip="Exportar para Excel")
         add_button("Dashboard", "dashboard", self.open_dashboard, layout, self.icons, tooltip="Abrir dashboard")  # 🔹 Novo botão
+        add_button("Fracionamento", "analysis", self.detectFracionamento, layout, self.icons, tooltip="Detectar possível fracionamento de despesa")
+        add_button("Triagem", "magnifying-glass", self.screenValores, layout, self.icons, tooltip="Benford, valores atípicos e valores redondos por UG")
+        add_button("Duplicidades", "analysis", self.detectDuplicidades, layout, self.icons, tooltip="Cobranças repetidas no mesmo dia")
+        add_button("Concentração", "dashboard", self.showConcentracao, layout, self.icons, tooltip="HHI e participação dos maiores favorecidos por UG e mês")
+        add_button("Arquivar", "arquivo", self.archiveExercicios, layout, self.icons, tooltip="Mover exercícios fechados para os arquivos anuais")
 
 
     def setup_table_view(self):
@@ -73,7 +83,7 @@ class CartaoCorporativoView(QMainWindow):
         # Table behavior
         self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table_view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
-        self.table_view.setStyleSheet(table_view_stylesheet())
+        set_variant(self.table_view, "data")
 
         # Center align delegate for cells
         center_delegate = CenterAlignDelegate(self.table_view)
@@ -109,6 +119,8 @@ class CartaoCorporativoView(QMainWindow):
         for column in range(self.model.columnCount()):
             if column not in visible_columns:
                 self.table_view.hideColumn(column)
+        # Busca do banco só as colunas exibidas; o detalhe lê a linha completa sob demanda
+        self.model.set_visible_columns(visible_columns)
 
     def adjust_columns(self):
         """Adjust column sizes for readability."""
@@ -143,12 +155,9 @@ class CartaoCorporativoView(QMainWindow):
 
     def load_data_by_id(self, transaction_id):
         """Fetch transaction details from database using its ID."""
-        query = f"SELECT * FROM tabela_cartao_corporativo WHERE id = '{transaction_id}'"
         try:
-            data = self.model.database_manager.fetch_all(query)
-            if isinstance(data, list):
-                data = pd.DataFrame(data, columns=self.model.column_names)
-            return data.iloc[0].to_dict() if not data.empty else None
+            # A tabela só tem as colunas visíveis; as demais são lidas aqui, quando o detalhe abre
+            return self.model.fetch_record_by_key(transaction_id)
         except Exception as e:
             print(f"Erro ao carregar dados: {e}")
             return None
@@ -1,8 +1,8 @@
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QComboBox, QPushButton, QHBoxLayout, QWidget, QLineEdit, QScrollArea
 from PyQt6.QtCore import Qt
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import pandas as pd
+from database.tracing import span
+from utils.bar_chart_canvas import BarChartCanvas
 
 class DashboardPopup(QDialog): 
     def __init__(self, unique_orgaos, data_fetcher, parent=None):
@@ -46,6 +46,23 @@ class DashboardPopup(QDialog):
         self.scroll_area.setWidget(self.scroll_widget)
         self.layout.addWidget(self.scroll_area)
 
+        # Conjunto fixo de gráficos, reaproveitados a cada troca de órgão
+        self.charts = {
+            'nome_unidade_gestora': BarChartCanvas(
+                'Top 10 Valores por Unidade Gestora', 'nome_unidade_gestora', 'valor_transacao', parent=self.scroll_widget
+            ),
+            'nome_favorecido': BarChartCanvas(
+                'Top 10 Favorecidos', 'nome_favorecido', 'valor_transacao', parent=self.scroll_widget
+            ),
+        }
+        for chart in self.charts.values():
+            chart.setMinimumHeight(380)
+            chart.hide()
+            self.scroll_layout.addWidget(chart)
+        self.filtered_label = QLabel(self.scroll_widget)
+        self.filtered_label.hide()
+        self.scroll_layout.addWidget(self.filtered_label)
+
         # Conectar o ComboBox para atualização de gráficos
         self.orgao_combobox.currentIndexChanged.connect(self.update_graphs)
 
@@ -76,9 +93,11 @@ class DashboardPopup(QDialog):
             print("Nenhum dado disponível para esse órgão")
             return
         
-        self.add_bar_chart(data, 'nome_unidade_gestora', 'valor_transacao', 'Top 10 Valores por Unidade Gestora')
-        self.add_bar_chart(data, 'nome_favorecido', 'valor_transacao', 'Top 10 Favorecidos')
-        self.add_filtered_view(data, 'nome_favorecido', 'SEM INFORMACAO')
+        with span("dashboard_cartao.update_graphs", "render") as info:
+            info["rows"] = len(data)
+            self.add_bar_chart(data, 'nome_unidade_gestora', 'valor_transacao')
+            self.add_bar_chart(data, 'nome_favorecido', 'valor_transacao')
+            self.add_filtered_view(data, 'nome_favorecido', 'SEM INFORMACAO')
 
     def filter_combobox(self, text):
         """Filtra as opções do ComboBox com base no texto digitado pelo usuário."""
@@ -87,16 +106,12 @@ class DashboardPopup(QDialog):
             if text.lower() in item.lower():  # 🔹 Agora item é uma string, evitando o erro
                 self.orgao_combobox.addItem(item, self.orgao_data_map[item])  # 🔹 Adiciona os códigos corretamente
 
-    def add_bar_chart(self, data, x_col, y_col, title):
-        """Adiciona um gráfico de barras ao layout."""
+    def add_bar_chart(self, data, x_col, y_col):
+        """Atualiza, no lugar, o gráfico de barras (top 10) da coluna informada."""
         top10 = data.groupby(x_col)[y_col].sum().nlargest(10)
-        fig, ax = plt.subplots()
-        top10.plot(kind='bar', ax=ax)
-        ax.set_title(title)
-        ax.set_ylabel(y_col)
-        ax.set_xlabel(x_col)
-        canvas = FigureCanvas(fig)
-        self.scroll_layout.addWidget(canvas)
+        chart = self.charts[x_col]
+        chart.update_data(top10.index, top10.values)
+        chart.show()
 
     def add_filtered_view(self, data, column, filter_value):
         """Cria uma visualização para os valores filtrados."""
@@ -104,13 +119,11 @@ class DashboardPopup(QDialog):
         if filtered_data.empty:
             return
         
-        label = QLabel(f"Registros com {column} = {filter_value}: {len(filtered_data)}", self)
-        self.scroll_layout.addWidget(label)
+        self.filtered_label.setText(f"Registros com {column} = {filter_value}: {len(filtered_data)}")
+        self.filtered_label.show()
 
     def clear_graphs(self):
-        """Remove os gráficos existentes antes de adicionar novos."""
-        while self.scroll_layout.count():
-            item = self.scroll_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        """Oculta os gráficos (os canvases são mantidos para a próxima atualização)."""
+        for chart in self.charts.values():
+            chart.hide()
+        self.filtered_label.hide()
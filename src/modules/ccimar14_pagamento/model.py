@@ -1,4 +1,6 @@
 from database.db_manager import DatabaseManager
+from database.contratos import preparar_contrato, preparar_contratos, upsert_contratos
+from utils.projected_table_model import ProjectedSqlTableModel
 from PyQt6.QtWidgets import *
 from PyQt6.QtGui import *
 from PyQt6.QtCore import *
@@ -77,59 +79,13 @@ class CCIMAR14Model(QObject):
     def insert_or_update_data(self, data):
         print("Dados recebidos para salvar:", data)
 
-        # Define 'Planejamento' como valor padrão para status se estiver vazio ou None
-        data['status'] = data.get('status', 'Planejamento')
-        if not data['status']:  # Se for string vazia, define 'Planejamento'
-            data['status'] = 'Planejamento'
-            
-        upsert_sql = '''
-        INSERT INTO controle_planejamento (
-            status, dias, prorrogavel, custeio, numero_contrato, 
-            tipo, id, nome_fornecedor, objeto, valor_global, 
-            codigo_uasg, processo_nup, cnpj_cpf_idgener, natureza_continuada, orgao_contratante_resumido, 
-            orgao_contratante, material_servico, link_pncp, vigencia_inicial, vigencia_final, 
-            termo_aditivo, atualizacao_comprasnet, instancia_governanca, comprasnet_contratos, licitacao_numero, 
-            data_assinatura, data_publicacao, categoria, subtipo, amparo_legal, 
-            modalidade, assinatura_contrato, situacao
-        ) VALUES (
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?, ?, ?, 
-            ?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-                status=excluded.status, dias=excluded.dias, prorrogavel=excluded.prorrogavel, custeio=excluded.custeio, numero_contrato=excluded.numero_contrato,
-                tipo=excluded.tipo, nome_fornecedor=excluded.nome_fornecedor, objeto=excluded.objeto, valor_global=excluded.valor_global,    
-                codigo_uasg=excluded.codigo_uasg, processo_nup=excluded.processo_nup, cnpj_cpf_idgener=excluded.cnpj_cpf_idgener, natureza_continuada=excluded.natureza_continuada,
-                orgao_contratante_resumido=excluded.orgao_contratante_resumido, orgao_contratante=excluded.orgao_contratante, material_servico=excluded.material_servico, link_pncp=excluded.link_pncp,
-                vigencia_inicial=excluded.vigencia_inicial, vigencia_final=excluded.vigencia_final, termo_aditivo=excluded.termo_aditivo, atualizacao_comprasnet=excluded.atualizacao_comprasnet,
-                instancia_governanca=excluded.instancia_governanca, comprasnet_contratos=excluded.comprasnet_contratos, licitacao_numero=excluded.licitacao_numero, data_assinatura=excluded.data_assinatura,
-                data_publicacao=excluded.data_publicacao, categoria=excluded.categoria, subtipo=excluded.subtipo, amparo_legal=excluded.amparo_legal, 
-                modalidade=excluded.modalidade, assinatura_contrato=excluded.assinatura_contrato, situacao=excluded.situacao
-        '''
-
-        # Verifica se 'situacao' está dentro dos valores válidos
-        valid_situations = ["Planejamento", "Aprovado", "Sessão Pública", "Homologado", "Empenhado", "Concluído", "Arquivado"]
-        data['situacao'] = data.get('situacao', 'Planejamento')
-        if data['situacao'] not in valid_situations:
-            data['situacao'] = 'Planejamento'
+        # 'Planejamento' como padrão para status vazio e situação inválida
+        preparar_contrato(data)
 
         # Executa a inserção ou atualização
         try:
             with self.database_manager as conn:
-                cursor = conn.cursor()
-                cursor.execute(upsert_sql, (
-                    data.get('status'), data.get('dias'), data.get('prorrogavel'), data.get('custeio'), data.get('numero_contrato'),
-                    data.get('tipo'), data.get('id'), data.get('nome_fornecedor'), data.get('objeto'), data.get('valor_global'),
-                    data.get('codigo_uasg'), data.get('processo_nup'), data.get('cnpj_cpf_idgener'), data.get('natureza_continuada'), data.get('orgao_contratante_resumido'),
-                    data.get('orgao_contratante'), data.get('material_servico'), data.get('link_pncp'), data.get('vigencia_inicial'), data.get('vigencia_final'),
-                    data.get('termo_aditivo'), data.get('atualizacao_comprasnet'), data.get('instancia_governanca'), data.get('comprasnet_contratos'), data.get('licitacao_numero'),
-                    data.get('data_assinatura'), data.get('data_publicacao'), data.get('categoria'), data.get('subtipo'), data.get('amparo_legal'),
-                    data.get('modalidade'), data.get('assinatura_contrato'), data.get('situacao')
-                    )) 
-                conn.commit()
+                upsert_contratos(conn, 'controle_planejamento', [data])
 
         except sqlite3.OperationalError as e:
             if "no such table" in str(e):
@@ -138,7 +94,28 @@ class CCIMAR14Model(QObject):
             else:
                 QMessageBox.warning(None, "Erro", f"Ocorreu um erro ao tentar salvar os dados: {str(e)}")
 
-class CustomSqlTableModel(QSqlTableModel):
+    def insert_or_update_many(self, df):
+        """
+        Insere ou atualiza todas as linhas de um DataFrame em uma única transação.
+
+        Aplica de forma vetorizada os mesmos padrões de ``insert_or_update_data``
+        (status e situação) e grava com ``upsert_contratos``. Retorna a
+        quantidade de registros gravados.
+        """
+        df = preparar_contratos(df)
+
+        try:
+            with self.database_manager as conn:
+                gravados = upsert_contratos(conn, 'controle_planejamento', df)
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                QMessageBox.warning(None, "Erro", "A tabela 'controle_planejamento' não existe. Por favor, crie a tabela primeiro.")
+            else:
+                QMessageBox.warning(None, "Erro", f"Ocorreu um erro ao tentar salvar os dados: {str(e)}")
+            return 0
+        return gravados
+
+class CustomSqlTableModel(ProjectedSqlTableModel):
     def __init__(self, parent=None, db=None, database_manager=None, non_editable_columns=None):
         super().__init__(parent, db)
         self.database_manager = database_manager
@@ -3,7 +3,7 @@ from PyQt6.QtGui import *
 from PyQt6.QtCore import *
 from utils.search_bar import setup_search_bar, MultiColumnFilterProxyModel
 from utils.add_button import add_button
-from assets.styles.styles import table_view_stylesheet, title_view_stylesheet
+from assets.styles.theme import set_variant
 import pandas as pd
 
 class CCIMAR14View(QMainWindow):
@@ -37,7 +37,7 @@ class CCIMAR14View(QMainWindow):
         self.main_layout = QVBoxLayout(self.main_widget)
         title_layout = QHBoxLayout()
         label_contratos = QLabel("Planejamento", self)
-        label_contratos.setStyleSheet(title_view_stylesheet())
+        set_variant(label_contratos, "viewTitle")
         title_layout.addWidget(label_contratos)
         title_layout.addStretch()
         label_select_om = QLabel("Selecione a OM:", self)
@@ -110,7 +110,7 @@ class CCIMAR14View(QMainWindow):
         self.table_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table_view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
 
-        self.table_view.setStyleSheet(table_view_stylesheet())
+        set_variant(self.table_view, "data")
         
         # Define CenterAlignDelegate para centralizar o conteúdo em todas as colunas
         center_delegate = CenterAlignDelegate(self.table_view)
@@ -142,6 +142,8 @@ class CCIMAR14View(QMainWindow):
         for column in range(self.model.columnCount()):
             if column not in visible_columns:
                 self.table_view.hideColumn(column)
+        # Busca do banco só as colunas exibidas ('vigencia_final' alimenta a coluna 'dias')
+        self.model.set_visible_columns(visible_columns, always_columns=["vigencia_final"])
 
     def adjust_columns(self):
         # Ajustar automaticamente as larguras das colunas ao conteúdo
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QTreeView, QAbstractItemView
 from PyQt6.QtGui import QStandardItemModel, QStandardItem, QIcon
 from PyQt6.QtCore import Qt, QSize
+from assets.styles.theme import set_variant
 
 
 class TreeMenu(QTreeView):
@@ -15,24 +16,7 @@ class TreeMenu(QTreeView):
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         # Desativa a edição via duplo clique.
         self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.setStyleSheet("""
-            QTreeView { 
-                color: #FFF; 
-                font-size: 14px; 
-            }
-            QTreeView::item:hover {
-                background-color: #2C2F3F;
-                border: none;
-            }
-            QTreeView::item:selected {
-                background-color: #44475A;
-                border: 1px solid #6272A4;
-                outline: none;
-            }
-            QTreeView::item:focus {
-                outline: none;
-            }
-        """)
+        set_variant(self, "moduleMenuCompact")
         self.model = QStandardItemModel()
         self.setModel(self.model)
         self.populate_tree()
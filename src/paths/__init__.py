@@ -20,8 +20,8 @@ from modules.ccimar_utils import CCIMAR_UTIL_DIR, CCIMAR_UTIL_PATH
 # Definindo __all__ para controle explícito do que será exportado
 __all__ = [
     # base_path
-    "BASE_DIR", "CONFIG_FILE", "DATABASE_DIR", "MODULES_DIR", "JSON_DIR", "SQL_DIR", 
-    "ASSETS_DIR", "TEMPLATE_DIR", "STYLE_PATH", "ICONS_DIR", "ICONS_MENU_DIR", "CONTROLE_DADOS",
+    "BASE_DIR", "USER_DATA_DIR", "SEED_DATABASE_DIR", "CONFIG_FILE", "DATABASE_DIR", "MODULES_DIR", "JSON_DIR", "SQL_DIR", 
+    "ASSETS_DIR", "TEMPLATE_DIR", "STYLE_PATH", "ICONS_DIR", "ICONS_MENU_DIR", "CONTROLE_DADOS", "PNCP_DB_PATH", "CACHE_DIR", "BACKUP_DIR",
         
     # ccimar10_auditoria
     "CCIMAR10_DIR", "CCIMAR10_PATH",
@@ -51,4 +51,7 @@ __all__ = [
 
     # config_path
     "PRE_DEFINICOES_JSON", "ORGANIZACOES_FILE", "AGENTES_RESPONSAVEIS_FILE", "PDF_DIR",
+
+    # document_service
+    "document_store",
     ]
@@ -2,17 +2,91 @@
 
 import sys
 import json
+import shutil
 from pathlib import Path
 import os
 
+APP_NAME = "CCIMAR360"
+
 if getattr(sys, 'frozen', False):  # Executável compilado
-    BASE_DIR = Path(sys._MEIPASS) / "src"  # Diretório temporário + 'src'
+    BASE_DIR = Path(sys._MEIPASS) / "src"  # Arquivos somente leitura empacotados + 'src'
 else:  # Ambiente de desenvolvimento
     BASE_DIR = Path(__file__).resolve().parent.parent
-  
-DATABASE_DIR = BASE_DIR / "database"    
+
+# Bancos e JSONs distribuídos com a aplicação: usados apenas como semente
+SEED_DATABASE_DIR = BASE_DIR / "database"
+# Apenas dados entram na semente (o diretório 'database' também contém código Python)
+SEED_SUFFIXES = {".db", ".json"}
+SEED_IGNORE = {"__pycache__", "logs", "trace.db"}
+
+
+def default_user_data_dir():
+    """
+    Diretório gravável dos dados do usuário (bancos SQLite e configurações JSON).
+
+    - CCIMAR360_DATA_DIR, se definida, tem prioridade;
+    - no executável: pasta de dados do usuário do sistema operacional;
+    - em desenvolvimento: a própria árvore 'src', como antes.
+    """
+    override = os.getenv("CCIMAR360_DATA_DIR")
+    if override:
+        return Path(override).expanduser()
+    if not getattr(sys, 'frozen', False):
+        return BASE_DIR
+    if sys.platform.startswith("win"):
+        return Path(os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local") / APP_NAME
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / APP_NAME
+    return Path(os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share") / APP_NAME.lower()
+
+
+def seed_user_data(seed_dir, target_dir):
+    """
+    Copia para o diretório do usuário os arquivos da semente que ainda não existem lá.
+
+    Arquivos já presentes nunca são sobrescritos, então os dados do usuário são
+    preservados entre versões e apenas arquivos novos de uma atualização são
+    copiados. Depois da primeira execução o custo é só listar a semente.
+
+    :return: Lista dos arquivos copiados.
+    """
+    seed_dir, target_dir = Path(seed_dir), Path(target_dir)
+    if not seed_dir.is_dir() or seed_dir.resolve() == target_dir.resolve():
+        return []
+    copied = []
+    for root, dirs, files in os.walk(seed_dir):
+        dirs[:] = [d for d in dirs if d not in SEED_IGNORE]
+        destination = target_dir / Path(root).relative_to(seed_dir)
+        for name in files:
+            if name in SEED_IGNORE or Path(name).suffix not in SEED_SUFFIXES:
+                continue
+            target = destination / name
+            if target.exists():
+                continue
+            destination.mkdir(parents=True, exist_ok=True)
+            # Cópia para arquivo temporário + rename: uma cópia interrompida não vira dado do usuário
+            temporary = target.with_name(target.name + ".seed-tmp")
+            shutil.copy2(Path(root) / name, temporary)
+            os.replace(temporary, target)
+            copied.append(target)
+    return copied
+
+
+USER_DATA_DIR = default_user_data_dir()
+DATABASE_DIR = USER_DATA_DIR / "database"
+# Dados descartáveis e regeneráveis (ex.: planilhas já interpretadas)
+CACHE_DIR = USER_DATA_DIR / "cache"
+# Snapshots deduplicados dos bancos das divisões
+BACKUP_DIR = USER_DATA_DIR / "backups"
 MODULES_DIR = BASE_DIR / "modules"
 
+try:
+    _seeded = seed_user_data(SEED_DATABASE_DIR, DATABASE_DIR)
+    if _seeded:
+        print(f"Dados iniciais copiados para {DATABASE_DIR} ({len(_seeded)} arquivos).")
+except OSError as e:
+    print(f"Erro ao preparar o diretório de dados {DATABASE_DIR}: {e}")
+
 JSON_DIR = DATABASE_DIR / "json"
 JSON_COMPRASNET_CONTRATOS = JSON_DIR / "consulta_comprasnet"
 CONFIG_FILE = JSON_DIR / "config.json"
@@ -34,6 +108,7 @@ API_KEY = CONFIG.get("API_KEY") or os.getenv("OPENAI_API_KEY")
 
 SQL_DIR = DATABASE_DIR / "sql"
 CONTROLE_DADOS = SQL_DIR / "controle_dados.db"
+PNCP_DB_PATH = SQL_DIR / "pncp.db"
 
 # Assets
 ASSETS_DIR = BASE_DIR / "assets"
@@ -1,33 +1,17 @@
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from .base_path import JSON_DIR, DATABASE_DIR, CONFIG_FILE
+from .document_service import document_store
 from pathlib import Path
-import json
 
 def load_config_path_id():
-    if not Path(CONFIG_FILE).exists():
-        return {}
-    with open(CONFIG_FILE, 'r') as file:
-        return json.load(file)
+    return document_store.load(CONFIG_FILE, {})
 
 def load_config(key, default_value):
-    try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-            return config.get(key, default_value)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return default_value
+    return document_store.value(CONFIG_FILE, key, default_value)
 
 def save_config(key, value):
-    config = {}
-    try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        pass
-    config[key] = value
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f)
+    document_store.set_value(CONFIG_FILE, key, value)
 
 def update_dir(title, key, default_value, parent=None):
     new_dir = QFileDialog.getExistingDirectory(parent, title)
@@ -51,16 +35,11 @@ class ConfigManager(QObject):
         self.config = self.load_config()
 
     def load_config(self):
-        try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        return document_store.load(self.config_file, {})
 
     def save_config(self, key, value):
         self.config[key] = value
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f)
+        document_store.set_value(self.config_file, key, value)
         self.config_updated.emit(key, Path(value))
         
     def update_config(self, key, value):
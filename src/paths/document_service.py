@@ -0,0 +1,202 @@
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QCoreApplication, pyqtSignal
+
+
+class DocumentStore(QObject):
+    """
+    Cache central dos arquivos JSON de configuração e dados.
+
+    Cada arquivo é lido e convertido uma única vez e passa a ser servido da
+    memória. A invalidação é feita pelo QFileSystemWatcher (quando há uma
+    QApplication) ou, na falta dele, pela comparação de mtime/tamanho.
+    As gravações são atômicas (arquivo temporário + os.replace) e notificadas
+    pelo sinal ``document_changed``.
+    """
+
+    document_changed = pyqtSignal(str)  # caminho absoluto do documento alterado
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache = {}  # caminho -> (assinatura, dados)
+        self._lock = threading.RLock()
+        self._watcher = None
+
+    # ====== LEITURA ======
+    def get(self, path, default=None):
+        """
+        Retorna o conteúdo do documento a partir da memória.
+
+        O arquivo só é relido se mudar; o objeto retornado é uma cópia, então
+        alterações do chamador não chegam ao cache nem aos demais leitores
+        até serem gravadas com ``save`` ou ``update``.
+
+        :param path: Caminho do arquivo JSON.
+        :param default: Valor retornado se o arquivo não existir ou for inválido.
+        """
+        return copy.deepcopy(self._cached(path, default))
+
+    def _cached(self, path, default=None):
+        """Objeto guardado no cache (compartilhado: uso interno, somente leitura)."""
+        key = self._key(path)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and (self._is_watched(key) or cached[0] == _signature(key)):
+                return cached[1]
+
+            signature = _signature(key)
+            if signature is None:
+                self._cache.pop(key, None)
+                return default
+            try:
+                with open(key, "r", encoding="utf-8") as f:
+                    content = f.read()
+                data = json.loads(content) if content.strip() else default
+            except (OSError, json.JSONDecodeError) as e:
+                logging.error(f"Erro ao ler o documento {key}: {e}")
+                return default
+
+            self._cache[key] = (signature, data)
+            self._watch(key)
+            return data
+
+    def load(self, path, default=None):
+        """Retorna uma cópia editável do documento (equivale a ``get``)."""
+        return self.get(path, default)
+
+    def value(self, path, key, default=None):
+        """Atalho para ler uma chave de primeiro nível de um documento-dicionário (cópia do valor)."""
+        data = self._cached(path, {})
+        return copy.deepcopy(data.get(key, default)) if isinstance(data, dict) else default
+
+    # ====== GRAVAÇÃO ======
+    def save(self, path, data, indent=4):
+        """
+        Grava o documento de forma atômica e atualiza o cache.
+
+        :return: True se a gravação foi concluída.
+        """
+        key = self._key(path)
+        directory = os.path.dirname(key)
+        with self._lock:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=directory)
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(data, f, indent=indent, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, key)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            except OSError as e:
+                logging.error(f"Erro ao gravar o documento {key}: {e}")
+                return False
+
+            # O cache guarda uma cópia: o chamador pode continuar alterando o seu objeto
+            self._cache[key] = (_signature(key), copy.deepcopy(data))
+            # os.replace troca o inode; o watcher precisa voltar a observar o arquivo
+            self._watch(key, force=True)
+
+        self.document_changed.emit(key)
+        return True
+
+    def update(self, path, func, default=None):
+        """
+        Lê, altera e grava um documento em uma única operação.
+
+        :param func: Função que recebe uma cópia do documento e o modifica
+                     (ou retorna o novo conteúdo).
+        """
+        with self._lock:
+            data = self.load(path, default if default is not None else {})
+            result = func(data)
+            return self.save(path, data if result is None else result)
+
+    def set_value(self, path, key, value):
+        """Altera uma chave de primeiro nível de um documento-dicionário."""
+        def apply(data):
+            data[key] = value
+        return self.update(path, apply, {})
+
+    def invalidate(self, path=None):
+        """Descarta o cache de um documento (ou de todos)."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(self._key(path), None)
+
+    # ====== NOTIFICAÇÃO ======
+    def subscribe(self, path, callback):
+        """Chama ``callback(caminho)`` sempre que o documento informado mudar."""
+        key = self._key(path)
+
+        def handler(changed_path):
+            if changed_path == key:
+                callback(changed_path)
+
+        self.document_changed.connect(handler)
+        return handler
+
+    def unsubscribe(self, handler):
+        try:
+            self.document_changed.disconnect(handler)
+        except TypeError:
+            pass
+
+    # ====== OBSERVAÇÃO DE ARQUIVOS ======
+    def _watch(self, key, force=False):
+        watcher = self._ensure_watcher()
+        if watcher is None or not os.path.exists(key):
+            return
+        if force and key in watcher.files():
+            watcher.removePath(key)
+        if key not in watcher.files():
+            watcher.addPath(key)
+
+    def _is_watched(self, key):
+        return self._watcher is not None and key in self._watcher.files()
+
+    def _ensure_watcher(self):
+        # O watcher só funciona com um loop de eventos ativo
+        if self._watcher is None and QCoreApplication.instance() is not None:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._on_file_changed)
+        return self._watcher
+
+    def _on_file_changed(self, path):
+        key = self._key(path)
+        with self._lock:
+            cached = self._cache.get(key)
+            signature = _signature(key)
+            if cached is not None and cached[0] == signature:
+                return  # Notificação da nossa própria gravação
+            self._cache.pop(key, None)
+            if signature is not None and key not in self._watcher.files():
+                self._watcher.addPath(key)
+        self.document_changed.emit(key)
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(str(Path(path))))
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# Instância compartilhada por toda a aplicação
+document_store = DocumentStore()
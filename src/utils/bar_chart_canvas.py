@@ -0,0 +1,96 @@
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+
+class BarChartCanvas(FigureCanvasQTAgg):
+    """
+    Gráfico de barras reutilizável para painéis que trocam de dados com frequência.
+
+    A figura é criada uma única vez (sem o estado global do pyplot, então nada
+    fica retido no registro de figuras) com um número fixo de barras. Cada
+    ``update_data`` apenas altera alturas e rótulos das barras existentes.
+    Quando rótulos e escala do eixo não mudam, a atualização usa blitting:
+    restaura o fundo já renderizado e redesenha só as barras.
+    """
+
+    def __init__(self, title="", xlabel="", ylabel="", max_bars=10, max_label_chars=18, parent=None):
+        self.figure = Figure(figsize=(6.4, 4.2), tight_layout=True)
+        super().__init__(self.figure)
+        self.setParent(parent)
+        self.max_bars = max_bars
+        self.max_label_chars = max_label_chars
+
+        self.ax = self.figure.add_subplot()
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_xlim(-0.5, max_bars - 0.5)
+        self.ax.set_xticks(range(max_bars))
+        # Barras animadas ficam fora do desenho completo e são desenhadas por cima do fundo
+        self.bars = self.ax.bar(range(max_bars), [0] * max_bars, animated=True)
+
+        self._labels = None
+        self._ylim = None
+        self._background = None
+        self.mpl_connect("draw_event", self._on_draw)
+
+    def update_data(self, labels, values):
+        """
+        Exibe até ``max_bars`` pares (rótulo, valor).
+
+        :param labels: Rótulos das barras (truncados em ``max_label_chars``).
+        :param values: Alturas das barras.
+        """
+        labels = [self._shorten(label) for label in list(labels)[:self.max_bars]]
+        values = [float(value) for value in list(values)[:self.max_bars]]
+
+        for index, bar in enumerate(self.bars):
+            visible = index < len(values)
+            bar.set_height(values[index] if visible else 0)
+            bar.set_visible(visible)
+
+        ylim = self._nice_limit(max(values, default=0))
+        frame_changed = labels != self._labels or ylim != self._ylim
+        if frame_changed:
+            self._labels = labels
+            self._ylim = ylim
+            self.ax.set_ylim(0, ylim)
+            self.ax.set_xticklabels(labels + [""] * (self.max_bars - len(labels)), rotation=45, ha="right")
+            # Eixos mudaram: desenho completo; o fundo é recapturado em _on_draw
+            self.draw_idle()
+        elif self._background is None:
+            self.draw_idle()
+        else:
+            self.restore_region(self._background)
+            self._draw_bars()
+            self.blit(self.figure.bbox)
+
+    def clear(self):
+        self.update_data([], [])
+
+    def _on_draw(self, event):
+        """Guarda o fundo (eixos, rótulos, título) após cada desenho completo."""
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_bars()
+
+    def _draw_bars(self):
+        for bar in self.bars:
+            if bar.get_visible():
+                self.figure.draw_artist(bar)
+
+    def _shorten(self, label):
+        label = str(label)
+        if len(label) <= self.max_label_chars:
+            return label
+        return label[:self.max_label_chars - 1] + "…"
+
+    @staticmethod
+    def _nice_limit(value):
+        """Arredonda o limite do eixo para 1, 2 ou 5 × 10^n, reduzindo redesenhos completos."""
+        if value <= 0:
+            return 1.0
+        magnitude = 10 ** (len(str(int(value))) - 1)
+        for step in (1, 2, 5, 10):
+            if value <= step * magnitude:
+                return float(step * magnitude)
+        return float(10 * magnitude)
@@ -0,0 +1,126 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+    QComboBox, QLabel, QTextEdit, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QTimer
+from database.tracing import tracer
+
+
+class DiagnosticsPanel(QDialog):
+    """
+    Painel oculto de diagnóstico (Ctrl+Shift+D) com as operações mais lentas
+    registradas pelo tracer: consultas SQL, importações, cálculos,
+    renderizações, chamadas à LLM e travamentos da interface.
+    """
+
+    HEADERS = ["Categoria", "Operação", "Duração (ms)", "Linhas", "Horário"]
+
+    def __init__(self, parent=None, limit=100):
+        super().__init__(parent)
+        self.limit = limit
+        self.records = []
+        self.setWindowTitle("Diagnóstico de Desempenho")
+        self.resize(1100, 650)
+
+        layout = QVBoxLayout(self)
+
+        filtros_layout = QHBoxLayout()
+        filtros_layout.addWidget(QLabel("Categoria:"))
+        self.category_combo = QComboBox()
+        self.category_combo.currentIndexChanged.connect(self.refresh)
+        filtros_layout.addWidget(self.category_combo)
+        filtros_layout.addStretch()
+
+        self.summary_label = QLabel()
+        filtros_layout.addWidget(self.summary_label)
+
+        refresh_button = QPushButton("Atualizar")
+        refresh_button.clicked.connect(self.refresh)
+        filtros_layout.addWidget(refresh_button)
+
+        clear_button = QPushButton("Limpar")
+        clear_button.clicked.connect(self.clear_records)
+        filtros_layout.addWidget(clear_button)
+        layout.addLayout(filtros_layout)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.itemSelectionChanged.connect(self.show_detail)
+        layout.addWidget(self.table, stretch=3)
+
+        self.detail_view = QTextEdit()
+        self.detail_view.setReadOnly(True)
+        layout.addWidget(self.detail_view, stretch=1)
+
+        # Atualiza periodicamente enquanto o painel estiver aberto
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(2000)
+        self.refresh_timer.timeout.connect(self.auto_refresh)
+
+        self.populate_categories()
+        self.refresh()
+
+    def populate_categories(self):
+        current = self.category_combo.currentData()
+        self.category_combo.blockSignals(True)
+        self.category_combo.clear()
+        self.category_combo.addItem("Todas", None)
+        for category in tracer.categories():
+            self.category_combo.addItem(category, category)
+        index = self.category_combo.findData(current)
+        self.category_combo.setCurrentIndex(max(index, 0))
+        self.category_combo.blockSignals(False)
+
+    def refresh(self):
+        """Recarrega as operações mais lentas do buffer do tracer."""
+        self.populate_categories()
+        self.records = tracer.top_slow(self.limit, self.category_combo.currentData())
+        self.table.setRowCount(len(self.records))
+        for row, record in enumerate(self.records):
+            values = [
+                record["category"],
+                record["tag"],
+                f"{record['duration_ms']:.1f}",
+                "" if record["rows"] is None else str(record["rows"]),
+                record["timestamp"].strftime("%H:%M:%S.%f")[:-3],
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col in (2, 3):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+        total = len(tracer.snapshot())
+        self.summary_label.setText(f"{total} operações no buffer (capacidade {tracer.records.maxlen})")
+
+    def auto_refresh(self):
+        # Não reordena a tabela enquanto o usuário inspeciona uma operação
+        if not self.table.selectedItems():
+            self.refresh()
+
+    def show_detail(self):
+        row = self.table.currentRow()
+        if row < 0 or row >= len(self.records):
+            self.detail_view.clear()
+            return
+        record = self.records[row]
+        text = record["detail"] or ""
+        if record["stack"]:
+            text += "\n\nAmostra de pilha:\n" + record["stack"]
+        self.detail_view.setPlainText(text.strip())
+
+    def clear_records(self):
+        tracer.clear()
+        self.detail_view.clear()
+        self.refresh()
+
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
@@ -10,11 +10,14 @@ from datetime import datetime, timedelta
 import numpy as np
 import os
 from babel.dates import format_date
-import locale
+from babel.numbers import format_currency
 #from config import *
 
-locale.setlocale(locale.LC_MONETARY, 'pt_BR.UTF-8')
-locale.setlocale(locale.LC_NUMERIC, 'pt_BR.UTF-8')
+
+def formatar_moeda(valor) -> str:
+    """Formata um valor em reais (ex.: 'R$ 1.234,56') sem alterar o locale do processo."""
+    # O babel separa o símbolo com espaço não separável; o locale.currency usava espaço comum
+    return format_currency(float(valor), "BRL", locale="pt_BR").replace("\xa0", " ")
 
 
 def resolve_data(data: str) -> str:
@@ -115,7 +118,7 @@ def insert_table(modelo: Document, dados: pd.DataFrame) -> Document:
     flag = "<tabela_abaixo>"
 
     valor_total = dados['Total2'].astype(float).sum()
-    valor_total = locale.currency(float(valor_total), grouping=True)
+    valor_total = formatar_moeda(valor_total)
     valor_total = 'TOTAL ' + valor_total
 
     dados = dados.drop(columns=['Total2'])
@@ -206,52 +209,53 @@ ficha = data - timedelta(30)
 data_MMAAAA = ficha.strftime('%B%Y').capitalize()
 prazo = (data + timedelta(days=60)).strftime('%d%b%Y').upper()
 
-# Argumentos que sempre mudam
-nome_planilha = './MUNIC_EM_LIC.xlsx'
-nome_aba_base = 'Dados NA'
-#nome_aba_siglas = 'Siglas'
-colunas_valor = ['VALOR TOTAL']
-colunas_data = ['DATA INÍCIO' ,'DATA FIM','DATA INÍCIO DA LICENÇA']
+if __name__ == "__main__":
+    # Argumentos que sempre mudam
+    nome_planilha = './MUNIC_EM_LIC.xlsx'
+    nome_aba_base = 'Dados NA'
+    #nome_aba_siglas = 'Siglas'
+    colunas_valor = ['VALOR TOTAL']
+    colunas_data = ['DATA INÍCIO' ,'DATA FIM','DATA INÍCIO DA LICENÇA']
 
-args = {
-    'titulo': None,
-    'nome_notas': 'NA-{sigla}-munic_em_lic',
-    'coluna_oms': "OC",
-    'path_modelo': 'modelo-formatado.docx',
-    'num_nota': 'S/N',
-}
+    args = {
+        'titulo': None,
+        'nome_notas': 'NA-{sigla}-munic_em_lic',
+        'coluna_oms': "OC",
+        'path_modelo': 'modelo-formatado.docx',
+        'num_nota': 'S/N',
+    }
 
 
-####### Daqui para baixo ########
-# inserir nomes do arquivo e da aba com os dados
+    ####### Daqui para baixo ########
+    # inserir nomes do arquivo e da aba com os dados
 
-df_inconsistencias = pd.read_excel(nome_planilha,sheet_name=nome_aba_base, dtype=str)
-df_inconsistencias.fillna('', inplace = True)
+    df_inconsistencias = pd.read_excel(nome_planilha,sheet_name=nome_aba_base, dtype=str)
+    df_inconsistencias.fillna('', inplace = True)
 
-#if nome_aba_siglas:
-#    df_siglas = pd.read_excel(nome_planilha,
-#                                  sheet_name=nome_aba_siglas, dtype=str)
-#    df_inconsistencias = pd.merge(df_inconsistencias, df_siglas, on=['uge'])
+    #if nome_aba_siglas:
+    #    df_siglas = pd.read_excel(nome_planilha,
+    #                                  sheet_name=nome_aba_siglas, dtype=str)
+    #    df_inconsistencias = pd.merge(df_inconsistencias, df_siglas, on=['uge'])
 
-args['df_inconsistencias']= df_inconsistencias
+    args['df_inconsistencias']= df_inconsistencias
 
-####### Transformação de colunas
-# Coluna com valor monetário (não esquecer do ponto no excel!!!)
-# Inserir nomes das colunas com valor monetário na lista
-for col in colunas_valor:
-     df_inconsistencias[col] = df_inconsistencias[col].apply(lambda x: locale.currency(float(x), grouping=True))
+    ####### Transformação de colunas
+    # Coluna com valor monetário (não esquecer do ponto no excel!!!)
+    # Inserir nomes das colunas com valor monetário na lista
+    for col in colunas_valor:
+         df_inconsistencias[col] = df_inconsistencias[col].apply(formatar_moeda)
 
 
 
-# Se as colunas com data aparecerem mal formatadas no documento final:
-# Inserir nomes das colunas com data na lista
-for coluna in colunas_data:
-    df_inconsistencias[coluna] = df_inconsistencias[coluna].apply(resolve_data)
+    # Se as colunas com data aparecerem mal formatadas no documento final:
+    # Inserir nomes das colunas com data na lista
+    for coluna in colunas_data:
+        df_inconsistencias[coluna] = df_inconsistencias[coluna].apply(resolve_data)
 
 
 
 
-main(**args)
+    main(**args)
 
 
 
@@ -1,110 +1,274 @@
 # config/icon_loader.py
-from pathlib import Path
-from PyQt6.QtGui import QIcon
-from paths import ICONS_DIR, ICONS_MENU_DIR
+"""
+Registro de ícones da aplicação.
+
+Os PNGs de ``assets/icons`` e ``assets/icons/menu`` são compilados em um único
+arquivo de recursos do Qt (``assets/icons.rcc``), registrado uma vez por
+mapeamento em memória. Sem o ``.rcc`` (ex.: desenvolvimento sem rodar o
+build), os diretórios são indexados com uma única listagem cada.
+
+Os ícones são criados sob demanda, na primeira vez que são usados, e os
+pixmaps nos tamanhos efetivamente desenhados (24/30/40 px) ficam no
+``QPixmapCache``, evitando leitura e redimensionamento repetidos.
+
+Para gerar o ``.rcc``:
+    python -m utils.icon_loader --build
+"""
+
+import argparse
 import logging
+import os
+import shutil
+import subprocess
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from PyQt6.QtCore import QResource, Qt
+from PyQt6.QtGui import QIcon, QImage, QPixmap, QPixmapCache
+from paths import ASSETS_DIR, ICONS_DIR, ICONS_MENU_DIR
 
 # Configuração de logging
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
-# Cache para ícones
-_icon_cache = {}
+ICONS_QRC = ASSETS_DIR / "icons.qrc"
+ICONS_RCC = ASSETS_DIR / "icons.rcc"
+RESOURCE_PREFIX = "/icons"
+
+# Tamanhos em que os ícones são desenhados (botões, menu lateral e árvore de módulos)
+PIXMAP_SIZES = (24, 30, 40)
+
+# Nome usado no código -> arquivo PNG #8AB4F7 #FFFFFF
+ICON_FILES = {
+    "number-10": "number-10.png",
+    "number-10-b": "number-10-b.png",
+    "number-11": "number-11.png",
+    "number-11-b": "number-11-b.png",
+    "number-12": "number-12.png",
+    "number-12-b": "number-12-b.png",
+    "number-13": "number-13.png",
+    "number-13-b": "number-13-b.png",
+    "number-14": "number-14.png",
+    "number-14-b": "number-14-b.png",
+    "number-15": "number-15.png",
+    "number-15-b": "number-15-b.png",
+    "number-16": "number-16.png",
+    "number-16-b": "number-16-b.png",
+
+    "initdataprocessing": "initdataprocessing.png",
+    "initdatacollection": "initdatacollection.png",
+    "initexploration": "initexploration.png",
+    "data-collection": "data-collection.png",
+    "data-collection_blue": "data-collection_blue.png",
+    "data-processing": "data-processing.png",
+    "data-processing_blue": "data-processing_blue.png",
+    "initreport": "initreport.png",
+    "click": "click.png",
+    "analytics": "analytics.png",
+    "report": "report.png",
+    "criteria": "criteria.png",
+
+    "doc": "doc.png",
+    "chat": "chat.png",
+    "mail": "mail.png",
+    "prioridade": "prioridade.png",
+    "api_azul": "API_azul.png",
+    "statistics_azul": "statistics_azul.png",
+    "statistics": "statistics.png",
+    "pdf": "pdf.png",
+    "word": "word.png",
+    "timeline": "timeline.png",
+    "process": "process.png",
+    "delete": "delete.png",
+
+    # "pdf_button": "pdf_button.png",
+    # "pdf_button_blue": "pdf_button_blue.png",
+    # "planning": "planning.png",
+    # "info": "info.png",
+    "360-degrees": "360-degrees.png",
+    "data-science": "data-science.png",
+
+    "brasil": "brasil.png",
+    "mensagem": "mensagem.png",
+    "excel": "excel.png",
+
+    "api": "api.png",
+    "meeting": "meeting.png",
+    "auditor": "auditor.png",
+    "link": "link.png",
+    "dashboard": "dashboard.png",
+    # "api_button": "api_button.png",
+    "menu": "menu.png",
+    "menu-open": "menu-open.png",
+    "sign": "sign.png",
+    "init": "init.png",
+    "init_hover": "init_hover.png",
+    "contrato": "contrato.png",
+    "contrato_blue": "contrato_blue.png",
+    # "plan": "plan.png",
+    # "plan_hover": "plan_hover.png",
+    "contract": "contract.png",
+    "contract_hover": "contract_hover.png",
+    "config": "config.png",
+    "config_hover": "config_hover.png",
+    # "confirm": "confirm.png",
+    "magnifying-glass": "magnifying-glass.png",
+    "analysis": "analysis.png",
+    "data_blue": "data_blue.png",
+    "data": "data.png",
+}
+
+
+class IconRegistry:
+    """
+    Resolve nomes de arquivo de ícone para QIcon/QPixmap, com cache.
+
+    A origem é o ``.rcc`` registrado (caminhos ``:/icons/...``) ou, na falta
+    dele, um índice dos diretórios de ícones montado com uma listagem por
+    diretório, sem ``exists()`` por ícone.
+    """
+
+    def __init__(self, rcc_path=ICONS_RCC, directories=(ICONS_DIR, ICONS_MENU_DIR)):
+        self.rcc_path = Path(rcc_path)
+        self.directories = [Path(d) for d in directories]
+        self._index = None
+        self._icons = {}
+
+    def _build_index(self):
+        """Mapeia nome do arquivo -> caminho legível pelo Qt (recurso ou arquivo)."""
+        index = {}
+        if self.rcc_path.exists() and QResource.registerResource(str(self.rcc_path)):
+            # Diretórios na ordem de prioridade: um nome em ICONS_DIR prevalece sobre o menu
+            for directory in reversed(self.directories):
+                resource_dir = f":{RESOURCE_PREFIX}/{_resource_alias(directory)}"
+                for name in QResource(resource_dir).children():
+                    index[name] = f"{resource_dir}/{name}"
+            return index
+
+        for directory in reversed(self.directories):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            index[entry.name] = entry.path
+            except FileNotFoundError:
+                logger.warning(f"Diretório de ícones não encontrado: {directory}")
+        return index
+
+    def path(self, icon_name):
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index.get(icon_name)
+
+    def icon(self, icon_name):
+        """Retorna o QIcon do arquivo, criando-o na primeira chamada."""
+        if icon_name not in self._icons:
+            path = self.path(icon_name)
+            if path is None:
+                logger.warning(f"Ícone '{icon_name}' não encontrado em {ICONS_DIR} nem em {ICONS_MENU_DIR}")
+                self._icons[icon_name] = QIcon()  # Retorna um ícone vazio em caso de falha
+            else:
+                icon = QIcon()
+                # Pixmaps pré-rasterizados nos tamanhos usados; o original atende os demais
+                for size in PIXMAP_SIZES:
+                    icon.addPixmap(self.pixmap(icon_name, size))
+                icon.addFile(path)
+                self._icons[icon_name] = icon
+        return self._icons[icon_name]
+
+    def pixmap(self, icon_name, size):
+        """Pixmap quadrado do ícone no tamanho pedido, guardado no QPixmapCache."""
+        key = f"icon:{icon_name}:{size}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+        path = self.path(icon_name)
+        image = QImage(path) if path else QImage()
+        if image.isNull():
+            return QPixmap()
+        pixmap = QPixmap.fromImage(image.scaled(
+            size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        ))
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+
+class LazyIcons(Mapping):
+    """
+    Dicionário somente leitura de ícones por nome lógico.
+
+    Mantém a interface do antigo ``load_icons()`` (``icons["x"]``,
+    ``icons.get("x")``), mas só cria cada QIcon quando ele é acessado.
+    """
+
+    def __init__(self, registry, files):
+        self._registry = registry
+        self._files = files
+
+    def __getitem__(self, name):
+        return self._registry.icon(self._files[name])
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, name):
+        return name in self._files
+
+
+registry = IconRegistry()
+_icons = LazyIcons(registry, ICON_FILES)
+
 
 def load_icon(icon_name):
-    """Carrega e armazena em cache os ícones como QIcon. Verifica se o arquivo existe antes de carregar."""
-    if icon_name not in _icon_cache:
-        # Primeiro, tenta carregar de ICONS_DIR
-        icon_path = ICONS_DIR / icon_name
-        if not icon_path.exists():
-            # Se não encontrar, tenta em ICONS_MENU_DIR
-            icon_path = ICONS_MENU_DIR / icon_name
-
-        if icon_path.exists():
-            _icon_cache[icon_name] = QIcon(str(icon_path))
-        else:
-            logger.warning(f"Ícone '{icon_name}' não encontrado em {ICONS_DIR} nem em {ICONS_MENU_DIR}")
-            _icon_cache[icon_name] = QIcon()  # Retorna um ícone vazio em caso de falha
-
-    return _icon_cache[icon_name]
-
-# Funções específicas para carregar ícones usados frequentemente #8AB4F7 #FFFFFF
+    """Retorna o QIcon de um arquivo (ex.: 'excel.png'), carregado uma única vez."""
+    return registry.icon(icon_name)
+
+
 def load_icons():
-    return {
-        "number-10": load_icon("number-10.png"),
-        "number-10-b": load_icon("number-10-b.png"),
-        "number-11": load_icon("number-11.png"),
-        "number-11-b": load_icon("number-11-b.png"),
-        "number-12": load_icon("number-12.png"),
-        "number-12-b": load_icon("number-12-b.png"),
-        "number-13": load_icon("number-13.png"),
-        "number-13-b": load_icon("number-13-b.png"),
-        "number-14": load_icon("number-14.png"),
-        "number-14-b": load_icon("number-14-b.png"),
-        "number-15": load_icon("number-15.png"),
-        "number-15-b": load_icon("number-15-b.png"),
-        "number-16": load_icon("number-16.png"),
-        "number-16-b": load_icon("number-16-b.png"),
-        
-        "initdataprocessing": load_icon("initdataprocessing.png"),    
-        "initdatacollection": load_icon("initdatacollection.png"),    
-        "initexploration": load_icon("initexploration.png"),    
-        "data-collection": load_icon("data-collection.png"),
-        "data-collection_blue": load_icon("data-collection_blue.png"),        
-        "data-processing": load_icon("data-processing.png"),
-        "data-processing_blue": load_icon("data-processing_blue.png"),        
-        "initreport": load_icon("initreport.png"),   
-        "click": load_icon("click.png"),   
-        "analytics": load_icon("analytics.png"),   
-        "report": load_icon("report.png"),   
-        "criteria": load_icon("criteria.png"),   
-
-        "doc": load_icon("doc.png"),
-        "chat": load_icon("chat.png"),
-        "mail": load_icon("mail.png"),
-        "prioridade": load_icon("prioridade.png"),
-        "api_azul": load_icon("API_azul.png"),    
-        "statistics_azul": load_icon("statistics_azul.png"),
-        "statistics": load_icon("statistics.png"),
-        "pdf": load_icon("pdf.png"),
-        "word": load_icon("word.png"),
-        "timeline": load_icon("timeline.png"),
-        "process": load_icon("process.png"),
-        "delete": load_icon("delete.png"),
-
-        # "pdf_button": load_icon("pdf_button.png"),
-        # "pdf_button_blue": load_icon("pdf_button_blue.png"),
-        # "planning": load_icon("planning.png"),
-        # "info": load_icon("info.png"),
-        "360-degrees": load_icon("360-degrees.png"),
-        "data-science": load_icon("data-science.png"),
-
-        "brasil": load_icon("brasil.png"),
-        "mensagem": load_icon("mensagem.png"),
-        "excel": load_icon("excel.png"),
-
-        "api": load_icon("api.png"),
-        "meeting": load_icon("meeting.png"),
-        "auditor": load_icon("auditor.png"),
-        "link": load_icon("link.png"),
-        "dashboard": load_icon("dashboard.png"),
-        # "api_button": load_icon("api_button.png"),
-        "menu": load_icon("menu.png"),
-        "menu-open": load_icon("menu-open.png"),
-        "sign": load_icon("sign.png"),
-        "init": load_icon("init.png"),
-        "init_hover": load_icon("init_hover.png"),
-        "contrato": load_icon("contrato.png"),
-        "contrato_blue": load_icon("contrato_blue.png"),
-        # "plan": load_icon("plan.png"),
-        # "plan_hover": load_icon("plan_hover.png"),
-        "contract": load_icon("contract.png"),
-        "contract_hover": load_icon("contract_hover.png"),
-        "config": load_icon("config.png"),
-        "config_hover": load_icon("config_hover.png"),
-        # "confirm": load_icon("confirm.png"),
-        "magnifying-glass": load_icon("magnifying-glass.png"),
-        "analysis": load_icon("analysis.png"),
-        "data_blue": load_icon("data_blue.png"),
-        "data": load_icon("data.png"),
-}
\ No newline at end of file
+    """Retorna o dicionário (compartilhado e preguiçoso) com os ícones usados pela aplicação."""
+    return _icons
+
+
+def _resource_alias(directory):
+    return Path(directory).relative_to(ASSETS_DIR).as_posix()
+
+
+def write_qrc(qrc_path=ICONS_QRC, directories=(ICONS_DIR, ICONS_MENU_DIR)):
+    """Gera o arquivo .qrc com os PNGs dos diretórios de ícones."""
+    lines = ['<!DOCTYPE RCC>', '<RCC version="1.0">', f'<qresource prefix="{RESOURCE_PREFIX}">']
+    for directory in directories:
+        alias = _resource_alias(directory)
+        for file in sorted(Path(directory).glob("*.png")):
+            relative = file.relative_to(Path(qrc_path).parent).as_posix()
+            lines.append(f'    <file alias="{alias}/{file.name}">{relative}</file>')
+    lines += ['</qresource>', '</RCC>']
+    Path(qrc_path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return qrc_path
+
+
+def build_rcc(qrc_path=ICONS_QRC, rcc_path=ICONS_RCC):
+    """
+    Compila o .qrc em um recurso binário (.rcc) com o ``rcc`` do Qt.
+
+    O PyQt6 não traz o ``rcc``; é usado o do Qt instalado ou o ``pyside6-rcc``.
+    """
+    compiler = shutil.which("rcc") or shutil.which("pyside6-rcc")
+    if not compiler:
+        raise FileNotFoundError("Compilador de recursos do Qt (rcc ou pyside6-rcc) não encontrado no PATH.")
+    write_qrc(qrc_path)
+    subprocess.run([compiler, "--binary", str(qrc_path), "-o", str(rcc_path)], check=True)
+    return rcc_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o recurso compilado dos ícones (assets/icons.rcc).")
+    parser.add_argument("--build", action="store_true", help="Gera o .qrc e compila o .rcc")
+    args = parser.parse_args()
+    if args.build:
+        print(f"Recurso gerado em {build_rcc()}")
+    else:
+        parser.print_help()
+    sys.exit(0)
@@ -0,0 +1,164 @@
+"""
+Cache das planilhas já interpretadas.
+
+Reimportar a mesma pasta de trabalho XLSX (corrigindo uma coluna, repetindo a
+validação) fazia o ``pd.read_excel`` reinterpretar o arquivo inteiro com o
+openpyxl a cada vez. Aqui cada aba interpretada é guardada em formato colunar
+no diretório de dados do usuário, com chave pelo hash do conteúdo do arquivo,
+nome da aba e opções de leitura. Reabrir uma planilha sem alterações carrega
+a aba do cache em milissegundos; abas pedidas juntas e ainda não cacheadas são
+interpretadas em uma única leitura do arquivo.
+
+O formato é Parquet quando o ``pyarrow`` está instalado; caso contrário (ou se
+a aba tiver colunas de tipos mistos que o Parquet não aceita) usa pickle. O
+tamanho total é limitado e as entradas menos usadas recentemente são removidas.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+
+import pandas as pd
+
+from paths import CACHE_DIR
+
+PLANILHAS_CACHE_DIR = CACHE_DIR / "planilhas"
+LIMITE_CACHE_BYTES = 512 * 1024 * 1024
+PARQUET_DISPONIVEL = importlib.util.find_spec("pyarrow") is not None
+
+# (caminho, tamanho, mtime) -> hash: evita reler o arquivo para calcular o hash na mesma sessão
+_hashes = {}
+
+
+def hash_arquivo(file_path):
+    """Hash (BLAKE2b) do conteúdo do arquivo, memorizado por tamanho e data de modificação."""
+    stat = os.stat(file_path)
+    chave = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    if chave not in _hashes:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(bloco)
+        _hashes[chave] = digest.hexdigest()
+    return _hashes[chave]
+
+
+class PlanilhaCache:
+    def __init__(self, cache_dir=PLANILHAS_CACHE_DIR, limite_bytes=LIMITE_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.limite_bytes = limite_bytes
+
+    def ler(self, file_path, sheet_name=0, **opcoes):
+        """
+        Equivalente ao ``pd.read_excel(file_path, sheet_name, **opcoes)`` com cache.
+
+        ``sheet_name`` pode ser um nome/índice (retorna DataFrame), uma lista ou
+        None (retorna dict aba -> DataFrame, como o pandas).
+        """
+        hash_conteudo = hash_arquivo(file_path)
+        if sheet_name is None:
+            abas = self._nomes_das_abas(file_path, hash_conteudo)
+        elif isinstance(sheet_name, (list, tuple)):
+            abas = list(sheet_name)
+        else:
+            abas = [sheet_name]
+
+        resultado = {}
+        faltantes = []
+        for aba in abas:
+            df = self._carregar(self._chave(hash_conteudo, aba, opcoes))
+            if df is None:
+                faltantes.append(aba)
+            else:
+                resultado[aba] = df
+
+        if faltantes:
+            # Uma só leitura do arquivo para todas as abas que não estavam no cache
+            lidas = pd.read_excel(file_path, sheet_name=faltantes, **opcoes)
+            for aba, df in lidas.items():
+                self._salvar(self._chave(hash_conteudo, aba, opcoes), df)
+                resultado[aba] = df
+            self._limitar_tamanho()
+
+        if sheet_name is None or isinstance(sheet_name, (list, tuple)):
+            return {aba: resultado[aba] for aba in abas}
+        return resultado[sheet_name]
+
+    def limpar(self):
+        for arquivo in self._entradas():
+            arquivo.unlink(missing_ok=True)
+
+    def _nomes_das_abas(self, file_path, hash_conteudo):
+        manifesto = self.cache_dir / f"{hash_conteudo}.abas.json"
+        if manifesto.exists():
+            return json.loads(manifesto.read_text(encoding="utf-8"))
+        with pd.ExcelFile(file_path) as excel:
+            abas = list(excel.sheet_names)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        manifesto.write_text(json.dumps(abas, ensure_ascii=False), encoding="utf-8")
+        return abas
+
+    @staticmethod
+    def _chave(hash_conteudo, aba, opcoes):
+        detalhe = json.dumps([aba, sorted((k, repr(v)) for k, v in opcoes.items())], ensure_ascii=False)
+        return f"{hash_conteudo}-{hashlib.blake2b(detalhe.encode(), digest_size=8).hexdigest()}"
+
+    def _carregar(self, chave):
+        for sufixo, leitor in ((".parquet", pd.read_parquet), (".pkl", pd.read_pickle)):
+            arquivo = self.cache_dir / f"{chave}{sufixo}"
+            if arquivo.exists():
+                try:
+                    df = leitor(arquivo)
+                except Exception as e:
+                    logging.warning(f"Entrada de cache inválida removida ({arquivo.name}): {e}")
+                    arquivo.unlink(missing_ok=True)
+                    return None
+                os.utime(arquivo)  # Marca como usada recentemente (LRU)
+                return df
+        return None
+
+    def _salvar(self, chave, df):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if PARQUET_DISPONIVEL:
+            try:
+                self._gravar_atomico(self.cache_dir / f"{chave}.parquet", lambda caminho: df.to_parquet(caminho))
+                return
+            except Exception as e:
+                logging.debug(f"Aba não suportada em Parquet, usando pickle: {e}")
+        self._gravar_atomico(self.cache_dir / f"{chave}.pkl", lambda caminho: df.to_pickle(caminho))
+
+    def _gravar_atomico(self, destino, gravar):
+        fd, temporario = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            gravar(temporario)
+            os.replace(temporario, destino)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    def _entradas(self):
+        if not self.cache_dir.exists():
+            return []
+        return [arquivo for arquivo in self.cache_dir.iterdir() if arquivo.suffix in (".parquet", ".pkl", ".json")]
+
+    def _limitar_tamanho(self):
+        """Remove as entradas usadas há mais tempo até o cache caber no limite."""
+        entradas = [(arquivo, arquivo.stat()) for arquivo in self._entradas()]
+        total = sum(stat.st_size for _, stat in entradas)
+        for arquivo, stat in sorted(entradas, key=lambda item: item[1].st_mtime):
+            if total <= self.limite_bytes:
+                break
+            arquivo.unlink(missing_ok=True)
+            total -= stat.st_size
+
+
+planilha_cache = PlanilhaCache()
+
+
+def ler_planilha(file_path, sheet_name=0, **opcoes):
+    """Lê aba(s) de uma planilha Excel usando o cache compartilhado (ver ``PlanilhaCache.ler``)."""
+    return planilha_cache.ler(file_path, sheet_name, **opcoes)
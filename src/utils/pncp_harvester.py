@@ -0,0 +1,417 @@
+"""
+Coleta concorrente de compras e itens homologados no PNCP.
+
+As compras de um período são paginadas em paralelo e, para cada compra, os
+itens e seus resultados também são buscados em paralelo. O número de
+requisições simultâneas é limitado por um semáforo, a taxa por um token
+bucket, e falhas temporárias (429, 5xx, timeouts) são repetidas com backoff
+exponencial.
+
+Cada resposta bruta é gravada em ``JSON_COMPRASNET_CONTRATOS/pncp``. Nas
+coletas seguintes o ETag é enviado (``If-None-Match``) e compras cujo
+``dataAtualizacao`` não mudou são reaproveitadas do disco sem nenhuma
+requisição de itens.
+
+O cliente HTTP assíncrono é o ``aiohttp`` (dependência opcional). Sem ele,
+as requisições são feitas com ``urllib`` da biblioteca padrão em threads,
+com o mesmo limite de concorrência e de taxa.
+
+Uso:
+    python -m utils.pncp_harvester --inicio 2024-01-01 --fim 2024-12-31 --db pncp.db
+    python -m utils.pncp_harvester --inicio 2024-01-01 --fim 2024-12-31 \\
+        --base-url http://127.0.0.1:8765        # servidor de replay (utils.pncp_replay_server)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import AsyncExitStack
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+try:
+    import aiohttp
+except ImportError:  # dependência opcional: usa urllib em threads
+    aiohttp = None
+
+from database.tracing import tracer
+from paths import JSON_COMPRASNET_CONTRATOS, PNCP_DB_PATH
+
+PNCP_BASE_URL = "https://pncp.gov.br"
+CONSULTA_COMPRAS_PATH = "/api/consulta/v1/contratacoes/publicacao"
+ITENS_PATH = "/api/pncp/v1/orgaos/{cnpj}/compras/{ano}/{sequencial}/itens"
+CNPJ_MARINHA = "00394502000144"
+MODALIDADE_PREGAO = 6
+
+CACHE_DIR = JSON_COMPRASNET_CONTRATOS / "pncp"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Falhas de conexão repetidas com backoff (as do aiohttp só existem com ele instalado)
+ERROS_CONEXAO = (urllib.error.URLError, ConnectionError, asyncio.TimeoutError, TimeoutError) + (
+    (aiohttp.ClientConnectionError,) if aiohttp is not None else ()
+)
+
+
+def chave_requisicao(path, params=None):
+    """
+    Identifica uma requisição pelo caminho e pelos parâmetros ordenados.
+
+    O host não entra na chave, de modo que as respostas gravadas da API real
+    podem ser servidas pelo servidor de replay local.
+    """
+    query = urlencode(sorted((k, str(v)) for k, v in (params or {}).items()))
+    return hashlib.sha1(f"{path}?{query}".encode("utf-8")).hexdigest()[:24]
+
+
+def _gravar_json(caminho, dados):
+    """Grava o JSON de forma atômica (arquivo temporário + os.replace)."""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(temporario, caminho)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def _ler_json(caminho):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class TokenBucket:
+    """Limita a taxa de requisições: ``rate`` fichas por segundo, acumulando até ``capacity``."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class PNCPHarvester:
+    """
+    Coletor assíncrono de pregões homologados do PNCP.
+
+    Produz, para cada compra, o par ``(data_informacoes, resultados_completos)``
+    no mesmo formato esperado por ``salvar_consulta_api_no_db`` e
+    ``popular_db_consulta_itens_api`` (e por ``handle_api_data`` dos controladores).
+    """
+
+    def __init__(self, base_url=PNCP_BASE_URL, cache_dir=CACHE_DIR, concorrencia=8, taxa=5.0,
+                 rajada=None, tentativas=4, backoff=0.5, timeout=30, tamanho_pagina=50):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = Path(cache_dir)
+        self.concorrencia = concorrencia
+        self.taxa = taxa
+        self.rajada = rajada
+        self.tentativas = tentativas
+        self.backoff = backoff
+        self.timeout = timeout
+        self.tamanho_pagina = tamanho_pagina
+        self.estatisticas = {}
+
+    # ====== HTTP ======
+    async def _get_json(self, path, params=None):
+        """
+        GET com cache em disco, requisição condicional por ETag e repetição com backoff.
+
+        :return: Corpo JSON da resposta (ou None para 204 No Content).
+        """
+        chave = chave_requisicao(path, params)
+        arquivo = self.cache_dir / "respostas" / f"{chave}.json"
+        gravado = _ler_json(arquivo)
+        headers = {}
+        if gravado and gravado.get("etag"):
+            headers["If-None-Match"] = gravado["etag"]
+
+        for tentativa in range(self.tentativas + 1):
+            async with self._semaforo:
+                await self._bucket.acquire()
+                inicio = time.perf_counter()
+                status = None
+                try:
+                    status, resp_headers, conteudo = await self._get(path, params, headers)
+                    if status == 304 and gravado:
+                        self.estatisticas["nao_modificadas"] += 1
+                        return gravado["body"]
+                    if status in RETRY_STATUS:
+                        raise _RespostaTemporaria(status, _retry_after(resp_headers.get("Retry-After")))
+                    if status >= 400:
+                        raise RuntimeError(f"PNCP {path}: HTTP {status}")
+                    corpo = json.loads(conteudo) if status == 200 and conteudo.strip() else None
+                    _gravar_json(arquivo, {
+                        "path": path,
+                        "params": {k: str(v) for k, v in (params or {}).items()},
+                        "status": status,
+                        "etag": resp_headers.get("ETag"),
+                        "body": corpo,
+                    })
+                    self.estatisticas["requisicoes"] += 1
+                    return corpo
+                except (_RespostaTemporaria, *ERROS_CONEXAO) as e:
+                    if tentativa >= self.tentativas:
+                        raise
+                    self.estatisticas["repeticoes"] += 1
+                    espera = getattr(e, "espera", None) or self.backoff * (2 ** tentativa)
+                    logging.info(f"PNCP {path}: {e!r}; nova tentativa em {espera:.1f}s")
+                finally:
+                    tracer.record("http", path, (time.perf_counter() - inicio) * 1000, detail=f"status={status}")
+            # Aguarda fora do semáforo para não bloquear as demais requisições
+            await asyncio.sleep(espera * random.uniform(0.8, 1.2))
+
+    async def _get(self, path, params, headers):
+        """Executa o GET e retorna ``(status, headers, corpo em bytes)``."""
+        if self._session is not None:
+            async with self._session.get(self.base_url + path, params=params, headers=headers) as resp:
+                return resp.status, resp.headers, await resp.read()
+        return await asyncio.to_thread(self._get_urllib, path, params, headers)
+
+    def _get_urllib(self, path, params, headers):
+        """GET bloqueante com urllib (sem aiohttp); executado em uma thread."""
+        url = self.base_url + path + (f"?{urlencode(params)}" if params else "")
+        requisicao = urllib.request.Request(url, headers={"Accept": "application/json", **headers})
+        try:
+            with urllib.request.urlopen(requisicao, timeout=self.timeout) as resp:
+                return resp.status, resp.headers, resp.read()
+        except urllib.error.HTTPError as e:
+            # 304 e os códigos de erro chegam como exceção no urllib
+            return e.code, e.headers, e.read()
+
+    # ====== COMPRAS ======
+    async def listar_compras(self, data_inicial, data_final, cnpj=CNPJ_MARINHA, uasg=None,
+                             modalidade=MODALIDADE_PREGAO):
+        """Lista as compras publicadas no período, buscando as páginas seguintes em paralelo."""
+        params = {
+            "dataInicial": data_inicial.strftime("%Y%m%d"),
+            "dataFinal": data_final.strftime("%Y%m%d"),
+            "codigoModalidadeContratacao": modalidade,
+            "tamanhoPagina": self.tamanho_pagina,
+        }
+        if cnpj:
+            params["cnpj"] = cnpj
+        if uasg:
+            params["codigoUnidadeAdministrativa"] = uasg
+
+        primeira = await self._get_json(CONSULTA_COMPRAS_PATH, {**params, "pagina": 1})
+        if not primeira:
+            return []
+        compras = list(primeira.get("data", []))
+        paginas = await asyncio.gather(*(
+            self._get_json(CONSULTA_COMPRAS_PATH, {**params, "pagina": pagina})
+            for pagina in range(2, (primeira.get("totalPaginas") or 1) + 1)
+        ))
+        for pagina in paginas:
+            compras.extend((pagina or {}).get("data", []))
+        return compras
+
+    # ====== ITENS ======
+    async def coletar_compra(self, compra):
+        """
+        Busca itens e resultados de uma compra.
+
+        Se a compra já foi coletada com o mesmo ``dataAtualizacao``, devolve o
+        que está no disco sem fazer requisições.
+        """
+        arquivo = self.cache_dir / "compras" / f"{_nome_arquivo(compra)}.json"
+        gravado = _ler_json(arquivo)
+        if gravado and gravado.get("dataAtualizacao") == compra.get("dataAtualizacao"):
+            self.estatisticas["compras_reaproveitadas"] += 1
+            return gravado["data_informacoes"], gravado["resultados_completos"]
+
+        path = ITENS_PATH.format(
+            cnpj=compra.get("orgaoEntidade", {}).get("cnpj"),
+            ano=compra.get("anoCompra"),
+            sequencial=compra.get("sequencialCompra"),
+        )
+        quantidade = await self._get_json(f"{path}/quantidade") or 0
+        paginas = await asyncio.gather(*(
+            self._get_json(path, {"pagina": pagina, "tamanhoPagina": self.tamanho_pagina})
+            for pagina in range(1, math.ceil(int(quantidade) / self.tamanho_pagina) + 1)
+        ))
+        itens = [item for pagina in paginas for item in (pagina or [])]
+
+        resultados = await asyncio.gather(*(
+            self._get_json(f"{path}/{item['numeroItem']}/resultados") if item.get("temResultado") else _vazio()
+            for item in itens
+        ))
+        resultados_completos = []
+        for item, resultado in zip(itens, resultados):
+            # Um item homologado traz o primeiro resultado (fornecedor vencedor) mesclado
+            resultados_completos.append({**item, **(resultado[0] if resultado else {})})
+
+        _gravar_json(arquivo, {
+            "dataAtualizacao": compra.get("dataAtualizacao"),
+            "data_informacoes": compra,
+            "resultados_completos": resultados_completos,
+        })
+        self.estatisticas["compras_coletadas"] += 1
+        return compra, resultados_completos
+
+    # ====== COLETA ======
+    async def coletar(self, data_inicial, data_final, cnpj=CNPJ_MARINHA, uasgs=None,
+                      modalidade=MODALIDADE_PREGAO, ao_coletar=None):
+        """
+        Coleta todas as compras do período (opcionalmente restritas a UASGs).
+
+        :param ao_coletar: Função chamada a cada compra concluída com
+            ``(data_informacoes, resultados_completos)``.
+        :return: Lista de tuplas ``(data_informacoes, resultados_completos)``.
+        """
+        self.estatisticas = dict.fromkeys(
+            ["requisicoes", "nao_modificadas", "repeticoes", "compras_coletadas", "compras_reaproveitadas"], 0
+        )
+        self._semaforo = asyncio.Semaphore(self.concorrencia)
+        self._bucket = TokenBucket(self.taxa, self.rajada)
+
+        coletas = []
+        with tracer.span("pncp.coletar", "import") as info:
+            async with AsyncExitStack() as pilha:
+                self._session = None
+                if aiohttp is not None:
+                    self._session = await pilha.enter_async_context(aiohttp.ClientSession(
+                        connector=aiohttp.TCPConnector(limit=self.concorrencia, keepalive_timeout=30),
+                        timeout=aiohttp.ClientTimeout(total=self.timeout),
+                        headers={"Accept": "application/json"},
+                    ))
+                listagens = await asyncio.gather(*(
+                    self.listar_compras(data_inicial, data_final, cnpj, uasg, modalidade)
+                    for uasg in (uasgs or [None])
+                ))
+                compras = [compra for listagem in listagens for compra in listagem]
+
+                for tarefa in asyncio.as_completed([self.coletar_compra(compra) for compra in compras]):
+                    try:
+                        coleta = await tarefa
+                    except Exception as e:
+                        logging.error(f"Falha ao coletar compra do PNCP: {e}")
+                        continue
+                    coletas.append(coleta)
+                    if ao_coletar:
+                        ao_coletar(*coleta)
+            info["rows"] = len(coletas)
+        return coletas
+
+    def coletar_sync(self, *args, **kwargs):
+        """Versão bloqueante de ``coletar`` para uso fora de um loop asyncio."""
+        return asyncio.run(self.coletar(*args, **kwargs))
+
+
+def salvar_coletas(db_path, coletas):
+    """Grava as compras coletadas em 'pregoes_consultados' e 'pncp_itens'."""
+    from config.config_Setores.database import DatabaseManager
+
+    manager = DatabaseManager(db_path)
+    total_itens = 0
+    for data_informacoes, resultados_completos in coletas:
+        manager.salvar_consulta_api_no_db(data_informacoes)
+        total_itens += manager.popular_db_consulta_itens_api(
+            resultados_completos, data_informacoes, data_informacoes.get("numeroCompra"),
+            data_informacoes.get("anoCompra"), data_informacoes.get("unidadeOrgao", {}).get("codigoUnidade"),
+        )
+    return total_itens
+
+
+def iniciar_coleta(data_inicial, data_final, uasgs=None, db_path=PNCP_DB_PATH, ao_terminar=None, harvester=None):
+    """
+    Coleta o período com o ``PNCPHarvester`` e grava com ``salvar_coletas`` em uma thread de fundo.
+
+    ``ao_terminar(total_de_itens)`` é chamado ao final; recebe None se a
+    coleta falhou (use um sinal Qt para voltar à interface).
+    """
+    harvester = harvester or PNCPHarvester()
+
+    def executar():
+        try:
+            coletas = harvester.coletar_sync(data_inicial, data_final, uasgs=uasgs)
+            total = salvar_coletas(db_path, coletas)
+        except Exception as e:
+            logging.error(f"Falha na coleta do PNCP: {e}")
+            total = None
+        if ao_terminar is not None:
+            ao_terminar(total)
+
+    thread = threading.Thread(target=executar, name="pncp-coleta", daemon=True)
+    thread.start()
+    return thread
+
+
+class _RespostaTemporaria(Exception):
+    def __init__(self, status, espera=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.espera = espera
+
+
+def _retry_after(valor):
+    try:
+        return float(valor) if valor else None
+    except ValueError:
+        return None
+
+
+async def _vazio():
+    return []
+
+
+def _nome_arquivo(compra):
+    controle = compra.get("numeroControlePNCP") or (
+        f"{compra.get('orgaoEntidade', {}).get('cnpj')}-{compra.get('sequencialCompra')}-{compra.get('anoCompra')}"
+    )
+    return controle.replace("/", "-")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coleta pregões homologados do PNCP.")
+    parser.add_argument("--inicio", type=date.fromisoformat, default=date.today() - timedelta(days=30))
+    parser.add_argument("--fim", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--cnpj", default=CNPJ_MARINHA, help="CNPJ do órgão (padrão: Comando da Marinha)")
+    parser.add_argument("--uasg", action="append", help="Restringe a coleta a uma UASG (pode repetir)")
+    parser.add_argument("--base-url", default=PNCP_BASE_URL)
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--taxa", type=float, default=5.0, help="Requisições por segundo")
+    parser.add_argument("--db", type=Path, default=PNCP_DB_PATH, help="Banco SQLite onde gravar as compras coletadas")
+    args = parser.parse_args(argv)
+
+    harvester = PNCPHarvester(args.base_url, args.cache_dir, args.concorrencia, args.taxa)
+    inicio = time.perf_counter()
+    coletas = harvester.coletar_sync(args.inicio, args.fim, args.cnpj, args.uasg)
+    print(f"{len(coletas)} compras coletadas em {time.perf_counter() - inicio:.1f}s: {harvester.estatisticas}")
+    if args.db:
+        print(f"{salvar_coletas(args.db, coletas)} itens gravados em {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
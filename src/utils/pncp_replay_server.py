@@ -0,0 +1,148 @@
+"""
+Servidor local que reproduz respostas gravadas do PNCP.
+
+Serve os arquivos de ``JSON_COMPRASNET_CONTRATOS/pncp/respostas`` (gravados
+pelo ``PNCPHarvester``) na mesma rota e com os mesmos parâmetros da API real,
+respeitando ETag/``If-None-Match``. Latência e falhas artificiais permitem
+exercitar a concorrência, o rate limiting e as repetições sem acesso à rede.
+Ferramenta de desenvolvimento/benchmarks: requer ``aiohttp`` instalado.
+
+Uso:
+    python -m utils.pncp_replay_server --porta 8765 --latencia-ms 150 --falhas 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+from pathlib import Path
+
+from aiohttp import web
+
+from utils.pncp_harvester import CACHE_DIR, chave_requisicao
+
+
+def carregar_gravacoes(diretorio):
+    """Indexa as respostas gravadas por chave de requisição."""
+    gravacoes = {}
+    for arquivo in Path(diretorio).glob("*.json"):
+        with open(arquivo, "r", encoding="utf-8") as f:
+            gravacao = json.load(f)
+        gravacoes[chave_requisicao(gravacao["path"], gravacao.get("params"))] = gravacao
+    return gravacoes
+
+
+def criar_app(gravacoes, latencia_ms=0, falhas=0.0, semente=None):
+    """
+    Cria a aplicação aiohttp de replay.
+
+    :param latencia_ms: Atraso médio por resposta, para simular a API real.
+    :param falhas: Fração de respostas 503 (testa repetição com backoff).
+    """
+    rng = random.Random(semente)
+    estatisticas = {"atendidas": 0, "nao_modificadas": 0, "falhas": 0, "nao_encontradas": 0}
+
+    async def responder(request):
+        if latencia_ms:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * latencia_ms / 1000)
+        if falhas and rng.random() < falhas:
+            estatisticas["falhas"] += 1
+            return web.Response(status=503, headers={"Retry-After": "0.1"})
+
+        gravacao = gravacoes.get(chave_requisicao(request.path, dict(request.query)))
+        if gravacao is None:
+            estatisticas["nao_encontradas"] += 1
+            return web.Response(status=404)
+
+        etag = gravacao.get("etag") or f'"{chave_requisicao(request.path, dict(request.query))}"'
+        if request.headers.get("If-None-Match") == etag:
+            estatisticas["nao_modificadas"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+
+        estatisticas["atendidas"] += 1
+        if gravacao.get("status") == 204 or gravacao.get("body") is None:
+            return web.Response(status=204, headers={"ETag": etag})
+        return web.json_response(gravacao["body"], headers={"ETag": etag})
+
+    app = web.Application()
+    app["estatisticas"] = estatisticas
+    app.router.add_get("/{caminho:.*}", responder)
+    return app
+
+
+class ReplayServer:
+    """
+    Executa o servidor de replay em uma thread própria (útil em benchmarks).
+
+    Uso:
+        with ReplayServer(diretorio, latencia_ms=100) as servidor:
+            PNCPHarvester(servidor.url).coletar_sync(...)
+    """
+
+    def __init__(self, diretorio=CACHE_DIR / "respostas", host="127.0.0.1", porta=0, **opcoes):
+        self.app = criar_app(carregar_gravacoes(diretorio), **opcoes)
+        self.host = host
+        self.porta = porta
+        self.url = None
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        pronto = threading.Event()
+
+        def executar():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self.app)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, self.host, self.porta)
+            self._loop.run_until_complete(site.start())
+            porta = self._runner.addresses[0][1]
+            self.url = f"http://{self.host}:{porta}"
+            pronto.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=executar, name="pncp-replay", daemon=True)
+        self._thread.start()
+        pronto.wait()
+
+    def stop(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    @property
+    def estatisticas(self):
+        return self.app["estatisticas"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de replay das respostas gravadas do PNCP.")
+    parser.add_argument("--diretorio", type=Path, default=CACHE_DIR / "respostas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--falhas", type=float, default=0.0, help="Fração de respostas 503")
+    args = parser.parse_args(argv)
+
+    gravacoes = carregar_gravacoes(args.diretorio)
+    print(f"{len(gravacoes)} respostas gravadas em {args.diretorio}; servindo em http://{args.host}:{args.porta}")
+    web.run_app(criar_app(gravacoes, args.latencia_ms, args.falhas), host=args.host, port=args.porta, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""
+Preços de referência dos itens homologados no PNCP, por catálogo e unidade de medida.
+
+Para cada (catálogo, unidade) a tabela ``pncp_precos_referencia`` guarda um
+sketch de quantis do preço unitário homologado e, já calculados a partir
+dele, mínimo, máximo, percentis 10/25/50/75/90 e IQR. Consultar a referência
+de um item é uma leitura pela chave primária, sem percorrer os itens de
+todos os pregões.
+
+O sketch é um histograma logarítmico (DDSketch): cada preço cai no balde
+``ceil(log(preço) / log(γ))`` com γ = (1 + α) / (1 − α), e qualquer quantil
+é estimado com erro relativo de no máximo α (1%). Por ser apenas uma
+contagem por balde, o sketch é mesclável (somam-se as contagens) e aceita
+remoção (subtraem-se): ao gravar um pregão, os preços anteriores dos seus
+itens são retirados e os novos acrescentados, então consultar o mesmo
+pregão de novo não conta os itens duas vezes.
+"""
+
+import json
+import math
+from datetime import datetime
+
+import pandas as pd
+
+TABELA_ITENS = "pncp_itens"
+TABELA_REFERENCIA = "pncp_precos_referencia"
+
+# Erro relativo máximo dos quantis estimados
+ERRO_RELATIVO = 0.01
+# Percentil acima do qual o preço homologado é sinalizado (padrão)
+PERCENTIL_ALERTA = 90
+# Referência com menos preços que isso não é usada para sinalizar
+AMOSTRA_MINIMA = 5
+SITUACAO_HOMOLOGADO = "Adjudicado e Homologado"
+
+COLUNAS_REFERENCIA = {
+    "catalogo": "TEXT NOT NULL",
+    "unidade": "TEXT NOT NULL",
+    "qtd": "INTEGER",
+    "minimo": "REAL",
+    "p10": "REAL",
+    "p25": "REAL",
+    "mediana": "REAL",
+    "p75": "REAL",
+    "p90": "REAL",
+    "maximo": "REAL",
+    "iqr": "REAL",
+    "sketch": "TEXT",
+    "atualizado_em": "TEXT",
+}
+
+SQL_PRECOS = (
+    f"SELECT catalogo, unidade, valor_homologado_item_unitario FROM {TABELA_ITENS} "
+    f"WHERE catalogo IS NOT NULL AND valor_homologado_item_unitario > 0 AND situacao = '{SITUACAO_HOMOLOGADO}'"
+)
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis com erro relativo limitado, mesclável e com remoção.
+
+    ``minimo`` e ``maximo`` são sempre valores exatos ou None. Uma remoção que
+    atinge um extremo o torna desconhecido (None), pois o sketch só guarda
+    contagens por balde; enquanto isso os quantis são limitados pelas bordas
+    dos baldes extremos (``piso``/``teto``).
+    """
+
+    def __init__(self, erro_relativo=ERRO_RELATIVO, baldes=None, minimo=None, maximo=None):
+        self.erro_relativo = erro_relativo
+        self.gamma = (1 + erro_relativo) / (1 - erro_relativo)
+        self._log_gamma = math.log(self.gamma)
+        self.baldes = dict(baldes or {})
+        self.minimo = minimo
+        self.maximo = maximo
+
+    @property
+    def qtd(self):
+        return sum(self.baldes.values())
+
+    @property
+    def piso(self):
+        """Mínimo exato ou, se desconhecido, a borda inferior do menor balde."""
+        if self.minimo is not None or not self.baldes:
+            return self.minimo
+        return self.gamma ** (min(self.baldes) - 1)
+
+    @property
+    def teto(self):
+        """Máximo exato ou, se desconhecido, a borda superior do maior balde."""
+        if self.maximo is not None or not self.baldes:
+            return self.maximo
+        return self.gamma ** max(self.baldes)
+
+    def _balde(self, valor):
+        return math.ceil(math.log(valor) / self._log_gamma)
+
+    def _menor(self, minimo, baldes, outro_minimo, outros_baldes):
+        """Mínimo exato da união de dois conjuntos de baldes (None se não for possível saber)."""
+        if not baldes:
+            return outro_minimo
+        if not outros_baldes:
+            return minimo
+        if minimo is not None and outro_minimo is not None:
+            return min(minimo, outro_minimo)
+        conhecido, baldes_desconhecido = (minimo, outros_baldes) if minimo is not None else (outro_minimo, baldes)
+        # O valor conhecido só é o mínimo se estiver num balde abaixo de todos os do outro lado
+        if conhecido is not None and self._balde(conhecido) < min(baldes_desconhecido):
+            return conhecido
+        return None
+
+    def _maior(self, maximo, baldes, outro_maximo, outros_baldes):
+        """Máximo exato da união de dois conjuntos de baldes (None se não for possível saber)."""
+        if not baldes:
+            return outro_maximo
+        if not outros_baldes:
+            return maximo
+        if maximo is not None and outro_maximo is not None:
+            return max(maximo, outro_maximo)
+        conhecido, baldes_desconhecido = (maximo, outros_baldes) if maximo is not None else (outro_maximo, baldes)
+        if conhecido is not None and self._balde(conhecido) > max(baldes_desconhecido):
+            return conhecido
+        return None
+
+    def adicionar(self, valor, vezes=1):
+        if valor <= 0:
+            return
+        balde = self._balde(valor)
+        novo = {balde: vezes}
+        self.minimo = self._menor(self.minimo, self.baldes, valor, novo)
+        self.maximo = self._maior(self.maximo, self.baldes, valor, novo)
+        self.baldes[balde] = self.baldes.get(balde, 0) + vezes
+
+    def remover(self, valor):
+        """Retira um valor adicionado antes; se ele era um extremo, o extremo passa a ser desconhecido."""
+        if valor <= 0:
+            return
+        balde = self._balde(valor)
+        restante = self.baldes.get(balde, 0) - 1
+        if restante > 0:
+            self.baldes[balde] = restante
+        else:
+            self.baldes.pop(balde, None)
+        if not self.baldes:
+            self.minimo = self.maximo = None
+            return
+        if self.minimo is not None and valor <= self.minimo:
+            self.minimo = None
+        if self.maximo is not None and valor >= self.maximo:
+            self.maximo = None
+
+    def mesclar(self, outro):
+        self.minimo = self._menor(self.minimo, self.baldes, outro.minimo, outro.baldes)
+        self.maximo = self._maior(self.maximo, self.baldes, outro.maximo, outro.baldes)
+        for balde, contagem in outro.baldes.items():
+            self.baldes[balde] = self.baldes.get(balde, 0) + contagem
+        return self
+
+    def _valor_do_balde(self, balde):
+        return 2 * self.gamma ** balde / (self.gamma + 1)
+
+    def quantis(self, qs):
+        """Estima os quantis ``qs`` (0 a 1) em uma única passagem pelos baldes ordenados."""
+        total = self.qtd
+        if not total:
+            return [None] * len(qs)
+        ordem = sorted(range(len(qs)), key=lambda i: qs[i])
+        resultados = [None] * len(qs)
+        baldes = sorted(self.baldes.items())
+        acumulado, posicao = 0, 0
+        for i in ordem:
+            alvo = qs[i] * (total - 1)
+            while posicao < len(baldes) - 1 and acumulado + baldes[posicao][1] <= alvo:
+                acumulado += baldes[posicao][1]
+                posicao += 1
+            valor = self._valor_do_balde(baldes[posicao][0])
+            resultados[i] = min(max(valor, self.piso), self.teto)
+        return resultados
+
+    def quantil(self, q):
+        return self.quantis([q])[0]
+
+    def para_json(self):
+        return json.dumps({
+            "a": self.erro_relativo,
+            "b": {str(balde): contagem for balde, contagem in self.baldes.items()},
+            "min": self.minimo,
+            "max": self.maximo,
+        })
+
+    @classmethod
+    def de_json(cls, texto):
+        dados = json.loads(texto)
+        return cls(dados["a"], {int(b): c for b, c in dados["b"].items()}, dados["min"], dados["max"])
+
+
+def preparar_tabela_referencia(conn):
+    """
+    Cria ``pncp_precos_referencia`` se necessário.
+
+    Retorna True quando a tabela acabou de ser criada e foi preenchida a partir
+    de todos os itens já gravados (nesse caso não há atualização incremental a fazer).
+    """
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABELA_REFERENCIA,)
+    ).fetchone()
+    if existe:
+        return False
+    colunas = ", ".join(f"{coluna} {tipo}" for coluna, tipo in COLUNAS_REFERENCIA.items())
+    conn.execute(f"CREATE TABLE {TABELA_REFERENCIA} ({colunas}, PRIMARY KEY (catalogo, unidade))")
+    reconstruir_referencias(conn)
+    return True
+
+
+def _chave_catalogo(catalogo):
+    return str(catalogo).strip()
+
+
+def _chave_unidade(unidade):
+    return str(unidade or "").strip().upper()
+
+
+def _chave(catalogo, unidade):
+    return _chave_catalogo(catalogo), _chave_unidade(unidade)
+
+
+def _registrar_chaves(conn):
+    """Expõe ao SQL a mesma normalização de ``_chave`` (o UPPER do SQLite só trata ASCII: 'Peça' viraria 'PEçA')."""
+    conn.create_function("chave_catalogo", 1, _chave_catalogo, deterministic=True)
+    conn.create_function("chave_unidade", 1, _chave_unidade, deterministic=True)
+
+
+def _gravar(conn, sketches):
+    atualizado_em = datetime.now().isoformat(timespec="seconds")
+    remover, gravar = [], []
+    for (catalogo, unidade), sketch in sketches.items():
+        if not sketch.qtd:
+            remover.append((catalogo, unidade))
+            continue
+        p10, p25, p50, p75, p90 = sketch.quantis([0.10, 0.25, 0.50, 0.75, 0.90])
+        gravar.append((
+            catalogo, unidade, sketch.qtd, sketch.minimo, p10, p25, p50, p75, p90, sketch.maximo,
+            p75 - p25, sketch.para_json(), atualizado_em,
+        ))
+    conn.executemany(f"DELETE FROM {TABELA_REFERENCIA} WHERE catalogo = ? AND unidade = ?", remover)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {TABELA_REFERENCIA} ({', '.join(COLUNAS_REFERENCIA)}) "
+        f"VALUES ({', '.join('?' * len(COLUNAS_REFERENCIA))})",
+        gravar,
+    )
+
+
+def reconstruir_referencias(conn):
+    """Recalcula todos os sketches a partir de ``pncp_itens`` (criação e migrações em lote)."""
+    sketches = {}
+    for catalogo, unidade, valor in conn.execute(SQL_PRECOS):
+        sketches.setdefault(_chave(catalogo, unidade), QuantileSketch()).adicionar(valor)
+    conn.execute(f"DELETE FROM {TABELA_REFERENCIA}")
+    _gravar(conn, sketches)
+    return len(sketches)
+
+
+def precos_do_pregao(conn, numero_controle):
+    """Preços homologados válidos de um pregão: lista de (catálogo, unidade, preço)."""
+    return conn.execute(SQL_PRECOS + " AND numeroControlePNCP = ?", (numero_controle,)).fetchall()
+
+
+def atualizar_referencias(conn, removidos, adicionados):
+    """
+    Retira dos sketches os preços ``removidos`` e acrescenta os ``adicionados``.
+
+    Só as chaves (catálogo, unidade) envolvidas são lidas e regravadas.
+    """
+    chaves = {_chave(c, u) for c, u, _ in removidos} | {_chave(c, u) for c, u, _ in adicionados}
+    if not chaves:
+        return 0
+    sketches = {}
+    for catalogo, unidade in chaves:
+        linha = conn.execute(
+            f"SELECT sketch FROM {TABELA_REFERENCIA} WHERE catalogo = ? AND unidade = ?", (catalogo, unidade)
+        ).fetchone()
+        sketches[(catalogo, unidade)] = QuantileSketch.de_json(linha[0]) if linha else QuantileSketch()
+    for catalogo, unidade, valor in removidos:
+        sketches[_chave(catalogo, unidade)].remover(valor)
+    for catalogo, unidade, valor in adicionados:
+        sketches[_chave(catalogo, unidade)].adicionar(valor)
+    _recalcular_extremos(conn, {chave: sketch for chave, sketch in sketches.items() if sketch.qtd})
+    _gravar(conn, sketches)
+    return len(sketches)
+
+
+def _recalcular_extremos(conn, sketches):
+    """
+    Relê de ``pncp_itens`` (já atualizada) o mínimo e o máximo exatos das
+    chaves cujo extremo ficou desconhecido após uma remoção.
+    """
+    pendentes = {chave for chave, sketch in sketches.items() if sketch.minimo is None or sketch.maximo is None}
+    if not pendentes:
+        return
+    _registrar_chaves(conn)
+    catalogos = sorted({catalogo for catalogo, _ in pendentes})
+    for i in range(0, len(catalogos), 900):  # limite de parâmetros do SQLite
+        lote = catalogos[i:i + 900]
+        for catalogo, unidade, minimo, maximo in conn.execute(
+            f"SELECT chave_catalogo(catalogo), chave_unidade(unidade), MIN(valor_homologado_item_unitario), "
+            f"MAX(valor_homologado_item_unitario) FROM ({SQL_PRECOS}) "
+            f"WHERE chave_catalogo(catalogo) IN ({','.join('?' * len(lote))}) "
+            f"GROUP BY chave_catalogo(catalogo), chave_unidade(unidade)",
+            lote,
+        ):
+            if (catalogo, unidade) in pendentes:
+                sketches[(catalogo, unidade)].minimo = minimo
+                sketches[(catalogo, unidade)].maximo = maximo
+
+
+def referencia_preco(conn, catalogo, unidade=None, quantis=None):
+    """
+    Referência de preço de um item de catálogo.
+
+    Retorna a lista de referências (uma por unidade de medida, ou só a de
+    ``unidade``) como dicionários com as colunas da tabela; ``quantis``
+    acrescenta percentis arbitrários (0 a 1) estimados pelo sketch.
+    """
+    preparar_tabela_referencia(conn)
+    if unidade is None:
+        cursor = conn.execute(f"SELECT * FROM {TABELA_REFERENCIA} WHERE catalogo = ?", (str(catalogo).strip(),))
+    else:
+        cursor = conn.execute(
+            f"SELECT * FROM {TABELA_REFERENCIA} WHERE catalogo = ? AND unidade = ?", _chave(catalogo, unidade)
+        )
+    colunas = [descricao[0] for descricao in cursor.description]
+    referencias = []
+    for linha in cursor.fetchall():
+        referencia = dict(zip(colunas, linha))
+        sketch = QuantileSketch.de_json(referencia.pop("sketch"))
+        if quantis:
+            referencia["quantis"] = dict(zip(quantis, sketch.quantis(list(quantis))))
+        referencias.append(referencia)
+    return referencias
+
+
+def itens_acima_do_percentil(conn, percentil=PERCENTIL_ALERTA, numero_controle=None, amostra_minima=AMOSTRA_MINIMA):
+    """
+    Itens homologados com preço unitário acima do percentil de referência do seu catálogo/unidade.
+
+    O limite de cada chave vem do sketch (percentil configurável); as
+    referências com menos de ``amostra_minima`` preços são ignoradas.
+    ``numero_controle`` restringe a verificação a um pregão.
+    """
+    preparar_tabela_referencia(conn)
+    _registrar_chaves(conn)
+    filtro, parametros = "", [amostra_minima]
+    if numero_controle:
+        filtro, parametros = f"AND catalogo IN (SELECT chave_catalogo(catalogo) FROM {TABELA_ITENS} WHERE numeroControlePNCP = ?)", [
+            amostra_minima, numero_controle
+        ]
+    limites = []
+    for catalogo, unidade, sketch in conn.execute(
+        f"SELECT catalogo, unidade, sketch FROM {TABELA_REFERENCIA} WHERE qtd >= ? {filtro}", parametros
+    ):
+        limites.append((catalogo, unidade, QuantileSketch.de_json(sketch).quantil(percentil / 100)))
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS limites_preco (catalogo TEXT, unidade TEXT, limite REAL, PRIMARY KEY (catalogo, unidade))")
+    conn.execute("DELETE FROM temp.limites_preco")
+    conn.executemany("INSERT INTO temp.limites_preco VALUES (?, ?, ?)", limites)
+    filtro_pregao = "AND i.numeroControlePNCP = ?" if numero_controle else ""
+    return pd.read_sql_query(
+        f"""
+        SELECT i.numeroControlePNCP, i.item, i.catalogo, i.descricao, i.unidade, i.uasg, i.empresa, i.cnpj,
+               i.valor_homologado_item_unitario, l.limite AS limite_percentil, r.mediana AS mediana_referencia,
+               ROUND(100.0 * (i.valor_homologado_item_unitario - r.mediana) / r.mediana, 2) AS acima_mediana_pct
+        FROM {TABELA_ITENS} i
+        JOIN temp.limites_preco l
+          ON l.catalogo = chave_catalogo(i.catalogo) AND l.unidade = chave_unidade(i.unidade)
+        JOIN {TABELA_REFERENCIA} r ON r.catalogo = l.catalogo AND r.unidade = l.unidade
+        WHERE i.situacao = '{SITUACAO_HOMOLOGADO}' AND i.valor_homologado_item_unitario > l.limite {filtro_pregao}
+        ORDER BY acima_mediana_pct DESC
+        """,
+        conn,
+        params=[numero_controle] if numero_controle else None,
+    )
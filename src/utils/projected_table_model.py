@@ -0,0 +1,119 @@
+from PyQt6.QtSql import QSqlDriver, QSqlQuery, QSqlTableModel
+
+
+class ProjectedSqlTableModel(QSqlTableModel):
+    """
+    QSqlTableModel que busca do banco apenas as colunas visíveis.
+
+    As tabelas de contratos e do cartão corporativo são largas e as views
+    exibem poucas colunas. Aqui o SELECT traz as colunas ocultas como
+    ``NULL AS coluna``: o registro do modelo continua com todas as colunas
+    (``fieldIndex``, cabeçalhos e delegates não mudam), mas o SQLite não lê
+    esses valores e nenhum QVariant é criado para eles. Filtro (WHERE) e
+    ordenação (ORDER BY qualificado pela tabela) continuam valendo sobre as
+    colunas reais.
+
+    A chave primária e a coluna de ordenação são sempre buscadas (a primeira
+    é necessária para gravar edições; sem a segunda o Qt não monta o ORDER
+    BY) e ``always_columns`` cobre colunas usadas por cálculos de outras
+    colunas.
+    A linha completa é lida sob demanda com ``fetch_record_by_key``.
+    """
+
+    def __init__(self, parent=None, db=None):
+        super().__init__(parent, db)
+        self._visible_columns = None  # None: sem projeção (todas as colunas)
+        self._always_columns = set()
+        self._sort_column = -1
+
+    def setSort(self, column, order):
+        # QSqlTableModel não expõe a coluna de ordenação; ``sort`` também passa por aqui
+        self._sort_column = column
+        super().setSort(column, order)
+
+    def sortColumn(self):
+        """Coluna de ordenação definida por ``setSort``/``sort`` (-1 se nenhuma)."""
+        return self._sort_column
+
+    def set_visible_columns(self, columns, always_columns=()):
+        """
+        Define as colunas (nomes ou índices) buscadas do banco.
+
+        Refaz a consulta apenas se a projeção mudou; chamar de novo após
+        exibir/ocultar colunas reprojeta o modelo.
+        """
+        visible = {self._column_name(column) for column in columns}
+        always = {self._column_name(column) for column in always_columns}
+        visible.discard(None)
+        always.discard(None)
+        if visible == self._visible_columns and always == self._always_columns:
+            return
+        self._visible_columns = visible
+        self._always_columns = always
+        if self.tableName():
+            self.select()
+
+    def set_visible_from_view(self, table_view, always_columns=()):
+        """Projeta as colunas que não estão ocultas em ``table_view``."""
+        visible = [column for column in range(self.columnCount()) if not table_view.isColumnHidden(column)]
+        self.set_visible_columns(visible, always_columns)
+
+    def clear_projection(self):
+        """Volta a buscar todas as colunas."""
+        if self._visible_columns is not None:
+            self._visible_columns = None
+            if self.tableName():
+                self.select()
+
+    def selectStatement(self):
+        primary_key = self.primaryKey()
+        if self._visible_columns is None or not self.tableName() or primary_key.isEmpty():
+            # Sem chave primária o Qt identifica a linha a editar por todos os valores: não projeta
+            return super().selectStatement()
+
+        driver = self.database().driver()
+        fetched = self._visible_columns | self._always_columns
+        fetched |= {primary_key.fieldName(i) for i in range(primary_key.count())}
+        if self.sortColumn() >= 0:
+            # Coluna oculta vira NULL no registro e o Qt deixaria de gerar o ORDER BY
+            fetched.add(self._column_name(self.sortColumn()))
+
+        record = self.database().record(self.tableName())
+        columns = []
+        for i in range(record.count()):
+            name = record.fieldName(i)
+            quoted = driver.escapeIdentifier(name, QSqlDriver.IdentifierType.FieldName)
+            columns.append(quoted if name in fetched else f"NULL AS {quoted}")
+
+        table = driver.escapeIdentifier(self.tableName(), QSqlDriver.IdentifierType.TableName)
+        statement = f"SELECT {', '.join(columns)} FROM {table}"
+        if self.filter():
+            statement += f" WHERE ({self.filter()})"
+        order_by = self.orderByClause()
+        if order_by:
+            statement += f" {order_by}"
+        return statement
+
+    def fetch_record_by_key(self, key_value):
+        """Lê do banco todas as colunas da linha com a chave primária informada (dict ou None)."""
+        primary_key = self.primaryKey()
+        key_column = primary_key.fieldName(0) if not primary_key.isEmpty() else "id"
+        driver = self.database().driver()
+        query = QSqlQuery(self.database())
+        query.prepare(
+            f"SELECT * FROM {driver.escapeIdentifier(self.tableName(), QSqlDriver.IdentifierType.TableName)} "
+            f"WHERE {driver.escapeIdentifier(key_column, QSqlDriver.IdentifierType.FieldName)} = ?"
+        )
+        query.addBindValue(key_value)
+        if not query.exec():
+            print(f"Erro ao carregar registro: {query.lastError().text()}")
+            return None
+        if not query.next():
+            return None
+        record = query.record()
+        return {record.fieldName(i): query.value(i) for i in range(record.count())}
+
+    def _column_name(self, column):
+        if isinstance(column, int):
+            return self.record().fieldName(column) or None
+        return column
@@ -1,6 +1,5 @@
 from PyQt6.QtWidgets import QLabel, QLineEdit
 from PyQt6.QtCore import QSortFilterProxyModel, Qt, QRegularExpression
-from datetime import datetime
 
 class MultiColumnFilterProxyModel(QSortFilterProxyModel):
     def __init__(self, *args, **kwargs):
@@ -50,8 +49,8 @@ class ContratosMultiColumnFilterProxyModel(QSortFilterProxyModel):
         # Verifica se estamos na coluna `vigencia_final`
         column = left.column()
         if column == self.sourceModel().fieldIndex("vigencia_final"):
-            left_date = self._parse_date(left_data)
-            right_date = self._parse_date(right_data)
+            left_date = self._iso_date(left_data)
+            right_date = self._iso_date(right_data)
 
             # Coloca valores inválidos ou NULL no final
             if left_date is None and right_date is None:
@@ -68,14 +67,16 @@ class ContratosMultiColumnFilterProxyModel(QSortFilterProxyModel):
         return super().lessThan(left, right)
 
     @staticmethod
-    def _parse_date(date_str):
-        """Tenta converter uma string de data no formato YYYY-MM-DD."""
-        if not date_str:
-            return None
-        try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            return None
+    def _iso_date(date_str):
+        """
+        Retorna a data ISO (YYYY-MM-DD) como texto, ou None se vazia/inválida.
+
+        As datas são gravadas normalizadas em ISO, que ordena corretamente como
+        texto; não é preciso converter para datetime a cada comparação.
+        """
+        if isinstance(date_str, str) and len(date_str) >= 10 and date_str[4] == "-" and date_str[7] == "-":
+            return date_str[:10]
+        return None
 
 def on_search_text_changed(text, proxy_model):
     """
@@ -1,4 +1,5 @@
 import json
+from paths import document_store
 from PyQt6.QtWidgets import QHBoxLayout, QLabel, QComboBox, QMessageBox, QSizePolicy
 
 def create_selecao_om_layout(database_path, dados, load_sigla_om_callback, on_om_changed_callback):
@@ -43,22 +44,16 @@ def create_selecao_om_layout(database_path, dados, load_sigla_om_callback, on_om
 def load_sigla_om(json_path, sigla_om_cb, sigla_om):
     """Carrega as siglas OM no QComboBox a partir do JSON."""
     try:
-        print(f"DEBUG: Tentando abrir {json_path}")  # Debug
-
         # Verifica se o arquivo realmente existe
         if not json_path.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {json_path}")
 
-        # Lê o conteúdo do arquivo
-        with open(json_path, "r", encoding="utf-8") as file:
-            content = file.read().strip()  # Remove espaços extras
-            print(f"DEBUG: Conteúdo do JSON -> {content}")  # Debug
-
-            # Se o arquivo estiver vazio, lança um erro
-            if not content:
-                raise ValueError("Arquivo JSON está vazio!")
+        # Lê o conteúdo do cache de documentos (o arquivo só é relido se mudar)
+        data = document_store.get(json_path)
 
-            data = json.loads(content)  # Converte JSON para dicionário
+        # Se o arquivo estiver vazio ou inválido, lança um erro
+        if not data:
+            raise ValueError("Arquivo JSON está vazio ou inválido!")
 
         # Verifica se a chave 'organizacoes' existe
         if "organizacoes" not in data:
@@ -83,11 +78,10 @@ def on_om_changed(obj, om_combo, dados, json_path):
     selected_om = om_combo.currentText()
     print(f"OM changed to: {selected_om}")
     try:
-        with open(json_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        data = document_store.get(json_path, {})
         
         # Filtra a organização correspondente à sigla selecionada
-        org = next((org for org in data["organizacoes"] if org["Sigla"] == selected_om), None)
+        org = next((org for org in data.get("organizacoes", []) if org["Sigla"] == selected_om), None)
         
         if org:
             dados['uasg'] = str(org["UASG"])  # Converte `uasg` para string
@@ -0,0 +1,88 @@
+import sys
+import threading
+import time
+import traceback
+from PyQt6.QtCore import QObject, QTimer
+from database.tracing import tracer
+
+
+class StallDetector(QObject):
+    """
+    Detecta bloqueios do loop de eventos do Qt.
+
+    Um QTimer na thread da interface atualiza um "batimento" a cada
+    ``interval_ms``. Uma thread de vigilância verifica esse batimento e, se a
+    interface ficar parada por mais de ``threshold_ms``, captura uma amostra
+    da pilha da thread principal. Quando o loop volta a responder, o
+    travamento é registrado no tracer com a duração total (categoria "stall").
+    """
+
+    def __init__(self, threshold_ms=250, interval_ms=50, parent=None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._stack_sample = None
+        self._running = False
+        self._watchdog = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._last_beat = time.perf_counter()
+        self._timer.start()
+        self._watchdog = threading.Thread(target=self._watch, name="stall-detector", daemon=True)
+        self._watchdog.start()
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        self._timer.stop()
+        # A vigilância confere ``_running`` a cada ciclo; o timeout evita travar o encerramento
+        watchdog, self._watchdog = self._watchdog, None
+        if watchdog is not None and watchdog is not threading.current_thread():
+            watchdog.join(timeout)
+
+    def _blocked_ms(self, last_beat, now):
+        """Atraso além do intervalo esperado entre dois batimentos (usado pelas duas threads)."""
+        return (now - last_beat) * 1000 - self.interval_ms
+
+    def _beat(self):
+        """Executado na thread da interface sempre que o loop de eventos está livre."""
+        now = time.perf_counter()
+        last_beat, self._last_beat = self._last_beat, now
+        # Todo batimento encerra o bloqueio: a amostra só vale para o bloqueio que termina aqui
+        sample, self._stack_sample = self._stack_sample, None
+        blocked_ms = self._blocked_ms(last_beat, now)
+        if blocked_ms >= self.threshold_ms:
+            stack = sample[1] if sample is not None and sample[0] == last_beat else None
+            tracer.record("stall", _stack_tag(stack), blocked_ms, detail="Loop de eventos bloqueado", stack=stack)
+
+    def _watch(self):
+        """Thread de vigilância: amostra a pilha da thread principal durante o bloqueio."""
+        check_interval = max(self.threshold_ms / 4000, 0.01)
+        while self._running:
+            time.sleep(check_interval)
+            last_beat = self._last_beat
+            if self._blocked_ms(last_beat, time.perf_counter()) < self.threshold_ms:
+                continue
+            sample = self._stack_sample
+            if sample is not None and sample[0] == last_beat:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is not None:
+                # A amostra guarda o batimento do bloqueio a que pertence
+                self._stack_sample = (last_beat, "".join(traceback.format_stack(frame)))
+
+
+def _stack_tag(stack):
+    """Usa a linha mais interna da amostra de pilha como identificação do travamento."""
+    if not stack:
+        return "event-loop"
+    lines = [line.strip() for line in stack.strip().splitlines() if line.strip().startswith("File ")]
+    return lines[-1] if lines else "event-loop"
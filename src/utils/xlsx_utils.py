@@ -1,4 +1,5 @@
 import pandas as pd
+from utils.planilha_cache import ler_planilha
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 
 def select_xlsx_multiple_sheets(sheet_names):
@@ -19,7 +20,7 @@ def select_xlsx_multiple_sheets(sheet_names):
 
     try:
         # Load only specified sheets
-        dfs = pd.read_excel(file_path, sheet_name=sheet_names)
+        dfs = ler_planilha(file_path, sheet_name=sheet_names)
 
         # Check for empty sheets
         for sheet_name in sheet_names:
@@ -44,7 +45,7 @@ def select_xlsx_file(sheet_name):
         return None, None  # No file selected
 
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        df = ler_planilha(file_path, sheet_name=sheet_name)
 
         if df.empty:
             QMessageBox.warning(None, "Erro", f"A aba '{sheet_name}' está vazia ou não existe.")